@@ -0,0 +1,60 @@
+"""
+Batch Recommendation Benchmark
+Throughput of get_recommendations_batch over large synthetic user cohorts
+
+Run from the project root:
+    python -m benchmarks.bench_batch
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+from benchmarks.synthetic import make_places_df
+from config.config import CATEGORY_KEYWORDS
+from src.recommender.recommendation_engine import RecommendationEngine
+
+
+def make_profiles(num_profiles: int, seed: int = 3) -> list:
+    """Random (categories, budget_level, top_n) profiles, 1-4 categories each"""
+    rng = np.random.default_rng(seed)
+    categories = np.array(list(CATEGORY_KEYWORDS))
+    profiles = []
+    for _ in range(num_profiles):
+        picked = rng.choice(categories, rng.integers(1, 5), replace=False)
+        profiles.append((list(picked), int(rng.integers(1, 5)), int(rng.choice([5, 10, 20]))))
+    return profiles
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 16 + "BATCH RECOMMENDATION BENCHMARK")
+    print("="*70)
+
+    profiles = make_profiles(100_000)
+    for num_places in (1_000, 100_000):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = RecommendationEngine('boston', places_df=make_places_df(num_places))
+
+        start = time.perf_counter()
+        batch = engine.get_recommendations_batch(profiles)
+        elapsed = time.perf_counter() - start
+
+        # Spot-check against the single-profile path
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(0, len(profiles), 5_000):
+                categories, budget_level, top_n = profiles[i]
+                expected = engine.get_recommendations(categories, budget_level, 1, top_n)
+                got = batch['positions'][i, :batch['counts'][i]]
+                assert np.array_equal(engine.places_df.index[got], expected.index)
+
+        print(f"\n📦 {num_places:,} places, {len(profiles):,} profiles "
+              f"({len({(tuple(c), b) for c, b, _ in profiles}):,} distinct)")
+        print(f"   {elapsed:.2f}s → {len(profiles) / elapsed * 60:,.0f} profiles/minute")
+
+    print("\n✅ Batch results match get_recommendations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+CLI Cold Start Benchmark
+Time from process start to printed answer for cli.py against loading the full engine
+
+Every run is a fresh interpreter, so import time, parquet reads and index
+builds are all counted. The CLI runs on both file layouts: a single row group
+(column projection only) and one row group per category as
+DataCollector.save_city_data writes it (projection plus row group skipping).
+
+Run from the project root:
+    python -m benchmarks.bench_cli
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_places_parquet
+from src.recommender.projection import DISPLAY_COLUMNS, ENGINE_COLUMNS, read_places, row_filters
+
+SIZES = (100_000, 1_000_000)
+RUNS = 5
+CITY = 'boston'
+CATEGORIES = ['food', 'cultural']
+BUDGET = 2
+
+FULL_ENGINE = (
+    "import contextlib, io, sys\n"
+    "from src.recommender.recommendation_engine import RecommendationEngine\n"
+    "from src.recommender.rendering import render_recommendations\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    engine = RecommendationEngine({city!r}, materialized_dir=None)\n"
+    "sys.stdout.write(render_recommendations(engine.get_recommendations({categories!r}, {budget}, 1, 20)))\n"
+)
+
+
+def cold_start(command: list, cwd: str) -> float:
+    """Median wall seconds of RUNS fresh processes"""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 22 + "CLI COLD START BENCHMARK")
+    print("="*70)
+
+    cli = os.path.join(os.getcwd(), 'cli.py')
+    query = ['recommend', CITY, *CATEGORIES, '--budget', str(BUDGET), '--top-n', '20']
+    full = FULL_ENGINE.format(city=CITY, categories=CATEGORIES, budget=BUDGET)
+
+    print(f"\n🐍 {'interpreter alone':30s} {cold_start([sys.executable, '-c', 'pass'], '.'):7.3f}s")
+    print(f"❓ {'cli.py --help':30s} {cold_start([sys.executable, cli, '--help'], '.'):7.3f}s")
+
+    for num_places in SIZES:
+        with tempfile.TemporaryDirectory() as workspace:
+            single = write_places_parquet(num_places, os.path.join(workspace, 'single'), CITY)
+            grouped = write_places_parquet(num_places, os.path.join(workspace, 'data/processed'),
+                                           CITY, by_category=True)
+            read = read_places(grouped, ENGINE_COLUMNS + DISPLAY_COLUMNS,
+                               row_filters(CATEGORIES, BUDGET))
+            print(f"\n📦 {num_places:,} places | query reads {len(read):,} rows × "
+                  f"{len(read.columns)} columns")
+
+            baseline = cold_start([sys.executable, '-c', full], workspace)
+            print(f"   {'full engine load':30s} {baseline:7.3f}s")
+            for label, data_file in (('single row group', single),
+                                     ('row group per category', grouped)):
+                elapsed = cold_start([sys.executable, cli, *query,
+                                      '--data-dir', str(data_file.parent)], workspace)
+                print(f"   {'cli, ' + label:30s} {elapsed:7.3f}s ({baseline / elapsed:4.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Collection Benchmark
+Sequential vs concurrent DataCollector runs against a local mock API server
+
+Run from the project root:
+    python -m benchmarks.bench_collection
+"""
+
+import contextlib
+import io
+import time
+
+from benchmarks.mock_api import MockAPIServer
+from config.config import API_CONCURRENCY, CATEGORY_KEYWORDS
+from src.api.google_client import GooglePlacesClient
+from src.api.rate_limiter import TokenBucket
+from src.api.yelp_client import YelpClient
+from src.data.data_collector import DataCollector
+
+# The mock API answers fast, so allow a higher rate than the real limits
+MOCK_RATE_LIMIT = 200.0
+
+
+def run_collection(server: MockAPIServer, concurrent: bool) -> dict:
+    """Collect every category for Boston and report wall time and call counts"""
+    google = GooglePlacesClient('mock-key', base_url=server.google_url, retry_backoff=0,
+                                rate_limiter=TokenBucket(MOCK_RATE_LIMIT),
+                                pool_size=API_CONCURRENCY['google'])
+    yelp = YelpClient('mock-key', base_url=server.yelp_url, retry_backoff=0,
+                      rate_limiter=TokenBucket(MOCK_RATE_LIMIT),
+                      pool_size=API_CONCURRENCY['yelp'])
+    collector = DataCollector(google, yelp, concurrent=concurrent)
+
+    requests_before = server.request_count
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        places = collector.collect_city_data('boston', list(CATEGORY_KEYWORDS), save=False)
+    elapsed = time.perf_counter() - start
+
+    stats = collector.get_usage_stats()
+    stats['server_requests'] = server.request_count - requests_before
+    stats['seconds'] = elapsed
+    stats['places'] = len(places)
+    return stats
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 20 + "COLLECTION BENCHMARK (MOCK API)")
+    print("="*70)
+
+    for mode in (False, True):
+        # Fresh server per run so both see the same 429 pattern
+        with MockAPIServer(latency=0.05) as server:
+            stats = run_collection(server, concurrent=mode)
+        label = 'concurrent' if mode else 'sequential'
+        print(f"\n⏱️  {label:10s}: {stats['seconds']:6.2f}s | "
+              f"{stats['total_calls']} calls (google {stats['google_calls']}, "
+              f"yelp {stats['yelp_calls']}) | server saw {stats['server_requests']} | "
+              f"{stats['places']} places")
+        if mode:
+            concurrent_stats = stats
+        else:
+            sequential_stats = stats
+
+    assert concurrent_stats['total_calls'] == sequential_stats['total_calls']
+    assert concurrent_stats['total_calls'] == concurrent_stats['server_requests']
+    assert concurrent_stats['places'] == sequential_stats['places']
+
+    speedup = sequential_stats['seconds'] / concurrent_stats['seconds']
+    print(f"\n🚀 Speedup: {speedup:.1f}x with the same number of API calls")
+
+
+if __name__ == "__main__":
+    main()
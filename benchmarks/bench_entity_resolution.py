@@ -0,0 +1,88 @@
+"""
+Entity Resolution Benchmark
+Cross-source matching runtime and accuracy on synthetic cities with known duplicates
+
+Run from the project root:
+    python -m benchmarks.bench_entity_resolution
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import make_places_df
+from src.data.entity_resolution import find_cross_source_matches, merge_cross_source
+
+WORDS = ['harbor', 'north', 'end', 'golden', 'lotus', 'blue', 'anchor', 'union', 'oyster',
+         'house', 'garden', 'taqueria', 'bistro', 'tavern', 'cafe', 'museum', 'park', 'grill',
+         'art', 'market', 'pearl', 'copper', 'river', 'stone', 'little', 'italy', 'spa', 'club']
+
+
+def make_duplicated_city(num_places: int, duplicate_rate: float = 0.3, seed: int = 7) -> tuple:
+    """
+    Synthetic city where a share of Google venues also appear as Yelp rows
+
+    Yelp copies get jittered coordinates (~30 m), a reformatted address and
+    a slightly different name. The city area grows with the row count so
+    density stays at the 10k-row level; runtime follows the number of
+    candidate pairs, which depends on density rather than city size.
+
+    Returns:
+        (places DataFrame, number of planted duplicates)
+    """
+    rng = np.random.default_rng(seed)
+    places = make_places_df(num_places, seed=seed)
+    spread = np.sqrt(num_places / 10_000)
+    for col in ('latitude', 'longitude'):
+        center = places[col].mean()
+        places[col] = center + (places[col] - center) * spread
+    words = np.array(WORDS)
+    name_words = words[rng.integers(0, len(words), (num_places, 3))]
+    places['name'] = pd.Series([' '.join(row) for row in name_words]).str.title()
+    places['address'] = places['address'].str.replace('Main St', 'Main Street', regex=False)
+
+    google = places[places['source'] == 'google']
+    copies = google.sample(frac=duplicate_rate, random_state=seed).copy()
+    copies['source'] = 'yelp'
+    copies['place_id'] = 'yelp_' + copies['place_id']
+    copies['latitude'] += rng.normal(0, 0.0002, len(copies))
+    copies['longitude'] += rng.normal(0, 0.0002, len(copies))
+    copies['name'] = copies['name'].str.replace(' ', '  ', n=1) + np.where(
+        rng.random(len(copies)) < 0.5, ' & Co', '')
+    copies['address'] = copies['address'].str.replace('Main Street', 'Main St', regex=False)
+    copies['yelp_url'] = 'https://www.yelp.com/biz/' + copies['place_id']
+
+    combined = pd.concat([places, copies], ignore_index=True)
+    return combined.sample(frac=1.0, random_state=seed).reset_index(drop=True), len(copies)
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 18 + "ENTITY RESOLUTION BENCHMARK")
+    print("="*70)
+
+    previous = None
+    for num_places in (10_000, 50_000, 100_000, 200_000):
+        places, planted = make_duplicated_city(num_places)
+
+        start = time.perf_counter()
+        matches = find_cross_source_matches(places)
+        merged = merge_cross_source(places, matches)
+        elapsed = time.perf_counter() - start
+
+        google_ids = places['place_id'].to_numpy()[matches['google_pos']]
+        yelp_ids = places['place_id'].to_numpy()[matches['yelp_pos']]
+        correct = int((yelp_ids == 'yelp_' + google_ids).sum())
+
+        scaling = ''
+        if previous:
+            scaling = f" | x{elapsed / previous[1]:.1f} time for x{len(places) / previous[0]:.1f} rows"
+        print(f"\n📦 {len(places):,} rows: {elapsed * 1000:8.1f} ms "
+              f"({elapsed / len(places) * 1e6:.2f} µs/row){scaling}")
+        print(f"   planted {planted:,} | matched {len(matches):,} | correct {correct:,} "
+              f"| {len(merged):,} rows after merge")
+        previous = (len(places), elapsed)
+
+
+if __name__ == "__main__":
+    main()
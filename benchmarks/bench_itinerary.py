@@ -0,0 +1,68 @@
+"""
+Itinerary Benchmark
+Build time and daily travel distance of geographic itineraries vs slice-by-rank
+
+Run from the project root:
+    python -m benchmarks.bench_itinerary
+"""
+
+import contextlib
+import io
+
+import numpy as np
+from benchmarks.bench_place_index import time_per_call
+from benchmarks.synthetic import make_places_df
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.spatial_index import haversine_meters
+
+CATEGORIES = ['food', 'cultural', 'nightlife']
+
+
+def day_travel_km(day) -> float:
+    """Total distance walking a day's stops in order"""
+    lat, lng = day['latitude'].to_numpy(), day['longitude'].to_numpy()
+    if len(lat) < 2:
+        return 0.0
+    return sum(haversine_meters(lat[i], lng[i], lat[i + 1:i + 2], lng[i + 1:i + 2])[0]
+               for i in range(len(lat) - 1)) / 1000
+
+
+def slice_by_rank(engine: RecommendationEngine, num_days: int, per_day: int = 5) -> dict:
+    """The previous itinerary: top num_days * 5 by score, cut into days by rank"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        recs = engine.get_recommendations(CATEGORIES, 3, num_days, top_n=num_days * per_day)
+    return {f"Day {d + 1}": recs.iloc[d * per_day:(d + 1) * per_day] for d in range(num_days)}
+
+
+def summarize(itinerary: dict) -> tuple:
+    """(average km per day, average score, average categories per day)"""
+    days = list(itinerary.values())
+    return (np.mean([day_travel_km(day) for day in days]),
+            np.mean([day['score'].mean() for day in days]),
+            np.mean([day['category'].nunique() for day in days]))
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 22 + "ITINERARY BENCHMARK")
+    print("="*70)
+
+    for num_places in (1_000, 10_000, 100_000):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = RecommendationEngine('boston', places_df=make_places_df(num_places))
+        candidates = len(engine.index.candidates(CATEGORIES, 3)[0])
+
+        seconds = time_per_call(lambda: engine.create_itinerary(CATEGORIES, 3, 7), 10)
+        geo_km, geo_score, geo_mix = summarize(engine.create_itinerary(CATEGORIES, 3, 7))
+        rank_km, rank_score, rank_mix = summarize(slice_by_rank(engine, 7))
+
+        print(f"\n📦 {num_places:,} places, {candidates:,} candidates, 7 days")
+        print(f"   build time: {seconds * 1000:7.2f} ms")
+        print(f"   geographic:    {geo_km:6.2f} km/day | avg score {geo_score:.2f} "
+              f"| {geo_mix:.1f} categories/day")
+        print(f"   slice-by-rank: {rank_km:6.2f} km/day | avg score {rank_score:.2f} "
+              f"| {rank_mix:.1f} categories/day")
+
+
+if __name__ == "__main__":
+    main()
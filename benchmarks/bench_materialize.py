@@ -0,0 +1,76 @@
+"""
+Materialization Benchmark
+Build time of the precomputed lookup and per-query latency with and without it
+
+Run from the project root:
+    python -m benchmarks.bench_materialize
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_places_df
+from src.recommender.materialize import MaterializedLookup, materialize
+from src.recommender.recommendation_engine import RecommendationEngine
+
+NUM_PLACES = 200_000
+MAX_DAYS = 2            # Fewer than the default 7 to keep the build short
+REPEATS = 50
+CATEGORIES = ['food', 'cultural', 'nightlife']
+
+
+def time_per_call(func, repeats: int = REPEATS) -> float:
+    """Average milliseconds per call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 21 + "MATERIALIZATION BENCHMARK")
+    print("="*70)
+
+    places_df = make_places_df(NUM_PLACES)
+    with tempfile.TemporaryDirectory() as workspace:
+        with contextlib.redirect_stdout(io.StringIO()):
+            live = RecommendationEngine('boston', places_df=places_df, materialized_dir=None)
+
+        workers = os.cpu_count() or 1
+        start = time.perf_counter()
+        lookup = materialize(live, max_days=MAX_DAYS, workers=workers)
+        build = time.perf_counter() - start
+        lookup.save(MaterializedLookup.path(workspace, 'boston', lookup.meta['fingerprint']))
+        print(f"\n📦 {NUM_PLACES:,} places: {len(lookup.arrays['rec_candidates']):,} keys "
+              f"(itineraries up to {MAX_DAYS} days) built in {build:.1f}s with {workers} workers, "
+              f"{lookup.nbytes / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            served = RecommendationEngine('boston', places_df=places_df, materialized_dir=workspace)
+        assert served.materialized is not None, "lookup not found"
+        print(f"   Engine load with fingerprint check: {time.perf_counter() - start:.2f}s")
+
+        queries = {
+            f"get_recommendations {'+'.join(CATEGORIES)} top 20":
+                lambda engine: engine.get_recommendations(CATEGORIES, 2, 2, 20),
+            "get_recommendations food top 50":
+                lambda engine: engine.get_recommendations(['food'], 4, 2, 50),
+            f"create_itinerary {'+'.join(CATEGORIES)} {MAX_DAYS} days":
+                lambda engine: engine.create_itinerary(CATEGORIES, 2, MAX_DAYS),
+        }
+        print()
+        for name, query in queries.items():
+            computed = time_per_call(lambda: query(live))
+            stored = time_per_call(lambda: query(served))
+            print(f"⏱️  {name:45s} live {computed:7.2f} ms | materialized {stored:6.2f} ms "
+                  f"({computed / stored:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
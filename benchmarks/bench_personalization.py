@@ -0,0 +1,75 @@
+"""
+Personalization Benchmark
+Cost of profile-based reranking over plain recommendations, and of the profile store
+
+Run from the project root:
+    python -m benchmarks.bench_personalization
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+
+import numpy as np
+from benchmarks.synthetic import make_places_df
+from src.recommender.personalization import ProfileStore
+from src.recommender.recommendation_engine import RecommendationEngine
+
+NUM_PLACES = 100_000
+REPEATS = 50
+CATEGORIES = ['food', 'cultural', 'nightlife']
+PROFILE_SIZES = (0, 10, 100, 1000)   # Liked places; as many again are visited
+
+
+def time_per_call(func, repeats: int = REPEATS) -> float:
+    """Average milliseconds per call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 21 + "PERSONALIZATION BENCHMARK")
+    print("="*70)
+
+    places_df = make_places_df(NUM_PLACES)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = RecommendationEngine('boston', places_df=places_df)
+
+    start = time.perf_counter()
+    vectors = engine.place_vectors
+    widths = ', '.join(f"{name} {block.stop - block.start}" for name, block in vectors.blocks.items())
+    print(f"\n📦 {NUM_PLACES:,} places: vectors built in {time.perf_counter() - start:.2f}s, "
+          f"{vectors.matrix.shape[1]} float32 dims ({widths}), {vectors.nbytes / 1e6:.1f} MB")
+
+    base = time_per_call(lambda: engine.get_recommendations(CATEGORIES, 2, 1, 20))
+    print(f"\n⏱️  get_recommendations {'+'.join(CATEGORIES)} top 20: {base:.2f} ms")
+
+    rng = np.random.default_rng(0)
+    place_ids = places_df['place_id'].to_numpy()
+    with tempfile.TemporaryDirectory() as workspace:
+        store = ProfileStore(f"{workspace}/profiles.sqlite3")
+        for size in PROFILE_SIZES:
+            user = f"user{size}"
+            picked = rng.choice(place_ids, 2 * size, replace=False)
+            store.like(user, picked[:size])
+            store.visit(user, picked[size:])
+
+            read = time_per_call(lambda: store.get_profile(user))
+            profile = store.get_profile(user)
+            personal = time_per_call(
+                lambda: engine.get_personalized_recommendations(profile, CATEGORIES, 2, 20)
+            )
+            print(f"   profile of {size:4d} liked + {size:4d} visited | store read {read:5.2f} ms | "
+                  f"personalized {personal:6.2f} ms (+{personal - base:5.2f} ms)")
+
+        write = time_per_call(lambda: store.like('writer', rng.choice(place_ids, 1)), 20)
+        print(f"\n💾 Profile store: one like recorded in {write:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
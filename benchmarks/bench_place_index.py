@@ -0,0 +1,89 @@
+"""
+Place Index Microbenchmark
+Compares the indexed get_recommendations path with the original pandas scan
+
+Run from the project root:
+    python -m benchmarks.bench_place_index
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import make_places_df
+from src.recommender.recommendation_engine import RecommendationEngine
+
+QUERIES = [
+    (['food', 'cultural'], 2, 10),
+    (['nightlife', 'food'], 3, 8),
+    (['nature'], 1, 20),
+    (['leisure', 'adventure', 'family', 'shopping'], 4, 50),
+]
+
+
+def scan_recommendations(engine: RecommendationEngine, categories: list,
+                         budget_level: int, top_n: int) -> pd.DataFrame:
+    """
+    The original per-request pandas path: isin + copy + budget filter + rescoring
+
+    This is the reference PlaceIndex is checked against (also in
+    tests/test_place_index.py).
+    """
+    places = engine.places_df
+    filtered = places[places['category'].isin(categories)].copy()
+    # At or below the budget, or no price data (0)
+    filtered = filtered[(filtered['price_estimate'] <= budget_level) | (filtered['price_estimate'] == 0)]
+    if filtered.empty:
+        return pd.DataFrame()
+
+    # Log review counts normalized by the candidates' maximum
+    filtered['review_score'] = np.log1p(filtered['review_count'].fillna(0))
+    max_review_score = filtered['review_score'].max()
+    if max_review_score > 0:
+        filtered['review_score'] = filtered['review_score'] / max_review_score
+    filtered['score'] = filtered['rating'].fillna(0) * 0.7 + filtered['review_score'] * 0.3
+    return filtered.nlargest(top_n, 'score')
+
+
+def time_per_call(func, repeats: int) -> float:
+    """Average seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 20 + "PLACE INDEX MICROBENCHMARK")
+    print("="*70)
+
+    for num_places in (1_000, 100_000):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = RecommendationEngine('boston', places_df=make_places_df(num_places))
+        repeats = 200 if num_places <= 10_000 else 20
+
+        print(f"\n📦 {num_places:,} places")
+        for categories, budget_level, top_n in QUERIES:
+            expected = scan_recommendations(engine, categories, budget_level, top_n)
+            with contextlib.redirect_stdout(io.StringIO()):
+                actual = engine.get_recommendations(categories, budget_level, 1, top_n)
+                indexed = time_per_call(
+                    lambda: engine.get_recommendations(categories, budget_level, 1, top_n), repeats
+                )
+            pd.testing.assert_frame_equal(actual[expected.columns], expected)
+            scan = time_per_call(
+                lambda: scan_recommendations(engine, categories, budget_level, top_n), repeats
+            )
+
+            print(f"   {'+'.join(categories):40s} budget={budget_level} top={top_n:<3d}"
+                  f" scan {scan * 1000:8.3f} ms | index {indexed * 1000:8.3f} ms"
+                  f" | {scan / indexed:5.1f}x")
+
+    print("\n✅ Indexed results match the pandas scan exactly")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Collection Planner Benchmark
+Distinct places per API call of collecting every keyword against a cache-learned plan
+
+A month-old (expired) cache of some categories is replayed against a mock
+API where a few keywords return the same places as another one. The
+planner learns that from the cache, and spends calls on the rest.
+
+Run from the project root:
+    python -m benchmarks.bench_planner
+"""
+
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+
+from benchmarks.mock_api import MockAPIServer
+from config.config import CATEGORY_KEYWORDS
+from src.api.google_client import GooglePlacesClient
+from src.api.rate_limiter import TokenBucket
+from src.api.yelp_client import YelpClient
+from src.data.cache_manager import CacheManager
+from src.data.data_collector import DataCollector
+from src.data.planner import plan_collection, planned_queries
+
+MOCK_RATE_LIMIT = 2000.0
+PLACES_PER_KEYWORD = 400
+CACHED_CATEGORIES = ['food', 'cultural', 'nightlife', 'adventure', 'nature']
+# Near-duplicate keywords of the mock world: these return the other keyword's places
+ALIASES = {'hiking trail': 'hiking', 'dining': 'restaurant', 'cultural center': 'museum',
+           'dance club': 'nightclub'}
+BUDGETS = (None, 30)
+
+
+def make_collector(server: MockAPIServer, cache_dir: str, expiry_days: float = 30) -> DataCollector:
+    cache = CacheManager(cache_dir, expiry_days=expiry_days)
+    google = GooglePlacesClient('mock-key', base_url=server.google_url, retry_backoff=0,
+                                rate_limiter=TokenBucket(MOCK_RATE_LIMIT), cache=cache)
+    yelp = YelpClient('mock-key', base_url=server.yelp_url, retry_backoff=0,
+                      rate_limiter=TokenBucket(MOCK_RATE_LIMIT), cache=cache)
+    return DataCollector(google, yelp, cache=cache)
+
+
+def report(label: str, seconds: float, calls: int, places: int):
+    """One result line; places are distinct venues after cross-source merging"""
+    per_call = f"{places / calls:5.2f}" if calls else "  n/a"
+    print(f"   {label:26s} {seconds:6.2f}s | {calls:5d} calls | {places:6d} places "
+          f"| {per_call} per call")
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 16 + "COLLECTION PLANNER BENCHMARK (MOCK API)")
+    print("="*70)
+
+    with MockAPIServer(latency=0.002, throttle_every=0, places_per_keyword=PLACES_PER_KEYWORD,
+                       aliases=ALIASES) as server, tempfile.TemporaryDirectory() as workspace:
+        # Last month's run of some categories, expired by now
+        with contextlib.redirect_stdout(io.StringIO()):
+            make_collector(server, f"{workspace}/old").collect_city_data(
+                'boston', CACHED_CATEGORIES, save=False)
+        print(f"\n📦 Expired cache of {CACHED_CATEGORIES}; collecting all "
+              f"{len(CATEGORY_KEYWORDS)} categories")
+        print(f"   Near-duplicate keywords: {ALIASES}")
+
+        shutil.copytree(f"{workspace}/old", f"{workspace}/every")
+        collector = make_collector(server, f"{workspace}/every", expiry_days=0)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            places = collector.collect_city_data('boston', save=False)
+        report('every keyword', time.perf_counter() - start,
+               collector.get_usage_stats()['total_calls'], places['place_id'].nunique())
+
+        for budget in BUDGETS:
+            directory = f"{workspace}/plan-{budget}"
+            shutil.copytree(f"{workspace}/old", directory)
+            collector = make_collector(server, directory, expiry_days=0)
+            start = time.perf_counter()
+            plan = plan_collection(collector, ['boston'],
+                                   budgets=budget and {'google': budget, 'yelp': budget})
+            planning_s = time.perf_counter() - start
+            with contextlib.redirect_stdout(io.StringIO()):
+                places = collector.collect_city_data('boston', save=False,
+                                                     queries=planned_queries(plan, 'boston'))
+            label = f"plan, {budget} calls/provider" if budget else "plan, daily quota"
+            report(label, time.perf_counter() - start, collector.get_usage_stats()['total_calls'],
+                   places['place_id'].nunique())
+            skipped = {status: sum(search['status'] == status for search in plan['searches'])
+                       for status in ('merged', 'redundant', 'over_budget')}
+            print(f"      planning {planning_s * 1000:.0f} ms | expected "
+                  f"{plan['expected_new_places']:.0f} places | skipped {skipped}")
+
+
+if __name__ == "__main__":
+    main()
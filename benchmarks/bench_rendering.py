@@ -0,0 +1,92 @@
+"""
+Rendering Benchmark
+Column-wise rendering against per-row iterrows formatting, and streamed itinerary export throughput
+
+Run from the project root:
+    python -m benchmarks.bench_rendering
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+from benchmarks.synthetic import make_places_df
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.rendering import FORMATS, ItineraryWriter, render_recommendations
+
+NUM_PLACES = 100_000
+LIST_SIZES = (20, 1_000, 10_000)
+NUM_ITINERARIES = 500
+CATEGORIES = ['food', 'cultural', 'nightlife']
+SUFFIXES = {'text': 'txt', 'jsonl': 'jsonl', 'csv': 'csv', 'html': 'html'}
+
+
+def iterrows_text(recommendations: pd.DataFrame) -> str:
+    """The previous print_recommendations loop, collected into a string"""
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("🌟 TOP RECOMMENDATIONS", file=out)
+    print("="*60, file=out)
+    for idx, (_, place) in enumerate(recommendations.iterrows(), 1):
+        rating_display = f"{place['rating']:.1f}⭐" if pd.notna(place['rating']) else "No rating"
+        price_display = '$' * int(place['price_estimate']) if place['price_estimate'] > 0 else 'Free/Unknown'
+        print(f"\n{idx}. {place['name']}", file=out)
+        print(f"   📍 {place['address']}", file=out)
+        print(f"   ⭐ {rating_display} ({int(place['review_count']):,} reviews)", file=out)
+        print(f"   💰 {price_display}", file=out)
+        print(f"   🏷️  {place['category']}", file=out)
+        print(f"   🔗 {place.get('google_maps_url', place.get('yelp_url', 'N/A'))}", file=out)
+        print(f"   📊 Score: {place['score']:.2f}", file=out)
+    return out.getvalue()
+
+
+def time_call(func, min_seconds: float = 0.5) -> float:
+    """Average milliseconds per call, repeating for at least min_seconds"""
+    func()
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        func()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 24 + "RENDERING BENCHMARK")
+    print("="*70)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = RecommendationEngine('boston', places_df=make_places_df(NUM_PLACES),
+                                      materialized_dir=None)
+
+    for size in LIST_SIZES:
+        recommendations = engine.get_recommendations(CATEGORIES, 4, 3, size)
+        baseline = time_call(lambda: iterrows_text(recommendations))
+        print(f"\n📄 {len(recommendations):,} recommendations | iterrows text {baseline:8.2f} ms")
+        for fmt in FORMATS:
+            elapsed = time_call(lambda: render_recommendations(recommendations, fmt))
+            print(f"   {fmt:5s} {elapsed:8.2f} ms ({baseline / elapsed:5.1f}x vs iterrows text)")
+
+    # Bulk export: distinct itineraries streamed into one file per format
+    queries = [(CATEGORIES[:1 + i % 3], 1 + i % 4, 1 + i % 5) for i in range(NUM_ITINERARIES)]
+    itineraries = [engine.create_itinerary(categories, budget, days) for categories, budget, days in queries]
+    stops = sum(len(places) for itinerary in itineraries for places in itinerary.values())
+    print(f"\n📬 Streaming {NUM_ITINERARIES} itineraries ({stops:,} stops) to one file")
+    with tempfile.TemporaryDirectory() as workspace:
+        for fmt in FORMATS:
+            path = os.path.join(workspace, f"campaign.{SUFFIXES[fmt]}")
+            start = time.perf_counter()
+            with ItineraryWriter(path) as writer:
+                for user, itinerary in enumerate(itineraries):
+                    writer.write(itinerary, name=f"user{user}")
+            elapsed = time.perf_counter() - start
+            megabytes = os.path.getsize(path) / 1e6
+            print(f"   {fmt:5s} {NUM_ITINERARIES / elapsed:8,.0f} itineraries/s | "
+                  f"{megabytes / elapsed:6.1f} MB/s | {megabytes:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Scoring Model Benchmark
+Query latency of the default vs a many-feature scoring model, and weight
+recovery of the offline trainer on a synthetic click log
+
+Run from the project root:
+    python -m benchmarks.bench_scoring
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+from benchmarks.synthetic import make_interactions, make_places_df
+from src.models.scoring import FEATURES, ScoringModel
+from src.models.trainer import train
+from src.recommender.recommendation_engine import RecommendationEngine
+
+NUM_PLACES = 100_000
+REPEATS = 50
+CATEGORIES = ['food', 'cultural']
+
+# Uses every feature; clicks in the recovery test follow it
+RICH_MODEL = ScoringModel({'rating': 0.25, 'log_reviews': 0.15, 'smoothed_rating': 0.2,
+                           'price_fit': 0.2, 'category_match': 0.1, 'reviews': 0.02,
+                           'distance': -0.08}, name='rich')
+
+
+def time_per_call(func, repeats: int = REPEATS) -> float:
+    """Average milliseconds per call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 22 + "SCORING MODEL BENCHMARK")
+    print("="*70)
+
+    places_df = make_places_df(NUM_PLACES)
+    # Every fifth venue is also listed under a second category
+    places_df.loc[1::5, 'place_id'] = places_df.loc[0::5, 'place_id'].to_numpy()[:len(places_df.loc[1::5])]
+    city = places_df['latitude'].mean(), places_df['longitude'].mean()
+
+    print(f"\n⏱️  Latency, {NUM_PLACES:,} places, categories {CATEGORIES}, budget 2")
+    for model in (None, RICH_MODEL):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = RecommendationEngine('boston', places_df=places_df, scoring_model=model)
+        label = engine.index.scoring_model.name
+        recommend = time_per_call(lambda: engine.get_recommendations(CATEGORIES, 2, 1, 20))
+        near = time_per_call(lambda: engine.get_recommendations_near(*city, 5, CATEGORIES, 2, 20))
+        batch = time_per_call(lambda: engine.get_recommendations_batch([(CATEGORIES, 2, 20)] * 100), 5)
+        print(f"   {label:8s} {len(engine.index.scoring_model.features)} features | "
+              f"recommend {recommend:6.2f} ms | near {near:6.2f} ms | batch of 100 {batch:7.2f} ms")
+
+    print(f"\n🎯 Weight recovery: clicks follow {RICH_MODEL}")
+    for num_queries in (500, 5_000):
+        log = make_interactions(engine, num_queries, RICH_MODEL, seed=num_queries)
+        start = time.perf_counter()
+        model, report = train(engine, log, baseline=ScoringModel({'rating': 0.7, 'log_reviews': 0.3}))
+        elapsed = time.perf_counter() - start
+        true, fitted = RICH_MODEL.vector, model.vector
+        cosine = true @ fitted / (np.linalg.norm(true) * np.linalg.norm(fitted))
+        print(f"\n   {num_queries:,} queries ({report['matched_rows']:,} rows) trained in {elapsed:.2f}s")
+        print(f"   holdout AUC: default {report['baseline_auc']:.3f} | trained {report['trained_auc']:.3f}"
+              f" | cosine(true, fitted) {cosine:.3f}")
+        normalized = true / np.abs(true).sum()
+        for feature, expected, got in zip(FEATURES, normalized, fitted):
+            print(f"      {feature:16s} true {expected:+.3f} | fitted {got:+.3f}")
+
+
+if __name__ == "__main__":
+    main()
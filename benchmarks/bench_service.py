@@ -0,0 +1,172 @@
+"""
+Service Load Test
+Closed-loop HTTP load against the recommendation service: p50/p99 latency and throughput
+
+Run from the project root:
+    python -m benchmarks.bench_service
+    python -m benchmarks.bench_service --workers 4 --clients 8 --places 100000
+    python -m benchmarks.bench_service --url http://127.0.0.1:8000
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import socket
+import tempfile
+import time
+from urllib.parse import urlencode, urlparse
+
+import numpy as np
+from benchmarks.bench_batch import make_profiles
+from benchmarks.synthetic import write_places_parquet
+
+CITY = 'boston'
+
+
+def make_paths(num_queries: int, seed: int) -> list:
+    """Request paths: mostly recommendations, plus itineraries, famous places and statistics"""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for categories, budget, top_n in make_profiles(num_queries, seed):
+        params = {'city': CITY, 'categories': ','.join(categories), 'budget': budget}
+        kind = rng.random()
+        if kind < 0.8:
+            paths.append('/recommendations?' + urlencode(dict(params, days=3, top_n=top_n)))
+        elif kind < 0.9:
+            paths.append('/itinerary?' + urlencode(dict(params, days=int(rng.integers(1, 5)))))
+        elif kind < 0.95:
+            paths.append('/famous?' + urlencode({'city': CITY, 'top_n': top_n}))
+        else:
+            paths.append('/statistics?' + urlencode({'city': CITY}))
+    return paths
+
+
+def run_client(url: str, paths: list, duration: float, seed: int) -> dict:
+    """One keep-alive connection issuing requests back to back for `duration` seconds"""
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port)
+    order = np.random.default_rng(seed).permutation(len(paths))
+    latencies, endpoints, hits, errors = [], [], 0, 0
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[order[i % len(order)]]
+        i += 1
+        start = time.perf_counter()
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        endpoints.append(path.split('?', 1)[0])
+        hits += response.getheader('X-Cache') == 'hit'
+        errors += response.status != 200
+    connection.close()
+    return {'latencies': latencies, 'endpoints': endpoints, 'hits': hits, 'errors': errors}
+
+
+def start_service(num_places: int, workers: int, cache_size: int, workspace: str) -> tuple:
+    """Serve a synthetic city from a child process; returns (process, url)"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    write_places_parquet(num_places, f"{workspace}/processed", CITY)
+
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=_serve, args=(port, workers, cache_size, workspace), daemon=True)
+    process.start()
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Service did not start")
+
+
+def _serve(port: int, workers: int, cache_size: int, workspace: str):
+    from src.recommender.registry import EngineRegistry
+    from src.recommender.service import ResultCache, serve
+
+    registry = EngineRegistry(data_dir=f"{workspace}/processed", arrow_dir=f"{workspace}/arrow")
+    serve('127.0.0.1', port, workers, [CITY], registry, ResultCache(max_size=cache_size))
+
+
+def load_test(url: str, paths: list, clients: int, duration: float) -> dict:
+    """Run `clients` client processes at once and summarize their requests"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(clients) as pool:
+        results = pool.starmap(run_client, [(url, paths, duration, seed) for seed in range(clients)])
+
+    latencies = np.concatenate([result['latencies'] for result in results])
+    endpoints = np.concatenate([result['endpoints'] for result in results])
+    summary = {
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / duration,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'cache_hit_rate': sum(result['hits'] for result in results) / max(len(latencies), 1),
+        'errors': sum(result['errors'] for result in results),
+        'endpoints': {}
+    }
+    for endpoint in np.unique(endpoints):
+        samples = latencies[endpoints == endpoint]
+        summary['endpoints'][str(endpoint)] = {
+            'requests': len(samples),
+            'p50_ms': float(np.percentile(samples, 50)),
+            'p99_ms': float(np.percentile(samples, 99)),
+        }
+    return summary
+
+
+def print_summary(label: str, summary: dict):
+    print(f"\n⏱️  {label}")
+    print(f"   {summary['requests']:,} requests | {summary['throughput_rps']:,.0f} req/s | "
+          f"p50 {summary['p50_ms']:.2f} ms | p99 {summary['p99_ms']:.2f} ms | "
+          f"cache hits {summary['cache_hit_rate']:.0%} | errors {summary['errors']}")
+    for endpoint, entry in summary['endpoints'].items():
+        print(f"   {endpoint:18s} {entry['requests']:7,} | p50 {entry['p50_ms']:8.2f} ms | "
+              f"p99 {entry['p99_ms']:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the recommendation service")
+    parser.add_argument('--url', help="Running service to test (default: start one on synthetic data)")
+    parser.add_argument('--places', type=int, default=100_000, help="Synthetic city size")
+    parser.add_argument('--workers', type=int, default=2, help="Service worker processes")
+    parser.add_argument('--clients', type=int, default=4, help="Concurrent client processes")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds per run")
+    parser.add_argument('--queries', type=int, default=500,
+                        help="Distinct queries in the request mix (fewer = more cache hits)")
+    parser.add_argument('--seed', type=int, default=3, help="Query mix seed")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(" " * 23 + "SERVICE LOAD TEST")
+    print("="*70)
+
+    paths = make_paths(args.queries, args.seed)
+    if args.url:
+        print_summary(f"{args.url} ({args.clients} clients)",
+                      load_test(args.url, paths, args.clients, args.duration))
+        return
+
+    with tempfile.TemporaryDirectory() as workspace:
+        for cache_size, label in ((0, 'no result cache'), (4 * args.queries, 'result cache')):
+            process, url = start_service(args.places, args.workers, cache_size, workspace)
+            try:
+                summary = load_test(url, paths, args.clients, args.duration)
+            finally:
+                process.terminate()
+                process.join()
+            print_summary(f"{args.places:,} places | {args.workers} workers | "
+                          f"{args.clients} clients | {label}", summary)
+
+
+if __name__ == "__main__":
+    main()
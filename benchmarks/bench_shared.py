@@ -0,0 +1,168 @@
+"""
+Shared Dataset Benchmark
+Memory of N worker processes with private engines against engines attached to one published snapshot
+
+Every worker loads its city, answers a mix of queries and then idles while
+its memory is read from /proc/<pid>/smaps_rollup: PSS splits each shared
+page between the processes mapping it, so the sum over workers is the
+memory they really use together. Private engines are built by each worker
+from the registry's memory-mapped Arrow copy (as after a reload); attached
+engines map the snapshot a loader process published. A hot swap run then
+republishes the city while the workers keep answering queries.
+
+Linux only. Run from the project root:
+    python -m benchmarks.bench_shared
+    python -m benchmarks.bench_shared --places 500000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.bench_batch import make_profiles
+from benchmarks.synthetic import write_places_parquet
+from src.recommender.registry import EngineRegistry
+from src.recommender.shared import (
+    SharedEngineRegistry, SharedPublisher, read_pointer, start_publisher
+)
+
+CITY = 'boston'
+QUERIES = 50
+MB = 1024 * 1024
+
+
+def memory(pid: int) -> dict:
+    """PSS and private bytes of a process"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return {'pss': fields['Pss'],
+            'private': fields['Private_Clean'] + fields['Private_Dirty']}
+
+
+def answer_queries(engine, seed: int):
+    """The endpoints' engine calls over a few query profiles"""
+    for categories, budget, top_n in make_profiles(QUERIES, seed):
+        engine.get_recommendations(categories, budget, 3, top_n)
+    engine.create_itinerary(['food', 'cultural'], 2, 3)
+    engine.get_top_famous_places(10)
+    engine.get_statistics()
+    engine.get_personalized_recommendations({'categories': {'food': 1.0}}, ['food'], 2, 20)
+
+
+def worker(make_registry, ready, stop, seed: int):
+    """Load, answer queries, report ready and idle until stopped"""
+    registry = make_registry()
+    answer_queries(registry.get(CITY), seed)
+    ready.put(os.getpid())
+    stop.wait()
+
+
+def swap_worker(shared_dir: str, results, stop, seed: int):
+    """Answer queries back to back on the freshest snapshot, recording versions seen"""
+    registry = SharedEngineRegistry(shared_dir, check_interval=0)
+    versions, queries, errors = [], 0, 0
+    profiles = make_profiles(QUERIES, seed)
+    while not stop.is_set():
+        try:
+            engine = registry.get(CITY)
+            categories, budget, top_n = profiles[queries % len(profiles)]
+            engine.get_recommendations(categories, budget, 3, top_n)
+        except Exception:
+            errors += 1
+        queries += 1
+        version = registry.get_version(CITY)
+        if not versions or versions[-1] != version:
+            versions.append(version)
+    results.put({'versions': versions, 'queries': queries, 'errors': errors})
+
+
+def measure(make_registry, num_workers: int) -> dict:
+    """Summed memory of num_workers workers after their queries"""
+    context = multiprocessing.get_context('fork')
+    ready, stop = context.Queue(), context.Event()
+    processes = [context.Process(target=worker, args=(make_registry, ready, stop, seed))
+                 for seed in range(num_workers)]
+    for process in processes:
+        process.start()
+    pids = [ready.get() for _ in processes]
+    usage = [memory(pid) for pid in pids]
+    stop.set()
+    for process in processes:
+        process.join()
+    return {key: sum(u[key] for u in usage) for key in ('pss', 'private')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker memory with private and shared engines")
+    parser.add_argument('--places', type=int, default=200_000, help="Synthetic dataset size")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Worker counts to measure")
+    parser.add_argument('--swaps', type=int, default=3, help="Republishes during the hot swap run")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(" " * 20 + "SHARED DATASET BENCHMARK")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        data_dir, shared_dir = f"{workspace}/processed", f"{workspace}/shared"
+        write_places_parquet(args.places, data_dir, CITY)
+        publisher = SharedPublisher(data_dir, shared_dir)
+        start = time.perf_counter()
+        loader = start_publisher(publisher, [CITY], interval=0.2)
+        pointer = read_pointer(shared_dir, CITY)
+        print(f"\n📤 {args.places:,} places published in {time.perf_counter() - start:.2f}s "
+              f"({pointer['bytes'] / MB:.0f} MB snapshot)")
+
+        modes = {
+            'private engines': lambda: EngineRegistry(data_dir, f"{workspace}/arrow"),
+            'shared snapshot': lambda: SharedEngineRegistry(shared_dir),
+        }
+        print(f"\n   {'workers':>7s} | {'mode':16s} | {'total PSS':>10s} | {'private/worker':>14s}")
+        for num_workers in args.workers:
+            for label, make_registry in modes.items():
+                usage = measure(make_registry, num_workers)
+                print(f"   {num_workers:7d} | {label:16s} | {usage['pss'] / MB:7.0f} MB "
+                      f"| {usage['private'] / num_workers / MB:11.0f} MB")
+
+        # Hot swap: the loader republishes under load, every worker must follow
+        num_workers = max(args.workers)
+        context = multiprocessing.get_context('fork')
+        results, stop = context.Queue(), context.Event()
+        processes = [context.Process(target=swap_worker, args=(shared_dir, results, stop, seed))
+                     for seed in range(num_workers)]
+        for process in processes:
+            process.start()
+        published = [tuple(pointer['version'])]
+        for swap in range(args.swaps):
+            time.sleep(1.0)
+            # Renamed into place, so the loader never reads a half-written file
+            new_file = write_places_parquet(args.places, f"{workspace}/staging", CITY, seed=100 + swap)
+            os.replace(new_file, f"{data_dir}/{new_file.name}")
+            # The loader notices the change and republishes
+            while tuple(pointer['version']) == published[-1]:
+                time.sleep(0.05)
+                pointer = read_pointer(shared_dir, CITY)
+            published.append(tuple(pointer['version']))
+        time.sleep(1.0)
+        stop.set()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        loader.terminate()
+
+        complete = sum(report['versions'][-1] == published[-1] for report in reports)
+        print(f"\n🔄 {args.swaps} hot swaps under {num_workers} workers: "
+              f"{sum(report['queries'] for report in reports):,} queries, "
+              f"{sum(report['errors'] for report in reports)} errors, "
+              f"{complete}/{num_workers} workers on the latest version")
+
+
+if __name__ == "__main__":
+    main()
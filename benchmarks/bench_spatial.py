@@ -0,0 +1,55 @@
+"""
+Spatial Query Benchmark
+Grid-indexed radius/nearest queries vs a linear haversine scan
+
+Run from the project root:
+    python -m benchmarks.bench_spatial
+"""
+
+import contextlib
+import io
+
+import numpy as np
+from benchmarks.bench_place_index import time_per_call
+from benchmarks.synthetic import make_places_df
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.spatial_index import haversine_meters
+
+HOTEL = (42.3554, -71.0605)   # Downtown Boston
+
+
+def scan_within(engine: RecommendationEngine, lat: float, lng: float, radius_m: float) -> np.ndarray:
+    """Linear scan: distance to every place, then filter"""
+    df = engine.places_df
+    distances = haversine_meters(lat, lng, df['latitude'].to_numpy(), df['longitude'].to_numpy())
+    return np.nonzero(distances <= radius_m)[0]
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 20 + "SPATIAL QUERY BENCHMARK")
+    print("="*70)
+
+    for num_places in (1_000, 100_000, 1_000_000):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = RecommendationEngine('boston', places_df=make_places_df(num_places))
+        repeats = 200 if num_places <= 100_000 else 20
+
+        indexed, _ = engine.spatial_index.within(*HOTEL, 2000)
+        assert np.array_equal(indexed, scan_within(engine, *HOTEL, 2000))
+
+        scan = time_per_call(lambda: scan_within(engine, *HOTEL, 2000), repeats)
+        grid = time_per_call(lambda: engine.spatial_index.within(*HOTEL, 2000), repeats)
+        near = time_per_call(
+            lambda: engine.get_recommendations_near(*HOTEL, 2, ['food', 'cultural'], 2, 10), repeats)
+        knn = time_per_call(lambda: engine.get_nearest_places(*HOTEL, 10, ['food']), repeats)
+
+        print(f"\n📦 {num_places:,} places ({len(indexed):,} within 2 km)")
+        print(f"   radius 2 km   scan {scan * 1000:8.3f} ms | grid {grid * 1000:8.3f} ms"
+              f" | {scan / grid:5.1f}x")
+        print(f"   get_recommendations_near: {near * 1000:8.3f} ms")
+        print(f"   get_nearest_places (k=10): {knn * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Streaming Collection Benchmark
+Peak memory of in-memory vs streamed collection as the number of queries grows
+
+Run from the project root:
+    python -m benchmarks.bench_streaming
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.mock_api import MockAPIServer
+from config.config import CATEGORY_KEYWORDS
+from src.api.google_client import GooglePlacesClient
+from src.api.rate_limiter import TokenBucket
+from src.api.yelp_client import YelpClient
+from src.data.data_collector import PROVIDERS, DataCollector
+
+MOCK_RATE_LIMIT = 2000.0
+
+
+def make_queries(num_queries: int) -> list:
+    """Distinct (provider, category, keyword) queries, cycling through the real keywords"""
+    keywords = [(category, keyword) for category, words in CATEGORY_KEYWORDS.items()
+                for keyword in words]
+    return [(PROVIDERS[i % 2], *keywords[i // 2 % len(keywords)])
+            for i in range(num_queries)]
+
+
+def make_collector(server: MockAPIServer, queries: list, output_dir: str) -> DataCollector:
+    google = GooglePlacesClient('mock-key', base_url=server.google_url, retry_backoff=0,
+                                rate_limiter=TokenBucket(MOCK_RATE_LIMIT))
+    yelp = YelpClient('mock-key', base_url=server.yelp_url, retry_backoff=0,
+                      rate_limiter=TokenBucket(MOCK_RATE_LIMIT))
+    collector = DataCollector(google, yelp, output_dir=output_dir)
+    # Same keywords with a run number appended, so every query is a distinct search
+    collector._build_queries = lambda categories: [
+        (provider, category, f"{keyword} {i}") for i, (provider, category, keyword) in enumerate(queries)
+    ]
+    return collector
+
+
+def measure(func) -> tuple:
+    """(seconds, peak traced MB) of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 17 + "STREAMING COLLECTION BENCHMARK (MOCK API)")
+    print("="*70)
+
+    categories = list(CATEGORY_KEYWORDS)
+    with MockAPIServer(latency=0.001, throttle_every=0) as server, \
+            tempfile.TemporaryDirectory() as workspace:
+        for num_queries in (500, 2_000):
+            queries = make_queries(num_queries)
+
+            collector = make_collector(server, queries, workspace)
+            batch_s, batch_mb = measure(
+                lambda: collector.collect_city_data('boston', categories, save=False))
+
+            collector = make_collector(server, queries, workspace)
+            stream_s, stream_mb = measure(
+                lambda: collector.stream_city_data('boston', categories,
+                                                   dataset_dir=f"{workspace}/dataset"))
+
+            print(f"\n📦 {num_queries:,} queries ({num_queries * 20:,} rows)")
+            print(f"   in-memory: {batch_s:6.2f}s | peak {batch_mb:8.1f} MB")
+            print(f"   streaming: {stream_s:6.2f}s | peak {stream_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
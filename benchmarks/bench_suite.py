@@ -0,0 +1,227 @@
+"""
+Recommendation Engine Benchmark Suite
+Load time, peak memory and per-call latency on synthetic cities, saved as JSON
+
+Run from the project root:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 1000 100000 --compare benchmarks/results/old.json
+"""
+
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import write_places_parquet
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+RESULTS_DIR = Path('benchmarks/results')
+CITY = 'boston'
+
+OPERATIONS = {
+    'get_recommendations': lambda engine: engine.get_recommendations(['food', 'cultural'], 2, 3, 20),
+    'get_top_famous_places': lambda engine: engine.get_top_famous_places(5),
+    'create_itinerary': lambda engine: engine.create_itinerary(['food', 'cultural', 'nightlife'], 2, 3),
+    'get_statistics': lambda engine: engine.get_statistics(),
+    'render_recommendations': lambda engine: _render(engine.get_recommendations(['food'], 4, 3, 200)),
+    'export_itineraries': lambda engine: _export(_itineraries(engine)),
+}
+
+CLI_QUERY = ['recommend', CITY, 'food', 'cultural', '--budget', '2', '--top-n', '20']
+
+
+def _render(recommendations):
+    from src.recommender.rendering import render_recommendations
+    return render_recommendations(recommendations)
+
+
+@functools.lru_cache(maxsize=1)
+def _itineraries(engine) -> list:
+    """Itineraries exported by export_itineraries, created once so only the export is timed"""
+    return [engine.create_itinerary(['food'], budget, 3) for budget in (1, 2, 3, 4)]
+
+
+def _export(itineraries: list):
+    """Stream itineraries into a JSON Lines file"""
+    from src.recommender.rendering import ItineraryWriter
+    with tempfile.TemporaryDirectory() as workspace, \
+            ItineraryWriter(os.path.join(workspace, 'itineraries.jsonl')) as writer:
+        for user, itinerary in enumerate(itineraries):
+            writer.write(itinerary, name=f"user{user}")
+
+
+def _timings(func, repeats: int) -> dict:
+    """Per-call latency summary in milliseconds (first call is a warm-up)"""
+    func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'repeats': repeats,
+        'mean_ms': float(np.mean(samples)),
+        'min_ms': float(np.min(samples)),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+    }
+
+
+def _cli_cold_start(project_root: str, data_dir: str, runs: int = 3) -> float:
+    """Median wall seconds of a fresh cli.py process answering CLI_QUERY"""
+    env = dict(os.environ, PYTHONPATH=project_root)
+    command = [sys.executable, os.path.join(project_root, 'cli.py'), *CLI_QUERY, '--data-dir', data_dir]
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_size(num_places: int, seed: int) -> dict:
+    """
+    Benchmark one dataset size in a fresh process
+
+    Runs in a scratch directory holding data/processed/{city}_places.parquet,
+    so the engine loads through its normal parquet path. The CLI reads a
+    copy written with one row group per category.
+    """
+    from src.recommender.recommendation_engine import RecommendationEngine
+    from src.recommender.registry import EngineRegistry
+
+    project_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as workspace:
+        os.chdir(workspace)
+        data_file = write_places_parquet(num_places, 'data/processed', CITY, seed)
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        engine = RecommendationEngine(CITY)
+        load_s = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Registry: first load converts to Arrow, later loads memory-map it
+        start = time.perf_counter()
+        EngineRegistry(check_interval=None).get(CITY)
+        registry_cold_s = time.perf_counter() - start
+        start = time.perf_counter()
+        EngineRegistry(check_interval=None).get(CITY)
+        registry_warm_s = time.perf_counter() - start
+
+        cli_dir = write_places_parquet(num_places, 'cli', CITY, seed, by_category=True).parent
+        cli_cold_start_s = _cli_cold_start(project_root, str(cli_dir))
+
+        repeats = int(np.clip(2_000_000 // num_places, 3, 200))
+        operations = {name: _timings(lambda: func(engine), repeats)
+                      for name, func in OPERATIONS.items()}
+
+        return {
+            'num_places': num_places,
+            'parquet_mb': data_file.stat().st_size / 1e6,
+            'load_s': load_s,
+            'registry_cold_load_s': registry_cold_s,
+            'registry_warm_load_s': registry_warm_s,
+            'cli_cold_start_s': cli_cold_start_s,
+            'load_traced_peak_mb': traced_peak / 1e6,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'peak_rss_growth_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                   - baseline_rss) / 1024,
+            'operations': operations,
+        }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Print timing ratios against an older result file, flagging slowdowns"""
+    print(f"\n📈 Compared with {baseline.get('commit') or 'baseline'} ({baseline['timestamp']})")
+    for size, result in current['sizes'].items():
+        old = baseline['sizes'].get(size)
+        if old is None:
+            continue
+        pairs = [(name, old[name], result[name])
+                 for name in ('load_s', 'registry_warm_load_s', 'cli_cold_start_s', 'peak_rss_mb')
+                 if name in old]
+        pairs += [(name, old['operations'][name]['p50_ms'], timing['p50_ms'])
+                  for name, timing in result['operations'].items() if name in old['operations']]
+        for name, before, after in pairs:
+            ratio = after / before if before else float('inf')
+            flag = '⚠️ ' if ratio > threshold else '  '
+            print(f"   {flag}{int(size):>9,} {name:24s} {before:10.3f} → {after:10.3f}  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recommendation engine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Synthetic city sizes (places)")
+    parser.add_argument('--seed', type=int, default=42, help="Synthetic data seed")
+    parser.add_argument('--output', type=Path, help="JSON result file "
+                        "(default: benchmarks/results/suite-<timestamp>.json)")
+    parser.add_argument('--compare', type=Path, help="Older result file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Slowdown ratio flagged when comparing")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(" " * 18 + "RECOMMENDATION ENGINE BENCHMARK SUITE")
+    print("="*70)
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'seed': args.seed,
+        'sizes': {},
+    }
+
+    # One fresh process per size so peak memory is not inherited from the previous one
+    context = multiprocessing.get_context('spawn')
+    project_root = os.getcwd()
+    for num_places in args.sizes:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_size, (num_places, args.seed))
+        results['sizes'][str(num_places)] = result
+
+        print(f"\n📦 {num_places:,} places ({result['parquet_mb']:.1f} MB parquet)")
+        print(f"   load {result['load_s']:.3f}s | registry cold {result['registry_cold_load_s']:.3f}s"
+              f" warm {result['registry_warm_load_s']:.3f}s | cli cold start {result['cli_cold_start_s']:.3f}s"
+              f" | peak RSS {result['peak_rss_mb']:.0f} MB")
+        for name, timing in result['operations'].items():
+            print(f"   {name:24s} p50 {timing['p50_ms']:10.3f} ms  mean {timing['mean_ms']:10.3f} ms")
+
+    output = args.output or Path(project_root) / RESULTS_DIR / \
+        f"suite-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Area Sweep Benchmark
+Distinct places per API call of center-point vs tiled sweep collection
+
+Run from the project root:
+    python -m benchmarks.bench_sweep
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+
+from benchmarks.mock_api import MockAPIServer
+from config.config import CITIES, SWEEP_MIN_TILE_RADIUS_METERS
+from src.api.google_client import GooglePlacesClient
+from src.api.rate_limiter import TokenBucket
+from src.api.yelp_client import YelpClient
+from src.data.cache_manager import CacheManager
+from src.data.data_collector import DataCollector
+from src.data.tiling import hex_tiles
+
+MOCK_RATE_LIMIT = 2000.0
+CATEGORIES = ['food', 'cultural']
+PLACES_PER_KEYWORD = 400
+
+
+def make_collector(server: MockAPIServer, cache_dir: str) -> DataCollector:
+    cache = CacheManager(cache_dir)
+    google = GooglePlacesClient('mock-key', base_url=server.google_url, retry_backoff=0,
+                                rate_limiter=TokenBucket(MOCK_RATE_LIMIT), cache=cache)
+    yelp = YelpClient('mock-key', base_url=server.yelp_url, retry_backoff=0,
+                      rate_limiter=TokenBucket(MOCK_RATE_LIMIT), cache=cache)
+    return DataCollector(google, yelp, cache=cache)
+
+
+def report(label: str, seconds: float, calls: int, places: int):
+    """One result line; places are rows after cross-source merging"""
+    per_call = f"{places / calls:5.2f}" if calls else "  n/a"
+    print(f"   {label:22s} {seconds:6.2f}s | {calls:5d} calls | {places:6d} places "
+          f"| {per_call} per call")
+
+
+def main():
+    print("\n" + "="*70)
+    print(" " * 19 + "AREA SWEEP BENCHMARK (MOCK API)")
+    print("="*70)
+
+    city = CITIES['boston']
+    with MockAPIServer(latency=0.002, throttle_every=0,
+                       places_per_keyword=PLACES_PER_KEYWORD) as server, \
+            tempfile.TemporaryDirectory() as workspace:
+        collector = make_collector(server, f"{workspace}/center")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            places = collector.collect_city_data('boston', CATEGORIES, save=False)
+        center_calls = collector.get_usage_stats()['total_calls']
+        print(f"\n📦 {PLACES_PER_KEYWORD} places per keyword, categories {CATEGORIES}")
+        report('center point', time.perf_counter() - start, center_calls, len(places))
+
+        collector = make_collector(server, f"{workspace}/sweep")
+        for label in ('sweep', 'sweep (rerun, cached)'):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, sweep = collector.sweep_city_data('boston', CATEGORIES, save=False)
+            summary = sweep['summary']
+            report(label, time.perf_counter() - start, summary['api_calls'],
+                   summary['total_places'])
+
+        for depth, entry in sorted(summary['by_depth'].items()):
+            print(f"      depth {depth}: {entry['tiles']:5d} tiles | "
+                  f"{entry['results']:6d} results | {entry['new_places']:5d} new")
+
+        # A uniform grid needs the finest tiles everywhere to reach the same depth
+        finest = max(tile['radius'] for tile in sweep['tiles'] if tile['depth'] == max(summary['by_depth']))
+        uniform = len(hex_tiles(city['coordinates']['lat'], city['coordinates']['lng'],
+                                city['radius'], finest))
+        queries = len(collector._build_queries(CATEGORIES))
+        print(f"\n   Uniform {finest}m grid would need {uniform * queries:,} calls "
+              f"(min tile radius {SWEEP_MIN_TILE_RADIUS_METERS}m)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Mock API Server
+Local stand-in for Google Places and Yelp search endpoints used by benchmarks
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+CENTER = (42.36, -71.06)
+METERS_PER_DEG_LAT = 111_195
+
+
+def _stable_hash(text: str) -> int:
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+
+class MockAPIServer:
+    """
+    Threaded HTTP server answering Google `:searchText` and Yelp
+    `/businesses/search` requests with deterministic fake results
+
+    Every response is delayed by `latency` seconds, and the first attempt of
+    roughly one in `throttle_every` distinct queries is answered with a 429,
+    so client retries are exercised the same way in every run.
+
+    With places_per_keyword set, every keyword instead has a fixed population
+    of places scattered around the city center (dense downtown, sparse
+    outskirts), and a search returns the ones nearest to its point within
+    its radius. Overlapping searches then return the same places, as the
+    real APIs do. `aliases` maps keywords to another keyword whose places
+    they return, like near-duplicate queries ("hiking trail" / "hiking").
+    """
+
+    def __init__(self, latency: float = 0.05, results_per_query: int = 20,
+                 throttle_every: int = 5, places_per_keyword: int = 0,
+                 spread_meters: float = 4000, aliases: dict = None):
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.throttle_every = throttle_every
+        self.places_per_keyword = places_per_keyword
+        self.spread_meters = spread_meters
+        self.aliases = aliases or {}
+        self._populations = {}
+        self.request_count = 0
+        self._throttled = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def google_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1/places"
+
+    @property
+    def yelp_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v3"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_throttle(self, query_key: str) -> bool:
+        """429 once for a fixed subset of queries"""
+        with self._lock:
+            self.request_count += 1
+            if self.throttle_every and _stable_hash(query_key) % self.throttle_every == 0 \
+                    and query_key not in self._throttled:
+                self._throttled.add(query_key)
+                return True
+        return False
+
+    def _population(self, keyword: str) -> tuple:
+        """(lats, lngs) of a keyword's fixed places"""
+        with self._lock:
+            if keyword not in self._populations:
+                rng = np.random.default_rng(_stable_hash(keyword))
+                offsets = rng.normal(0, self.spread_meters, size=(self.places_per_keyword, 2))
+                lats = CENTER[0] + offsets[:, 1] / METERS_PER_DEG_LAT
+                lngs = CENTER[1] + offsets[:, 0] / (METERS_PER_DEG_LAT * math.cos(math.radians(CENTER[0])))
+                self._populations[keyword] = (lats, lngs)
+            return self._populations[keyword]
+
+    def _locate(self, seed: int, keyword: str, lat: float, lng: float,
+                radius: float, limit: int) -> list:
+        """(result number, lat, lng) of the places a search returns"""
+        limit = min(limit, self.results_per_query)
+        if not self.places_per_keyword:
+            return [(i, 42.36 + (seed % 100 + i) * 1e-4, -71.06 + (seed % 97 + i) * 1e-4)
+                    for i in range(limit)]
+        lats, lngs = self._population(keyword)
+        dy = (lats - lat) * METERS_PER_DEG_LAT
+        dx = (lngs - lng) * METERS_PER_DEG_LAT * math.cos(math.radians(lat))
+        distance = np.hypot(dx, dy)
+        inside = np.flatnonzero(distance <= radius)
+        nearest = inside[np.argsort(distance[inside], kind='stable')[:limit]]
+        return [(int(i), float(lats[i]), float(lngs[i])) for i in nearest]
+
+    def _google_places(self, query_key: str, body: dict) -> dict:
+        keyword = body.get('textQuery', '').split(' near ')[0]
+        keyword = self.aliases.get(keyword, keyword)
+        circle = body.get('locationBias', {}).get('circle', {})
+        center = circle.get('center', {})
+        seed = _stable_hash(keyword if self.places_per_keyword else query_key)
+        located = self._locate(seed, keyword, center.get('latitude', CENTER[0]),
+                               center.get('longitude', CENTER[1]), circle.get('radius', 10000),
+                               body.get('maxResultCount', 20))
+        return {'places': [{
+            'id': f"g{seed}_{i}",
+            'displayName': {'text': f"{keyword.title()} {i}"},
+            'formattedAddress': f"{i + 1} {keyword.title()} St",
+            'location': {'latitude': place_lat, 'longitude': place_lng},
+            'rating': round(3.0 + (seed + i) % 21 / 10, 1),
+            'userRatingCount': (seed + i * 37) % 5000,
+            'priceLevel': 'PRICE_LEVEL_MODERATE',
+            'types': ['point_of_interest', 'establishment'],
+            'websiteUri': '',
+            'googleMapsUri': f"https://maps.google.com/?cid={seed}{i}",
+        } for i, place_lat, place_lng in located]}
+
+    def _yelp_businesses(self, query_key: str, params: dict) -> dict:
+        term = self.aliases.get(params.get('term', ''), params.get('term', ''))
+        seed = _stable_hash(term if self.places_per_keyword else query_key)
+        located = self._locate(seed, term, float(params.get('latitude', CENTER[0])),
+                               float(params.get('longitude', CENTER[1])),
+                               float(params.get('radius', 10000)), int(params.get('limit', 20)))
+        return {'businesses': [{
+            'id': f"y{seed}_{i}",
+            'name': f"{term.title()} {i}",
+            'location': {'display_address': [f"{i + 1} {term.title()} St", 'Boston, MA']},
+            'coordinates': {'latitude': place_lat, 'longitude': place_lng},
+            'rating': (seed + i) % 5 + 1,
+            'review_count': (seed + i * 37) % 3000,
+            'price': '$' * ((seed + i) % 4 + 1),
+            'categories': [{'title': term.title()}],
+            'phone': '',
+            'url': f"https://www.yelp.com/biz/{seed}-{i}",
+            'image_url': '',
+        } for i, place_lat, place_lng in located]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict = None):
+                payload = json.dumps(body or {}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                query_key = 'google:' + json.dumps(body, sort_keys=True)
+                time.sleep(server.latency)
+                if server._should_throttle(query_key):
+                    return self._reply(429)
+                self._reply(200, server._google_places(query_key, body))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                query_key = 'yelp:' + json.dumps(params, sort_keys=True)
+                time.sleep(server.latency)
+                if server._should_throttle(query_key):
+                    return self._reply(429)
+                self._reply(200, server._yelp_businesses(query_key, params))
+
+        return Handler
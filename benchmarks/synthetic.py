@@ -0,0 +1,169 @@
+"""
+Synthetic City Generator
+Builds seeded fake place datasets that match the processed parquet schema
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from config.config import CITIES, CATEGORY_KEYWORDS, DEFAULT_PRICE_BY_CATEGORY
+from src.data.streaming import write_city_parquet
+
+GOOGLE_TYPES = ['restaurant', 'cafe', 'bar', 'night_club', 'museum', 'art_gallery',
+                'park', 'tourist_attraction', 'shopping_mall', 'store', 'gym', 'spa',
+                'zoo', 'aquarium', 'amusement_park', 'point_of_interest', 'establishment']
+YELP_CATEGORIES = ['Restaurants', 'Cafes', 'Bars', 'Nightlife', 'Museums', 'Art Galleries',
+                   'Parks', 'Hiking', 'Shopping', 'Gyms', 'Yoga', 'Day Spas', 'Zoos',
+                   'Aquariums', 'Tours', 'Beaches', 'Music Venues']
+
+
+def _join_random_labels(rng, vocab: list, num_rows: int, max_labels: int = 3) -> np.ndarray:
+    """Build comma-joined label strings like the API parsers produce"""
+    vocab = np.array(vocab)
+    counts = rng.integers(1, max_labels + 1, num_rows)
+    picks = rng.integers(0, len(vocab), (num_rows, max_labels))
+    combos = {}
+    out = np.empty(num_rows, dtype=object)
+    for i, (count, row) in enumerate(zip(counts, picks)):
+        key = tuple(sorted(set(row[:count])))
+        if key not in combos:
+            combos[key] = ','.join(vocab[list(key)])
+        out[i] = combos[key]
+    return out
+
+
+def make_places_df(num_places: int, city_name: str = 'boston', seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a synthetic places DataFrame
+
+    Args:
+        num_places: Number of rows to generate
+        city_name: City whose center/radius the coordinates are drawn around
+        seed: Random seed (same seed -> same dataset)
+
+    Returns:
+        DataFrame with the same columns as {city}_places.parquet
+    """
+    rng = np.random.default_rng(seed)
+    city = CITIES[city_name]
+    center = city['coordinates']
+    categories = list(CATEGORY_KEYWORDS.keys())
+
+    # Scatter places around the city center (radius in meters -> degrees)
+    radius_deg = city['radius'] / 111_000
+    angle = rng.uniform(0, 2 * np.pi, num_places)
+    dist = radius_deg * np.sqrt(rng.uniform(0, 1, num_places))
+    lat = center['lat'] + dist * np.sin(angle)
+    lng = center['lng'] + dist * np.cos(angle) / np.cos(np.radians(center['lat']))
+
+    cat_idx = rng.integers(0, len(categories), num_places)
+    category = np.array(categories, dtype=object)[cat_idx]
+    is_google = rng.random(num_places) < 0.5
+
+    # Google rates in tenths, Yelp in halves; a few places have no rating
+    raw_rating = rng.uniform(3.0, 5.0, num_places)
+    rating = np.where(is_google, np.round(raw_rating, 1), np.round(raw_rating * 2) / 2)
+    rating[rng.random(num_places) < 0.05] = np.nan
+    review_count = rng.lognormal(4.5, 1.6, num_places).astype(np.int64)
+
+    price_level = rng.integers(1, 5, num_places)
+    price_level[rng.random(num_places) < 0.4] = 0
+    default_price = np.array([DEFAULT_PRICE_BY_CATEGORY[c] or 0 for c in categories])
+    price_estimate = np.where(price_level > 0, price_level, default_price[cat_idx])
+
+    ids = pd.Series(np.arange(num_places)).astype(str)
+    street_no = pd.Series(rng.integers(1, 1000, num_places)).astype(str)
+    types = _join_random_labels(rng, GOOGLE_TYPES, num_places)
+    yelp_categories = _join_random_labels(rng, YELP_CATEGORIES, num_places)
+
+    return pd.DataFrame({
+        'place_id': f"syn{seed}_" + ids,
+        'name': 'Place ' + ids,
+        'address': street_no + f" Main St, {city['display_name']}",
+        'latitude': lat,
+        'longitude': lng,
+        'rating': rating,
+        'review_count': review_count,
+        'price_level': price_level,
+        'types': np.where(is_google, types, None),
+        'website': np.where(is_google, '', None),
+        'google_maps_url': np.where(is_google, 'https://maps.google.com/?cid=' + ids, None),
+        'source': np.where(is_google, 'google', 'yelp'),
+        'categories': np.where(is_google, None, yelp_categories),
+        'phone': np.where(is_google, None, ''),
+        'yelp_url': np.where(is_google, None, 'https://www.yelp.com/biz/place-' + ids),
+        'image_url': np.where(is_google, None, ''),
+        'category': category,
+        'price_estimate': price_estimate,
+    })
+
+
+def write_places_parquet(num_places: int, data_dir: str, city_name: str = 'boston',
+                         seed: int = 42, by_category: bool = False) -> Path:
+    """
+    Write a synthetic dataset as {data_dir}/{city}_places.parquet
+
+    Args:
+        by_category: One row group per category, as DataCollector.save_city_data writes it
+
+    Returns:
+        Path of the written file
+    """
+    data_file = Path(data_dir) / f"{city_name}_places.parquet"
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    places = make_places_df(num_places, city_name, seed)
+    if by_category:
+        write_city_parquet(places, data_file)
+    else:
+        places.to_parquet(data_file, index=False)
+    return data_file
+
+
+def make_interactions(engine, num_queries: int, model, seed: int = 42, shown: int = 20,
+                      sharpness: float = 10.0) -> pd.DataFrame:
+    """
+    Generate a click log whose clicks follow a known scoring model
+
+    Each query picks 1-3 categories and a budget, is shown random places
+    from those categories (any price) and clicks each with probability
+    sigmoid(sharpness * (score - mean score)), i.e. the
+    logistic model the trainer fits.
+
+    Args:
+        engine: RecommendationEngine to draw places from
+        num_queries: Number of logged queries
+        model: ScoringModel the clicks follow
+        seed: Random seed
+        shown: Places logged per query
+        sharpness: How strongly clicks follow the score
+
+    Returns:
+        DataFrame in the interaction log format of src.models.trainer
+    """
+    from src.models.scoring import FEATURES
+    from src.models.trainer import interaction_features
+
+    rng = np.random.default_rng(seed)
+    categories = np.array(list(CATEGORY_KEYWORDS))
+    place_ids = engine.places_df['place_id'].astype(str).to_numpy()
+    place_categories = engine.places_df['category'].astype(str).to_numpy()
+
+    rows = []
+    for query_id in range(num_queries):
+        picked = list(rng.choice(categories, rng.integers(1, 4), replace=False))
+        positions, _ = engine.index.gather(engine.index.category_keys(picked))
+        if len(positions) == 0:
+            continue
+        budget = int(rng.integers(1, 5))
+        for position in rng.choice(positions, min(shown, len(positions)), replace=False):
+            rows.append((query_id, place_ids[position], place_categories[position],
+                         ','.join(picked), budget, float(rng.uniform(0, 10))))
+    log = pd.DataFrame(rows, columns=['query_id', 'place_id', 'category', 'categories',
+                                      'budget_level', 'distance_km'])
+
+    X, _, _ = interaction_features(engine, log.assign(clicked=0))
+    scores = np.broadcast_to(model.evaluate({f: X[:, i] for i, f in enumerate(FEATURES)}), len(X))
+    centered = scores - scores.mean()
+    log['clicked'] = (rng.random(len(X)) < 1 / (1 + np.exp(-sharpness * centered))).astype(int)
+    return log
@@ -0,0 +1,163 @@
+"""
+Command Line Interface
+One-shot recommendations, famous places, itineraries and statistics with a fast start
+
+Only the columns a command shows or scores with are read, and only the row
+groups of the requested categories (predicate pushdown on the parquet
+file). pandas, pyarrow and the engine are imported after the arguments are
+parsed, so --help and argument errors return immediately.
+
+    python cli.py recommend boston food cultural --budget 2 --top-n 10
+    python cli.py famous miami --category nightlife
+    python cli.py itinerary boston food nature --budget 3 --days 2 --format csv -o trip.csv
+    python cli.py stats boston
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from config.config import (
+    BUDGET_TIERS, CATEGORY_KEYWORDS, CITIES, ITINERARY_PLACES_PER_DAY, PROCESSED_DATA_DIR
+)
+
+FORMATS = ('text', 'jsonl', 'csv', 'html')
+
+def data_file(args) -> Path:
+    path = Path(args.data_dir) / f"{args.city}_places.parquet"
+    if not path.exists():
+        sys.exit(f"No data found for {args.city}. Run collect_data.py first!")
+    return path
+
+def load_engine(args, categories: list = None, budget_level: int = None, source: str = None):
+    """
+    Engine over the rows a query can return, read with projection and pushdown
+
+    Returns:
+        RecommendationEngine, or None when no row matches
+    """
+    from src.models.scoring import DEFAULT_MODEL, SMOOTHED_MODEL, ScoringModel
+    from src.recommender.projection import (
+        DISPLAY_COLUMNS, ENGINE_COLUMNS, filters_are_exact, read_places, row_filters, schema_names
+    )
+    from src.recommender.recommendation_engine import RecommendationEngine
+
+    path = data_file(args)
+    names = schema_names(path)
+    model = ScoringModel.load(args.scoring_model) if args.scoring_model else \
+        SMOOTHED_MODEL if 'smoothed_rating' in names else DEFAULT_MODEL
+    # Text listings only show a few columns; exports keep every column
+    columns = ENGINE_COLUMNS + DISPLAY_COLUMNS if args.format == 'text' else None
+    filters = row_filters(categories, budget_level, source)
+    if not filters_are_exact(model.features, names):
+        filters = []   # the model scores with rows outside the filter
+    places = read_places(path, columns, filters)
+    if args.timing:
+        print(f"⏱️  Read {len(places):,} rows × {len(places.columns)} columns "
+              f"in {time.perf_counter() - START:.3f}s since start", file=sys.stderr)
+    if places.empty:
+        return None
+    return RecommendationEngine(args.city, places_df=places, scoring_model=model,
+                                materialized_dir=None)
+
+def emit(args, text: str):
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            out.write(text)
+    else:
+        sys.stdout.write(text)
+
+def cmd_recommend(args):
+    engine = load_engine(args, args.categories, args.budget)
+    if engine is None:
+        sys.exit("❌ No places match your criteria!")
+    from src.recommender.rendering import render_recommendations
+    recommendations = engine.get_recommendations(args.categories, args.budget, args.days, args.top_n)
+    emit(args, render_recommendations(recommendations, args.format))
+
+def cmd_famous(args):
+    engine = load_engine(args, [args.category] if args.category else None, source=args.source)
+    if engine is None:
+        sys.exit("❌ No places match your criteria!")
+    from src.recommender.rendering import famous_text, render_recommendations
+    famous = engine.get_top_famous_places(args.top_n, args.category, args.source)
+    emit(args, famous_text(famous) if args.format == 'text' else
+         render_recommendations(famous, args.format))
+
+def cmd_itinerary(args):
+    engine = load_engine(args, args.categories, args.budget)
+    if engine is None:
+        sys.exit("❌ No places match your criteria!")
+    from src.recommender.rendering import render_itinerary
+    itinerary = engine.create_itinerary(args.categories, args.budget, args.days, args.places_per_day)
+    emit(args, render_itinerary(itinerary, args.format))
+
+def cmd_stats(args):
+    from src.recommender.projection import STATISTICS_COLUMNS, read_places
+    from src.recommender.recommendation_engine import place_statistics
+    stats = place_statistics(read_places(data_file(args), STATISTICS_COLUMNS))
+    if args.format != 'text':
+        emit(args, json.dumps(stats, default=lambda value: value.item()) + '\n')
+        return
+    lines = [f"\n📊 {CITIES[args.city]['display_name']}",
+             f"   Total places: {stats['total_places']:,}",
+             f"   Avg rating: {stats['avg_rating']:.2f}",
+             f"   Total reviews: {int(stats['total_reviews']):,}",
+             f"   Price coverage: {stats['price_coverage']:.1f}%",
+             "   By category:"]
+    lines += [f"      {category:18s} {count:8,d}" for category, count in stats['by_category'].items()]
+    lines.append("   By source:")
+    lines += [f"      {source:18s} {count:8,d}" for source, count in stats['by_source'].items()]
+    emit(args, '\n'.join(lines) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a city's recommendations from the command line")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('city', choices=list(CITIES), help="City to query")
+    common.add_argument('--format', choices=FORMATS, default='text', help="Output format")
+    common.add_argument('-o', '--output', help="Write to this file instead of stdout")
+    common.add_argument('--data-dir', default=PROCESSED_DATA_DIR,
+                        help="Directory with the {city}_places.parquet files")
+    common.add_argument('--scoring-model', metavar='PATH',
+                        help="Scoring weights written by train_scoring.py (default: built-in)")
+    common.add_argument('--timing', action='store_true', help="Print read and total time to stderr")
+
+    query = argparse.ArgumentParser(add_help=False)
+    query.add_argument('categories', nargs='+', choices=list(CATEGORY_KEYWORDS), metavar='CATEGORY',
+                       help=f"Categories ({', '.join(CATEGORY_KEYWORDS)})")
+    query.add_argument('--budget', type=int, choices=sorted(BUDGET_TIERS), default=2,
+                       help="Budget level, 1 (Budget) to 4 (Luxury)")
+    query.add_argument('--days', type=int, default=1, help="Trip length in days")
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    recommend = commands.add_parser('recommend', parents=[common, query], help="Top recommendations")
+    recommend.add_argument('--top-n', type=int, default=20, help="Number of places")
+    recommend.set_defaults(run=cmd_recommend)
+
+    famous = commands.add_parser('famous', parents=[common], help="Most reviewed, best rated places")
+    famous.add_argument('--top-n', type=int, default=5, help="Number of places")
+    famous.add_argument('--category', choices=list(CATEGORY_KEYWORDS), help="Only this category")
+    famous.add_argument('--source', choices=['google', 'yelp', 'google+yelp'],
+                        help="Only places with data from this source (google and yelp include "
+                             "venues merged from both, google+yelp only those)")
+    famous.set_defaults(run=cmd_famous)
+
+    itinerary = commands.add_parser('itinerary', parents=[common, query], help="Day-by-day itinerary")
+    itinerary.add_argument('--places-per-day', type=int, default=ITINERARY_PLACES_PER_DAY,
+                           help="Stops per day")
+    itinerary.set_defaults(run=cmd_itinerary)
+
+    stats = commands.add_parser('stats', parents=[common], help="Dataset statistics")
+    stats.set_defaults(run=cmd_stats)
+
+    args = parser.parse_args()
+    args.run(args)
+    if args.timing:
+        print(f"⏱️  Done in {time.perf_counter() - START:.3f}s since start", file=sys.stderr)
+
+START = time.perf_counter()
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,144 @@ Data Collection Script
 Run this to collect data for Boston and Miami
 """
 
+import argparse
+import json
+from pathlib import Path
+
+from config.config import API_DAILY_QUOTAS, CATEGORY_KEYWORDS
 from src.data.data_collector import DataCollector
+from src.data.planner import build_searches, plan_collection, planned_queries
+
+def refresh(collector: DataCollector, cities: list):
+    """Incrementally refresh the categories of saved cities, re-querying only stale cache entries"""
+    for city_name in cities:
+        print("\n" + "🔄" * 35)
+        report = collector.refresh_city_data(city_name)
+        print(f"   Rows: +{report['added']} added | ~{report['updated']} updated | "
+              f"-{report['dropped']} dropped | {report['unchanged']} unchanged")
+        print(f"   Snapshot: {report['snapshot']}")
+
+def stream(collector: DataCollector, cities: list):
+    """Stream all categories of each city into the partitioned dataset, then build its parquet"""
+    for city_name in cities:
+        print("\n" + "🌊" * 35)
+        collector.stream_city_data(city_name)
+        collector.build_city_from_dataset(city_name)
+
+def sweep(collector: DataCollector, cities: list):
+    """Collect each city tile by tile and save its per-tile yield report"""
+    for city_name in cities:
+        print("\n" + "🧭" * 35)
+        _, report = collector.sweep_city_data(city_name)
+        summary = report['summary']
+        report_file = collector.output_dir / f"{city_name}_sweep_report.json"
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report, indent=2))
+        per_call = f"{summary['places_per_call']:.2f}" if summary['places_per_call'] else "n/a"
+        print(f"   Tiles: {summary['tiles']} | split: {summary['tiles_subdivided']} | "
+              f"cached: {summary['cached_tiles']} | places per call: {per_call}")
+        for depth, entry in sorted(summary['by_depth'].items()):
+            print(f"   Depth {depth}: {entry['tiles']} tiles, {entry['new_places']} new places")
+        print(f"   Report: {report_file}")
+
+def plan(collector: DataCollector, cities: list, args):
+    """Print a quota-aware collection plan, save it, and run it with --execute"""
+    budgets = {'google': args.google_calls, 'yelp': args.yelp_calls}
+    collection_plan = plan_collection(collector, cities, args.categories, budgets)
+    calls = collection_plan['calls']
+    picked = [search for search in collection_plan['searches']
+              if search['status'] in ('cached', 'call')]
+
+    print("\n" + "🧮" * 35)
+    print(f"Plan for {', '.join(cities)}: {len(collection_plan['categories'])} categories, "
+          f"{collection_plan['distinct_searches']} distinct searches "
+          f"({collection_plan['naive_searches']} with repeated keywords)")
+    print(f"   API calls: google {calls['google']:,}/{budgets['google']:,} | "
+          f"yelp {calls['yelp']:,}/{budgets['yelp']:,} | free from cache: {collection_plan['free']}")
+    total_calls = sum(calls.values())
+    per_call = (f" ({collection_plan['expected_new_places'] / total_calls:.1f} per call)"
+                if total_calls else "")
+    print(f"   Expected new places: {collection_plan['expected_new_places']:,.0f}{per_call}")
+    for status in ('merged', 'redundant', 'over_budget'):
+        count = sum(search['status'] == status for search in collection_plan['searches'])
+        if count:
+            print(f"   Skipped as {status}: {count}")
+
+    print(f"\n   {'city':8s} {'provider':8s} {'keyword':20s} {'status':11s} {'new':>6s}  categories")
+    for search in collection_plan['searches']:
+        guess = '~' if search['estimated'] else ' '
+        note = f" (into \"{search['merged_into']}\")" if search['merged_into'] else ''
+        print(f"   {search['city']:8s} {search['provider']:8s} {search['keyword']:20s} "
+              f"{search['status']:11s} {guess}{search['expected_new']:5.1f}  "
+              f"{','.join(search['categories'])}{note}")
+
+    if args.plan_output:
+        Path(args.plan_output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.plan_output).write_text(json.dumps(collection_plan, indent=2))
+        print(f"\n💾 Plan saved to {args.plan_output}")
+
+    if not args.execute:
+        print("\n🧪 Dry run: no API calls made (add --execute to collect the planned searches)")
+        return
+    for city_name in cities:
+        print("\n" + "🟦" * 35)
+        collector.collect_city_data(city_name, queries=planned_queries(collection_plan, city_name))
+    print(f"\n🔍 {len(picked)} planned searches run")
 
 def main():
+    parser = argparse.ArgumentParser(description="Collect place data for the recommender")
+    parser.add_argument('--refresh', nargs='*', metavar='CITY',
+                        help="Incrementally refresh saved cities (default: boston miami)")
+    parser.add_argument('--stream', nargs='*', metavar='CITY',
+                        help="Collect every category with bounded memory via the "
+                             "partitioned dataset (default: boston miami)")
+    parser.add_argument('--sweep', nargs='*', metavar='CITY',
+                        help="Cover the whole city radius with adaptively split search "
+                             "tiles (default: boston miami)")
+    parser.add_argument('--plan', nargs='*', metavar='CITY',
+                        help="Plan which searches to spend the call budget on, learning their "
+                             "yields from the cache, and print it (default: boston miami)")
+    parser.add_argument('--categories', nargs='+', choices=list(CATEGORY_KEYWORDS),
+                        help="Categories to plan (default: all)")
+    parser.add_argument('--google-calls', type=int, default=API_DAILY_QUOTAS['google'],
+                        help="Google calls the plan may spend")
+    parser.add_argument('--yelp-calls', type=int, default=API_DAILY_QUOTAS['yelp'],
+                        help="Yelp calls the plan may spend")
+    parser.add_argument('--plan-output', metavar='PATH', help="Save the plan as JSON")
+    parser.add_argument('--execute', action='store_true',
+                        help="Collect the planned searches instead of a dry run")
+    args = parser.parse_args()
+    
     print("\n" + "="*70)
     print(" " * 15 + "TRAVEL REC SYSTEM - DATA COLLECTION")
     print("="*70)
     
     collector = DataCollector()
     
+    if args.plan is not None:
+        plan(collector, args.plan or ['boston', 'miami'], args)
+        stats = collector.get_usage_stats()
+        print(f"\n📊 API calls: {stats['total_calls']} | Cache hits: {stats['cache_hits']}")
+        return
+    
+    if args.stream is not None:
+        stream(collector, args.stream or ['boston', 'miami'])
+        stats = collector.get_usage_stats()
+        print(f"\n📊 API calls: {stats['total_calls']} | Cache hits: {stats['cache_hits']}")
+        return
+    
+    if args.sweep is not None:
+        sweep(collector, args.sweep or ['boston', 'miami'])
+        stats = collector.get_usage_stats()
+        print(f"\n📊 API calls: {stats['total_calls']} | Cache hits: {stats['cache_hits']}")
+        return
+    
+    if args.refresh is not None:
+        refresh(collector, args.refresh or ['boston', 'miami'])
+        stats = collector.get_usage_stats()
+        print(f"\n📊 API calls: {stats['total_calls']} | Cache hits: {stats['cache_hits']}")
+        return
+    
     # Choose which cities and categories to collect
     # Start with a subset to test, then expand
     
@@ -23,8 +152,8 @@ def main():
     
     print("\n🎯 STRATEGY: Collecting limited categories first to test")
     print(f"   Categories: {test_categories}")
-    print(f"   This will make ~{len(test_categories) * 5 * 2} API calls per city")
-    print(f"   (2 APIs × 5 keywords/category × {len(test_categories)} categories)")
+    print(f"   This will make at most {len(build_searches(test_categories))} API calls per city")
+    print(f"   (2 APIs × distinct keywords of {len(test_categories)} categories; cached ones are free)")
     
     input("\nPress Enter to continue or Ctrl+C to cancel...")
     
@@ -46,8 +175,9 @@ def main():
     print(f"   Google Places: {stats['google_calls']} calls")
     print(f"   Yelp: {stats['yelp_calls']} calls")
     print(f"   Total API calls: {stats['total_calls']}")
-    print(f"\n   Free tier remaining (Google): {10000 - stats['google_calls']:,} calls")
-    print(f"   Free tier remaining (Yelp): {5000 - stats['yelp_calls']:,} calls/day")
+    print(f"   Cache hits: {stats['cache_hits']} | misses: {stats['cache_misses']}")
+    print(f"\n   Free tier remaining (Google): {API_DAILY_QUOTAS['google'] - stats['google_calls']:,} calls")
+    print(f"   Free tier remaining (Yelp): {API_DAILY_QUOTAS['yelp'] - stats['yelp_calls']:,} calls/day")
     
     print(f"\n💾 DATA SAVED TO:")
     print(f"   data/processed/boston_places.parquet")
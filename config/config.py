@@ -55,14 +55,95 @@ BUDGET_TIERS = {
 # API endpoints
 GOOGLE_PLACES_BASE_URL = "https://places.googleapis.com/v1/places"
 YELP_BASE_URL = "https://api.yelp.com/v3"
+SEARCH_RADIUS_METERS = 10000  # Default search circle around a query point
 
 # Cache settings
 CACHE_DIR = "data/raw/cache"
 CACHE_EXPIRY_DAYS = 30
+CACHE_MAX_SIZE_MB = 500      # Least recently used entries are evicted above this
+CACHE_COORD_PRECISION = 4    # Decimal places kept from lat/lng in cache keys (~11m)
+
+# API rate limiting (per provider)
+API_CONCURRENCY = {"google": 4, "yelp": 4}       # Max requests in flight
+API_RATE_LIMITS = {"google": 10.0, "yelp": 5.0}  # Sustained requests per second (token bucket)
+API_MAX_RETRIES = 3                              # Retries on 429/5xx responses
+API_RETRY_BACKOFF_SECONDS = 1.0                  # Base delay, doubled on every retry
+API_DAILY_QUOTAS = {"google": 10000, "yelp": 5000}  # Free tier calls per day
 
 # Data collection settings
 MAX_RESULTS_PER_QUERY = 20  # Max for Google Places (New) API
 RESULTS_PER_CATEGORY = 20   # How many places to fetch per category
 
+# Tiled area sweep (collect_data.py --sweep)
+SWEEP_TILE_RADIUS_METERS = 5000      # Radius of the initial hex tiles covering the city circle
+SWEEP_MIN_TILE_RADIUS_METERS = 300   # Saturated tiles are not split below this radius
+
+# Collection planner (collect_data.py --plan)
+PLAN_MIN_NEW_PLACES = 1.0    # Searches expected to add fewer new places are skipped
+PLAN_MERGE_OVERLAP = 0.8     # Cached results sharing this much make two related keywords one search
+PLAN_RELATED_OVERLAP = 0.5   # Share of a related keyword's places assumed found already, until cached pairs say otherwise
+
+# Cross-source (Google/Yelp) duplicate matching
+ENTITY_MATCH_RADIUS_METERS = 150  # Max distance between two rows of the same venue
+ENTITY_MATCH_THRESHOLD = 0.5      # Min combined name/address similarity (0-1)
+
+# Ingest-time rating aggregation (src/data/aggregation.py)
+RATING_CALIBRATION_MIN_RATED = 30  # Rated places a source needs before its ratings are rescaled
+RATING_PRIOR_REVIEWS = 20          # Reviews' worth of the category mean rating mixed into smoothed_rating
+
+# Scoring models (src/models/scoring.py)
+SCORING_MODEL_PATH = "data/models/scoring_model.json"  # Weights written by train_scoring.py
+
+# Spatial index grid cell size for radius/nearest queries
+SPATIAL_CELL_METERS = 500
+
+# Itinerary builder settings
+ITINERARY_PLACES_PER_DAY = 5        # Stops per day
+ITINERARY_MAX_CANDIDATES = 5000     # Best-scored candidates considered for clustering
+ITINERARY_KMEANS_ITERATIONS = 15
+ITINERARY_DISTANCE_PENALTY = 0.1    # Score points traded per km away from a day's best place
+
+# Materialized results (materialize.py)
+MATERIALIZED_DIR = "data/processed/materialized"  # Precomputed results per city and dataset fingerprint
+MATERIALIZE_TOP_N = 50                            # Recommendations stored per category/budget combination
+MATERIALIZE_MAX_DAYS = 7                          # Itineraries stored for 1..this many days
+MATERIALIZE_WORKERS = None                        # Worker processes (None = one per CPU)
+
+# Rendering and export (src/recommender/rendering.py)
+EXPORT_BATCH_ITINERARIES = 200   # Itineraries rendered per write when streaming an export
+
+# Personalization (user profiles and reranking)
+PROFILE_DB_PATH = "data/profiles.sqlite3"  # SQLite store of each user's liked and visited places
+PROFILE_CELL_METERS = 4000                 # Location cell size in the place feature vectors
+PROFILE_VISITED_WEIGHT = 0.5               # Weight of a visited place in the profile (liked = 1)
+PERSONALIZATION_WEIGHT = 1.0               # Score points added at cosine similarity 1 with the profile
+PERSONALIZATION_CANDIDATES = 500           # Best base-scored candidates reranked per request
+
 # Processed data directory
-PROCESSED_DATA_DIR = "data/processed"
\ No newline at end of file
+PROCESSED_DATA_DIR = "data/processed"
+SNAPSHOT_DIR = "data/processed/snapshots"  # Category-partitioned copies written by refreshes
+STREAM_DATASET_DIR = "data/processed/dataset"  # city/category/source-partitioned parquet from streamed collection
+STREAM_ROW_GROUP_SIZE = 10_000                  # Rows buffered per partition before a row group is written
+
+# Engine registry settings
+ARROW_CACHE_DIR = "data/processed/arrow"  # Uncompressed Arrow copies, memory-mapped by every worker
+REGISTRY_RELOAD_CHECK_SECONDS = 2         # How often to check parquet files for changes
+SHARED_DATASET_DIR = "data/processed/shared"  # Published engine snapshots mapped by every worker (/dev/shm/... keeps them off disk)
+
+# HTTP service settings (serve.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8000
+SERVICE_WORKERS = 1              # Forked worker processes sharing the listening socket
+RESULT_CACHE_SIZE = 1024         # Cached responses per worker, least recently used evicted
+RESULT_CACHE_TTL_SECONDS = 300   # Cached responses expire after this
+SERVICE_MAX_DAYS = 14            # Largest days accepted by /recommendations and /itinerary
+SERVICE_MAX_TOP_N = 100          # Largest top_n accepted by /recommendations and /famous
+SERVICE_MAX_PLACES_PER_DAY = 10  # Largest places_per_day accepted by /itinerary
+
+# Query log replay (replay.py)
+REPLAY_PROFILE_TOP = 5             # Slowest requests listed and profiled
+REPLAY_SAMPLE_INTERVAL_MS = 1      # CPU time between stack samples of the sampling profiler
+REPLAY_SAMPLE_SECONDS = 0.5        # CPU time each profiled request is repeated for when sampling
+
+# Instrumentation: upper bounds of the timer histogram buckets, in milliseconds
+INSTRUMENTATION_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
\ No newline at end of file
@@ -3,19 +3,22 @@ Demo Recommendations
 Test the recommendation engine
 """
 
-from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.registry import EngineRegistry
 
 def main():
     print("\n" + "="*70)
     print(" " * 20 + "TRAVEL RECOMMENDATION DEMO")
     print("="*70)
     
+    # Cities are loaded on first use and share one mapped copy of their data
+    registry = EngineRegistry(verbose=True)
+    
     # Example 1: Boston - Cultural & Food, Moderate Budget, 3 days
     print("\n" + "🟦" * 35)
     print("EXAMPLE 1: Boston Cultural Food Tour")
     print("🟦" * 35)
     
-    engine_boston = RecommendationEngine('boston')
+    engine_boston = registry.get('boston')
     
     # Get top 10 recommendations
     recs = engine_boston.get_recommendations(
@@ -52,7 +55,7 @@ def main():
     print("EXAMPLE 2: Miami Beach & Nightlife")
     print("🟨" * 35)
     
-    engine_miami = RecommendationEngine('miami')
+    engine_miami = registry.get('miami')
     
     recs_miami = engine_miami.get_recommendations(
         categories=['nightlife', 'food'],
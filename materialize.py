@@ -0,0 +1,51 @@
+"""
+Materialization Script
+Precompute recommendations and itineraries for every category/budget/day combination
+"""
+
+import argparse
+import time
+
+from config.config import (
+    CITIES, ITINERARY_PLACES_PER_DAY, MATERIALIZED_DIR, MATERIALIZE_MAX_DAYS, MATERIALIZE_TOP_N,
+    MATERIALIZE_WORKERS
+)
+from src.models.scoring import ScoringModel
+from src.recommender.materialize import MaterializedLookup, materialize
+from src.recommender.recommendation_engine import RecommendationEngine
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute all category/budget/day combinations")
+    parser.add_argument('--cities', nargs='+', choices=list(CITIES), default=list(CITIES),
+                        help="Cities to materialize")
+    parser.add_argument('--top-n', type=int, default=MATERIALIZE_TOP_N,
+                        help="Recommendations stored per combination (larger requests are computed live)")
+    parser.add_argument('--max-days', type=int, default=MATERIALIZE_MAX_DAYS,
+                        help="Itineraries are stored for 1 to this many days")
+    parser.add_argument('--places-per-day', type=int, default=ITINERARY_PLACES_PER_DAY,
+                        help="Stops per itinerary day")
+    parser.add_argument('--workers', type=int, default=MATERIALIZE_WORKERS,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--scoring-model', help="Scoring weights JSON the server will use")
+    parser.add_argument('--output', default=MATERIALIZED_DIR, help="Materialized results directory")
+    args = parser.parse_args()
+
+    scoring_model = ScoringModel.load(args.scoring_model) if args.scoring_model else None
+    for city in args.cities:
+        engine = RecommendationEngine(city, scoring_model=scoring_model, materialized_dir=None)
+        print(f"\n🧮 Materializing {CITIES[city]['display_name']} ({len(engine.places_df):,} places)")
+
+        start = time.perf_counter()
+        def progress(done, total):
+            if done % 100 == 0 or done == total:
+                print(f"   {done:,}/{total:,} combinations", end='\r' if done < total else '\n')
+        lookup = materialize(engine, args.top_n, args.max_days, args.places_per_day,
+                             args.workers, progress)
+
+        path = MaterializedLookup.path(args.output, city, lookup.meta['fingerprint'])
+        lookup.save(path)
+        print(f"✅ {lookup.nbytes / 1e6:.1f} MB written to {path} "
+              f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
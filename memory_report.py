@@ -0,0 +1,46 @@
+"""
+Memory Report
+Show how much memory the compact in-memory representation saves per city
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+from config.config import CITIES, PROCESSED_DATA_DIR
+from src.recommender.compact import LABEL_COLUMNS, compact_places, memory_report
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-city memory of raw vs compact places data")
+    parser.add_argument('cities', nargs='*', metavar='CITY',
+                        help="Cities to report (default: every city with data)")
+    parser.add_argument('--columns', action='store_true', help="Show every column")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(" " * 22 + "PLACES MEMORY REPORT")
+    print("="*70)
+
+    for city_name in args.cities or list(CITIES):
+        data_file = Path(PROCESSED_DATA_DIR) / f"{city_name}_places.parquet"
+        if not data_file.exists():
+            print(f"\n⚠️  No data for {city_name}, skipping")
+            continue
+
+        places_df = pd.read_parquet(data_file)
+        report = memory_report(places_df, *compact_places(places_df)[:2])
+
+        print(f"\n🏙️  {CITIES[city_name]['display_name']} ({len(places_df):,} places)")
+        print(f"   Raw: {report['before_mb']:.2f} MB → Compact: {report['after_mb']:.2f} MB "
+              f"(saved {report['saved_mb']:.2f} MB, {report['saved_pct']:.0f}%)")
+        if args.columns:
+            for col, sizes in report['columns'].items():
+                print(f"   {col:18s} {sizes['before_mb']:8.3f} MB → {sizes['after_mb']:8.3f} MB")
+        labels_mb = sum(sizes['after_mb'] for col, sizes in report['columns'].items()
+                        if col in LABEL_COLUMNS)
+        print(f"   Through EngineRegistry: {report['after_mb'] - labels_mb:.2f} MB mapped from the "
+              f"shared Arrow copy, {labels_mb:.2f} MB of label bitsets")
+        print("   (plus the query indexes) private to each worker; serve.py --shared shares all of it")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Dataset Publisher
+Build each city's engine once and publish it as a snapshot every server worker maps read-only
+"""
+
+import argparse
+from pathlib import Path
+
+from config.config import (
+    CITIES, PROCESSED_DATA_DIR, REGISTRY_RELOAD_CHECK_SECONDS, SHARED_DATASET_DIR
+)
+from src.models.scoring import ScoringModel
+from src.recommender.shared import SharedPublisher
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish city engines for serve.py --attach")
+    parser.add_argument('--cities', nargs='*', metavar='CITY',
+                        help="Cities to publish (default: every city with data)")
+    parser.add_argument('--scoring-model', metavar='PATH',
+                        help="Scoring weights written by train_scoring.py (default: built-in)")
+    parser.add_argument('--shared-dir', default=SHARED_DATASET_DIR,
+                        help="Snapshot directory the servers attach to")
+    parser.add_argument('--no-profiles', action='store_true',
+                        help="Skip the personalization vectors (servers run without profiles)")
+    parser.add_argument('--force', action='store_true',
+                        help="Republish cities whose data did not change")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and republish a city whenever its parquet file changes")
+    parser.add_argument('--interval', type=float, default=REGISTRY_RELOAD_CHECK_SECONDS,
+                        help="Seconds between change checks with --watch")
+    args = parser.parse_args()
+
+    cities = args.cities
+    if cities is None:
+        cities = [city_name for city_name in CITIES
+                  if (Path(PROCESSED_DATA_DIR) / f"{city_name}_places.parquet").exists()]
+
+    publisher = SharedPublisher(
+        shared_dir=args.shared_dir, place_vectors=not args.no_profiles, verbose=True,
+        scoring_model=ScoringModel.load(args.scoring_model) if args.scoring_model else None
+    )
+    for city_name in cities:
+        pointer = publisher.publish(city_name, force=args.force)
+        if 'seconds' not in pointer:
+            print(f"✅ {city_name} is up to date ({pointer['file']})")
+    if args.watch:
+        print(f"👀 Watching {', '.join(cities) or 'nothing'} every {args.interval:g}s (Ctrl+C to stop)")
+        publisher.run(cities, args.interval)
+
+if __name__ == "__main__":
+    main()
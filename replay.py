@@ -0,0 +1,98 @@
+"""
+Query Replay Script
+Replay a JSONL query log against the engines and report latency, throughput and cache hit rates
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from config.config import PROCESSED_DATA_DIR, REPLAY_PROFILE_TOP
+from src.models.scoring import ScoringModel
+from src.recommender.personalization import ProfileStore
+from src.recommender.registry import EngineRegistry
+from src.recommender.replay import PROFILERS, load_queries, profile_requests, replay, summarize
+from src.recommender.service import RecommendationService
+
+def print_report(report: dict):
+    mode = (f"open loop at {report['target_qps']:g} QPS" if report['mode'] == 'open'
+            else "closed loop")
+    print(f"\n📊 {report['requests']:,} requests in {report['wall_s']:.2f}s with "
+          f"{report['workers']} worker(s), {mode}: {report['throughput_qps']:,.1f} req/s")
+    print(f"   {'endpoint':16s} {'count':>7s} {'errors':>6s} {'p50 ms':>9s} {'p95 ms':>9s} "
+          f"{'p99 ms':>9s} {'max ms':>9s} {'cache hits':>10s}")
+    rows = list(report['endpoints'].items()) + [('all', report['overall'])]
+    for endpoint, summary in rows:
+        print(f"   {endpoint:16s} {summary['count']:7,d} {summary['errors']:6,d} "
+              f"{summary['p50_ms']:9.2f} {summary['p95_ms']:9.2f} {summary['p99_ms']:9.2f} "
+              f"{summary['max_ms']:9.2f} {summary['cache_hit_rate']:10.1%}")
+
+    print("\n🐢 Slowest requests")
+    for slow in report['slowest']:
+        print(f"   {slow['latency_ms']:9.2f} ms  #{slow['index']:<6d} {slow['path']}")
+
+def print_profiles(captures: list):
+    for capture in captures:
+        print(f"\n🔬 #{capture['index']} {capture['path']} "
+              f"({capture['ms']:.2f} ms uncached, {capture['profiler']})")
+        if capture['profiler'] == 'cprofile':
+            print(f"   {'cumulative ms':>13s} {'own ms':>9s}  function")
+            for function, cumulative, own in capture['top']:
+                print(f"   {cumulative:13.2f} {own:9.2f}  {function}")
+            if 'file' in capture:
+                print(f"   Saved to {capture['file']}")
+        else:
+            print(f"   {capture['samples']:,} samples over {capture['runs']} runs")
+            print(f"   {'inclusive':>9s} {'self':>7s}  function")
+            for function, inclusive, own in capture['top']:
+                print(f"   {inclusive:9.1%} {own:7.1%}  {function}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JSONL query log against the engines")
+    parser.add_argument('log', help="JSON Lines log, one request per line: {\"path\": "
+                                    "\"/recommendations?city=boston&...\"} or {\"endpoint\": ..., "
+                                    "\"params\": {...}}")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes sharing the preloaded engines")
+    parser.add_argument('--qps', type=float,
+                        help="Open-loop arrival rate (default: closed loop, back to back)")
+    parser.add_argument('--limit', type=int, help="Replay only the first N requests")
+    parser.add_argument('--data-dir', default=PROCESSED_DATA_DIR,
+                        help="Directory with the {city}_places.parquet files")
+    parser.add_argument('--scoring-model', metavar='PATH',
+                        help="Scoring weights written by train_scoring.py (default: built-in)")
+    parser.add_argument('--profiles', metavar='PATH',
+                        help="SQLite user profile store, for logged personalized requests")
+    parser.add_argument('--slowest', type=int, default=REPLAY_PROFILE_TOP,
+                        help="Slowest requests to list")
+    parser.add_argument('--profile', choices=PROFILERS,
+                        help="Re-run the slowest requests under cProfile or the sampling profiler")
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help="Where to save cProfile captures of the slowest requests")
+    parser.add_argument('--output', metavar='PATH', help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    queries = load_queries(args.log)[:args.limit]
+    print(f"\n🔁 Replaying {len(queries):,} requests from {args.log}")
+    scoring_model = ScoringModel.load(args.scoring_model) if args.scoring_model else None
+    registry = EngineRegistry(args.data_dir, check_interval=None, scoring_model=scoring_model)
+    profiles = ProfileStore(args.profiles) if args.profiles else None
+    service = RecommendationService(registry, profiles=profiles)
+
+    results = replay(service, queries, args.workers, args.qps)
+    report = summarize(results, queries, args.slowest)
+    print_report(report)
+
+    if args.profile:
+        indexes = [slow['index'] for slow in report['slowest']]
+        report['profiles'] = profile_requests(service, queries, indexes, args.profile,
+                                              args.profile_dir)
+        print_profiles(report['profiles'])
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Report saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Recommendation Server
+Serve recommendations, famous places, itineraries and statistics over HTTP/JSON
+"""
+
+import argparse
+from pathlib import Path
+
+from config.config import (
+    CITIES, PROCESSED_DATA_DIR, PROFILE_DB_PATH, SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS
+)
+from src.models.scoring import ScoringModel
+from src.recommender.personalization import ProfileStore
+from src.recommender.registry import EngineRegistry
+from src.recommender.service import serve
+from src.recommender.shared import SharedEngineRegistry, SharedPublisher, start_publisher
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the recommendation HTTP service")
+    parser.add_argument('--host', default=SERVICE_HOST, help="Address to listen on")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="Port to listen on")
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS,
+                        help="Worker processes sharing the preloaded data")
+    parser.add_argument('--cities', nargs='*', metavar='CITY',
+                        help="Cities to preload before the workers start "
+                             "(default: every city with data)")
+    parser.add_argument('--scoring-model', metavar='PATH',
+                        help="Scoring weights written by train_scoring.py (default: built-in)")
+    parser.add_argument('--profiles', default=PROFILE_DB_PATH, metavar='PATH',
+                        help="SQLite user profile store for personalized recommendations")
+    parser.add_argument('--no-profiles', action='store_true',
+                        help="Disable user profiles and personalization")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--shared', action='store_true',
+                      help="Build engines once in a loader process and have every worker "
+                           "map the published snapshots read-only (hot swaps on data changes)")
+    mode.add_argument('--attach', action='store_true',
+                      help="Map snapshots published by a separate publish.py --watch")
+    args = parser.parse_args()
+
+    cities = args.cities
+    if cities is None:
+        cities = [city_name for city_name in CITIES
+                  if (Path(PROCESSED_DATA_DIR) / f"{city_name}_places.parquet").exists()]
+
+    registry = None
+    scoring_model = ScoringModel.load(args.scoring_model) if args.scoring_model else None
+    if scoring_model is not None:
+        print(f"🧮 Scoring with {scoring_model}")
+    if args.shared:
+        publisher = SharedPublisher(scoring_model=scoring_model,
+                                    place_vectors=not args.no_profiles, verbose=True)
+        start_publisher(publisher, cities)
+        print(f"📤 Loader process publishing to {publisher.shared_dir}")
+    if args.shared or args.attach:
+        registry = SharedEngineRegistry()
+    elif scoring_model is not None:
+        registry = EngineRegistry(scoring_model=scoring_model)
+
+    print(f"🚀 Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    print(f"   Preloading: {', '.join(cities) or 'none'}")
+    print("   Try: /recommendations?city=boston&categories=food,cultural&budget=2&days=3")
+    profiles = None if args.no_profiles else ProfileStore(args.profiles)
+    if profiles:
+        print(f"👤 User profiles: {profiles.path}")
+    serve(args.host, args.port, args.workers, cities, registry, profiles=profiles)
+
+if __name__ == "__main__":
+    main()
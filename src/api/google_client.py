@@ -3,15 +3,59 @@ Google Places API Client
 Handles all interactions with Google Places API (New)
 """
 
+import threading
+import time
+
 import requests
 import pandas as pd
+import pyarrow as pa
 from typing import Optional
+from config.config import (
+    GOOGLE_PLACES_BASE_URL, API_MAX_RETRIES, API_RETRY_BACKOFF_SECONDS,
+    SEARCH_RADIUS_METERS
+)
+from src.api.rate_limiter import RETRY_STATUS_CODES, TokenBucket, retry_delay
+from src.data.cache_manager import CacheManager
+from src.instrumentation import DISABLED, Instrumentation
+
+# Columns of the record batches yielded by iter_batches
+PLACE_SCHEMA = pa.schema([
+    ('place_id', pa.string()), ('name', pa.string()), ('address', pa.string()),
+    ('latitude', pa.float64()), ('longitude', pa.float64()), ('rating', pa.float64()),
+    ('review_count', pa.int64()), ('price_level', pa.int64()), ('types', pa.string()),
+    ('website', pa.string()), ('google_maps_url', pa.string()), ('source', pa.string()),
+])
 
 class GooglePlacesClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = GOOGLE_PLACES_BASE_URL,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 max_retries: int = API_MAX_RETRIES,
+                 retry_backoff: float = API_RETRY_BACKOFF_SECONDS,
+                 pool_size: int = 10,
+                 cache: Optional[CacheManager] = None,
+                 instrumentation: Optional[Instrumentation] = None):
+        """
+        Args:
+            api_key: Google Maps Platform API key
+            base_url: Places API base URL (override to point at a mock server)
+            rate_limiter: Token bucket shared by every request of this client
+            max_retries: Retries on 429/5xx responses
+            retry_backoff: Base retry delay in seconds (doubled per retry)
+            pool_size: HTTP connections kept open, at least the number of
+                threads using this client concurrently
+            cache: Response cache checked before every search
+            instrumentation: Receives google_request timings and google_api_calls,
+                google_cache_hits and google_cache_misses counters
+        """
         self.api_key = api_key
-        self.base_url = "https://places.googleapis.com/v1/places"
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'X-Goog-Api-Key': api_key,
@@ -28,10 +72,15 @@ class GooglePlacesClient:
                 'places.googleMapsUri'
             )
         })
+        self.cache = cache
         self.call_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._count_lock = threading.Lock()
+        self.instrumentation = instrumentation or DISABLED
     
     def search_places(self, lat: float, lng: float, keyword: str, 
-                     max_results: int = 20) -> pd.DataFrame:
+                     max_results: int = 20, radius: int = SEARCH_RADIUS_METERS) -> pd.DataFrame:
         """
         Search for places near a location by keyword
         
@@ -40,12 +89,39 @@ class GooglePlacesClient:
             lng: Longitude
             keyword: Search keyword (e.g., "museums", "restaurants")
             max_results: Maximum results (max 20 per call)
+            radius: Radius in meters of the circle results are biased to
             
         Returns:
             DataFrame with place information
         """
+        return pd.DataFrame(self._fetch(lat, lng, keyword, max_results, radius))
+    
+    def iter_batches(self, lat: float, lng: float, keyword: str, 
+                     max_results: int = 20, radius: int = SEARCH_RADIUS_METERS):
+        """
+        Search like search_places, yielding results as Arrow record batches
+        
+        Used by streaming collection, which writes batches straight to
+        parquet without building a DataFrame per query.
+        
+        Yields:
+            pa.RecordBatch with PLACE_SCHEMA columns, one per response
+        """
+        places = self._fetch(lat, lng, keyword, max_results, radius)
+        if places:
+            yield pa.RecordBatch.from_pylist(places, schema=PLACE_SCHEMA)
+    
+    def _fetch(self, lat: float, lng: float, keyword: str, max_results: int, radius: int) -> list:
+        """One search through the cache or the API, parsed into dicts ([] on errors)"""
         url = f"{self.base_url}:searchText"
         
+        cache_request = self._cache_request(lat, lng, keyword, max_results, radius)
+        if self.cache is not None:
+            data = self.cache.get('google', cache_request)
+            self._count_cache(data is not None)
+            if data is not None:
+                return self._parse_places_response(data)
+        
         payload = {
             "textQuery": f"{keyword} near {lat},{lng}",
             "maxResultCount": min(max_results, 20),
@@ -55,24 +131,70 @@ class GooglePlacesClient:
                         "latitude": lat,
                         "longitude": lng
                     },
-                    "radius": 10000
+                    "radius": cache_request['radius']
                 }
             }
         }
         
         try:
-            response = self.session.post(url, json=payload)
-            self.call_count += 1
+            response = self._send('POST', url, json=payload)
             response.raise_for_status()
             
             data = response.json()
+            if self.cache is not None:
+                self.cache.set('google', cache_request, data)
             places = self._parse_places_response(data)
             
-            return pd.DataFrame(places)
+            return places
             
         except requests.exceptions.RequestException as e:
             print(f"Google API Error: {e}")
-            return pd.DataFrame()
+            return []
+    
+    def is_cached(self, lat: float, lng: float, keyword: str, 
+                  max_results: int = 20, radius: int = SEARCH_RADIUS_METERS) -> bool:
+        """Whether search_places would be answered from an unexpired cache entry"""
+        if self.cache is None:
+            return False
+        return self.cache.is_fresh('google', self._cache_request(lat, lng, keyword, max_results, radius))
+    
+    def cached_places(self, lat: float, lng: float, keyword: str, max_results: int = 20,
+                      radius: int = SEARCH_RADIUS_METERS, include_expired: bool = True):
+        """
+        Places a search returned when it was last cached, without counting a cache lookup
+
+        Returns:
+            DataFrame like search_places, or None if the search was never cached
+        """
+        if self.cache is None:
+            return None
+        data = self.cache.peek('google', self._cache_request(lat, lng, keyword, max_results, radius),
+                               include_expired)
+        return None if data is None else pd.DataFrame(self._parse_places_response(data))
+    
+    def _cache_request(self, lat: float, lng: float, keyword: str, max_results: int, radius: int) -> dict:
+        """The parts of a search that identify its cache entry"""
+        return {'lat': lat, 'lng': lng, 'keyword': keyword,
+                'limit': min(max_results, 20), 'radius': radius}
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the rate limiter, retrying 429/5xx responses
+        
+        Every attempt that reaches the API is counted in call_count.
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self.instrumentation.timer('google_request'):
+                response = self.session.request(method, url, **kwargs)
+            with self._count_lock:
+                self.call_count += 1
+            self.instrumentation.increment('google_api_calls')
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            time.sleep(retry_delay(response, attempt, self.retry_backoff))
     
     def _parse_places_response(self, data: dict) -> list:
         """Parse API response into list of place dictionaries"""
@@ -114,6 +236,22 @@ class GooglePlacesClient:
         
         return price_map.get(price_str, 0)
     
+    def _count_cache(self, hit: bool):
+        with self._count_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        self.instrumentation.increment('google_cache_hits' if hit else 'google_cache_misses')
+    
     def get_call_count(self) -> int:
         """Return number of API calls made"""
-        return self.call_count
\ No newline at end of file
+        return self.call_count
+    
+    def get_cache_hit_count(self) -> int:
+        """Return number of searches answered from the cache"""
+        return self.cache_hits
+    
+    def get_cache_miss_count(self) -> int:
+        """Return number of searches that had to call the API"""
+        return self.cache_misses
\ No newline at end of file
@@ -3,21 +3,72 @@ Yelp Fusion API Client
 Handles all interactions with Yelp API
 """
 
+import threading
+import time
+
 import requests
 import pandas as pd
+import pyarrow as pa
+from typing import Optional
+from config.config import (
+    YELP_BASE_URL, API_MAX_RETRIES, API_RETRY_BACKOFF_SECONDS,
+    SEARCH_RADIUS_METERS
+)
+from src.api.rate_limiter import RETRY_STATUS_CODES, TokenBucket, retry_delay
+from src.data.cache_manager import CacheManager
+from src.instrumentation import DISABLED, Instrumentation
+
+# Columns of the record batches yielded by iter_batches
+PLACE_SCHEMA = pa.schema([
+    ('place_id', pa.string()), ('name', pa.string()), ('address', pa.string()),
+    ('latitude', pa.float64()), ('longitude', pa.float64()), ('rating', pa.float64()),
+    ('review_count', pa.int64()), ('price_level', pa.int64()), ('categories', pa.string()),
+    ('phone', pa.string()), ('yelp_url', pa.string()), ('image_url', pa.string()),
+    ('source', pa.string()),
+])
 
 class YelpClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = YELP_BASE_URL,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 max_retries: int = API_MAX_RETRIES,
+                 retry_backoff: float = API_RETRY_BACKOFF_SECONDS,
+                 pool_size: int = 10,
+                 cache: Optional[CacheManager] = None,
+                 instrumentation: Optional[Instrumentation] = None):
+        """
+        Args:
+            api_key: Yelp Fusion API key
+            base_url: Yelp API base URL (override to point at a mock server)
+            rate_limiter: Token bucket shared by every request of this client
+            max_retries: Retries on 429/5xx responses
+            retry_backoff: Base retry delay in seconds (doubled per retry)
+            pool_size: HTTP connections kept open, at least the number of
+                threads using this client concurrently
+            cache: Response cache checked before every search
+            instrumentation: Receives yelp_request timings and yelp_api_calls,
+                yelp_cache_hits and yelp_cache_misses counters
+        """
         self.api_key = api_key
-        self.base_url = "https://api.yelp.com/v3"
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Authorization': f'Bearer {api_key}'
         })
+        self.cache = cache
         self.call_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._count_lock = threading.Lock()
+        self.instrumentation = instrumentation or DISABLED
     
     def search_businesses(self, lat: float, lng: float, term: str, 
-                         limit: int = 20) -> pd.DataFrame:
+                         limit: int = 20, radius: int = SEARCH_RADIUS_METERS) -> pd.DataFrame:
         """
         Search for businesses by coordinates and term
         
@@ -26,33 +77,106 @@ class YelpClient:
             lng: Longitude
             term: Search term (e.g., "museums", "restaurants")
             limit: Max results (max 50 per call, but we use 20 to match Google)
+            radius: Search radius in meters (max 40000)
             
         Returns:
             DataFrame with business information
         """
+        return pd.DataFrame(self._fetch(lat, lng, term, limit, radius))
+    
+    def iter_batches(self, lat: float, lng: float, term: str, 
+                     limit: int = 20, radius: int = SEARCH_RADIUS_METERS):
+        """
+        Search like search_businesses, yielding results as Arrow record batches
+        
+        Used by streaming collection, which writes batches straight to
+        parquet without building a DataFrame per query.
+        
+        Yields:
+            pa.RecordBatch with PLACE_SCHEMA columns, one per response
+        """
+        businesses = self._fetch(lat, lng, term, limit, radius)
+        if businesses:
+            yield pa.RecordBatch.from_pylist(businesses, schema=PLACE_SCHEMA)
+    
+    def _fetch(self, lat: float, lng: float, term: str, limit: int, radius: int) -> list:
+        """One search through the cache or the API, parsed into dicts ([] on errors)"""
         url = f"{self.base_url}/businesses/search"
         
+        cache_request = self._cache_request(lat, lng, term, limit, radius)
+        if self.cache is not None:
+            data = self.cache.get('yelp', cache_request)
+            self._count_cache(data is not None)
+            if data is not None:
+                return self._parse_businesses_response(data)
+        
         params = {
             'latitude': lat,
             'longitude': lng,
             'term': term,
-            'limit': min(limit, 50),
-            'radius': 10000  # 10km radius
+            'limit': cache_request['limit'],
+            'radius': cache_request['radius']
         }
         
         try:
-            response = self.session.get(url, params=params)
-            self.call_count += 1
+            response = self._send('GET', url, params=params)
             response.raise_for_status()
             
             data = response.json()
+            if self.cache is not None:
+                self.cache.set('yelp', cache_request, data)
             businesses = self._parse_businesses_response(data)
             
-            return pd.DataFrame(businesses)
+            return businesses
             
         except requests.exceptions.RequestException as e:
             print(f"Yelp API Error: {e}")
-            return pd.DataFrame()
+            return []
+    
+    def is_cached(self, lat: float, lng: float, term: str, 
+                  limit: int = 20, radius: int = SEARCH_RADIUS_METERS) -> bool:
+        """Whether search_businesses would be answered from an unexpired cache entry"""
+        if self.cache is None:
+            return False
+        return self.cache.is_fresh('yelp', self._cache_request(lat, lng, term, limit, radius))
+    
+    def cached_places(self, lat: float, lng: float, term: str, limit: int = 20,
+                      radius: int = SEARCH_RADIUS_METERS, include_expired: bool = True):
+        """
+        Businesses a search returned when it was last cached, without counting a cache lookup
+
+        Returns:
+            DataFrame like search_businesses, or None if the search was never cached
+        """
+        if self.cache is None:
+            return None
+        data = self.cache.peek('yelp', self._cache_request(lat, lng, term, limit, radius),
+                               include_expired)
+        return None if data is None else pd.DataFrame(self._parse_businesses_response(data))
+    
+    def _cache_request(self, lat: float, lng: float, term: str, limit: int, radius: int) -> dict:
+        """The parts of a search that identify its cache entry"""
+        return {'lat': lat, 'lng': lng, 'keyword': term,
+                'limit': min(limit, 50), 'radius': min(radius, 40000)}
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the rate limiter, retrying 429/5xx responses
+        
+        Every attempt that reaches the API is counted in call_count.
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self.instrumentation.timer('yelp_request'):
+                response = self.session.request(method, url, **kwargs)
+            with self._count_lock:
+                self.call_count += 1
+            self.instrumentation.increment('yelp_api_calls')
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            time.sleep(retry_delay(response, attempt, self.retry_backoff))
     
     def _parse_businesses_response(self, data: dict) -> list:
         """Parse API response into list of business dictionaries"""
@@ -85,6 +209,22 @@ class YelpClient:
             return 0
         return len(price_str)  # $=1, $$=2, $$$=3, $$$$=4
     
+    def _count_cache(self, hit: bool):
+        with self._count_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        self.instrumentation.increment('yelp_cache_hits' if hit else 'yelp_cache_misses')
+    
     def get_call_count(self) -> int:
         """Return number of API calls made"""
-        return self.call_count
\ No newline at end of file
+        return self.call_count
+    
+    def get_cache_hit_count(self) -> int:
+        """Return number of searches answered from the cache"""
+        return self.cache_hits
+    
+    def get_cache_miss_count(self) -> int:
+        """Return number of searches that had to call the API"""
+        return self.cache_misses
\ No newline at end of file
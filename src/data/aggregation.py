@@ -0,0 +1,145 @@
+"""
+Rating Aggregation
+Ingest-time source calibration and Bayesian smoothing of place ratings
+"""
+
+import numpy as np
+import pandas as pd
+from config.config import RATING_CALIBRATION_MIN_RATED, RATING_PRIOR_REVIEWS
+
+# Columns added to {city}_places.parquet
+RATING_COLUMNS = ['calibrated_rating', 'smoothed_rating']
+
+# Both APIs rate on a 1-5 scale
+RATING_RANGE = (1.0, 5.0)
+
+
+def _group_means(values: np.ndarray, codes: np.ndarray, num_groups: int) -> tuple:
+    """(mean, sample std, count) of the non-NaN values of each group code"""
+    keep = ~np.isnan(values) & (codes >= 0)
+    codes, values = codes[keep], values[keep]
+    count = np.bincount(codes, minlength=num_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, values, num_groups) / count
+        squares = np.bincount(codes, (values - mean[codes]) ** 2, num_groups)
+        std = np.sqrt(squares / (count - 1))
+    return mean, std, count
+
+
+def source_rating_stats(ratings: np.ndarray, sources) -> dict:
+    """
+    Rating distribution of each source and of all sources pooled ('*')
+
+    Args:
+        ratings: Raw ratings (NaN = unrated)
+        sources: Source of each rating
+
+    Returns:
+        {source: (mean, std, rated rows)}
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    codes, names = pd.factorize(sources)
+    mean, std, count = _group_means(ratings, codes, len(names))
+    pooled = _group_means(ratings, np.zeros(len(ratings), dtype=np.int64), 1)
+    stats = {name: (mean[i], std[i], int(count[i])) for i, name in enumerate(names) if count[i]}
+    stats['*'] = (pooled[0][0], pooled[1][0], int(pooled[2][0]))
+    return stats
+
+
+def calibrate_ratings(ratings: np.ndarray, sources, stats: dict = None,
+                      min_rated: int = RATING_CALIBRATION_MIN_RATED) -> np.ndarray:
+    """
+    Map each source's ratings onto the pooled rating distribution
+
+    A rating r from source s becomes pooled_mean + (r - mean_s) / std_s *
+    pooled_std, clipped to the 1-5 scale, so a Yelp 4.5 and a Google 4.5
+    count as equally good relative to their platforms. Sources with fewer
+    than min_rated rated rows or no spread keep their raw ratings.
+
+    Args:
+        ratings: Raw ratings (NaN = unrated, stays NaN)
+        sources: Source of each rating
+        stats: Output of source_rating_stats (computed from these rows if omitted)
+        min_rated: Rated rows a source needs to be rescaled
+
+    Returns:
+        float64 calibrated ratings
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    if stats is None:
+        stats = source_rating_stats(ratings, sources)
+    pooled_mean, pooled_std, _ = stats['*']
+
+    # Per-source linear map, identity for sources that are not rescaled
+    codes, names = pd.factorize(sources)
+    scale = np.ones(len(names) + 1)
+    shift = np.zeros(len(names) + 1)
+    for i, name in enumerate(names):
+        mean, std, count = stats.get(name, (np.nan, np.nan, 0))
+        if count >= min_rated and std > 0:
+            scale[i] = pooled_std / std
+            shift[i] = pooled_mean - mean * scale[i]
+    return np.clip(ratings * scale[codes] + shift[codes], *RATING_RANGE)
+
+
+def smooth_ratings(ratings: np.ndarray, review_count: np.ndarray, categories,
+                   prior_reviews: float = RATING_PRIOR_REVIEWS, fallback: float = None) -> np.ndarray:
+    """
+    Bayesian average of each rating toward its category's mean
+
+    smoothed = (reviews * rating + prior_reviews * category_mean) /
+    (reviews + prior_reviews): a 5.0 backed by 3 reviews stays close to
+    the category mean, one backed by 10,000 keeps its rating. Unrated
+    places get the category mean.
+
+    Args:
+        ratings: (Calibrated) ratings, NaN = unrated
+        review_count: Reviews behind each rating
+        categories: Category of each row; the prior is the mean rating of its category
+        prior_reviews: Weight of the prior, in reviews
+        fallback: Prior of categories without any rating (default: mean of all ratings)
+
+    Returns:
+        float64 smoothed ratings (NaN only when nothing is rated at all)
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    reviews = np.nan_to_num(np.asarray(review_count, dtype=np.float64))
+    rated = ~np.isnan(ratings)
+    if fallback is None:
+        fallback = ratings[rated].mean() if rated.any() else np.nan
+
+    codes, names = pd.factorize(categories)
+    category_mean = _group_means(ratings, codes, len(names))[0]
+    prior = np.append(np.where(np.isnan(category_mean), fallback, category_mean), fallback)[codes]
+    weight = np.where(rated, reviews, 0.0)
+    return (weight * np.where(rated, ratings, 0.0) + prior_reviews * prior) / (weight + prior_reviews)
+
+
+def aggregate_ratings(places: pd.DataFrame, stats: dict = None, fallback: float = None) -> pd.DataFrame:
+    """
+    Add (or refresh) the calibrated_rating and smoothed_rating columns
+
+    Rows that already have a calibrated_rating keep it: merged Google/Yelp
+    rows carry the review-weighted mean of their calibrated source ratings,
+    which cannot be recovered from the fused raw rating. The smoothing
+    priors are always recomputed over the given rows.
+
+    Args:
+        places: Places with rating, review_count, source and category
+        stats: Source statistics for rows calibrated here (default: from these rows)
+        fallback: Prior of categories without any rating (see smooth_ratings)
+
+    Returns:
+        The DataFrame with both columns set (modified in place)
+    """
+    ratings = places['rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+    calibrated = calibrate_ratings(ratings, places['source'], stats)
+    if 'calibrated_rating' in places:
+        existing = places['calibrated_rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+        calibrated = np.where(np.isnan(existing), calibrated, existing)
+    places['calibrated_rating'] = calibrated
+    places['smoothed_rating'] = smooth_ratings(
+        calibrated, places['review_count'].to_numpy(dtype=np.float64, na_value=np.nan),
+        places['category'], fallback=fallback
+    )
+    return places
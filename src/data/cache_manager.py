@@ -0,0 +1,246 @@
+"""
+Cache Manager
+Content-addressed on-disk cache of raw API responses
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from config.config import (
+    CACHE_COORD_PRECISION, CACHE_DIR, CACHE_EXPIRY_DAYS, CACHE_MAX_SIZE_MB
+)
+
+
+class CacheManager:
+    """
+    Stores raw API responses as gzipped JSON, one file per request
+
+    Files live under {cache_dir}/{provider}/{key[:2]}/{key}.json.gz, where
+    key is a SHA-256 of the provider and the normalized request. A file's
+    mtime is its write time (used for expiry) and its atime is set on every
+    hit (used for LRU eviction). Writes go to a temp file that is renamed
+    into place, so concurrent collector processes never read partial data.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, expiry_days: float = CACHE_EXPIRY_DAYS,
+                 max_size_mb: float = CACHE_MAX_SIZE_MB):
+        """
+        Args:
+            cache_dir: Root directory of the cache
+            expiry_days: Entries older than this are treated as misses
+            max_size_mb: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.expiry_seconds = expiry_days * 86400
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size_bytes = None  # Lazily scanned estimate of the cache size
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_request(request: dict) -> dict:
+        """
+        Canonical form of a request, so equivalent queries share one entry
+
+        Coordinates are rounded, text is lower-cased with whitespace collapsed
+        and numeric limits are cast to int.
+        """
+        normalized = {}
+        for name, value in request.items():
+            if name in ('lat', 'lng'):
+                value = round(float(value), CACHE_COORD_PRECISION)
+            elif name in ('limit', 'radius'):
+                value = int(value)
+            elif isinstance(value, str):
+                value = ' '.join(value.lower().split())
+            normalized[name] = value
+        return normalized
+
+    def make_key(self, provider: str, request: dict) -> str:
+        """Content address of a provider + normalized request"""
+        canonical = json.dumps(
+            {'provider': provider, 'request': self.normalize_request(request)},
+            sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, provider: str, request: dict) -> Optional[dict]:
+        """
+        Cached raw response for a request
+
+        Returns:
+            The response JSON, or None on a miss or expired entry
+        """
+        path = self._path(provider, self.make_key(provider, request))
+        try:
+            if self._is_expired(path.stat().st_mtime):
+                self._count('misses')
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Record the access for LRU eviction, keeping the write time
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except (OSError, EOFError, ValueError):
+            # Missing, evicted by another process or unreadable
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return entry['response']
+
+    def set(self, provider: str, request: dict, response: dict):
+        """Store a raw response atomically"""
+        path = self._path(provider, self.make_key(provider, request))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'provider': provider,
+            'request': self.normalize_request(request),
+            'created_at': time.time(),
+            'response': response
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+            size = os.path.getsize(tmp_path)
+            try:
+                # An overwritten entry no longer counts towards the size
+                size -= path.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._count('writes')
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes += size
+        if self._current_size() > self.max_size_bytes:
+            self.enforce_size_limit()
+
+    def peek(self, provider: str, request: dict, include_expired: bool = False) -> Optional[dict]:
+        """
+        Cached raw response without counting a lookup or refreshing its LRU time
+
+        Used for planning, which inspects entries it may never use.
+
+        Args:
+            include_expired: Also return entries older than expiry_days
+        """
+        path = self._path(provider, self.make_key(provider, request))
+        try:
+            if not include_expired and self._is_expired(path.stat().st_mtime):
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)['response']
+        except (OSError, EOFError, ValueError):
+            return None
+
+    def is_fresh(self, provider: str, request: dict) -> bool:
+        """Whether an unexpired entry exists for a request (does not count as a hit)"""
+        path = self._path(provider, self.make_key(provider, request))
+        try:
+            return not self._is_expired(path.stat().st_mtime)
+        except OSError:
+            return False
+
+    def evict_expired(self) -> int:
+        """Delete every expired entry; returns how many were removed"""
+        removed = 0
+        for path in self._entries():
+            try:
+                if self._is_expired(path.stat().st_mtime):
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        self._record_evictions(removed)
+        return removed
+
+    def enforce_size_limit(self) -> int:
+        """Evict least recently used entries until the cache fits max_size_mb"""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size_bytes = total
+        self._record_evictions(removed)
+        return removed
+
+    def get_hit_count(self) -> int:
+        """Return number of cache hits"""
+        return self.hits
+
+    def get_miss_count(self) -> int:
+        """Return number of cache misses"""
+        return self.misses
+
+    def get_stats(self) -> dict:
+        """Hit/miss/write/eviction counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups * 100 if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'size_mb': self._current_size() / (1024 * 1024)
+        }
+
+    def _path(self, provider: str, key: str) -> Path:
+        return self.cache_dir / provider / key[:2] / f"{key}.json.gz"
+
+    def _entries(self):
+        return self.cache_dir.glob('*/*/*.json.gz')
+
+    def _is_expired(self, written_at: float) -> bool:
+        return time.time() - written_at > self.expiry_seconds
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _record_evictions(self, removed: int):
+        with self._lock:
+            self.evictions += removed
+
+    def _current_size(self) -> int:
+        """Cache size in bytes, scanning the directory on first use"""
+        if self._size_bytes is None:
+            total = 0
+            for path in self._entries():
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    continue
+            with self._lock:
+                self._size_bytes = total
+        return self._size_bytes
@@ -0,0 +1,758 @@
+"""
+Data Collector
+Orchestrates Google and Yelp queries into per-city place datasets
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config.config import (
+    API_CONCURRENCY, API_RATE_LIMITS, CATEGORY_KEYWORDS, CITIES,
+    DEFAULT_PRICE_BY_CATEGORY, PROCESSED_DATA_DIR, RESULTS_PER_CATEGORY, SNAPSHOT_DIR,
+    STREAM_DATASET_DIR, SWEEP_MIN_TILE_RADIUS_METERS, SWEEP_TILE_RADIUS_METERS
+)
+from src.api.google_client import GooglePlacesClient
+from src.api.rate_limiter import TokenBucket
+from src.api.yelp_client import YelpClient
+from src.data.aggregation import (
+    RATING_COLUMNS, aggregate_ratings, calibrate_ratings, source_rating_stats
+)
+from src.data.cache_manager import CacheManager
+from src.data.entity_resolution import find_cross_source_matches, merge_cross_source
+from src.data.streaming import PLACE_SCHEMA, PartitionedPlaceWriter, tag_batch, write_city_parquet
+from src.data.tiling import hex_tiles, subdivide
+from src.instrumentation import Instrumentation
+
+PROVIDERS = ('google', 'yelp')
+
+# A row is one place from one source in one travel category
+ROW_KEY = ['place_id', 'source', 'category']
+
+# Columns of {city}_places.parquet built from a streamed dataset
+CITY_SCHEMA = pa.schema(list(PLACE_SCHEMA) + [
+    pa.field('yelp_place_id', pa.string()),
+    pa.field('calibrated_rating', pa.float64()),
+    pa.field('smoothed_rating', pa.float64()),
+])
+
+
+class DataCollector:
+    def __init__(self, google_client: GooglePlacesClient = None, yelp_client: YelpClient = None,
+                 output_dir: str = PROCESSED_DATA_DIR, concurrent: bool = True,
+                 concurrency: dict = None, cache: CacheManager = None,
+                 snapshot_dir: str = SNAPSHOT_DIR, instrumentation: Instrumentation = None):
+        """
+        Initialize the collector
+
+        Args:
+            google_client: Client to use (built from config/api_keys.py if omitted)
+            yelp_client: Client to use (built from config/api_keys.py if omitted)
+            output_dir: Where {city}_places.parquet/.csv are written
+            concurrent: Run queries on bounded per-provider thread pools
+                instead of one at a time
+            concurrency: Max in-flight requests per provider
+                (defaults to config.API_CONCURRENCY)
+            cache: Response cache given to clients built here
+                (defaults to one under config.CACHE_DIR)
+            snapshot_dir: Where refresh_city_data writes partitioned snapshots
+            instrumentation: Given to clients built here for API call and
+                cache counters
+        """
+        self.concurrency = dict(API_CONCURRENCY, **(concurrency or {}))
+        self.cache = cache if cache is not None else CacheManager()
+
+        if google_client is None or yelp_client is None:
+            from config.api_keys import GOOGLE_MAPS_API_KEY, YELP_API_KEY
+            if google_client is None:
+                google_client = GooglePlacesClient(
+                    GOOGLE_MAPS_API_KEY,
+                    rate_limiter=TokenBucket(API_RATE_LIMITS['google']),
+                    pool_size=self.concurrency['google'],
+                    cache=self.cache,
+                    instrumentation=instrumentation
+                )
+            if yelp_client is None:
+                yelp_client = YelpClient(
+                    YELP_API_KEY,
+                    rate_limiter=TokenBucket(API_RATE_LIMITS['yelp']),
+                    pool_size=self.concurrency['yelp'],
+                    cache=self.cache,
+                    instrumentation=instrumentation
+                )
+
+        self.google = google_client
+        self.yelp = yelp_client
+        self.output_dir = Path(output_dir)
+        self.snapshot_dir = Path(snapshot_dir)
+        self.concurrent = concurrent
+
+    def collect_city_data(self, city_name: str, categories: list = None,
+                          save: bool = True, queries: list = None) -> pd.DataFrame:
+        """
+        Query both APIs for every keyword of the selected categories
+
+        Args:
+            city_name: Key from config.CITIES
+            categories: Categories to collect (default: all of CATEGORY_KEYWORDS)
+            save: Write {city}_places.parquet and .csv to the output directory
+            queries: (provider, category, keyword) queries to run instead,
+                e.g. a plan's picked searches (src/data/planner.py)
+
+        Returns:
+            DataFrame with one row per place and category
+        """
+        city = CITIES[city_name]
+        if queries is None:
+            categories = categories or list(CATEGORY_KEYWORDS.keys())
+            queries = self._build_queries(categories)
+        else:
+            categories = list(dict.fromkeys(category for _, category, _ in queries))
+
+        print(f"📍 Collecting {city['display_name']}: {len(categories)} categories, "
+              f"{len(queries)} queries ({'concurrent' if self.concurrent else 'sequential'})")
+
+        results = self._run_queries(city, queries)
+        places = self._combine_results(queries, results)
+
+        print(f"✅ {len(places)} places collected for {city['display_name']}")
+
+        if save and not places.empty:
+            self.save_city_data(city_name, places)
+            self._save_searches(city_name, [])
+
+        return places
+
+    def refresh_city_data(self, city_name: str, categories: list = None) -> dict:
+        """
+        Incrementally refresh a city's saved dataset
+        
+        The dataset is refreshed with the searches it was built from: the
+        center-point query of every keyword, or, for categories collected
+        by sweep_city_data, the same tiles the sweep searched (without
+        splitting them again; rerun the sweep for that). Only searches whose
+        cache entries are missing or older than CACHE_EXPIRY_DAYS reach the
+        APIs; the others are answered from the cache for free. The rebuilt
+        rows of the selected categories are upserted into
+        {city}_places.parquet by (place_id, source, category), so rows none
+        of these searches return any more are dropped, and a
+        category-partitioned snapshot of the result is written.
+        
+        Args:
+            city_name: Key from config.CITIES
+            categories: Categories to refresh (default: the categories the
+                saved dataset holds or was swept for; all of
+                CATEGORY_KEYWORDS when the city has no saved dataset)
+            
+        Returns:
+            Dictionary with added/updated/dropped/unchanged row counts,
+            refreshed query counts, API calls made and the snapshot path
+        """
+        city = CITIES[city_name]
+        data_file = self.output_dir / f"{city_name}_places.parquet"
+        existing = pd.read_parquet(data_file) if data_file.exists() else pd.DataFrame(columns=ROW_KEY)
+        searches = self._load_searches(city_name)
+        if not categories and data_file.exists():
+            # Never-collected categories have no cache entries and would all be queried
+            saved = set(existing['category'].dropna().astype(str))
+            saved |= {search['category'] for search in searches}
+            categories = [category for category in CATEGORY_KEYWORDS if category in saved]
+        elif not categories:
+            categories = list(CATEGORY_KEYWORDS.keys())
+        tile_tasks = [(search['provider'], search['category'], search['keyword'], search)
+                      for search in searches if search['category'] in categories]
+        swept = {category for _, category, _, _ in tile_tasks}
+        queries = self._build_queries([category for category in categories if category not in swept])
+        stale = [query for query in queries if not self._is_cached(city, query[0], query[2])]
+        stale += [task for task in tile_tasks if not self._is_tile_cached(task)]
+        
+        print(f"🔄 Refreshing {city['display_name']}: {len(stale)} of "
+              f"{len(queries) + len(tile_tasks)} queries are stale")
+        
+        calls_before = self.get_usage_stats()['total_calls']
+        results = self._run_queries(city, queries)
+        for (provider, category, keyword, _), (result, _) in self._run_tiles(tile_tasks, self._search_tile):
+            queries.append((provider, category, keyword))
+            results.append(result)
+        fresh = self._combine_results(queries, results)
+        
+        places, counts = self._upsert(existing, fresh, categories)
+        # Category priors span kept and refreshed rows; rows saved before
+        # calibration existed are calibrated here
+        places = aggregate_ratings(places) if not places.empty else places
+        
+        snapshot = self._write_snapshot(city_name, places)
+        self.save_city_data(city_name, places)
+        
+        report = dict(counts)
+        report.update({
+            'queries_total': len(queries),
+            'queries_refreshed': len(stale),
+            'api_calls': self.get_usage_stats()['total_calls'] - calls_before,
+            'total_places': len(places),
+            'snapshot': str(snapshot)
+        })
+        
+        print(f"✅ +{report['added']} added, ~{report['updated']} updated, "
+              f"-{report['dropped']} dropped ({report['api_calls']} API calls)")
+        
+        return report
+    
+    def stream_city_data(self, city_name: str, categories: list = None,
+                         dataset_dir: str = STREAM_DATASET_DIR) -> dict:
+        """
+        Collect a city straight into a partitioned parquet dataset
+        
+        Clients yield Arrow record batches that are appended to
+        {dataset_dir}/city={city}/category={category}/source={source}/ as
+        they arrive; no per-query DataFrames or final concat are built, so
+        peak memory does not grow with the number of queries. Files from
+        earlier runs of the collected categories are replaced when the run
+        succeeds.
+        
+        Dropping rows repeated across keywords and cross-source merging need
+        every row of a category at once and happen in build_city_from_dataset.
+        
+        Args:
+            city_name: Key from config.CITIES
+            categories: Categories to collect (default: all of CATEGORY_KEYWORDS)
+            dataset_dir: Root of the partitioned dataset
+            
+        Returns:
+            Dictionary with queries, rows written and the city's dataset directory
+        """
+        city = CITIES[city_name]
+        categories = categories or list(CATEGORY_KEYWORDS.keys())
+        queries = self._build_queries(categories)
+        
+        print(f"📍 Streaming {city['display_name']}: {len(categories)} categories, "
+              f"{len(queries)} queries → {dataset_dir}")
+        
+        with PartitionedPlaceWriter(dataset_dir) as writer:
+            for (_, category, _), batches in self._iter_query_batches(city, queries):
+                for batch in batches:
+                    writer.write(city_name, tag_batch(batch, category))
+        
+        # The new files are complete: drop the ones they replace
+        city_dir = Path(dataset_dir) / f"city={city_name}"
+        for category in categories:
+            for old_file in (city_dir / f"category={category}").glob('source=*/part-*.parquet'):
+                if writer.run_id not in old_file.name:
+                    old_file.unlink(missing_ok=True)
+        
+        print(f"✅ {writer.rows_written} rows streamed for {city['display_name']}")
+        
+        return {
+            'queries': len(queries),
+            'rows_written': writer.rows_written,
+            'dataset': str(city_dir)
+        }
+    
+    def sweep_city_data(self, city_name: str, categories: list = None,
+                        tile_radius: float = SWEEP_TILE_RADIUS_METERS,
+                        min_tile_radius: float = SWEEP_MIN_TILE_RADIUS_METERS,
+                        save: bool = True) -> tuple:
+        """
+        Collect a city tile by tile instead of from its center point alone
+        
+        Every query returns at most RESULTS_PER_CATEGORY places, so a single
+        search around the city center saturates immediately. Here each
+        (provider, keyword) query runs over a hex grid of search circles
+        covering the city radius; a tile that comes back full is split into
+        seven half-radius tiles (down to min_tile_radius) because it likely
+        holds more places than one query can return. A full child tile that
+        returned nothing its parent had not is not split again: searching
+        finer there stopped finding places. Sparse tiles cost one call, dense
+        areas get searched more finely.
+        
+        Tiles run concurrently on the per-provider pools, so the clients'
+        token buckets are the shared rate budget. Tiles answered from an
+        unexpired cache entry cost no API call, so rerunning a sweep is free.
+        
+        Google treats the circle as a location bias rather than a hard
+        bound; results outside a tile are still kept.
+        
+        Args:
+            city_name: Key from config.CITIES
+            categories: Categories to collect (default: all of CATEGORY_KEYWORDS)
+            tile_radius: Radius of the initial hex tiles in meters
+            min_tile_radius: Saturated tiles are not split below this radius
+            save: Write {city}_places.parquet and .csv to the output directory
+            
+        Returns:
+            (places DataFrame, report dict with a 'tiles' list of per-tile
+            yield and a 'summary' of calls, cache use and distinct places)
+        """
+        city = CITIES[city_name]
+        categories = categories or list(CATEGORY_KEYWORDS.keys())
+        lat, lng = city['coordinates']['lat'], city['coordinates']['lng']
+        grid = hex_tiles(lat, lng, city['radius'], tile_radius)
+        queries = self._build_queries(categories)
+        
+        print(f"📍 Sweeping {city['display_name']}: {len(grid)} tiles × {len(queries)} queries "
+              f"(tile radius {tile_radius:.0f}m, min {min_tile_radius:.0f}m)")
+        
+        calls_before = self.get_usage_stats()['total_calls']
+        tile_queries, results, tiles, searches = [], [], [], []
+        seen = set()
+        
+        tasks = [(*query, tile) for query in queries for tile in grid]
+        queued = set()
+        for task, (result, cached) in self._run_tiles(tasks, self._search_tile):
+            provider, category, keyword, tile = task
+            ids = set(result['place_id']) if not result.empty else set()
+            new_places = len(ids - seen)
+            seen |= ids
+            
+            # Only the tile's own results decide, so reruns split the same tiles
+            children = []
+            if len(result) >= RESULTS_PER_CATEGORY and tile['radius'] / 2 >= min_tile_radius \
+                    and not ids <= tile.get('parent_ids', set()):
+                children = subdivide(tile, lat, lng, city['radius'])
+                for child in children:
+                    child['parent_ids'] = ids
+                    # Children of neighbouring tiles can land on the same circle
+                    key = (provider, category, keyword, round(child['lat'], 4),
+                           round(child['lng'], 4), child['radius'])
+                    if key not in queued:
+                        queued.add(key)
+                        tasks.append((provider, category, keyword, child))
+            
+            tile_queries.append((provider, category, keyword))
+            results.append(result)
+            searches.append({'provider': provider, 'category': category, 'keyword': keyword,
+                             'lat': tile['lat'], 'lng': tile['lng'], 'radius': tile['radius']})
+            tiles.append({
+                'provider': provider, 'category': category, 'keyword': keyword,
+                'lat': round(tile['lat'], 6), 'lng': round(tile['lng'], 6),
+                'radius': int(round(tile['radius'])), 'depth': tile['depth'],
+                'results': len(result), 'new_places': new_places,
+                'cached': cached, 'subdivided': len(children)
+            })
+        
+        places = self._combine_results(tile_queries, results)
+        api_calls = self.get_usage_stats()['total_calls'] - calls_before
+        
+        by_depth = {}
+        for tile in tiles:
+            depth = by_depth.setdefault(tile['depth'], {'tiles': 0, 'results': 0, 'new_places': 0})
+            depth['tiles'] += 1
+            depth['results'] += tile['results']
+            depth['new_places'] += tile['new_places']
+        
+        summary = {
+            'tiles': len(tiles),
+            'tiles_subdivided': sum(1 for tile in tiles if tile['subdivided']),
+            'cached_tiles': sum(1 for tile in tiles if tile['cached']),
+            'api_calls': api_calls,
+            'distinct_places': len(seen),
+            'places_per_call': len(seen) / api_calls if api_calls else None,
+            'total_places': len(places),
+            'by_depth': by_depth
+        }
+        
+        print(f"✅ {summary['distinct_places']} distinct places from {summary['tiles']} tiles "
+              f"({summary['api_calls']} API calls, {summary['cached_tiles']} cached)")
+        
+        if save and not places.empty:
+            self.save_city_data(city_name, places)
+            # refresh_city_data repeats these searches instead of center-point ones
+            self._save_searches(city_name, searches)
+        
+        return places, {'tiles': tiles, 'summary': summary}
+    
+    def build_city_from_dataset(self, city_name: str, dataset_dir: str = STREAM_DATASET_DIR) -> int:
+        """
+        Write {city}_places.parquet from a streamed dataset, one category at a time
+        
+        Each category is read, rows repeated across keywords are dropped, its
+        Google/Yelp duplicates are merged, its rating columns are aggregated
+        and it is appended as a row group, so only one category is in memory
+        at once. Per-source rating statistics come from a first pass that
+        reads only the rating and source columns of the whole city.
+        
+        Returns:
+            Number of places written
+        """
+        city_dir = Path(dataset_dir) / f"city={city_name}"
+        category_dirs = sorted(city_dir.glob('category=*'))
+        if not category_dirs:
+            raise FileNotFoundError(f"No streamed data for {city_name} in {dataset_dir}")
+        
+        ratings = pq.read_table(city_dir, columns=['rating', 'source'], partitioning='hive')
+        stats = source_rating_stats(ratings.column('rating').to_numpy(zero_copy_only=False),
+                                    ratings.column('source').to_pandas())
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data_file = self.output_dir / f"{city_name}_places.parquet"
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        os.close(fd)
+        total = 0
+        try:
+            with pq.ParquetWriter(tmp_path, CITY_SCHEMA) as writer:
+                for category_dir in category_dirs:
+                    category = category_dir.name.split('=', 1)[1]
+                    places = pq.read_table(category_dir, partitioning='hive').to_pandas()
+                    if places.empty:
+                        continue
+                    places['source'] = places['source'].astype(str)
+                    places['category'] = category
+                    places = places.drop_duplicates(subset=ROW_KEY).reset_index(drop=True)
+                    places['calibrated_rating'] = calibrate_ratings(
+                        places['rating'].to_numpy(dtype=np.float64, na_value=np.nan),
+                        places['source'].to_numpy(), stats
+                    )
+                    places = merge_cross_source(places)
+                    places = aggregate_ratings(places, stats, fallback=stats['*'][0])
+                    places = places.reindex(columns=CITY_SCHEMA.names)
+                    writer.write_table(pa.Table.from_pandas(places, schema=CITY_SCHEMA,
+                                                            preserve_index=False))
+                    total += len(places)
+            os.replace(tmp_path, data_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._save_searches(city_name, [])
+        
+        print(f"✅ Wrote {total} places to {data_file}")
+        return total
+    
+    def save_city_data(self, city_name: str, places: pd.DataFrame):
+        """
+        Write a city's dataset as parquet (used by the engine) and CSV (for inspection)
+        
+        The parquet file has one row group per category (see write_city_parquet).
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Replace the parquet atomically; engines may be reading it concurrently
+        data_file = self.output_dir / f"{city_name}_places.parquet"
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            write_city_parquet(places, tmp_path)
+            os.replace(tmp_path, data_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        
+        places.to_csv(self.output_dir / f"{city_name}_places.csv", index=False)
+
+    def get_usage_stats(self) -> dict:
+        """API calls and cache hits/misses so far for both clients"""
+        google_calls = self.google.get_call_count()
+        yelp_calls = self.yelp.get_call_count()
+        cache_hits = self.google.get_cache_hit_count() + self.yelp.get_cache_hit_count()
+        cache_misses = self.google.get_cache_miss_count() + self.yelp.get_cache_miss_count()
+        return {
+            'google_calls': google_calls,
+            'yelp_calls': yelp_calls,
+            'total_calls': google_calls + yelp_calls,
+            'cache_hits': cache_hits,
+            'cache_misses': cache_misses
+        }
+
+    def _build_queries(self, categories: list) -> list:
+        """(provider, category, keyword) for every query of a collection run"""
+        return [
+            (provider, category, keyword)
+            for category in categories
+            for keyword in CATEGORY_KEYWORDS[category]
+            for provider in PROVIDERS
+        ]
+
+    def _is_cached(self, city: dict, provider: str, keyword: str) -> bool:
+        """Whether a query can be answered from an unexpired cache entry"""
+        lat, lng = city['coordinates']['lat'], city['coordinates']['lng']
+        client = self.google if provider == 'google' else self.yelp
+        return client.is_cached(lat, lng, keyword, RESULTS_PER_CATEGORY)
+    
+    def _search(self, city: dict, provider: str, keyword: str) -> pd.DataFrame:
+        """Run a single query against one provider"""
+        lat, lng = city['coordinates']['lat'], city['coordinates']['lng']
+        if provider == 'google':
+            return self.google.search_places(lat, lng, keyword, RESULTS_PER_CATEGORY)
+        return self.yelp.search_businesses(lat, lng, keyword, RESULTS_PER_CATEGORY)
+
+    def _is_tile_cached(self, task: tuple) -> bool:
+        """Whether a (provider, category, keyword, tile) search has an unexpired cache entry"""
+        provider, _, keyword, tile = task
+        client = self.google if provider == 'google' else self.yelp
+        return client.is_cached(tile['lat'], tile['lng'], keyword, RESULTS_PER_CATEGORY,
+                                int(round(tile['radius'])))
+    
+    def _search_tile(self, task: tuple) -> tuple:
+        """Run a (provider, category, keyword, tile) search, returning (result, was cached)"""
+        provider, _, keyword, tile = task
+        cached = self._is_tile_cached(task)
+        radius = int(round(tile['radius']))
+        if provider == 'google':
+            result = self.google.search_places(tile['lat'], tile['lng'], keyword,
+                                               RESULTS_PER_CATEGORY, radius)
+        else:
+            result = self.yelp.search_businesses(tile['lat'], tile['lng'], keyword,
+                                                 RESULTS_PER_CATEGORY, radius)
+        return result, cached
+
+    def _searches_path(self, city_name: str) -> Path:
+        return self.output_dir / f"{city_name}_searches.json"
+
+    def _save_searches(self, city_name: str, searches: list):
+        """Record the tile searches a saved dataset was swept with ([]: center-point queries)"""
+        path = self._searches_path(city_name)
+        if not searches:
+            path.unlink(missing_ok=True)
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(searches, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _load_searches(self, city_name: str) -> list:
+        """Tile searches recorded by the sweep that built a city's dataset"""
+        try:
+            return json.loads(self._searches_path(city_name).read_text())
+        except FileNotFoundError:
+            return []
+
+    def _run_queries(self, city: dict, queries: list) -> list:
+        """
+        Run all queries, returning results in query order
+
+        Queries of several categories sharing a keyword ("beach") are one
+        request: each distinct (provider, keyword) is searched once and its
+        result returned for all of them. In concurrent mode each provider
+        gets its own thread pool sized by its concurrency limit; the clients'
+        token buckets and retries keep the request rate within the API limits.
+        """
+        # First spelling of each distinct search
+        searches = {}
+        for provider, _, keyword in queries:
+            searches.setdefault(self._search_key(provider, keyword), (provider, keyword))
+        if not self.concurrent:
+            found = {key: self._search(city, *search) for key, search in searches.items()}
+        else:
+            pools = {
+                provider: ThreadPoolExecutor(max_workers=self.concurrency[provider],
+                                             thread_name_prefix=f"{provider}-collector")
+                for provider in PROVIDERS
+            }
+            try:
+                futures = {
+                    key: pools[search[0]].submit(self._search, city, *search)
+                    for key, search in searches.items()
+                }
+                found = {key: future.result() for key, future in futures.items()}
+            finally:
+                for pool in pools.values():
+                    pool.shutdown(wait=True)
+        return [found[self._search_key(provider, keyword)] for provider, _, keyword in queries]
+
+    @staticmethod
+    def _search_key(provider: str, keyword: str) -> tuple:
+        """Queries with equal keys share one cache entry, so one request answers them all"""
+        return provider, CacheManager.normalize_request({'keyword': keyword})['keyword']
+
+    def _iter_query_batches(self, city: dict, queries: list):
+        """
+        Yield (query, list of record batches) as queries finish
+        
+        As in _run_queries, each distinct (provider, keyword) is searched
+        once and its batches are yielded for every query sharing it, right
+        after each other. In concurrent mode at most twice the total
+        concurrency of searches are submitted at a time, so finished results
+        never pile up.
+        """
+        def fetch(provider, keyword):
+            lat, lng = city['coordinates']['lat'], city['coordinates']['lng']
+            client = self.google if provider == 'google' else self.yelp
+            return list(client.iter_batches(lat, lng, keyword, RESULTS_PER_CATEGORY))
+        
+        # Queries of each distinct search, the first one's spelling is searched
+        searches = {}
+        for query in queries:
+            searches.setdefault(self._search_key(query[0], query[2]), []).append(query)
+        
+        if not self.concurrent:
+            for shared in searches.values():
+                batches = fetch(shared[0][0], shared[0][2])
+                for query in shared:
+                    yield query, batches
+            return
+        
+        pools = {
+            provider: ThreadPoolExecutor(max_workers=self.concurrency[provider],
+                                         thread_name_prefix=f"{provider}-collector")
+            for provider in PROVIDERS
+        }
+        window = 2 * sum(self.concurrency[provider] for provider in PROVIDERS)
+        pending = {}
+        remaining = iter(searches.values())
+        try:
+            while True:
+                for shared in remaining:
+                    provider, _, keyword = shared[0]
+                    pending[pools[provider].submit(fetch, provider, keyword)] = shared
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shared, batches = pending.pop(future), future.result()
+                    for query in shared:
+                        yield query, batches
+        finally:
+            for future in pending:
+                future.cancel()
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+    def _run_tiles(self, tasks: list, search):
+        """
+        Yield (task, search(task)) for a growing list of (provider, ...) tasks
+        
+        Tasks appended to the list while iterating are run too. In concurrent
+        mode tasks go to their provider's pool, at most twice the total
+        concurrency at a time, and are yielded as they finish.
+        """
+        if not self.concurrent:
+            for task in tasks:
+                yield task, search(task)
+            return
+        
+        pools = {
+            provider: ThreadPoolExecutor(max_workers=self.concurrency[provider],
+                                         thread_name_prefix=f"{provider}-collector")
+            for provider in PROVIDERS
+        }
+        window = 2 * sum(self.concurrency[provider] for provider in PROVIDERS)
+        pending = {}
+        submitted = 0
+        try:
+            while True:
+                while submitted < len(tasks) and len(pending) < window:
+                    task = tasks[submitted]
+                    pending[pools[task[0]].submit(search, task)] = task
+                    submitted += 1
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+    
+    def _combine_results(self, queries: list, results: list) -> pd.DataFrame:
+        """Tag results with their category, estimate prices, merge duplicates and aggregate ratings"""
+        frames = []
+        for (provider, category, keyword), result in zip(queries, results):
+            if result.empty:
+                continue
+            frames.append(result.assign(category=category))
+
+        if not frames:
+            return pd.DataFrame()
+
+        places = pd.concat(frames, ignore_index=True)
+
+        # The same place often comes back for several keywords of a category
+        places = places.drop_duplicates(subset=['place_id', 'source', 'category'])
+
+        # Fall back to the category default when the API has no price data
+        default_price = places['category'].map(DEFAULT_PRICE_BY_CATEGORY).fillna(0)
+        places['price_estimate'] = places['price_level'].where(
+            places['price_level'] > 0, default_price
+        ).astype(int)
+
+        # Calibrate per source before merging, so merged rows fuse comparable ratings
+        places = places.reset_index(drop=True)
+        places['calibrated_rating'] = calibrate_ratings(
+            places['rating'].to_numpy(dtype=np.float64, na_value=np.nan),
+            places['source'].to_numpy()
+        )
+
+        # Google and Yelp often return the same venue; keep one merged row
+        matches = find_cross_source_matches(places)
+        if not matches.empty:
+            print(f"🔗 Merged {len(matches)} Google/Yelp duplicates")
+            places = merge_cross_source(places, matches)
+
+        return aggregate_ratings(places)
+
+    def _upsert(self, existing: pd.DataFrame, fresh: pd.DataFrame, categories: list) -> tuple:
+        """
+        Merge freshly collected rows of `categories` into an existing dataset
+
+        Rows of other categories are kept as they are. Inside the refreshed
+        categories, rows missing from the fresh results are dropped, rows
+        present in both take the fresh values, and new rows are appended
+        after the existing ones.
+
+        Returns:
+            (merged DataFrame, dict of added/updated/dropped/unchanged counts)
+        """
+        if fresh.empty:
+            fresh = pd.DataFrame(columns=existing.columns)
+        if existing.empty:
+            return fresh.reset_index(drop=True), {
+                'added': len(fresh), 'updated': 0, 'dropped': 0, 'unchanged': 0
+            }
+
+        old_keys = pd.MultiIndex.from_frame(existing[ROW_KEY])
+        new_keys = pd.MultiIndex.from_frame(fresh[ROW_KEY])
+        in_scope = existing['category'].isin(categories).to_numpy()
+        match = new_keys.get_indexer(old_keys)
+        match[~in_scope] = -1
+
+        matched_old = (match >= 0).nonzero()[0]
+        matched_new = match[matched_old]
+        dropped = in_scope & (match < 0)
+        added = ~new_keys.isin(old_keys[in_scope])
+
+        # Compare shared columns of matched rows, treating NaN == NaN; the
+        # aggregated rating columns shift with every run's statistics
+        columns = [col for col in fresh.columns
+                   if col in existing.columns and col not in RATING_COLUMNS]
+        old_values = existing.iloc[matched_old][columns].reset_index(drop=True)
+        new_values = fresh.iloc[matched_new][columns].reset_index(drop=True)
+        same = (old_values == new_values) | (old_values.isna() & new_values.isna())
+        num_updated = int((~same.all(axis=1)).sum())
+
+        # Fresh rows take the position of the row they replace; new ones go last
+        position = np.arange(len(existing), len(existing) + len(fresh))
+        position[matched_new] = matched_old
+        merged = pd.concat([existing[~in_scope], fresh], ignore_index=True)
+        order = np.concatenate([(~in_scope).nonzero()[0], position])
+        merged = merged.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+
+        return merged, {
+            'added': int(added.sum()),
+            'updated': num_updated,
+            'dropped': int(dropped.sum()),
+            'unchanged': len(matched_old) - num_updated
+        }
+
+    def _write_snapshot(self, city_name: str, places: pd.DataFrame) -> Path:
+        """Write a category-partitioned, timestamped copy of a city's dataset"""
+        snapshot = self.snapshot_dir / city_name / datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        pq.write_to_dataset(
+            pa.Table.from_pandas(places, preserve_index=False),
+            root_path=str(snapshot),
+            partition_cols=['category']
+        )
+        return snapshot
@@ -0,0 +1,266 @@
+"""
+Entity Resolution
+Finds Google and Yelp rows describing the same venue and merges them
+"""
+
+import numpy as np
+import pandas as pd
+from config.config import ENTITY_MATCH_RADIUS_METERS, ENTITY_MATCH_THRESHOLD
+
+EARTH_RADIUS_METERS = 6_371_000
+NAME_WEIGHT = 0.6
+ADDRESS_WEIGHT = 0.4
+SIGNATURE_WIDTH = 48   # Characters of a name/address that are hashed
+
+# Set bits in every byte value, used to popcount packed signatures
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Columns only Yelp fills in, copied onto the merged Google row
+YELP_ONLY_COLUMNS = ['categories', 'phone', 'yelp_url', 'image_url']
+
+# Source of a merged Google/Yelp row
+MERGED_SOURCE = 'google+yelp'
+
+
+def matching_sources(source: str) -> list:
+    """Source values of the rows holding a source's data: its own and merged rows"""
+    if source != MERGED_SOURCE and source in MERGED_SOURCE.split('+'):
+        return [source, MERGED_SOURCE]
+    return [source]
+
+
+def trigram_signatures(texts: pd.Series) -> np.ndarray:
+    """
+    Hash the character trigrams of each text into a 256-bit set
+
+    Text is lower-cased, runs of anything but letters and digits become a
+    single space, and a space is added on each side so word boundaries
+    form trigrams.
+
+    Returns:
+        (len(texts), 32) uint8 array of packed bitsets
+    """
+    normalized = (
+        texts.fillna('').astype(str).str.lower()
+        .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+        .str.strip()
+    )
+    padded = np.array((' ' + normalized + ' ').tolist(), dtype=f'S{SIGNATURE_WIDTH}')
+    chars = padded.view(np.uint8).reshape(len(padded), SIGNATURE_WIDTH).astype(np.uint32)
+
+    # Multiplicative hash of each trigram down to 8 bits; skip trigrams in the zero padding
+    trigram = (chars[:, :-2] << 16) | (chars[:, 1:-1] << 8) | chars[:, 2:]
+    buckets = ((trigram * np.uint32(2654435761)) >> np.uint32(24)).astype(np.uint8)
+    rows, cols = np.nonzero(chars[:, 2:] != 0)
+
+    bits = np.zeros((len(padded), 256), dtype=bool)
+    bits[rows, buckets[rows, cols]] = True
+    return np.packbits(bits, axis=1)
+
+
+def signature_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Jaccard similarity of packed trigram bitsets, row by row"""
+    intersection = _POPCOUNT[a & b].sum(axis=1, dtype=np.int32)
+    union = _POPCOUNT[a | b].sum(axis=1, dtype=np.int32)
+    return np.where(union > 0, intersection / np.maximum(union, 1), 0.0)
+
+
+def _project(lat: np.ndarray, lng: np.ndarray) -> tuple:
+    """Equirectangular projection to meters, accurate at city scale"""
+    lat0 = np.radians(np.nanmean(lat)) if len(lat) else 0.0
+    x = np.radians(lng) * np.cos(lat0) * EARTH_RADIUS_METERS
+    y = np.radians(lat) * EARTH_RADIUS_METERS
+    return x, y
+
+
+def _candidate_pairs(block_a: np.ndarray, cx_a: np.ndarray, cy_a: np.ndarray,
+                     block_b: np.ndarray, cx_b: np.ndarray, cy_b: np.ndarray,
+                     nx: int, ny: int) -> tuple:
+    """
+    All (a, b) pairs in the same block and neighbouring grid cells
+
+    Cells are encoded as one int64 key per row; b rows are sorted by key and
+    each of the 9 neighbouring cells of every a row becomes a searchsorted
+    range, expanded into pairs without a Python loop over rows.
+    """
+    key_b = (block_b * ny + cy_b) * nx + cx_b
+    order_b = np.argsort(key_b, kind='stable')
+    sorted_b = key_b[order_b]
+
+    pairs_a, pairs_b = [], []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            key_a = (block_a * ny + cy_a + dy) * nx + cx_a + dx
+            lo = np.searchsorted(sorted_b, key_a, side='left')
+            hi = np.searchsorted(sorted_b, key_a, side='right')
+            counts = hi - lo
+            total = counts.sum()
+            if total == 0:
+                continue
+            starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+            pairs_a.append(np.repeat(np.arange(len(key_a)), counts))
+            pairs_b.append(order_b[starts + np.arange(total)])
+
+    if not pairs_a:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+
+def _mutual_best(a: np.ndarray, b: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """Indices of pairs that are the best match for both of their rows"""
+    def best_per(side):
+        order = np.lexsort((-score, side))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = side[order][1:] != side[order][:-1]
+        return order[first]
+
+    return np.intersect1d(best_per(a), best_per(b))
+
+
+def find_cross_source_matches(places: pd.DataFrame,
+                              radius_meters: float = ENTITY_MATCH_RADIUS_METERS,
+                              threshold: float = ENTITY_MATCH_THRESHOLD) -> pd.DataFrame:
+    """
+    Match Google rows to Yelp rows of the same venue
+
+    Candidates are rows of the other source in the same category within
+    `radius_meters` (blocked on a grid with radius-sized cells). Each
+    candidate pair is scored on trigram similarity of name and address,
+    and pairs above `threshold` that are mutually best are kept.
+
+    Args:
+        places: Collected places with both sources
+        radius_meters: Max distance between matching rows
+        threshold: Min weighted name/address similarity
+
+    Returns:
+        DataFrame of google_pos, yelp_pos (row positions in `places`),
+        distance_m and score
+    """
+    source = places['source'].to_numpy()
+    has_coords = places['latitude'].notna().to_numpy() & places['longitude'].notna().to_numpy()
+    google = np.nonzero((source == 'google') & has_coords)[0]
+    yelp = np.nonzero((source == 'yelp') & has_coords)[0]
+    columns = ['google_pos', 'yelp_pos', 'distance_m', 'score']
+    if len(google) == 0 or len(yelp) == 0:
+        return pd.DataFrame(columns=columns)
+
+    x, y = _project(places['latitude'].to_numpy(dtype=float), places['longitude'].to_numpy(dtype=float))
+    cx = np.floor(x / radius_meters).astype(np.int64)
+    cy = np.floor(y / radius_meters).astype(np.int64)
+    used = np.concatenate([google, yelp])
+    cx = cx - cx[used].min() + 1    # Leave a free column/row on each side for neighbours
+    cy = cy - cy[used].min() + 1
+    nx, ny = int(cx[used].max()) + 2, int(cy[used].max()) + 2
+
+    if 'category' in places:
+        block = pd.factorize(places['category'])[0].astype(np.int64)
+    else:
+        block = np.zeros(len(places), dtype=np.int64)
+
+    a, b = _candidate_pairs(block[google], cx[google], cy[google],
+                            block[yelp], cx[yelp], cy[yelp], nx, ny)
+    a, b = google[a], yelp[b]
+
+    distance = np.hypot(x[a] - x[b], y[a] - y[b])
+    near = distance <= radius_meters
+    a, b, distance = a[near], b[near], distance[near]
+
+    # Signatures only for rows that have a candidate
+    rows = np.unique(np.concatenate([a, b]))
+    lookup = np.full(len(places), -1, dtype=np.int64)
+    lookup[rows] = np.arange(len(rows))
+    names = trigram_signatures(places['name'].iloc[rows])
+    # Street part only; city/state/zip add no signal within one city
+    addresses = trigram_signatures(
+        places['address'].iloc[rows].astype(str).str.replace(r',.*', '', regex=True)
+    )
+
+    score = (NAME_WEIGHT * signature_similarity(names[lookup[a]], names[lookup[b]]) +
+             ADDRESS_WEIGHT * signature_similarity(addresses[lookup[a]], addresses[lookup[b]]))
+    good = score >= threshold
+    a, b, distance, score = a[good], b[good], distance[good], score[good]
+
+    best = _mutual_best(a, b, score)
+    return pd.DataFrame({
+        'google_pos': a[best], 'yelp_pos': b[best],
+        'distance_m': distance[best], 'score': score[best]
+    }, columns=columns)
+
+
+def merge_cross_source(places: pd.DataFrame, matches: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Collapse matched Google/Yelp rows into one row per venue
+
+    The merged row keeps the Google row's position and id, takes the Yelp
+    id (yelp_place_id), URL, phone, image and categories, sums the review
+    counts, uses the review-weighted mean rating (and calibrated_rating,
+    when present), and prefers the Google price when it has one. Its
+    source becomes MERGED_SOURCE ('google+yelp').
+
+    Args:
+        places: Collected places with both sources
+        matches: Output of find_cross_source_matches (computed if omitted)
+
+    Returns:
+        DataFrame without the duplicate Yelp rows
+    """
+    if matches is None:
+        matches = find_cross_source_matches(places)
+    if matches.empty:
+        return places
+
+    g = matches['google_pos'].to_numpy(dtype=np.int64)
+    y = matches['yelp_pos'].to_numpy(dtype=np.int64)
+    merged = places.reset_index(drop=True)
+    if 'yelp_place_id' not in merged:
+        merged['yelp_place_id'] = None
+    merged = merged.astype({col: object for col in YELP_ONLY_COLUMNS + ['yelp_place_id', 'source']
+                            if col in merged})
+
+    def column(name):
+        return merged[name].to_numpy()
+
+    reviews_g = np.nan_to_num(column('review_count').astype(float)[g])
+    reviews_y = np.nan_to_num(column('review_count').astype(float)[y])
+
+    def fuse(name):
+        """Review-weighted mean rating; plain mean/whichever exists when there are no reviews"""
+        rating_g = column(name).astype(float)[g]
+        rating_y = column(name).astype(float)[y]
+        weight_g = np.where(np.isnan(rating_g), 0, reviews_g)
+        weight_y = np.where(np.isnan(rating_y), 0, reviews_y)
+        total_weight = weight_g + weight_y
+        weighted = (np.nan_to_num(rating_g) * weight_g + np.nan_to_num(rating_y) * weight_y) / \
+            np.maximum(total_weight, 1)
+        unweighted = np.where(np.isnan(rating_g), rating_y,
+                              np.where(np.isnan(rating_y), rating_g, (rating_g + rating_y) / 2))
+        return np.where(total_weight > 0, weighted, unweighted)
+
+    price_g = column('price_level')[g]
+    has_google_price = price_g > 0
+    updates = {
+        'rating': fuse('rating'),
+        'review_count': (reviews_g + reviews_y).astype(merged['review_count'].dtype),
+        'price_level': np.where(has_google_price, price_g, column('price_level')[y]),
+        'yelp_place_id': column('place_id')[y],
+        'source': MERGED_SOURCE,
+    }
+    if 'calibrated_rating' in merged:
+        updates['calibrated_rating'] = fuse('calibrated_rating')
+    if 'price_estimate' in merged:
+        updates['price_estimate'] = np.where(
+            has_google_price | (column('price_level')[y] == 0),
+            column('price_estimate')[g], column('price_estimate')[y]
+        )
+    for col in YELP_ONLY_COLUMNS:
+        if col in merged:
+            updates[col] = column(col)[y]
+
+    for col, values in updates.items():
+        merged.iloc[g, merged.columns.get_loc(col)] = values
+
+    keep = np.ones(len(merged), dtype=bool)
+    keep[y] = False
+    return merged[keep].reset_index(drop=True)
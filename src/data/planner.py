@@ -0,0 +1,314 @@
+"""
+Collection Planner
+Spends a per-provider API call budget on the keyword searches expected to find the most new places
+"""
+
+import heapq
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from config.config import (
+    API_DAILY_QUOTAS, CATEGORY_KEYWORDS, CITIES, PLAN_MERGE_OVERLAP, PLAN_MIN_NEW_PLACES,
+    PLAN_RELATED_OVERLAP, RESULTS_PER_CATEGORY
+)
+from src.data.cache_manager import CacheManager
+from src.data.data_collector import PROVIDERS
+from src.data.entity_resolution import find_cross_source_matches
+
+# Search fields written to a plan (the place sets stay internal)
+PLAN_FIELDS = ['city', 'provider', 'keyword', 'categories', 'status', 'expected_new',
+               'estimated', 'fresh', 'results', 'merged_into']
+
+
+def keyword_key(keyword: str) -> str:
+    """A keyword as the cache normalizes it; equal keys are the same request"""
+    return CacheManager.normalize_request({'keyword': keyword})['keyword']
+
+
+def related(a: str, b: str) -> bool:
+    """Whether one keyword's words include the other's ("hiking" / "hiking trail")"""
+    words_a, words_b = set(keyword_key(a).split()), set(keyword_key(b).split())
+    return words_a != words_b and (words_a <= words_b or words_b <= words_a)
+
+
+def build_searches(categories: list) -> list:
+    """
+    One search per distinct (provider, keyword) of the categories
+
+    A keyword listed under several categories ("beach") is searched once and
+    its results are tagged with every one of them.
+
+    Returns:
+        List of {'provider', 'keyword', 'categories'} in category order
+    """
+    searches = {}
+    for category in categories:
+        for keyword in CATEGORY_KEYWORDS[category]:
+            for provider in PROVIDERS:
+                search = searches.setdefault((provider, keyword_key(keyword)), {
+                    'provider': provider, 'keyword': keyword, 'categories': []
+                })
+                if category not in search['categories']:
+                    search['categories'].append(category)
+    return list(searches.values())
+
+
+def observe(collector, city_name: str, searches: list) -> list:
+    """
+    What the cache knows about each search of a city
+
+    Expired entries count as observations too: they cost a call to refresh
+    but still show what the search returns.
+
+    Args:
+        collector: DataCollector whose clients and cache are inspected
+        city_name: Key from config.CITIES
+        searches: Output of build_searches
+
+    Returns:
+        Copies of the searches with 'city', 'fresh' (answered by an unexpired
+        entry, so free), 'results' (places returned when last cached, None if
+        never) and 'places' (their venue keys; the Google and Yelp rows of
+        one venue share a key)
+    """
+    city = CITIES[city_name]
+    lat, lng = city['coordinates']['lat'], city['coordinates']['lng']
+    observed, frames = [], []
+    for search in searches:
+        client = collector.google if search['provider'] == 'google' else collector.yelp
+        cached = client.cached_places(lat, lng, search['keyword'], RESULTS_PER_CATEGORY)
+        observed.append(dict(
+            search, city=city_name, places=None, results=None if cached is None else len(cached),
+            fresh=client.is_cached(lat, lng, search['keyword'], RESULTS_PER_CATEGORY)
+        ))
+        if cached is not None:
+            observed[-1]['places'] = frozenset()
+            if not cached.empty:
+                frames.append(cached.assign(search=len(observed) - 1))
+    if not frames:
+        return observed
+
+    rows = pd.concat(frames, ignore_index=True)
+    rows['key'] = rows['source'] + ':' + rows['place_id'].astype(str)
+
+    # Key each Yelp venue that matches a Google venue by the Google key
+    venues = rows.drop_duplicates('key').reset_index(drop=True)
+    matches = find_cross_source_matches(venues.assign(category=''))
+    keys = venues['key'].to_numpy()
+    canonical = dict(zip(keys[matches['yelp_pos'].to_numpy(dtype=np.int64)],
+                         keys[matches['google_pos'].to_numpy(dtype=np.int64)]))
+    rows['key'] = rows['key'].map(lambda key: canonical.get(key, key))
+
+    for position, places in rows.groupby('search')['key']:
+        observed[position]['places'] = frozenset(places)
+    return observed
+
+
+def _overlap(a: frozenset, b: frozenset) -> float:
+    """Share of the smaller place set that the other one also has"""
+    return len(a & b) / min(len(a), len(b)) if a and b else 0.0
+
+
+def _related_pairs(searches: list):
+    """Related keyword pairs of the same city and provider, both with cached results"""
+    for a, b in combinations(searches, 2):
+        if (a['city'] == b['city'] and a['provider'] == b['provider']
+                and a['places'] and b['places'] and related(a['keyword'], b['keyword'])):
+            yield a, b
+
+
+def merge_related(searches: list, threshold: float = PLAN_MERGE_OVERLAP) -> list:
+    """
+    Fold related keywords whose cached results mostly coincide into one search
+
+    The search kept (the fresh one, else the one with more places) is tagged
+    with both keywords' categories and the other gets 'merged_into'. Only
+    pairs with cached results are merged, so an unseen keyword is never
+    dropped on a guess.
+    """
+    for a, b in _related_pairs(searches):
+        if 'merged_into' in a or 'merged_into' in b or _overlap(a['places'], b['places']) < threshold:
+            continue
+        keep, drop = sorted((a, b), key=lambda search: (search['fresh'], len(search['places'])),
+                            reverse=True)
+        keep['categories'] = keep['categories'] + [
+            category for category in drop['categories'] if category not in keep['categories']
+        ]
+        drop['merged_into'] = keep['keyword']
+    return searches
+
+
+def learn_priors(searches: list) -> dict:
+    """
+    Per-provider yield estimates for searches that were never cached
+
+    The dataset has one row per venue and category, so yields count
+    (venue, category) pairs. A cached search's yield in one of its
+    categories is its share of that category's venues in its city: each
+    venue counts 1/k for each of the k cached searches (of either provider)
+    that found it for the category, so a keyword that only repeats others
+    ("dining" after "restaurant") learns a low yield, and the shares of a
+    city add up to its distinct (venue, category) pairs.
+
+    Returns:
+        {provider: {'yield': mean share per cached search and category,
+                    'keywords': mean share of each keyword's cached searches (any city),
+                    'related_overlap': mean overlap of cached related keyword pairs}},
+        falling back to RESULTS_PER_CATEGORY and PLAN_RELATED_OVERLAP without data
+    """
+    found_by = defaultdict(int)
+    for search in searches:
+        for category in search['categories']:
+            for place in search['places'] or ():
+                found_by[search['city'], category, place] += 1
+
+    priors = {}
+    for provider in PROVIDERS:
+        cached = [search for search in searches
+                  if search['provider'] == provider and search['places'] is not None]
+        keywords = defaultdict(list)
+        for search in cached:
+            for category in search['categories']:
+                share = sum(1 / found_by[search['city'], category, place] for place in search['places'])
+                keywords[keyword_key(search['keyword'])].append(share)
+        shares = [share for values in keywords.values() for share in values]
+        overlaps = [_overlap(a['places'], b['places']) for a, b in _related_pairs(cached)]
+
+        priors[provider] = {
+            'yield': float(np.mean(shares)) if shares else float(RESULTS_PER_CATEGORY),
+            'keywords': {key: float(np.mean(values)) for key, values in keywords.items()},
+            'related_overlap': float(np.mean(overlaps)) if overlaps else PLAN_RELATED_OVERLAP,
+        }
+    return priors
+
+
+def allocate(searches: list, priors: dict, budgets: dict,
+             min_new: float = PLAN_MIN_NEW_PLACES) -> list:
+    """
+    Choose searches greedily by expected new venues per call
+
+    Fresh searches are free and always run. The rest cost one call of their
+    provider's budget and are picked best first: a cached search is worth
+    the (venue, category) pairs of its last results and categories not
+    found yet in its city, an unseen one its keyword's (or provider's)
+    learned yield per category, less the related-keyword overlap for every
+    related search already picked. A venue found for one category ("museum",
+    cultural) is still new for another ("children's museum", family), so no
+    category loses its rows to another's search.
+    Values only shrink as searches are picked, so stale heap entries are
+    re-scored lazily.
+
+    Sets 'status' ('cached', 'call', 'redundant' or 'over_budget'),
+    'expected_new' and 'estimated' on every search.
+
+    Returns:
+        The searches in decision order
+    """
+    covered = defaultdict(set)
+    picked = defaultdict(list)
+    spent = dict.fromkeys(budgets, 0)
+
+    def value(search):
+        if search['places'] is not None:
+            return float(sum(len(search['places'] - covered[search['city'], category])
+                             for category in search['categories']))
+        prior = priors[search['provider']]
+        estimate = prior['keywords'].get(keyword_key(search['keyword']), prior['yield'])
+        overlapping = sum(related(search['keyword'], keyword)
+                          for keyword in picked[search['city'], search['provider']])
+        return estimate * len(search['categories']) * (1 - prior['related_overlap']) ** overlapping
+
+    def take(search, gain, status):
+        search.update(status=status, expected_new=gain, estimated=search['places'] is None)
+        for category in search['categories']:
+            covered[search['city'], category] |= search['places'] or set()
+        picked[search['city'], search['provider']].append(search['keyword'])
+        decided.append(search)
+
+    decided = []
+    for search in searches:
+        if search['fresh']:
+            take(search, value(search), 'cached')
+
+    paid = [search for search in searches if not search['fresh']]
+    heap = [(-value(search), position) for position, search in enumerate(paid)]
+    heapq.heapify(heap)
+    while heap:
+        _, position = heapq.heappop(heap)
+        search = paid[position]
+        gain = value(search)
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, position))
+            continue
+        if gain >= min_new and spent[search['provider']] < budgets[search['provider']]:
+            spent[search['provider']] += 1
+            take(search, gain, 'call')
+        else:
+            search.update(status='redundant' if gain < min_new else 'over_budget',
+                          expected_new=gain, estimated=search['places'] is None)
+            decided.append(search)
+    return decided
+
+
+def plan_collection(collector, city_names: list, categories: list = None,
+                    budgets: dict = None, min_new: float = PLAN_MIN_NEW_PLACES) -> dict:
+    """
+    Plan a collection run of several cities under one call budget
+
+    Makes no API calls: yields are learned from the collector's cache.
+
+    Args:
+        collector: DataCollector whose clients and cache are inspected
+        city_names: Keys from config.CITIES
+        categories: Categories to collect (default: all of CATEGORY_KEYWORDS)
+        budgets: Calls allowed per provider (default: config.API_DAILY_QUOTAS)
+        min_new: Skip searches expected to add fewer new venues
+
+    Returns:
+        Dictionary with the budgets, 'calls' per provider, 'free' cached
+        searches, 'naive_searches' (every keyword of every category on
+        both providers), 'distinct_searches' (after dropping repeated
+        keywords), 'expected_new_places', the learned 'priors' and every
+        search with its decision, picked ones first
+    """
+    categories = categories or list(CATEGORY_KEYWORDS.keys())
+    budgets = dict(API_DAILY_QUOTAS, **(budgets or {}))
+
+    searches = []
+    for city_name in city_names:
+        searches += merge_related(observe(collector, city_name, build_searches(categories)))
+    priors = learn_priors(searches)
+    decided = allocate([search for search in searches if 'merged_into' not in search],
+                       priors, budgets, min_new)
+    for search in searches:
+        if 'merged_into' in search:
+            search.update(status='merged', expected_new=0.0, estimated=False)
+            decided.append(search)
+
+    picked = [search for search in decided if search['status'] in ('cached', 'call')]
+    return {
+        'cities': list(city_names),
+        'categories': categories,
+        'budgets': budgets,
+        'calls': {provider: sum(search['status'] == 'call' and search['provider'] == provider
+                                for search in decided) for provider in PROVIDERS},
+        'free': sum(search['status'] == 'cached' for search in decided),
+        'naive_searches': len(city_names) * len(PROVIDERS) * sum(
+            len(CATEGORY_KEYWORDS[category]) for category in categories),
+        'distinct_searches': len(searches),
+        'expected_new_places': sum(search['expected_new'] for search in picked),
+        'priors': priors,
+        'searches': [{field: search.get(field) for field in PLAN_FIELDS} for search in decided],
+    }
+
+
+def planned_queries(plan: dict, city_name: str) -> list:
+    """(provider, category, keyword) queries of a city's picked searches, for DataCollector"""
+    return [
+        (search['provider'], category, search['keyword'])
+        for search in plan['searches']
+        if search['city'] == city_name and search['status'] in ('cached', 'call')
+        for category in search['categories']
+    ]
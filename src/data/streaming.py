@@ -0,0 +1,162 @@
+"""
+Streaming Place Writer
+Appends place record batches to a city/category/source-partitioned parquet dataset
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from config.config import DEFAULT_PRICE_BY_CATEGORY, STREAM_ROW_GROUP_SIZE
+from src.api.google_client import PLACE_SCHEMA as GOOGLE_SCHEMA
+from src.api.yelp_client import PLACE_SCHEMA as YELP_SCHEMA
+
+# Every column a collected place can have, in the order of the batch DataFrames
+PLACE_SCHEMA = pa.unify_schemas([GOOGLE_SCHEMA, YELP_SCHEMA]).append(
+    pa.field('category', pa.string())
+).append(pa.field('price_estimate', pa.int64()))
+
+# Partition values live in the directory names, not in the files
+PARTITION_COLUMNS = ['city', 'category', 'source']
+FILE_SCHEMA = pa.schema([field for field in PLACE_SCHEMA if field.name not in PARTITION_COLUMNS])
+
+
+def tag_batch(batch: pa.RecordBatch, category: str) -> pa.RecordBatch:
+    """
+    Conform a client batch to PLACE_SCHEMA
+
+    Adds the category, the price_estimate (price_level, or the category
+    default when the API has no price) and null columns the source lacks.
+    """
+    price_level = batch.column('price_level').to_pylist()
+    default_price = DEFAULT_PRICE_BY_CATEGORY.get(category) or 0
+    columns = {name: batch.column(name) for name in batch.schema.names}
+    columns['category'] = pa.array([category] * batch.num_rows, pa.string())
+    columns['price_estimate'] = pa.array(
+        [level if level and level > 0 else default_price for level in price_level], pa.int64()
+    )
+    return pa.RecordBatch.from_arrays(
+        [columns[field.name].cast(field.type) if field.name in columns
+         else pa.nulls(batch.num_rows, field.type) for field in PLACE_SCHEMA],
+        schema=PLACE_SCHEMA
+    )
+
+
+def write_city_parquet(places, path):
+    """
+    Write a city's places as parquet with one row group per category
+
+    Rows are grouped by category with a stable sort, so each category keeps
+    its row order; readers filtering on category skip the other row groups
+    by their statistics. Rows without a category go last.
+
+    Args:
+        places: Places DataFrame
+        path: Output file
+    """
+    grouped = places.sort_values('category', kind='stable', na_position='last')
+    table = pa.Table.from_pandas(grouped, preserve_index=False)
+    category = grouped['category'].to_numpy(dtype=object)
+    bounds = [0, *(np.flatnonzero(category[1:] != category[:-1]) + 1).tolist(), len(category)]
+    with pq.ParquetWriter(path, table.schema) as writer:
+        for start, stop in zip(bounds, bounds[1:]):
+            writer.write_table(table.slice(start, stop - start))
+
+
+class PartitionedPlaceWriter:
+    """
+    Hive-partitioned parquet writer for streamed places
+
+    Rows go to {root}/city={city}/category={category}/source={source}/
+    part-{run_id}.parquet through one open ParquetWriter per partition. At
+    most row_group_size rows are buffered in total: once the buffers reach
+    it, the largest partition is written out as a row group. Memory is
+    therefore bounded regardless of how many rows or queries a run has. Files are
+    written under a dot-prefixed name (ignored by dataset readers) and
+    renamed into place on close().
+    """
+
+    def __init__(self, root: str, row_group_size: int = STREAM_ROW_GROUP_SIZE):
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+        self.run_id = uuid.uuid4().hex[:12]
+        self.rows_written = 0
+        self._buffers = {}    # partition dir -> (list of batches, buffered rows)
+        self._buffered_rows = 0
+        self._writers = {}    # partition dir -> (ParquetWriter, temp path, final path)
+
+    def write(self, city_name: str, batch: pa.RecordBatch):
+        """Append a PLACE_SCHEMA batch (one city, any categories/sources)"""
+        if batch.num_rows == 0:
+            return
+        table = pa.Table.from_batches([batch])
+        keys = pa.Table.from_arrays(
+            [table.column('category'), table.column('source')], names=['category', 'source']
+        ).group_by(['category', 'source']).aggregate([])
+
+        for category, source in zip(keys.column('category').to_pylist(),
+                                    keys.column('source').to_pylist()):
+            mask = pc.and_(pc.equal(table.column('category'), category),
+                           pc.equal(table.column('source'), source))
+            rows = table.filter(mask).select(FILE_SCHEMA.names)
+            partition = (self.root / f"city={city_name}" / f"category={category}"
+                         / f"source={source}")
+            batches, count = self._buffers.get(partition, ([], 0))
+            batches.extend(rows.to_batches())
+            count += rows.num_rows
+            self._buffers[partition] = (batches, count)
+            self._buffered_rows += rows.num_rows
+
+        while self._buffered_rows >= self.row_group_size:
+            self._flush(max(self._buffers, key=lambda partition: self._buffers[partition][1]))
+
+    def close(self) -> list:
+        """Flush all buffers and publish the files; returns their paths"""
+        for partition in list(self._buffers):
+            self._flush(partition)
+        files = []
+        for writer, tmp_path, final_path in self._writers.values():
+            writer.close()
+            os.replace(tmp_path, final_path)
+            files.append(final_path)
+        self._writers = {}
+        return files
+
+    def abort(self):
+        """Drop everything written by this run"""
+        for writer, tmp_path, _ in self._writers.values():
+            writer.close()
+            Path(tmp_path).unlink(missing_ok=True)
+        self._writers = {}
+        self._buffers = {}
+        self._buffered_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _flush(self, partition: Path):
+        batches, count = self._buffers.pop(partition, ([], 0))
+        self._buffered_rows -= count
+        if count == 0:
+            return
+        if partition not in self._writers:
+            partition.mkdir(parents=True, exist_ok=True)
+            name = f"part-{self.run_id}.parquet"
+            tmp_path = partition / f".{name}"
+            self._writers[partition] = (pq.ParquetWriter(tmp_path, FILE_SCHEMA),
+                                        tmp_path, partition / name)
+        self._writers[partition][0].write_table(
+            pa.Table.from_batches(batches, schema=FILE_SCHEMA), row_group_size=self.row_group_size
+        )
+        self.rows_written += count
@@ -0,0 +1,82 @@
+"""
+Search Tiling
+Hex grid of search circles covering a city, with adaptive subdivision
+"""
+
+import math
+
+EARTH_RADIUS_METERS = 6_371_000
+METERS_PER_DEG_LAT = math.radians(1) * EARTH_RADIUS_METERS
+
+
+def _offset(lat: float, lng: float, dx: float, dy: float) -> tuple:
+    """(lat, lng) moved dx meters east and dy meters north"""
+    return (lat + dy / METERS_PER_DEG_LAT,
+            lng + dx / (METERS_PER_DEG_LAT * math.cos(math.radians(lat))))
+
+
+def _distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Equirectangular distance in meters (accurate at city scale)"""
+    dx = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    dy = math.radians(lat2 - lat1)
+    return math.hypot(dx, dy) * EARTH_RADIUS_METERS
+
+
+def hex_tiles(lat: float, lng: float, area_radius: float, tile_radius: float) -> list:
+    """
+    Circles of tile_radius on a hex grid covering a circular area
+
+    Centers are sqrt(3) * tile_radius apart, so every circle contains its
+    hexagonal grid cell and the circles together cover the plane. Tiles whose
+    circle does not reach the area are dropped.
+
+    Args:
+        lat, lng: Center of the area
+        area_radius: Radius of the area in meters
+        tile_radius: Radius of each tile in meters
+
+    Returns:
+        List of tile dicts with lat, lng, radius and depth (0), center tile first
+    """
+    spacing = math.sqrt(3) * tile_radius
+    rows = int(math.ceil((area_radius + tile_radius) / (spacing * math.sqrt(3) / 2)))
+    cols = int(math.ceil((area_radius + tile_radius) / spacing)) + 1
+
+    tiles = []
+    for row in range(-rows, rows + 1):
+        dy = row * spacing * math.sqrt(3) / 2
+        shift = spacing / 2 if row % 2 else 0.0
+        for col in range(-cols, cols + 1):
+            dx = col * spacing + shift
+            if math.hypot(dx, dy) < area_radius + tile_radius:
+                tile_lat, tile_lng = _offset(lat, lng, dx, dy)
+                tiles.append({'lat': tile_lat, 'lng': tile_lng,
+                              'radius': tile_radius, 'depth': 0})
+
+    tiles.sort(key=lambda tile: _distance(lat, lng, tile['lat'], tile['lng']))
+    return tiles
+
+
+def subdivide(tile: dict, lat: float, lng: float, area_radius: float) -> list:
+    """
+    Seven circles of half the radius covering a tile's circle
+
+    One child shares the tile's center, the other six sit sqrt(3)/2 * radius
+    away at 60 degree steps; this is the tightest covering of a disk by seven
+    equal disks. Children outside the area (centered at lat, lng) are dropped.
+
+    Returns:
+        List of child tile dicts, one level deeper
+    """
+    radius = tile['radius'] / 2
+    ring = math.sqrt(3) / 2 * tile['radius']
+    offsets = [(0.0, 0.0)] + [(ring * math.cos(math.radians(angle)), ring * math.sin(math.radians(angle)))
+                              for angle in range(0, 360, 60)]
+
+    children = []
+    for dx, dy in offsets:
+        child_lat, child_lng = _offset(tile['lat'], tile['lng'], dx, dy)
+        if _distance(lat, lng, child_lat, child_lng) < area_radius + radius:
+            children.append({'lat': child_lat, 'lng': child_lng,
+                             'radius': radius, 'depth': tile['depth'] + 1})
+    return children
@@ -0,0 +1,155 @@
+"""
+Instrumentation
+Opt-in stage timers, counters and metric hooks
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+
+from config.config import INSTRUMENTATION_BUCKETS_MS
+
+# Shared no-op context returned by disabled timers
+_NO_TIMER = contextlib.nullcontext()
+
+
+class _StageTimer:
+    """Context manager that records its elapsed time under one stage"""
+
+    __slots__ = ('instrumentation', 'stage', 'start')
+
+    def __init__(self, instrumentation, stage: str):
+        self.instrumentation = instrumentation
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Per-stage timing histograms and event counters
+
+    Timings go into fixed millisecond buckets (INSTRUMENTATION_BUCKETS_MS plus
+    an overflow bucket), so recording is O(log buckets) with no per-sample
+    storage. Every timing and counter update is also passed to the
+    registered hooks as hook(kind, name, value), with kind 'timer' (value in
+    seconds) or 'counter' (value = increment), for export to external metrics.
+
+    A disabled instance returns a shared no-op context from timer() and
+    ignores record()/increment(), so instrumented code paths cost about one
+    attribute check when nobody is listening.
+    """
+
+    def __init__(self, enabled: bool = True, buckets_ms: tuple = INSTRUMENTATION_BUCKETS_MS):
+        """
+        Args:
+            enabled: Record timings and counters
+            buckets_ms: Ascending upper bounds of the histogram buckets
+        """
+        self.enabled = enabled
+        self.buckets_ms = tuple(buckets_ms)
+        self._timers = {}    # stage -> [count, total_s, min_s, max_s, bucket counts]
+        self._counters = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def timer(self, stage: str):
+        """Context manager timing one run of a stage"""
+        if not self.enabled:
+            return _NO_TIMER
+        return _StageTimer(self, stage)
+
+    def record(self, stage: str, seconds: float):
+        """Add one timing of a stage"""
+        if not self.enabled:
+            return
+        bucket = bisect.bisect_left(self.buckets_ms, seconds * 1000)
+        with self._lock:
+            timing = self._timers.get(stage)
+            if timing is None:
+                timing = [0, 0.0, seconds, seconds, [0] * (len(self.buckets_ms) + 1)]
+                self._timers[stage] = timing
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = min(timing[2], seconds)
+            timing[3] = max(timing[3], seconds)
+            timing[4][bucket] += 1
+        for hook in self._hooks:
+            hook('timer', stage, seconds)
+
+    def increment(self, counter: str, amount: int = 1):
+        """Add to an event counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+        for hook in self._hooks:
+            hook('counter', counter, amount)
+
+    def add_hook(self, hook):
+        """Register hook(kind, name, value), called on every timing and counter update"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Unregister a hook added with add_hook"""
+        self._hooks.remove(hook)
+
+    def reset(self):
+        """Clear all timings and counters (hooks stay registered)"""
+        with self._lock:
+            self._timers = {}
+            self._counters = {}
+
+    def get_stats(self) -> dict:
+        """
+        Snapshot of everything recorded
+
+        Returns:
+            Dictionary with:
+                timers: stage -> count, total_ms, mean_ms, min_ms, max_ms,
+                    p50_ms, p99_ms (bucket upper bounds) and histogram
+                    (bucket upper bound in ms, 'inf' for overflow -> count)
+                counters: counter -> value
+        """
+        with self._lock:
+            timers = {stage: (count, total, low, high, list(buckets))
+                      for stage, (count, total, low, high, buckets) in self._timers.items()}
+            counters = dict(self._counters)
+
+        bounds = [*self.buckets_ms, float('inf')]
+        stats = {}
+        for stage, (count, total, low, high, buckets) in timers.items():
+            stats[stage] = {
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_ms': total / count * 1000,
+                'min_ms': low * 1000,
+                'max_ms': high * 1000,
+                'p50_ms': min(self._percentile(buckets, bounds, 0.50), high * 1000),
+                'p99_ms': min(self._percentile(buckets, bounds, 0.99), high * 1000),
+                'histogram': {('inf' if bound == float('inf') else bound): n
+                              for bound, n in zip(bounds, buckets)}
+            }
+        return {'timers': stats, 'counters': counters}
+
+    @staticmethod
+    def _percentile(buckets: list, bounds: list, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        target = fraction * sum(buckets)
+        seen = 0
+        for bound, n in zip(bounds, buckets):
+            seen += n
+            if seen >= target:
+                return bound
+        return bounds[-1]
+
+
+# Default for components created without instrumentation
+DISABLED = Instrumentation(enabled=False)
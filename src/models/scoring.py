@@ -0,0 +1,190 @@
+"""
+Scoring Models
+Place scores as weight vectors over precomputed feature columns
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from src.data.aggregation import aggregate_ratings
+
+# Every feature a model can weight, in vector order
+FEATURES = (
+    'rating',            # Rating, 0 when missing
+    'log_reviews',       # log1p(review count), divided by its max over the candidates
+    'reviews',           # Review count / 100
+    'smoothed_rating',   # Calibrated rating pulled toward its category mean (few reviews -> more)
+    'calibrated_rating', # Rating rescaled to the pooled Google/Yelp distribution
+    'price_fit',         # 1 at the requested budget level, falling by 0.25 per level away
+    'category_match',    # Share of the requested categories the venue is listed under
+    'distance',          # Kilometers from the query point (0 without one)
+)
+
+# Features that depend only on the place, computed once per dataset
+STATIC_FEATURES = ('rating', 'log_reviews', 'reviews', 'smoothed_rating', 'calibrated_rating')
+
+
+def place_features(places_df: pd.DataFrame) -> dict:
+    """
+    Static feature columns of a places DataFrame
+
+    calibrated_rating and smoothed_rating are read from the columns
+    written at ingest time (src/data/aggregation.py). Datasets saved
+    before those columns existed get them computed here from the loaded
+    rows, with merged Google/Yelp rows calibrated as a source of their own.
+
+    Returns:
+        {feature: float64 array over all rows} for STATIC_FEATURES
+    """
+    rating = places_df['rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+    review_count = places_df['review_count'].fillna(0).to_numpy(dtype=np.float64)
+    rated = ~np.isnan(rating)
+
+    aggregated = places_df
+    if not {'calibrated_rating', 'smoothed_rating'} <= set(places_df.columns):
+        aggregated = aggregate_ratings(pd.DataFrame({
+            'rating': rating,
+            'review_count': review_count,
+            'source': places_df['source'] if 'source' in places_df else '',
+            'category': places_df['category'] if 'category' in places_df else '',
+        }, index=places_df.index))
+
+    return {
+        'rating': np.where(rated, rating, 0.0),
+        'log_reviews': np.log1p(review_count),
+        'reviews': review_count / 100,
+        'smoothed_rating': np.nan_to_num(
+            aggregated['smoothed_rating'].to_numpy(dtype=np.float64, na_value=np.nan)),
+        'calibrated_rating': np.nan_to_num(
+            aggregated['calibrated_rating'].to_numpy(dtype=np.float64, na_value=np.nan)),
+    }
+
+
+def price_fit(price_estimate: np.ndarray, budget_level) -> np.ndarray:
+    """
+    How close each price is to the budget (1 = same level, 0 = 4+ levels away)
+
+    budget_level may be a scalar or a (queries, 1) column, giving one row
+    per query. Unknown prices get 0.
+    """
+    fit = np.clip(1 - np.abs(price_estimate - budget_level) / 4, 0.0, 1.0)
+    return np.where(np.isnan(fit), 0.0, fit)
+
+
+class ScoringModel:
+    """
+    Linear score over named features
+
+    score = sum(weight[f] * feature[f]) over the features with a non-zero
+    weight: the weight vector times the (places x features) matrix, one
+    column at a time. Columns may be flat (one score per place) or
+    (queries, places) for batched evaluation; zero-weight features are
+    never computed. Terms that only depend on the place are summed first,
+    so they can be precomputed once per dataset and a request only pays
+    for query-dependent features. Summing columns in a fixed order keeps
+    the default model bit-identical to the original formula, which BLAS
+    matrix-vector products do not guarantee.
+    """
+
+    def __init__(self, weights: dict, name: str = 'custom'):
+        """
+        Args:
+            weights: {feature: weight}, features from FEATURES
+            name: Label stored with saved models
+        """
+        unknown = [feature for feature in weights if feature not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown scoring features: {', '.join(unknown)}")
+        # Place-only terms go first so they can be summed once per dataset (static_score)
+        weights = {feature: float(weight) for feature, weight in weights.items() if weight}
+        static = [feature for feature in weights if feature in STATIC_FEATURES
+                  and feature != 'log_reviews']
+        self.weights = {feature: weights[feature]
+                        for feature in static + [f for f in weights if f not in static]}
+        self.name = name
+
+    @property
+    def features(self) -> list:
+        """Features with a non-zero weight, in evaluation order"""
+        return list(self.weights)
+
+    @property
+    def vector(self) -> np.ndarray:
+        """Weights as a vector aligned with FEATURES"""
+        return np.array([self.weights.get(feature, 0.0) for feature in FEATURES])
+
+    @classmethod
+    def from_vector(cls, vector, name: str = 'custom') -> 'ScoringModel':
+        return cls(dict(zip(FEATURES, np.asarray(vector, dtype=np.float64).tolist())), name)
+
+    @property
+    def static_features(self) -> list:
+        """
+        Leading features that depend only on the place
+
+        log_reviews is excluded: it is normalized per candidate set.
+        """
+        return [feature for feature in self.weights
+                if feature in STATIC_FEATURES and feature != 'log_reviews']
+
+    def static_score(self, features: dict) -> np.ndarray:
+        """Sum of the static_features terms over all places, passed back to evaluate()"""
+        return self.evaluate(features, static=None, terms=self.static_features)
+
+    def evaluate(self, columns: dict, static: np.ndarray = None, terms: list = None) -> np.ndarray:
+        """
+        Scores from feature columns
+
+        Args:
+            columns: {feature: array} holding the features to sum; flat and
+                (queries, places) columns broadcast together
+            static: Precomputed static_score (at the scored rows); only
+                the remaining features are then read from columns
+            terms: Features to sum (default: every weighted feature)
+
+        Returns:
+            float64 scores (a scalar 0.0 when nothing is weighted)
+        """
+        if terms is None:
+            terms = self.features
+        scores = None
+        if static is not None:
+            scores = static
+            terms = terms[len(self.static_features):]
+        for feature in terms:
+            term = columns[feature] * self.weights[feature]
+            scores = term if scores is None else scores + term
+        return 0.0 if scores is None else scores
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'weights': self.weights}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ScoringModel':
+        return cls(data['weights'], data.get('name', 'custom'))
+
+    def save(self, path: str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoringModel':
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+    def __repr__(self) -> str:
+        terms = ' + '.join(f"{weight:g}*{feature}" for feature, weight in self.weights.items())
+        return f"ScoringModel({self.name}: {terms or '0'})"
+
+
+# 70% rating, 30% popularity: the original recommendation score
+DEFAULT_MODEL = ScoringModel({'rating': 0.7, 'log_reviews': 0.3}, name='default')
+
+# The original weights over the ingest-time smoothed rating; the engine
+# default for datasets that carry the aggregated rating columns
+SMOOTHED_MODEL = ScoringModel({'smoothed_rating': 0.7, 'log_reviews': 0.3}, name='smoothed')
+
+# Famous places weight raw review volume heavily
+FAME_MODEL = ScoringModel({'rating': 0.3, 'reviews': 0.7}, name='fame')
@@ -0,0 +1,199 @@
+"""
+Scoring Model Trainer
+Fits scoring weights offline from logged recommendation interactions
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from src.models.scoring import FEATURES, STATIC_FEATURES, ScoringModel, price_fit
+
+# Columns every interaction log needs; distance_km and category are optional
+LOG_COLUMNS = ['query_id', 'place_id', 'clicked', 'categories', 'budget_level']
+
+
+def load_interactions(path: str) -> pd.DataFrame:
+    """
+    Read an interaction log (.jsonl, .csv or .parquet)
+
+    One row per place shown for a query: query_id, place_id, clicked (0/1),
+    the query's categories (list or comma-separated string) and
+    budget_level, plus optionally the row's category (to tell apart venues
+    listed under several categories) and distance_km.
+    """
+    path = Path(path)
+    if path.suffix == '.jsonl':
+        interactions = pd.read_json(path, lines=True, dtype={'place_id': str})
+    elif path.suffix == '.csv':
+        interactions = pd.read_csv(path, dtype={'place_id': str})
+    else:
+        interactions = pd.read_parquet(path)
+
+    missing = [col for col in LOG_COLUMNS if col not in interactions]
+    if missing:
+        raise ValueError(f"Interaction log is missing columns: {', '.join(missing)}")
+    return interactions
+
+
+def interaction_features(engine, interactions: pd.DataFrame) -> tuple:
+    """
+    Feature matrix of logged interactions, as the engine computes it at serve time
+
+    log_reviews is normalized by the maximum over each query's logged
+    places, standing in for the candidate set. Places no longer in the
+    engine's dataset are dropped.
+
+    Args:
+        engine: RecommendationEngine of the city the log was recorded in
+        interactions: Log as returned by load_interactions()
+
+    Returns:
+        (len(FEATURES)-column float64 matrix, clicked labels, query ids)
+    """
+    index = engine.index
+    places = pd.DataFrame({'place_id': engine.places_df['place_id'].astype(str).to_numpy(),
+                           'position': np.arange(len(engine.places_df))})
+    keys = ['place_id']
+    if 'category' in interactions:
+        places['category'] = engine.places_df['category'].astype(str).to_numpy()
+        keys.append('category')
+    lookup = places.drop_duplicates(keys)
+
+    logged = interactions.assign(place_id=interactions['place_id'].astype(str))
+    # A left merge keeps the log's row order (inner merges may regroup rows by key)
+    logged = logged.merge(lookup, on=keys, how='left')
+    logged = logged[logged['position'].notna()]
+    positions = logged['position'].to_numpy(dtype=np.int64)
+
+    review_score = index.review_score[positions]
+    query_max = (pd.Series(review_score).groupby(logged['query_id'].to_numpy())
+                 .transform('max').to_numpy())
+
+    # Requested categories as bitmasks over the index's category codes
+    codes = {name: code for code, name in enumerate(index.category_names)}
+    wanted = np.array([
+        sum(1 << codes[cat] for cat in set(cats.split(',') if isinstance(cats, str) else cats)
+            if cat in codes)
+        for cats in logged['categories']
+    ], dtype=np.uint64)
+    bits = index.venue_bits[positions].astype(np.uint64)
+    matched = np.zeros(len(positions))
+    requested = np.zeros(len(positions))
+    for code in range(len(index.category_names)):
+        bit = np.uint64(code)
+        requested += (wanted >> bit) & np.uint64(1)
+        matched += (wanted >> bit) & (bits >> bit) & np.uint64(1)
+
+    columns = {feature: index.features[feature][positions] for feature in STATIC_FEATURES}
+    columns.update({
+        'log_reviews': np.divide(review_score, query_max, out=review_score.copy(),
+                                 where=query_max > 0),
+        'price_fit': price_fit(index.price_estimate[positions],
+                               logged['budget_level'].to_numpy(dtype=np.float64)),
+        'category_match': matched / np.maximum(requested, 1),
+        'distance': (logged['distance_km'].fillna(0).to_numpy(dtype=np.float64)
+                     if 'distance_km' in logged else np.zeros(len(positions))),
+    })
+    return (np.column_stack([columns[feature] for feature in FEATURES]),
+            logged['clicked'].to_numpy(dtype=np.float64), logged['query_id'].to_numpy())
+
+
+def fit_weights(X: np.ndarray, clicked: np.ndarray, l2: float = 1.0,
+                iterations: int = 25, name: str = 'trained') -> ScoringModel:
+    """
+    L2-regularized logistic regression of clicks on the feature columns
+
+    Solved by Newton's method (IRLS) on standardized features; constant
+    columns get no weight. The intercept is dropped and the weights are
+    scaled to sum to 1 in absolute value, which changes no ranking.
+
+    Args:
+        X: Feature matrix with FEATURES as columns
+        clicked: 0/1 labels
+        l2: Ridge penalty on the standardized weights (not the intercept)
+        iterations: Maximum Newton steps
+        name: Name of the returned model
+
+    Returns:
+        ScoringModel over FEATURES
+    """
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    varying = std > 1e-12
+    Z = np.column_stack([np.ones(len(X)), (X[:, varying] - mean[varying]) / std[varying]])
+    penalty = np.full(Z.shape[1], float(l2))
+    penalty[0] = 0.0
+
+    w = np.zeros(Z.shape[1])
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(Z @ w)))
+        gradient = Z.T @ (p - clicked) + penalty * w
+        hessian = (Z * (p * (1 - p))[:, None]).T @ Z + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < 1e-8:
+            break
+
+    weights = np.zeros(X.shape[1])
+    weights[varying] = w[1:] / std[varying]
+    total = np.abs(weights).sum()
+    if total > 0:
+        weights /= total
+    return ScoringModel.from_vector(weights, name)
+
+
+def auc(scores: np.ndarray, clicked: np.ndarray) -> float:
+    """Probability that a clicked place outscores a skipped one (ties count half)"""
+    positives = clicked > 0
+    num_pos = positives.sum()
+    num_neg = len(clicked) - num_pos
+    if num_pos == 0 or num_neg == 0:
+        return float('nan')
+    ranks = pd.Series(scores).rank().to_numpy()
+    return float((ranks[positives].sum() - num_pos * (num_pos + 1) / 2) / (num_pos * num_neg))
+
+
+def split_queries(query_ids: np.ndarray, holdout: float = 0.2, seed: int = 0) -> np.ndarray:
+    """Boolean mask of rows whose query lands in the holdout set"""
+    queries = pd.unique(query_ids)
+    rng = np.random.default_rng(seed)
+    held = rng.choice(queries, int(round(len(queries) * holdout)), replace=False)
+    return np.isin(query_ids, held)
+
+
+def train(engine, interactions: pd.DataFrame, l2: float = 1.0, holdout: float = 0.2,
+          baseline: ScoringModel = None) -> tuple:
+    """
+    Fit a model on part of the queries and compare it to a baseline on the rest
+
+    Args:
+        engine: RecommendationEngine the log was recorded against
+        interactions: Log as returned by load_interactions()
+        l2: Ridge penalty passed to fit_weights()
+        holdout: Share of queries held out for evaluation
+        baseline: Model to compare with (default: the engine's scoring model)
+
+    Returns:
+        (trained ScoringModel, report dict with row counts and holdout AUCs)
+    """
+    X, clicked, query_ids = interaction_features(engine, interactions)
+    if len(X) == 0:
+        raise ValueError("No logged place matches the engine's dataset")
+    baseline = baseline or engine.index.scoring_model
+    test = split_queries(query_ids, holdout) if holdout else np.zeros(len(X), dtype=bool)
+    model = fit_weights(X[~test], clicked[~test], l2)
+
+    columns = {feature: X[test, i] for i, feature in enumerate(FEATURES)}
+    report = {
+        'rows': len(interactions),
+        'matched_rows': len(X),
+        'train_rows': int((~test).sum()),
+        'holdout_rows': int(test.sum()),
+        'click_rate': float(clicked.mean()),
+    }
+    if test.any():
+        for label, scorer in (('baseline', baseline), ('trained', model)):
+            scores = np.broadcast_to(scorer.evaluate(columns), test.sum())
+            report[f'{label}_auc'] = auc(scores, clicked[test])
+    return model, report
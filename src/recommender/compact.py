@@ -0,0 +1,213 @@
+"""
+Compact Places
+Load-time columnar normalization of places data to cut memory per city
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Low-cardinality strings stored as pandas categoricals (integer codes + one copy per value)
+CATEGORICAL_COLUMNS = ['category', 'source']
+
+# Comma-joined label lists stored as multi-hot bitsets
+LABEL_COLUMNS = ['types', 'categories']
+
+# Integer columns downcast to the narrowest type holding their values. rating,
+# latitude and longitude stay float64 so scores and distances are unchanged.
+INTEGER_COLUMNS = {'review_count': np.int32, 'price_level': np.int8, 'price_estimate': np.int8}
+
+_ARROW_STRING = pd.StringDtype('pyarrow')
+
+
+class LabelSet:
+    """
+    Multi-hot bitset of a comma-joined label column
+
+    Every distinct label gets one bit; a row's labels are packed into
+    ceil(len(labels) / 8) bytes. Decoded strings list labels in vocabulary
+    (first appearance) order.
+    """
+
+    def __init__(self, values: pd.Series):
+        """
+        Args:
+            values: Comma-joined label strings (None/NaN for rows without the column)
+        """
+        self.is_null = values.isna().to_numpy()
+        codes, combos = pd.factorize(values)
+
+        # Split each distinct combination once; rows repeat combinations heavily
+        split = [[label for label in combo.split(',') if label] for combo in combos]
+        vocabulary = {}
+        for labels in split:
+            for label in labels:
+                vocabulary.setdefault(label, len(vocabulary))
+        self.labels = pd.Index(list(vocabulary), dtype=object)
+
+        combo_bits = np.zeros((len(combos) + 1, max(len(vocabulary), 1)), dtype=bool)
+        for i, labels in enumerate(split):
+            combo_bits[i, [vocabulary[label] for label in labels]] = True
+
+        # Null rows (code -1) take the all-zero last row
+        self.bits = np.packbits(combo_bits, axis=1)[codes]
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes + self.is_null.nbytes + int(self.labels.memory_usage(deep=True))
+
+    def mask(self, labels: list, match_all: bool = False) -> np.ndarray:
+        """
+        Rows carrying any (or all) of the given labels
+
+        Returns:
+            Boolean mask over all rows
+        """
+        wanted = self.labels.get_indexer(list(labels))
+        if match_all and (wanted < 0).any():
+            return np.zeros(len(self), dtype=bool)
+        wanted = wanted[wanted >= 0]
+        if len(wanted) == 0:
+            return np.zeros(len(self), dtype=bool)
+
+        byte, bit = wanted // 8, np.uint8(0x80) >> (wanted % 8).astype(np.uint8)
+        hits = (self.bits[:, byte] & bit) != 0
+        return hits.all(axis=1) if match_all else hits.any(axis=1)
+
+    def decode(self, positions: np.ndarray) -> np.ndarray:
+        """Comma-joined label strings of the given rows (None for null rows)"""
+        bits = np.unpackbits(self.bits[positions], axis=1, count=len(self.labels)).astype(bool)
+        labels = self.labels.to_numpy()
+        out = np.empty(len(positions), dtype=object)
+        for i, (row, null) in enumerate(zip(bits, self.is_null[positions])):
+            out[i] = None if null else ','.join(labels[row])
+        return out
+
+
+def compact_places(places_df: pd.DataFrame) -> tuple:
+    """
+    Memory-compact copy of a places DataFrame
+
+    - category/source become categoricals
+    - integer columns are downcast (review_count int32, price_level and
+      price_estimate int8) when they have no missing values
+    - types/categories move out of the frame into LabelSets
+    - other string columns become Arrow-backed strings
+
+    Args:
+        places_df: Places as loaded from {city}_places.parquet
+
+    Returns:
+        (compact DataFrame, {column: LabelSet}, original column order)
+    """
+    columns = list(places_df.columns)
+    labels = {col: LabelSet(places_df[col]) for col in LABEL_COLUMNS if col in places_df}
+
+    compact = {}
+    for col in columns:
+        if col in labels:
+            continue
+        series = original = places_df[col]
+        if col in CATEGORICAL_COLUMNS:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+        elif col in INTEGER_COLUMNS and series.dtype != INTEGER_COLUMNS[col] \
+                and _fits(series, INTEGER_COLUMNS[col]):
+            series = series.astype(INTEGER_COLUMNS[col])
+        elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+            series = series.astype(_ARROW_STRING)
+        if series is original and not _is_read_only(series):
+            # Never share writable memory with the caller
+            series = series.copy()
+        compact[col] = series
+
+    # copy=False keeps read-only columns (views of a memory-mapped file
+    # written by compact_table) mapped instead of consolidating them
+    return pd.DataFrame(compact, index=places_df.index, copy=False), labels, columns
+
+
+def compact_table(table: pa.Table) -> pa.Table:
+    """
+    Arrow table already in the layout compact_places gives its scalar columns
+
+    Categorical columns become int8-coded dictionaries (sorted, like
+    astype('category')), fitting integer columns are narrowed and float
+    nulls become NaN. Memory-mapped and converted with to_pandas, these
+    columns are zero-copy read-only arrays that compact_places keeps as
+    they are, so they stay shared between the processes mapping the file.
+    Label columns are left as strings (their LabelSets are built per process).
+    """
+    table = table.combine_chunks()
+    for i, name in enumerate(table.column_names):
+        column = table.column(i)
+        if name in CATEGORICAL_COLUMNS and pa.types.is_string(column.type):
+            values = pc.unique(column).drop_null().sort()
+            if len(values) > np.iinfo(np.int8).max:
+                continue
+            indices = pc.index_in(column, value_set=values).cast(pa.int8())
+            column = pa.chunked_array([pa.DictionaryArray.from_arrays(chunk, values)
+                                       for chunk in indices.chunks], pa.dictionary(pa.int8(), pa.string()))
+        elif name in INTEGER_COLUMNS and pa.types.is_integer(column.type) and column.null_count == 0:
+            info = np.iinfo(INTEGER_COLUMNS[name])
+            bounds = pc.min_max(column)
+            if len(column) == 0 or (bounds['min'].as_py() >= info.min and bounds['max'].as_py() <= info.max):
+                column = column.cast(pa.from_numpy_dtype(INTEGER_COLUMNS[name]))
+        elif pa.types.is_floating(column.type) and column.null_count:
+            column = pc.fill_null(column, float('nan'))
+        else:
+            continue
+        table = table.set_column(i, name, column)
+    return table
+
+
+def _is_read_only(series: pd.Series) -> bool:
+    """Whether a column's values cannot be written (Arrow-backed or a read-only view)"""
+    array = series.array
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        return True
+    if isinstance(array, pd.Categorical):
+        return not array.codes.flags.writeable
+    return not np.asarray(array).flags.writeable
+
+
+def _fits(series: pd.Series, dtype) -> bool:
+    """Whether a numeric column is whole, has no missing values and fits dtype"""
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return False
+    values = series.to_numpy()
+    if len(values) == 0:
+        return True
+    info = np.iinfo(dtype)
+    return bool(values.min() >= info.min and values.max() <= info.max and
+                (values == np.round(values)).all())
+
+
+def memory_report(places_df: pd.DataFrame, compact_df: pd.DataFrame, labels: dict) -> dict:
+    """
+    Per-column memory before and after compact_places
+
+    Returns:
+        Dictionary with:
+            columns: column -> {'before_mb', 'after_mb'}
+            before_mb, after_mb, saved_mb, saved_pct: totals
+    """
+    before = places_df.memory_usage(deep=True, index=False)
+    after = compact_df.memory_usage(deep=True, index=False)
+    columns = {}
+    for col in places_df.columns:
+        size = labels[col].nbytes if col in labels else after[col]
+        columns[col] = {'before_mb': before[col] / 1e6, 'after_mb': size / 1e6}
+
+    before_mb = sum(entry['before_mb'] for entry in columns.values())
+    after_mb = sum(entry['after_mb'] for entry in columns.values())
+    return {
+        'columns': columns,
+        'before_mb': before_mb,
+        'after_mb': after_mb,
+        'saved_mb': before_mb - after_mb,
+        'saved_pct': (before_mb - after_mb) / before_mb * 100 if before_mb else 0.0
+    }
@@ -0,0 +1,198 @@
+"""
+Itinerary Builder
+Groups candidate places into geographic days and orders each day's stops
+"""
+
+import numpy as np
+from config.config import (
+    ITINERARY_DISTANCE_PENALTY, ITINERARY_KMEANS_ITERATIONS, ITINERARY_MAX_CANDIDATES,
+    ITINERARY_PLACES_PER_DAY
+)
+
+EARTH_RADIUS_METERS = 6_371_000
+
+
+def project_meters(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """(n, 2) equirectangular x/y in meters around the points' mean latitude"""
+    lat0 = np.radians(lat.mean())
+    return np.column_stack([
+        np.radians(lng) * np.cos(lat0) * EARTH_RADIUS_METERS,
+        np.radians(lat) * EARTH_RADIUS_METERS,
+    ])
+
+
+def kmeans(points: np.ndarray, k: int, iterations: int = ITINERARY_KMEANS_ITERATIONS,
+           seed: int = 0) -> tuple:
+    """
+    Plain vectorized k-means with k-means++ seeding
+
+    Returns:
+        (labels, centers)
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.empty((k, points.shape[1]))
+    centers[0] = points[rng.integers(len(points))]
+    closest = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centers[i] = points[pick]
+        closest = np.minimum(closest, ((points - centers[i]) ** 2).sum(axis=1))
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    for iteration in range(iterations):
+        distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_labels = distances.argmin(axis=1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+    return labels, centers
+
+
+def order_stops(points: np.ndarray) -> np.ndarray:
+    """
+    Visiting order for one day's stops (open path)
+
+    Nearest-neighbour tour from each possible start, keeping the shortest,
+    then improved with 2-opt segment reversals until no move helps.
+    """
+    n = len(points)
+    if n <= 2:
+        return np.arange(n)
+    dist = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+
+    def path_length(path):
+        return dist[path[:-1], path[1:]].sum()
+
+    best = None
+    for start in range(n):
+        path = [start]
+        unvisited = np.ones(n, dtype=bool)
+        unvisited[start] = False
+        for _ in range(n - 1):
+            row = np.where(unvisited, dist[path[-1]], np.inf)
+            nxt = int(row.argmin())
+            path.append(nxt)
+            unvisited[nxt] = False
+        path = np.array(path)
+        if best is None or path_length(path) < path_length(best):
+            best = path
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(0, n - 2):
+            for j in range(i + 2, n):
+                # Reversing best[i+1..j] replaces edges (i, i+1) and (j, j+1)
+                a, b = best[i], best[i + 1]
+                c = best[j]
+                before = dist[a, b] + (dist[c, best[j + 1]] if j + 1 < n else 0)
+                after = dist[a, c] + (dist[b, best[j + 1]] if j + 1 < n else 0)
+                if after < before - 1e-9:
+                    best[i + 1:j + 1] = best[i + 1:j + 1][::-1].copy()
+                    improved = True
+        # Reversing a prefix is free in an open path: try moving the start
+        for j in range(1, n - 1):
+            if dist[best[0], best[j + 1]] < dist[best[j], best[j + 1]] - 1e-9:
+                best[:j + 1] = best[:j + 1][::-1].copy()
+                improved = True
+    return best
+
+
+def _pick_day(members: np.ndarray, points: np.ndarray, scores: np.ndarray,
+              category_codes: np.ndarray, places_per_day: int, max_per_category: int) -> list:
+    """
+    Stops for one day from a cluster's members
+
+    The day is anchored on the cluster's best place; other members are
+    ranked by score minus ITINERARY_DISTANCE_PENALTY per km from the anchor,
+    with at most max_per_category stops per category.
+    """
+    if len(members) == 0:
+        return []
+    anchor = members[np.argmax(scores[members])]
+    km_from_anchor = np.sqrt(((points[members] - points[anchor]) ** 2).sum(axis=1)) / 1000
+    value = scores[members] - ITINERARY_DISTANCE_PENALTY * km_from_anchor
+    ranked = members[np.argsort(-value, kind='stable')]
+    picks, skipped, per_category = [], [], {}
+    for candidate in ranked:
+        code = category_codes[candidate]
+        if per_category.get(code, 0) < max_per_category:
+            picks.append(candidate)
+            per_category[code] = per_category.get(code, 0) + 1
+            if len(picks) == places_per_day:
+                return picks
+        else:
+            skipped.append(candidate)
+    # Not enough variety in this area: relax the cap rather than leave slots empty
+    return picks + skipped[:places_per_day - len(picks)]
+
+
+def build_itinerary(lat: np.ndarray, lng: np.ndarray, scores: np.ndarray,
+                    category_codes: np.ndarray, num_days: int,
+                    places_per_day: int = ITINERARY_PLACES_PER_DAY,
+                    max_candidates: int = ITINERARY_MAX_CANDIDATES) -> list:
+    """
+    Split candidates into compact days and route each day
+
+    1. Keep the best `max_candidates` by score.
+    2. k-means on location with one cluster per day.
+    3. Each day takes its cluster's best place and the best places near it,
+       capped per category so a day mixes the requested categories; short
+       clusters borrow the nearest unused candidates so every day gets
+       places_per_day stops.
+    4. Stops are ordered with nearest neighbour + 2-opt.
+
+    Args:
+        lat, lng: Candidate coordinates (no NaNs)
+        scores: Candidate scores (higher is better)
+        category_codes: Integer category per candidate
+        num_days: Number of days
+        places_per_day: Stops per day
+
+    Returns:
+        List of num_days arrays of candidate indices in visiting order,
+        best-scored day first
+    """
+    if num_days <= 0 or len(scores) == 0:
+        return []
+
+    candidates = np.arange(len(scores))
+    if len(candidates) > max_candidates:
+        candidates = np.argpartition(-scores, max_candidates - 1)[:max_candidates]
+    points = project_meters(lat[candidates], lng[candidates])
+    local_scores = scores[candidates]
+    local_codes = category_codes[candidates]
+
+    k = min(num_days, len(candidates))
+    labels, centers = kmeans(points, k)
+    num_categories = len(np.unique(local_codes))
+    max_per_category = int(np.ceil(places_per_day / max(min(num_categories, places_per_day), 1)))
+
+    used = np.zeros(len(candidates), dtype=bool)
+    days = []
+    # Fill the strongest clusters first so they keep their best places
+    cluster_strength = np.array([local_scores[labels == c].sum() for c in range(k)])
+    for cluster in np.argsort(-cluster_strength, kind='stable'):
+        members = np.nonzero((labels == cluster) & ~used)[0]
+        picks = _pick_day(members, points, local_scores, local_codes,
+                          places_per_day, max_per_category)
+        if len(picks) < places_per_day:
+            spare = np.nonzero(~used)[0]
+            spare = spare[~np.isin(spare, picks)]
+            nearest = spare[np.argsort(((points[spare] - centers[cluster]) ** 2).sum(axis=1),
+                                       kind='stable')]
+            picks += list(nearest[:places_per_day - len(picks)])
+        picks = np.array(picks, dtype=np.int64)
+        used[picks] = True
+        if len(picks):
+            days.append(picks[order_stops(points[picks])])
+
+    days.sort(key=lambda day: -local_scores[day].sum())
+    days += [np.empty(0, dtype=np.int64)] * (num_days - len(days))
+    return [candidates[day] for day in days]
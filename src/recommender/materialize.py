@@ -0,0 +1,309 @@
+"""
+Materialized Lookup
+Precomputed recommendations and itineraries for every category/budget/day combination
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from config.config import (
+    BUDGET_TIERS, CATEGORY_KEYWORDS, ITINERARY_DISTANCE_PENALTY, ITINERARY_KMEANS_ITERATIONS,
+    ITINERARY_MAX_CANDIDATES, ITINERARY_PLACES_PER_DAY, MATERIALIZE_MAX_DAYS, MATERIALIZE_TOP_N
+)
+
+# Bit of each category in a combination key, in CATEGORY_KEYWORDS order
+CATEGORY_BITS = {category: 1 << bit for bit, category in enumerate(CATEGORY_KEYWORDS)}
+NUM_MASKS = 1 << len(CATEGORY_BITS)
+BUDGET_LEVELS = sorted(BUDGET_TIERS)
+
+# Arrays of a lookup, one .npy file each
+ARRAYS = (
+    'rec_positions',    # (keys, top_n) int32 row positions, best first, -1 padded
+    'rec_scores',       # (keys, top_n) float64 scores
+    'rec_max_review',   # (keys,) float64 max log review count of the candidates
+    'rec_candidates',   # (keys,) int64 candidates before top_n (0 = no match)
+    'itin_positions',   # (keys * max_days, max_days * places_per_day) int32, -1 padded
+    'itin_scores',      # same shape, float64
+    'itin_lengths',     # (keys * max_days, max_days) int16 stops per day
+    'itin_days',        # (keys * max_days,) int16 days returned (0 = empty itinerary)
+)
+
+
+def category_mask(categories: list):
+    """Combination key of a category list, or None if it has an unknown category"""
+    mask = 0
+    for category in categories:
+        if category not in CATEGORY_BITS:
+            return None
+        mask |= CATEGORY_BITS[category]
+    return mask or None
+
+
+def mask_categories(mask: int) -> list:
+    return [category for category, bit in CATEGORY_BITS.items() if mask & bit]
+
+
+def fingerprint(engine) -> str:
+    """
+    Hash of everything a materialized result depends on
+
+    Covers the scoring model, the itinerary settings and, row by row, the
+    feature, filter and coordinate arrays of the engine's dataset. A lookup
+    is only used by engines with the same fingerprint.
+    """
+    index = engine.index
+    digest = hashlib.blake2b(digest_size=16)
+    settings = {
+        'model': index.scoring_model.to_dict(),
+        'itinerary': [ITINERARY_MAX_CANDIDATES, ITINERARY_KMEANS_ITERATIONS,
+                      ITINERARY_DISTANCE_PENALTY],
+        'categories': [str(name) for name in index.category_names],
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    arrays = [index.features[feature] for feature in sorted(index.features)] + [
+        index.price_estimate, index.category_codes,
+        engine.spatial_index.latitude, engine.spatial_index.longitude,
+    ]
+    if 'category_match' in index.scoring_model.features:
+        arrays.append(index.venue_bits)
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+class MaterializedLookup:
+    """
+    Precomputed results indexed by (category mask, budget level[, days])
+
+    Category masks range over all non-empty subsets of CATEGORY_KEYWORDS.
+    Recommendation rows hold the top_n best places of every combination,
+    so any smaller top_n is a prefix; itinerary rows hold every day count
+    up to max_days at the default places_per_day. Loaded arrays are
+    memory-mapped, so a lookup costs one row read.
+    """
+
+    def __init__(self, arrays: dict, meta: dict):
+        self.arrays = arrays
+        self.meta = meta
+        self.top_n = meta['top_n']
+        self.max_days = meta['max_days']
+        self.places_per_day = meta['places_per_day']
+        self.source = None   # Directory the arrays are mapped from, if loaded
+
+    def __reduce__(self):
+        # A loaded lookup is reopened from its files instead of copying the mapped arrays
+        if self.source is not None:
+            return (type(self).load, (str(self.source),))
+        return (type(self), (self.arrays, self.meta))
+
+    @staticmethod
+    def path(directory: str, city_name: str, engine_fingerprint: str) -> Path:
+        return Path(directory) / city_name / engine_fingerprint
+
+    @classmethod
+    def find(cls, directory: str, city_name: str, engine):
+        """
+        Load the lookup matching an engine, if one was materialized
+
+        The dataset is only fingerprinted when the city has lookups at all.
+
+        Returns:
+            MaterializedLookup or None
+        """
+        if not (Path(directory) / city_name).is_dir():
+            return None
+        path = cls.path(directory, city_name, fingerprint(engine))
+        return cls.load(path) if (path / 'meta.json').exists() else None
+
+    @classmethod
+    def load(cls, path: str) -> 'MaterializedLookup':
+        path = Path(path)
+        meta = json.loads((path / 'meta.json').read_text())
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode='r') for name in ARRAYS}
+        lookup = cls(arrays, meta)
+        lookup.source = path
+        return lookup
+
+    def save(self, path: str):
+        """
+        Write the lookup to a directory
+
+        Files are written to a temporary sibling directory that is renamed
+        into place, so engines never see a partial lookup. Lookups of other
+        fingerprints of the same city are removed.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=path.parent, prefix='.tmp-'))
+        try:
+            for name in ARRAYS:
+                np.save(tmp_dir / f"{name}.npy", self.arrays[name])
+            (tmp_dir / 'meta.json').write_text(json.dumps(self.meta, indent=2))
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp_dir, path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        for old in path.parent.iterdir():
+            if old != path and not old.name.startswith('.'):
+                shutil.rmtree(old, ignore_errors=True)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def _key(self, categories: list, budget_level: int):
+        mask = category_mask(categories)
+        if mask is None or budget_level not in BUDGET_TIERS:
+            return None
+        return mask * len(BUDGET_LEVELS) + BUDGET_LEVELS.index(budget_level)
+
+    def recommendations(self, categories: list, budget_level: int, top_n: int):
+        """
+        Stored top_n recommendations of a combination
+
+        Returns:
+            (positions, scores, max review score, number of candidates),
+            or None when the combination or top_n is not covered
+        """
+        key = self._key(categories, budget_level)
+        if key is None or not 0 <= top_n <= self.top_n:
+            return None
+        positions = self.arrays['rec_positions'][key]
+        count = min(top_n, int((positions >= 0).sum()))
+        return (positions[:count].astype(np.int64), np.array(self.arrays['rec_scores'][key, :count]),
+                float(self.arrays['rec_max_review'][key]), int(self.arrays['rec_candidates'][key]))
+
+    def itinerary(self, categories: list, budget_level: int, num_days: int, places_per_day: int):
+        """
+        Stored itinerary of a combination
+
+        Returns:
+            (list of (positions, scores) per day, max review score), or
+            None when the combination is not covered
+        """
+        key = self._key(categories, budget_level)
+        if (key is None or places_per_day != self.places_per_day
+                or not 1 <= num_days <= self.max_days):
+            return None
+        row = key * self.max_days + num_days - 1
+        positions = self.arrays['itin_positions'][row]
+        scores = self.arrays['itin_scores'][row]
+        lengths = self.arrays['itin_lengths'][row]
+        days = []
+        start = 0
+        for length in lengths[:self.arrays['itin_days'][row]]:
+            days.append((positions[start:start + length].astype(np.int64),
+                         np.array(scores[start:start + length])))
+            start += length
+        return days, float(self.arrays['rec_max_review'][key])
+
+
+# Engine of the pool's worker processes (inherited through fork)
+_engine = None
+
+
+def _init_worker(engine):
+    global _engine
+    _engine = engine
+
+
+def _compute(task: tuple) -> tuple:
+    """Recommendations and every itinerary length of one (mask, budget, top_n, max_days, ppd)"""
+    mask, budget_level, top_n, max_days, places_per_day = task
+    categories = mask_categories(mask)
+    positions, scores, max_review, num_candidates = _engine._top_recommendations(
+        categories, budget_level, top_n)
+    itineraries = [
+        [(stops, stop_scores) for stops, _, stop_scores in
+         _engine._itinerary_days(categories, budget_level, num_days, places_per_day)]
+        for num_days in range(1, max_days + 1)
+    ]
+    return positions, scores, max_review, num_candidates, itineraries
+
+
+def materialize(engine, top_n: int = MATERIALIZE_TOP_N, max_days: int = MATERIALIZE_MAX_DAYS,
+                places_per_day: int = ITINERARY_PLACES_PER_DAY, workers: int = None,
+                progress=None) -> MaterializedLookup:
+    """
+    Compute every combination with the engine's own query paths
+
+    Args:
+        engine: RecommendationEngine to materialize
+        top_n: Recommendations stored per combination
+        max_days: Longest itinerary stored
+        places_per_day: Stops per itinerary day
+        workers: Worker processes (default: one per CPU; 1 runs in-process).
+            Workers are forked, sharing the loaded engine copy-on-write.
+        progress: Called with (done, total) after each combination
+
+    Returns:
+        MaterializedLookup ready to save()
+    """
+    keys = [(mask, budget) for mask in range(NUM_MASKS) for budget in BUDGET_LEVELS]
+    tasks = [(mask, budget, top_n, max_days, places_per_day) for mask, budget in keys if mask]
+    num_keys = len(keys)
+    width = max_days * places_per_day
+    arrays = {
+        'rec_positions': np.full((num_keys, top_n), -1, dtype=np.int32),
+        'rec_scores': np.full((num_keys, top_n), np.nan),
+        'rec_max_review': np.zeros(num_keys),
+        'rec_candidates': np.zeros(num_keys, dtype=np.int64),
+        'itin_positions': np.full((num_keys * max_days, width), -1, dtype=np.int32),
+        'itin_scores': np.full((num_keys * max_days, width), np.nan),
+        'itin_lengths': np.zeros((num_keys * max_days, max_days), dtype=np.int16),
+        'itin_days': np.zeros(num_keys * max_days, dtype=np.int16),
+    }
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_init_worker, initargs=(engine,))
+        results = executor.map(_compute, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+    else:
+        executor = None
+        _init_worker(engine)
+        results = map(_compute, tasks)
+
+    try:
+        for done, ((mask, budget, *_), result) in enumerate(zip(tasks, results), 1):
+            positions, scores, max_review, num_candidates, itineraries = result
+            key = mask * len(BUDGET_LEVELS) + BUDGET_LEVELS.index(budget)
+            arrays['rec_positions'][key, :len(positions)] = positions
+            arrays['rec_scores'][key, :len(scores)] = scores
+            arrays['rec_max_review'][key] = max_review
+            arrays['rec_candidates'][key] = num_candidates
+            for num_days, days in enumerate(itineraries, 1):
+                row = key * max_days + num_days - 1
+                arrays['itin_days'][row] = len(days)
+                start = 0
+                for day, (stops, stop_scores) in enumerate(days):
+                    arrays['itin_positions'][row, start:start + len(stops)] = stops
+                    arrays['itin_scores'][row, start:start + len(stops)] = stop_scores
+                    arrays['itin_lengths'][row, day] = len(stops)
+                    start += len(stops)
+            if progress:
+                progress(done, len(tasks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    meta = {
+        'city': engine.city_name,
+        'fingerprint': fingerprint(engine),
+        'num_places': len(engine.places_df),
+        'categories': list(CATEGORY_BITS),
+        'budget_levels': BUDGET_LEVELS,
+        'top_n': top_n,
+        'max_days': max_days,
+        'places_per_day': places_per_day,
+    }
+    return MaterializedLookup(arrays, meta)
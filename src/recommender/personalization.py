@@ -0,0 +1,242 @@
+"""
+Personalization
+User profile store and place feature vectors for similarity reranking
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from config.config import PROFILE_CELL_METERS, PROFILE_DB_PATH, PROFILE_VISITED_WEIGHT
+
+PROFILE_KINDS = ('liked', 'visited')
+
+METERS_PER_DEG_LAT = np.radians(1) * 6_371_000
+
+
+class ProfileStore:
+    """
+    Liked and visited place_ids per user in a local SQLite database
+
+    Every call opens its own short-lived connection, so one store can be
+    shared by server threads and forked workers. The database runs in WAL
+    mode: readers never wait for a writer.
+    """
+
+    def __init__(self, path: str = PROFILE_DB_PATH):
+        """
+        Args:
+            path: Database file, created with its table if missing
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS interactions ("
+                " user_id TEXT NOT NULL,"
+                " kind TEXT NOT NULL CHECK (kind IN ('liked', 'visited')),"
+                " place_id TEXT NOT NULL,"
+                " recorded_at REAL NOT NULL,"
+                " PRIMARY KEY (user_id, kind, place_id)"
+                ") WITHOUT ROWID"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Connection committed on success, rolled back on error, always closed"""
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, user_id: str, kind: str, place_ids: list) -> int:
+        """
+        Add places to a user's liked or visited list (repeats are ignored)
+
+        Returns:
+            Number of places newly added
+        """
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(PROFILE_KINDS)}")
+        now = time.time()
+        with self._connect() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO interactions VALUES (?, ?, ?, ?)",
+                [(user_id, kind, str(place_id), now) for place_id in place_ids]
+            )
+            added = db.total_changes - before
+        return added
+
+    def like(self, user_id: str, place_ids: list) -> int:
+        return self.record(user_id, 'liked', place_ids)
+
+    def visit(self, user_id: str, place_ids: list) -> int:
+        return self.record(user_id, 'visited', place_ids)
+
+    def remove(self, user_id: str, kind: str, place_ids: list) -> int:
+        """Remove places from a user's list; returns how many were there"""
+        with self._connect() as db:
+            before = db.total_changes
+            db.executemany("DELETE FROM interactions WHERE user_id = ? AND kind = ? AND place_id = ?",
+                           [(user_id, kind, str(place_id)) for place_id in place_ids])
+            return db.total_changes - before
+
+    def clear(self, user_id: str):
+        """Forget everything about a user"""
+        with self._connect() as db:
+            db.execute("DELETE FROM interactions WHERE user_id = ?", (user_id,))
+
+    def get_profile(self, user_id: str) -> dict:
+        """
+        A user's places, oldest first
+
+        Returns:
+            {'liked': [place_id, ...], 'visited': [place_id, ...]}
+        """
+        profile = {kind: [] for kind in PROFILE_KINDS}
+        with self._connect() as db:
+            rows = db.execute("SELECT kind, place_id FROM interactions WHERE user_id = ? "
+                              "ORDER BY recorded_at", (user_id,))
+            for kind, place_id in rows:
+                profile[kind].append(place_id)
+        return profile
+
+
+class PlaceVectors:
+    """
+    Dense float32 feature vector per place row
+
+    Blocks: travel category (one-hot), price estimate (one-hot), every
+    label column such as Google types and Yelp categories (multi-hot), and
+    a location cell of cell_meters (one-hot). Each block is scaled to unit
+    length and each row to unit length overall, so the dot product of two
+    rows is their cosine similarity and every block weighs the same.
+    """
+
+    def __init__(self, places_df: pd.DataFrame, labels: dict = None,
+                 cell_meters: float = PROFILE_CELL_METERS):
+        """
+        Args:
+            places_df: Places (compact layout)
+            labels: {column: LabelSet} split off by compact_places
+            cell_meters: Location cell size
+        """
+        num_rows = len(places_df)
+        blocks = {}   # block name -> (codes or multi-hot matrix, width)
+
+        blocks['category'] = pd.factorize(places_df['category'])
+        price = places_df['price_estimate'].to_numpy(dtype=np.float64, na_value=np.nan)
+        blocks['price'] = (np.where(np.isnan(price), -1, price).astype(np.int64), np.arange(5))
+        for col, label_set in (labels or {}).items():
+            blocks[col] = np.unpackbits(label_set.bits, axis=1, count=len(label_set.labels))
+        blocks['location'] = self._cells(
+            places_df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan),
+            places_df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan), cell_meters
+        )
+
+        widths = {name: (len(block[1]) if isinstance(block, tuple) else block.shape[1])
+                  for name, block in blocks.items()}
+        self.matrix = np.zeros((num_rows, sum(widths.values())), dtype=np.float32)
+        self.blocks = {}   # block name -> column slice
+        filled = np.zeros(num_rows, dtype=np.float32)
+        start = 0
+        for name, block in blocks.items():
+            columns = slice(start, start + widths[name])
+            self.blocks[name] = columns
+            start = columns.stop
+            if isinstance(block, tuple):
+                codes = block[0]
+                rows = np.nonzero((codes >= 0) & (codes < widths[name]))[0]
+                self.matrix[rows, columns.start + codes[rows]] = 1.0
+                filled[rows] += 1
+            else:
+                counts = block.sum(axis=1, dtype=np.float32)
+                self.matrix[:, columns] = block / np.sqrt(np.maximum(counts, 1))[:, None]
+                filled += counts > 0
+        self.matrix /= np.sqrt(np.maximum(filled, 1))[:, None]
+
+        # Rows of each venue (place_id), contiguous in _by_venue. Venue ids are
+        # sorted fixed-width bytes found by binary search: a plain buffer that
+        # published snapshots share, where an object index would be rebuilt as
+        # Python strings (and a hash table) in every worker
+        codes, venue_ids = pd.factorize(places_df['place_id'])
+        venue_ids = np.array([str(venue).encode() for venue in venue_ids], dtype=bytes)
+        order = np.argsort(venue_ids, kind='stable')
+        rank = np.empty(len(order) + 1, dtype=np.int64)
+        rank[order], rank[-1] = np.arange(len(order)), -1
+        self.venue_codes = rank[codes]
+        self.venue_ids = venue_ids[order]
+        self._by_venue = np.argsort(self.venue_codes, kind='stable')
+        self._venue_starts = np.searchsorted(self.venue_codes[self._by_venue],
+                                             np.arange(len(self.venue_ids) + 1))
+
+    @staticmethod
+    def _cells(lat: np.ndarray, lng: np.ndarray, cell_meters: float) -> tuple:
+        """(cell code per row, -1 without coordinates; distinct cells)"""
+        valid = ~(np.isnan(lat) | np.isnan(lng))
+        if not valid.any():
+            return np.full(len(lat), -1), np.empty(0)
+        lat0 = lat[valid].mean()
+        x = np.floor((lng - lng[valid].mean()) * METERS_PER_DEG_LAT * np.cos(np.radians(lat0))
+                     / cell_meters)
+        y = np.floor((lat - lat0) * METERS_PER_DEG_LAT / cell_meters)
+        keys = np.where(valid, x * 1_000_003 + y, np.nan)
+        return pd.factorize(keys)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.matrix.nbytes + self.venue_codes.nbytes + self.venue_ids.nbytes
+                + self._by_venue.nbytes)
+
+    def rows_of(self, place_ids: list) -> np.ndarray:
+        """Row positions of the given venues (every category they are listed under), sorted"""
+        keys = np.array([str(place_id).encode() for place_id in place_ids], dtype=bytes)
+        if len(keys) == 0 or len(self.venue_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        # Longer keys match nothing (and would be truncated by the cast)
+        keys = keys[np.char.str_len(keys) <= self.venue_ids.itemsize].astype(self.venue_ids.dtype)
+        codes = np.searchsorted(self.venue_ids, keys)
+        codes = codes[self.venue_ids[np.minimum(codes, len(self.venue_ids) - 1)] == keys]
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenated _by_venue ranges of every venue, without a Python loop
+        begin = self._venue_starts[codes]
+        lengths = self._venue_starts[codes + 1] - begin
+        offsets = np.repeat(begin - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.sort(self._by_venue[offsets])
+
+    def profile_vector(self, profile: dict, visited_weight: float = PROFILE_VISITED_WEIGHT) -> np.ndarray:
+        """
+        Unit-length preference vector of a profile
+
+        The weighted sum of the liked (1) and visited (visited_weight)
+        places' rows; all zeros when none of them is in this dataset.
+        """
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        for kind, weight in (('liked', 1.0), ('visited', visited_weight)):
+            rows = self.rows_of(profile.get(kind, ()))
+            if len(rows) and weight:
+                vector += weight * self.matrix[rows].sum(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def similarity(self, positions: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the given rows to a unit profile vector"""
+        return self.matrix[positions] @ vector
+
+    def exclude(self, positions: np.ndarray, place_ids: list) -> np.ndarray:
+        """Sorted positions without the rows of the given venues"""
+        rows = self.rows_of(place_ids)
+        if len(rows) == 0 or len(positions) == 0:
+            return positions
+        found = np.searchsorted(positions, rows)
+        found = found[found < len(positions)]
+        found = found[np.isin(positions[found], rows)]
+        return np.delete(positions, found)
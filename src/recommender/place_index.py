@@ -0,0 +1,318 @@
+"""
+Place Index
+Precomputed category/budget buckets and base score arrays for fast queries
+"""
+
+import numpy as np
+import pandas as pd
+from src.models.scoring import DEFAULT_MODEL, ScoringModel, place_features, price_fit
+
+
+class PlaceIndex:
+    """
+    Load-time index over a places DataFrame
+
+    Rows are grouped into (category, price_estimate) buckets holding sorted
+    row positions, and the static scoring features (filled rating, log
+    review count, ...) are stored as flat arrays. A query gathers the
+    matching buckets and scores only those rows with the scoring model, so
+    no per-request pandas filtering or copying of the full frame is needed.
+    """
+
+    def __init__(self, places_df: pd.DataFrame, scoring_model: ScoringModel = DEFAULT_MODEL):
+        """
+        Args:
+            places_df: Places to index
+            scoring_model: Weights used by score() and top_n_batch()
+        """
+        self.num_places = len(places_df)
+        self.scoring_model = scoring_model
+
+        # Static feature columns; rating and log review count are computed
+        # exactly like the original pandas path (benchmarks/bench_place_index.py)
+        self.features = place_features(places_df)
+        self.rating = self.features['rating']
+        self.review_score = self.features['log_reviews']
+        self.static_score = scoring_model.static_score(self.features)
+
+        # Per-row filter columns, for filtering candidate sets from other indexes
+        category = places_df['category']
+        if isinstance(category.dtype, pd.CategoricalDtype):
+            self.category_codes = category.cat.codes.to_numpy(dtype=np.int64)
+            self.category_names = category.cat.categories
+        else:
+            self.category_codes, self.category_names = pd.factorize(category)
+        self.price_estimate = places_df['price_estimate'].to_numpy(dtype=np.float64)
+        self._place_ids = places_df['place_id'] if 'place_id' in places_df else None
+        self._venue_bits = None
+
+        # Bucket rows by (category code, price_estimate); missing categories/prices never match
+        rows = np.nonzero((self.category_codes >= 0) & ~np.isnan(self.price_estimate))[0]
+        groups = pd.Series(rows).groupby(
+            [self.category_codes[rows], self.price_estimate[rows]], sort=False
+        ).indices
+        self.buckets = {}
+        self.bucket_max_review = {}
+        for (code, price_est), members in groups.items():
+            positions = np.sort(rows[members])
+            cat = self.category_names[code]
+            self.buckets[(cat, price_est)] = positions
+            self.bucket_max_review[(cat, price_est)] = self.review_score[positions].max()
+
+        self.category_counts = {}
+        for (cat, _), positions in self.buckets.items():
+            self.category_counts[cat] = self.category_counts.get(cat, 0) + len(positions)
+
+    def category_keys(self, categories: list) -> list:
+        """Bucket keys inside the selected categories"""
+        wanted = set(categories)
+        return [key for key in self.buckets if key[0] in wanted]
+
+    def budget_keys(self, keys: list, budget_level: int) -> list:
+        """Bucket keys within a budget (price_estimate at or below it, or 0)"""
+        return [key for key in keys if key[1] <= budget_level or key[1] == 0]
+
+    def gather(self, keys: list) -> tuple:
+        """
+        Rows of the given buckets
+
+        Returns:
+            (sorted row positions, max log review count over those rows)
+        """
+        if not keys:
+            return np.empty(0, dtype=np.int64), 0.0
+        positions = np.sort(np.concatenate([self.buckets[key] for key in keys]))
+        return positions, max(self.bucket_max_review[key] for key in keys)
+
+    def count_in_categories(self, categories: list) -> int:
+        """Number of places in the given categories (before the budget filter)"""
+        return sum(self.category_counts.get(cat, 0) for cat in set(categories))
+
+    def candidates(self, categories: list, budget_level: int) -> tuple:
+        """
+        Rows matching the category and budget filters
+
+        Returns:
+            (sorted row positions, max log review count over those rows)
+        """
+        return self.gather(self.budget_keys(self.category_keys(categories), budget_level))
+
+    def matches(self, positions: np.ndarray, categories: list = None,
+                budget_level: int = None) -> np.ndarray:
+        """
+        Which of the given rows pass the category and budget filters
+
+        Args:
+            positions: Row positions to test
+            categories: Allowed categories (None = any)
+            budget_level: Max price_estimate, 0 always allowed (None = any)
+
+        Returns:
+            Boolean mask aligned with positions
+        """
+        keep = np.ones(len(positions), dtype=bool)
+        if categories is not None:
+            wanted = self.category_names.get_indexer(list(categories))
+            keep &= np.isin(self.category_codes[positions], wanted[wanted >= 0])
+        if budget_level is not None:
+            price = self.price_estimate[positions]
+            keep &= (price <= budget_level) | (price == 0)
+        return keep
+
+    def score(self, positions: np.ndarray, max_review_score: float, budget_level: int = None,
+              categories: list = None, distances_km: np.ndarray = None) -> tuple:
+        """
+        Recommendation scores for a candidate set
+
+        Review scores are normalized by the maximum over the candidate set,
+        matching the original pandas path on the equivalent filtered
+        DataFrame (scan_recommendations in benchmarks/bench_place_index.py). The
+        query arguments feed the query-dependent features and are only used
+        when the scoring model weights them.
+
+        Args:
+            positions: Candidate row positions
+            max_review_score: Max log review count over the candidates
+            budget_level: Requested budget (price_fit; None gives 0)
+            categories: Requested categories (category_match; None matches all)
+            distances_km: Distance of each candidate from the query point
+
+        Returns:
+            (scores, normalized review scores)
+        """
+        review_score = self.normalized_reviews(positions, max_review_score)
+        model = self.scoring_model
+        static = self.static_score[positions] if model.static_features else None
+        columns = {}
+        for feature in model.features[len(model.static_features):]:
+            if feature == 'log_reviews':
+                columns[feature] = review_score
+            elif feature == 'price_fit':
+                columns[feature] = (price_fit(self.price_estimate[positions], budget_level)
+                                    if budget_level is not None else 0.0)
+            elif feature == 'category_match':
+                columns[feature] = (self.category_match(positions, categories)
+                                    if categories is not None else 1.0)
+            elif feature == 'distance':
+                columns[feature] = distances_km if distances_km is not None else 0.0
+        scores = model.evaluate(columns, static)
+        return np.broadcast_to(scores, len(positions)).astype(np.float64, copy=False), review_score
+
+    @property
+    def venue_bits(self) -> np.ndarray:
+        """
+        Bitmask per row of every category its venue (place_id) is listed
+        under (bit = category code), built on first use
+        """
+        return self.build_venue_bits()
+
+    def build_venue_bits(self) -> np.ndarray:
+        """Build venue_bits unless it is built already, and return it"""
+        if self._venue_bits is None:
+            if len(self.category_names) > 64:
+                raise ValueError("category_match supports at most 64 categories")
+            if self._place_ids is not None:
+                venues, _ = pd.factorize(self._place_ids)
+            else:
+                venues = np.full(self.num_places, -1)
+            # Rows without a place_id are venues of their own
+            missing = venues < 0
+            venues[missing] = venues.max(initial=-1) + 1 + np.arange(missing.sum())
+
+            rows = np.nonzero(self.category_codes >= 0)[0]
+            by_venue = np.zeros(venues.max(initial=-1) + 1, dtype=np.uint64)
+            np.bitwise_or.at(by_venue, venues[rows],
+                             np.left_shift(np.uint64(1), self.category_codes[rows].astype(np.uint64)))
+            dtype = np.min_scalar_type((1 << max(len(self.category_names), 1)) - 1)
+            self._venue_bits = by_venue[venues].astype(dtype)
+        return self._venue_bits
+
+    def category_match(self, positions: np.ndarray, categories: list) -> np.ndarray:
+        """Share of the requested categories each row's venue is listed under"""
+        wanted = self.category_names.get_indexer(list(categories))
+        wanted = np.unique(wanted[wanted >= 0])
+        if len(wanted) == 0:
+            return np.zeros(len(positions))
+        bits = self.venue_bits[positions]
+        matched = np.zeros(len(positions), dtype=np.uint8)
+        for code in wanted:
+            matched += (bits >> bits.dtype.type(code)) & 1
+        return matched / len(wanted)
+
+    def normalized_reviews(self, positions: np.ndarray, max_review_score: float) -> np.ndarray:
+        """Log review counts of the given rows divided by the candidate maximum"""
+        review_score = self.review_score[positions]
+        if max_review_score > 0:
+            review_score = review_score / max_review_score
+        return review_score
+
+    def top_n(self, positions: np.ndarray, scores: np.ndarray, top_n: int) -> tuple:
+        """
+        Select the top_n candidates by score
+
+        Ties are broken by row position, the same as DataFrame.nlargest.
+
+        Returns:
+            (positions, scores) of the selected rows, best first
+        """
+        if top_n <= 0 or len(positions) == 0:
+            return positions[:0], scores[:0]
+        if len(positions) > top_n:
+            # Keep everything tied with the top_n-th score so ties resolve by position
+            kth = np.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+            keep = scores >= kth
+            positions, scores = positions[keep], scores[keep]
+        order = np.lexsort((positions, -scores))[:top_n]
+        return positions[order], scores[order]
+
+    def top_n_batch(self, category_masks: np.ndarray, budget_levels: np.ndarray,
+                    top_n: int, chunk_cells: int = 4_000_000) -> tuple:
+        """
+        Top-N rows for many (category set, budget) queries in one pass
+
+        For a chunk of queries a (queries x places) boolean mask is built from
+        the category membership matrix and the budget column, the scoring
+        model is evaluated over the whole chunk (review scores normalized per
+        query by the masked maximum), and np.argpartition picks each row's
+        top_n. Rows whose top_n boundary falls inside a tie
+        are recomputed with the single-query path so ties resolve by row
+        position exactly like get_recommendations.
+
+        Args:
+            category_masks: (queries, len(category_names)) bool, selected categories
+            budget_levels: (queries,) budget level per query
+            top_n: Results per query
+            chunk_cells: Max queries x places cells evaluated at once
+
+        Returns:
+            (positions, scores, counts): (queries, top_n) int64 positions
+            padded with -1, matching float64 scores padded with NaN, and the
+            number of valid results per query
+        """
+        num_queries = len(budget_levels)
+        positions = np.full((num_queries, top_n), -1, dtype=np.int64)
+        scores = np.full((num_queries, top_n), np.nan)
+        counts = np.zeros(num_queries, dtype=np.int64)
+        if num_queries == 0 or top_n <= 0 or self.num_places == 0:
+            return positions, scores, counts
+
+        # Rows with an unknown category or price never match
+        codes = self.category_codes
+        known = (codes >= 0) & ~np.isnan(self.price_estimate)
+        safe_codes = np.where(codes >= 0, codes, 0)
+        free = self.price_estimate == 0
+        k = min(top_n, self.num_places)
+        chunk = max(1, chunk_cells // self.num_places)
+
+        for start in range(0, num_queries, chunk):
+            stop = min(start + chunk, num_queries)
+            mask = category_masks[start:stop][:, safe_codes] & known
+            mask &= (self.price_estimate <= budget_levels[start:stop, None]) | free
+
+            model = self.scoring_model
+            static = self.static_score if model.static_features else None
+            columns = {}
+            for feature in model.features[len(model.static_features):]:
+                if feature == 'log_reviews':
+                    max_review = np.where(mask, self.review_score, -np.inf).max(axis=1)
+                    divisor = np.where(max_review > 0, max_review, 1.0)
+                    columns[feature] = self.review_score / divisor[:, None]
+                elif feature == 'price_fit':
+                    columns[feature] = price_fit(self.price_estimate, budget_levels[start:stop, None])
+                elif feature == 'category_match':
+                    wanted = category_masks[start:stop]
+                    bits = self.venue_bits
+                    matched = np.zeros(mask.shape, dtype=np.uint8)
+                    for code in np.nonzero(wanted.any(axis=0))[0]:
+                        matched += wanted[:, code, None] & ((bits >> bits.dtype.type(code)) & 1).astype(bool)
+                    columns[feature] = matched / np.maximum(wanted.sum(axis=1), 1)[:, None]
+                elif feature == 'distance':
+                    columns[feature] = 0.0
+            matrix = np.broadcast_to(model.evaluate(columns, static), mask.shape).copy()
+            matrix[~mask] = -np.inf
+
+            top = np.argpartition(-matrix, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(matrix, top, axis=1)
+            order = np.lexsort((top, -top_scores), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            valid = np.isfinite(top_scores)
+            positions[start:stop, :k] = np.where(valid, top, -1)
+            scores[start:stop, :k] = np.where(valid, top_scores, np.nan)
+            counts[start:stop] = valid.sum(axis=1)
+
+            # Ties straddling the cut: argpartition may have kept the wrong one
+            kth = top_scores[:, -1]
+            tied = valid[:, -1] & ((matrix == kth[:, None]).sum(axis=1) >
+                                   (top_scores == kth[:, None]).sum(axis=1))
+            for row in np.nonzero(tied)[0]:
+                query = start + row
+                categories = list(self.category_names[category_masks[query]])
+                exact, max_review_score = self.candidates(categories, budget_levels[query])
+                exact_scores, _ = self.score(exact, max_review_score, budget_levels[query], categories)
+                exact, exact_scores = self.top_n(exact, exact_scores, top_n)
+                positions[query, :len(exact)] = exact
+                scores[query, :len(exact)] = exact_scores
+
+        return positions, scores, counts
@@ -0,0 +1,87 @@
+"""
+Projected Reads
+Column-projected, predicate-pushdown parquet reads of a city for one-shot queries
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+from src.data.entity_resolution import matching_sources
+
+# Columns shown by the text listings (src/recommender/rendering.py)
+DISPLAY_COLUMNS = ['name', 'address', 'rating', 'review_count', 'price_estimate', 'category',
+                   'google_maps_url', 'yelp_url']
+
+# Columns the engine builds its indexes and scores from
+ENGINE_COLUMNS = ['place_id', 'latitude', 'longitude', 'rating', 'review_count', 'source',
+                  'category', 'price_estimate', 'calibrated_rating', 'smoothed_rating']
+
+# Columns of get_statistics
+STATISTICS_COLUMNS = ['category', 'source', 'rating', 'review_count', 'price_level']
+
+# Features computed from each row alone (log_reviews is normalized over the
+# candidates, which are exactly the filtered rows). category_match needs a
+# venue's rows in other categories, and ratings aggregated at load time need
+# every row of the dataset.
+ROW_FEATURES = {'rating', 'log_reviews', 'reviews', 'price_fit', 'distance'}
+INGEST_FEATURES = {'calibrated_rating', 'smoothed_rating'}
+
+
+def row_filters(categories: list = None, budget_level: int = None, source: str = None) -> list:
+    """
+    Parquet filters selecting exactly the rows the engine would consider
+
+    Args:
+        categories: Keep these categories
+        budget_level: Keep price_estimate at or below it (0 = free/unknown is kept)
+        source: Keep rows with data from this source (merged google+yelp
+            rows count for both)
+
+    Returns:
+        pyarrow filter list (empty = every row)
+    """
+    filters = []
+    if categories:
+        filters.append(('category', 'in', sorted(set(categories))))
+    if budget_level is not None:
+        filters.append(('price_estimate', '<=', budget_level))
+    if source:
+        filters.append(('source', 'in', matching_sources(source)))
+    return filters
+
+
+def filters_are_exact(features: list, schema_names: list) -> bool:
+    """
+    Whether scoring only the filtered rows gives the full dataset's scores
+
+    True when every feature is computed per row, or was aggregated at
+    ingest time and stored in the file.
+    """
+    stored = INGEST_FEATURES & set(schema_names)
+    return set(features) <= ROW_FEATURES | stored
+
+
+def schema_names(path: str) -> list:
+    """Column names of a parquet file (footer only)"""
+    return pq.read_schema(path).names
+
+
+def read_places(path: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+    """
+    Read some columns of the matching rows of a city's parquet file
+
+    Row groups whose statistics rule out the filters are skipped without
+    being read; files written by write_city_parquet have one row group per
+    category. Requested columns the file does not have are ignored.
+
+    Args:
+        path: {city}_places.parquet
+        columns: Columns to read (default: all)
+        filters: Output of row_filters
+
+    Returns:
+        DataFrame of the matching rows, in file order
+    """
+    if columns is not None:
+        names = set(schema_names(path))
+        columns = [col for col in dict.fromkeys(columns) if col in names]
+    return pq.read_table(path, columns=columns, filters=filters or None).to_pandas()
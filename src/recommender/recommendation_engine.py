@@ -3,30 +3,108 @@ Recommendation Engine
 Generates personalized travel recommendations
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from config.config import CITIES, BUDGET_TIERS, PROCESSED_DATA_DIR
+from config.config import (
+    CITIES, BUDGET_TIERS, PROCESSED_DATA_DIR, ITINERARY_PLACES_PER_DAY,
+    MATERIALIZED_DIR, PERSONALIZATION_CANDIDATES, PERSONALIZATION_WEIGHT
+)
+from src.data.entity_resolution import matching_sources
+from src.instrumentation import DISABLED, Instrumentation
+from src.models.scoring import (
+    DEFAULT_MODEL, FAME_MODEL, SMOOTHED_MODEL, STATIC_FEATURES, ScoringModel
+)
+from src.recommender.compact import compact_places
+from src.recommender.itinerary import build_itinerary
+from src.recommender.materialize import MaterializedLookup
+from src.recommender.personalization import PlaceVectors
+from src.recommender.rendering import render_itinerary, render_recommendations
+from src.recommender.place_index import PlaceIndex
+from src.recommender.spatial_index import SpatialIndex
+
+def place_statistics(places_df: pd.DataFrame) -> dict:
+    """Place counts by category and source, average rating, total reviews and price coverage"""
+    return {
+        'total_places': len(places_df),
+        'by_category': places_df['category'].value_counts().to_dict(),
+        'by_source': places_df['source'].value_counts().to_dict(),
+        'avg_rating': places_df['rating'].mean(),
+        'total_reviews': places_df['review_count'].sum(),
+        'price_coverage': (places_df['price_level'] > 0).sum() / len(places_df) * 100
+    }
 
 class RecommendationEngine:
-    def __init__(self, city_name: str):
+    def __init__(self, city_name: str, places_df: pd.DataFrame = None, verbose: bool = False,
+                 instrumentation: Instrumentation = None, scoring_model: ScoringModel = None,
+                 fame_model: ScoringModel = None, materialized_dir: str = MATERIALIZED_DIR):
         """
         Initialize recommendation engine for a city
         
         Args:
             city_name: 'boston' or 'miami'
+            places_df: Already loaded places (skips reading the parquet file)
+            verbose: Print load and progress messages (off for library/server use)
+            instrumentation: Collects per-stage timings (load, category_filter,
+                budget_filter, scoring, top_n, itinerary); disabled by default
+            scoring_model: Weights of the recommendation score (default:
+                0.7 rating + 0.3 normalized log reviews, with the ingest-time
+                smoothed_rating in place of rating when the dataset has it)
+            fame_model: Weights of the fame score, over static features only
+                (default: 0.3 rating + 0.7 reviews / 100)
+            materialized_dir: Where materialize.py writes precomputed results;
+                a lookup matching this dataset and scoring model answers
+                covered queries without computing them (None: always compute)
         """
         self.city_name = city_name
         self.city_config = CITIES[city_name]
+        self.verbose = verbose
+        self.instrumentation = instrumentation or DISABLED
+        self.fame_model = fame_model or FAME_MODEL
+        if not set(self.fame_model.features) <= set(STATIC_FEATURES):
+            raise ValueError(f"fame_model can only use {', '.join(STATIC_FEATURES)}")
         
-        # Load processed data
-        data_file = Path(PROCESSED_DATA_DIR) / f"{city_name}_places.parquet"
-        if not data_file.exists():
-            raise FileNotFoundError(
-                f"No data found for {city_name}. Run collect_data.py first!"
+        with self.instrumentation.timer('load'):
+            if places_df is None:
+                # Load processed data
+                data_file = Path(PROCESSED_DATA_DIR) / f"{city_name}_places.parquet"
+                if not data_file.exists():
+                    raise FileNotFoundError(
+                        f"No data found for {city_name}. Run collect_data.py first!"
+                    )
+                places_df = pd.read_parquet(data_file)
+            
+            # Categorical codes, narrow ints and label bitsets instead of Python strings
+            self.places_df, self.labels, self._columns = compact_places(places_df)
+            if scoring_model is None:
+                scoring_model = SMOOTHED_MODEL if 'smoothed_rating' in places_df else DEFAULT_MODEL
+            self.index = PlaceIndex(self.places_df, scoring_model)
+            self.spatial_index = SpatialIndex(
+                self.places_df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan),
+                self.places_df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
             )
-        
-        self.places_df = pd.read_parquet(data_file)
-        print(f"✅ Loaded {len(self.places_df)} places for {self.city_config['display_name']}")
+            self.materialized = None
+            if materialized_dir is not None:
+                self.materialized = MaterializedLookup.find(materialized_dir, city_name, self)
+        # Dataset aggregates, computed on first use (an engine never changes its data)
+        self._fame_score = None
+        self._fame_orders = {}   # (category, source) -> positions in descending fame order
+        self._statistics = None
+        self._place_vectors = None
+        if self.verbose:
+            print(f"✅ Loaded {len(self.places_df)} places for {self.city_config['display_name']}")
+            if self.materialized is not None:
+                print(f"⚡ Using materialized results ({self.materialized.meta['fingerprint']})")
+    
+    def __getstate__(self) -> dict:
+        # Instrumentation holds a lock and belongs to the process using the engine
+        state = dict(self.__dict__)
+        del state['instrumentation']
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.instrumentation = DISABLED
     
     def get_recommendations(self, categories: list, budget_level: int, 
                            num_days: int, top_n: int = 20) -> pd.DataFrame:
@@ -42,164 +120,416 @@ class RecommendationEngine:
         Returns:
             DataFrame with top recommendations
         """
-        print("\n" + "="*60)
-        print("🎯 GENERATING RECOMMENDATIONS")
-        print("="*60)
-        print(f"City: {self.city_config['display_name']}")
-        print(f"Categories: {', '.join(categories)}")
-        print(f"Budget: {BUDGET_TIERS[budget_level]['name']} ({BUDGET_TIERS[budget_level]['range']})")
-        print(f"Duration: {num_days} days")
+        if self.verbose:
+            print("\n" + "="*60)
+            print("🎯 GENERATING RECOMMENDATIONS")
+            print("="*60)
+            print(f"City: {self.city_config['display_name']}")
+            print(f"Categories: {', '.join(categories)}")
+            print(f"Budget: {BUDGET_TIERS[budget_level]['name']} ({BUDGET_TIERS[budget_level]['range']})")
+            print(f"Duration: {num_days} days")
+        
+        top = None
+        if self.materialized is not None:
+            with self.instrumentation.timer('materialized'):
+                top = self.materialized.recommendations(categories, budget_level, top_n)
+        if top is None:
+            top = self._top_recommendations(categories, budget_level, top_n)
+        else:
+            self.instrumentation.increment('materialized_hits')
+        top_positions, top_scores, max_review_score, num_candidates = top
         
-        # Filter by categories
-        filtered = self.places_df[self.places_df['category'].isin(categories)].copy()
-        print(f"\n📍 Found {len(filtered)} places in selected categories")
+        if num_candidates == 0:
+            if self.verbose:
+                print("❌ No places match your criteria!")
+            return pd.DataFrame()
+        
+        review_scores = self.index.normalized_reviews(top_positions, max_review_score)
+        return self._result_frame(top_positions, review_scores, top_scores)
+    
+    def get_personalized_recommendations(self, profile: dict, categories: list, budget_level: int,
+                                         top_n: int = 20,
+                                         weight: float = PERSONALIZATION_WEIGHT,
+                                         pool_size: int = PERSONALIZATION_CANDIDATES) -> pd.DataFrame:
+        """
+        Get recommendations reranked for one user
         
-        # Filter by budget
-        filtered = self._filter_by_budget(filtered, budget_level)
-        print(f"💰 After budget filter: {len(filtered)} places")
+        Places the user already visited are left out. The pool_size best
+        remaining candidates by the usual score are then reranked by
+        score + weight * cosine similarity between each place's feature
+        vector and the user's profile vector. An empty profile gives the
+        get_recommendations order.
         
-        if filtered.empty:
-            print("❌ No places match your criteria!")
+        Args:
+            profile: {'liked': [place_id, ...], 'visited': [place_id, ...]}
+                (see ProfileStore.get_profile)
+            categories: List of category preferences
+            budget_level: 1-4
+            top_n: Number of recommendations to return
+            weight: Score points added at similarity 1
+            pool_size: Candidates reranked
+            
+        Returns:
+            DataFrame like get_recommendations with an extra similarity column
+        """
+        positions, max_review_score = self._candidates(categories, budget_level)
+        vectors = self.place_vectors
+        positions = vectors.exclude(positions, profile.get('visited', ()))
+        if len(positions) == 0:
             return pd.DataFrame()
         
-        # Calculate scores
-        filtered = self._calculate_scores(filtered)
+        timer = self.instrumentation.timer
+        with timer('scoring'):
+            scores, _ = self.index.score(positions, max_review_score, budget_level, categories)
+        with timer('personalization'):
+            pool, pool_scores = self.index.top_n(positions, scores, max(pool_size, top_n))
+            similarity = vectors.similarity(pool, vectors.profile_vector(profile))
+            order = np.argsort(pool, kind='stable')
+            pool, scores, similarity = pool[order], pool_scores[order] + weight * similarity, similarity[order]
+            top_positions, top_scores = self.index.top_n(pool, scores, top_n)
+            top = np.searchsorted(pool, top_positions)
+        review_scores = self.index.normalized_reviews(top_positions, max_review_score)
+        
+        recommendations = self._result_frame(top_positions, review_scores, top_scores)
+        recommendations['similarity'] = similarity[top]
+        return recommendations
+    
+    def get_recommendations_near(self, lat: float, lng: float, radius_km: float,
+                                 categories: list, budget_level: int,
+                                 top_n: int = 20) -> pd.DataFrame:
+        """
+        Get recommendations within a radius of a point (e.g. your hotel)
+        
+        Args:
+            lat: Latitude of the point
+            lng: Longitude of the point
+            radius_km: Search radius in kilometers
+            categories: List of category preferences
+            budget_level: 1-4
+            top_n: Number of recommendations to return
+            
+        Returns:
+            DataFrame like get_recommendations with an extra distance_km column
+        """
+        positions, distances = self.spatial_index.within(lat, lng, radius_km * 1000)
+        keep = self.index.matches(positions, categories, budget_level)
+        positions, distances = positions[keep], distances[keep]
+        if len(positions) == 0:
+            return pd.DataFrame()
         
-        # Sort by score
-        recommendations = filtered.nlargest(top_n, 'score')
+        max_review_score = self.index.review_score[positions].max()
+        scores, _ = self.index.score(positions, max_review_score, budget_level, categories,
+                                     distances / 1000)
+        top_positions, top_scores = self.index.top_n(positions, scores, top_n)
+        review_scores = self.index.normalized_reviews(top_positions, max_review_score)
+        top = np.searchsorted(positions, top_positions)
         
+        recommendations = self._result_frame(top_positions, review_scores, top_scores)
+        recommendations['distance_km'] = distances[top] / 1000
         return recommendations
     
-    def get_top_famous_places(self, top_n: int = 5) -> pd.DataFrame:
+    def get_nearest_places(self, lat: float, lng: float, k: int = 10,
+                           categories: list = None, budget_level: int = None) -> pd.DataFrame:
         """
-        Get the most famous/popular places regardless of category
-        Based on review count and ratings
+        Get the k places closest to a point, optionally filtered
         
         Args:
-            top_n: Number of places to return
+            lat: Latitude of the point
+            lng: Longitude of the point
+            k: Number of places to return
+            categories: Only these categories (default: any)
+            budget_level: Only places within this budget (default: any)
             
         Returns:
-            DataFrame with top famous places
+            DataFrame sorted by distance_km, with the usual score columns
+        """
+        positions, distances = self.spatial_index.nearest(
+            lat, lng, k, allowed=lambda rows: self.index.matches(rows, categories, budget_level)
+        )
+        if len(positions) == 0:
+            return pd.DataFrame()
+        
+        scores, review_scores = self.index.score(positions, self.index.review_score[positions].max(),
+                                                 budget_level, categories, distances / 1000)
+        nearest = self._result_frame(positions, review_scores, scores)
+        nearest['distance_km'] = distances / 1000
+        return nearest
+    
+    def get_recommendations_batch(self, profiles: list) -> dict:
+        """
+        Get recommendations for many user profiles at once
+        
+        Identical (categories, budget_level) profiles are computed once, and
+        all distinct ones are scored together in a vectorized pass. Results
+        match get_recommendations for each profile.
+        
+        Args:
+            profiles: (categories, budget_level, top_n) tuples, or dicts
+                with those keys
+            
+        Returns:
+            Dictionary with:
+                positions: (profiles, max top_n) int64 row positions into
+                    places_df, best first, padded with -1
+                scores: Matching scores, padded with NaN
+                counts: Number of results per profile
         """
-        df = self.places_df.copy()
+        names = self.index.category_names
+        masks_by_categories = {}
+        keys = np.empty((len(profiles), 2), dtype=np.int64)
+        top_ns = np.empty(len(profiles), dtype=np.int64)
+        for i, profile in enumerate(profiles):
+            if isinstance(profile, dict):
+                categories = profile['categories']
+                budget_level, top_n = profile['budget_level'], profile.get('top_n', 20)
+            else:
+                categories, budget_level, top_n = profile
+            
+            categories = tuple(categories)
+            bits = masks_by_categories.get(categories)
+            if bits is None:
+                codes = names.get_indexer(list(categories))
+                bits = int(sum(1 << int(code) for code in set(codes[codes >= 0])))
+                masks_by_categories[categories] = bits
+            keys[i] = (bits, budget_level)
+            top_ns[i] = top_n
         
-        # Calculate fame score (heavily weight review count)
-        df['fame_score'] = (
-            df['rating'].fillna(0) * 0.3 +
-            (df['review_count'].fillna(0) / 100) * 0.7  # Normalize reviews
+        # One query per distinct (category set, budget)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        category_masks = (unique_keys[:, :1] >> np.arange(len(names))) & 1 == 1
+        max_top_n = int(top_ns.max()) if len(top_ns) else 0
+        positions, scores, counts = self.index.top_n_batch(
+            category_masks, unique_keys[:, 1], max_top_n
         )
         
-        top_places = df.nlargest(top_n, 'fame_score')
+        # Scatter back to profiles and trim each one to its own top_n
+        counts = np.minimum(counts[inverse], top_ns)
+        keep = np.arange(max_top_n) < counts[:, None]
+        return {
+            'positions': np.where(keep, positions[inverse], -1),
+            'scores': np.where(keep, scores[inverse], np.nan),
+            'counts': counts
+        }
+    
+    def get_top_famous_places(self, top_n: int = 5, category: str = None,
+                              source: str = None) -> pd.DataFrame:
+        """
+        Get the most famous/popular places, optionally of one category or source
+        Based on review count and ratings
+        
+        The fame ordering is computed once per engine (i.e. per loaded
+        dataset) and per category/source filter; later calls slice it.
         
-        return top_places
+        Args:
+            top_n: Number of places to return
+            category: Only places of this category
+            source: Only places with data from this source: 'google' or
+                'yelp' (both include venues merged across sources, whose
+                source is 'google+yelp'), or 'google+yelp' for merged ones only
+            
+        Returns:
+            DataFrame with top famous places
+        """
+        top = self._fame_order(category, source)[:top_n]
+        return self._rows(top, fame_score=self._fame_score[top])
     
     def create_itinerary(self, categories: list, budget_level: int, 
-                        num_days: int) -> dict:
+                        num_days: int, places_per_day: int = ITINERARY_PLACES_PER_DAY) -> dict:
         """
         Create a day-by-day itinerary
         
+        Candidates are clustered by location so each day stays in one area,
+        each day mixes the requested categories, and stops are ordered to
+        keep walking/driving short.
+        
         Args:
             categories: List of category preferences
             budget_level: 1-4
             num_days: Number of days
+            places_per_day: Stops per day
             
         Returns:
-            Dictionary with day-by-day recommendations
+            Dictionary with day-by-day recommendations in visiting order
         """
-        # Get recommendations
-        all_recs = self.get_recommendations(
-            categories, budget_level, num_days, 
-            top_n=num_days * 5  # ~5 places per day
-        )
-        
-        if all_recs.empty:
-            return {}
-        
-        # Distribute across days
-        places_per_day = len(all_recs) // num_days
+        days = None
+        if self.materialized is not None:
+            with self.instrumentation.timer('materialized'):
+                stored = self.materialized.itinerary(categories, budget_level, num_days, places_per_day)
+            if stored is not None:
+                self.instrumentation.increment('materialized_hits')
+                stops, max_review_score = stored
+                days = [(positions, self.index.normalized_reviews(positions, max_review_score), scores)
+                        for positions, scores in stops]
+        if days is None:
+            days = self._itinerary_days(categories, budget_level, num_days, places_per_day)
         
         itinerary = {}
-        for day in range(1, num_days + 1):
-            start_idx = (day - 1) * places_per_day
-            end_idx = start_idx + places_per_day if day < num_days else len(all_recs)
-            
-            day_places = all_recs.iloc[start_idx:end_idx]
-            itinerary[f"Day {day}"] = day_places
+        for day, (positions, review_scores, scores) in enumerate(days, 1):
+            itinerary[f"Day {day}"] = self._result_frame(positions, review_scores, scores)
         
         return itinerary
     
-    def _filter_by_budget(self, df: pd.DataFrame, budget_level: int) -> pd.DataFrame:
-        """Filter places by budget level"""
-        # Include places at or below budget level, or places with no price data (0)
-        return df[
-            (df['price_estimate'] <= budget_level) | 
-            (df['price_estimate'] == 0)
-        ]
-    
-    def _calculate_scores(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Calculate recommendation score for each place
-        Score = weighted combination of rating and popularity
-        """
-        # Normalize review counts (log scale to handle wide range)
-        import numpy as np
-        df['review_score'] = np.log1p(df['review_count'].fillna(0))
-        max_review_score = df['review_score'].max()
-        if max_review_score > 0:
-            df['review_score'] = df['review_score'] / max_review_score
-        
-        # Calculate final score
-        df['score'] = (
-            df['rating'].fillna(0) * 0.7 +      # 70% weight on rating
-            df['review_score'] * 0.3            # 30% weight on popularity
-        )
+    @property
+    def place_vectors(self) -> PlaceVectors:
+        """Feature vectors for personalized reranking, built on first use"""
+        return self.build_place_vectors()
+    
+    def build_place_vectors(self) -> PlaceVectors:
+        """Build place_vectors unless they are built already, and return them"""
+        if self._place_vectors is None:
+            self._place_vectors = PlaceVectors(self.places_df, self.labels)
+        return self._place_vectors
+    
+    def warm(self, place_vectors: bool = False):
+        """
+        Compute every lazy dataset aggregate now
+        
+        Fame orders of every category/source filter, statistics, the
+        category_match bitmask and optionally the personalization vectors,
+        so an engine that is shared or published never builds them per worker.
+        """
+        for category in [None, *self.places_df['category'].dropna().unique()]:
+            for source in [None, *self.places_df['source'].dropna().unique()]:
+                self._fame_order(category, source)
+        self.get_statistics()
+        if 'category_match' in self.index.scoring_model.features:
+            self.index.build_venue_bits()
+        if place_vectors:
+            self.build_place_vectors()
+    
+    def _candidates(self, categories: list, budget_level: int) -> tuple:
+        """Category then budget filter on the index buckets, timed per stage"""
+        timer = self.instrumentation.timer
+        with timer('category_filter'):
+            keys = self.index.category_keys(categories)
+        if self.verbose:
+            print(f"\n📍 Found {self.index.count_in_categories(categories)} places in selected categories")
+        
+        with timer('budget_filter'):
+            positions, max_review_score = self.index.gather(self.index.budget_keys(keys, budget_level))
+        if self.verbose:
+            print(f"💰 After budget filter: {len(positions)} places")
+        return positions, max_review_score
+    
+    def _top_recommendations(self, categories: list, budget_level: int, top_n: int) -> tuple:
+        """
+        Score the candidates of a query and keep the best top_n
+        
+        Returns:
+            (top positions, their scores, max log review count of the
+            candidates, number of candidates)
+        """
+        positions, max_review_score = self._candidates(categories, budget_level)
+        if len(positions) == 0:
+            return positions, np.empty(0), max_review_score, 0
+        
+        timer = self.instrumentation.timer
+        with timer('scoring'):
+            scores, _ = self.index.score(positions, max_review_score, budget_level, categories)
+        with timer('top_n'):
+            top_positions, top_scores = self.index.top_n(positions, scores, top_n)
+        return top_positions, top_scores, max_review_score, len(positions)
+    
+    def _itinerary_days(self, categories: list, budget_level: int, num_days: int,
+                        places_per_day: int) -> list:
+        """
+        Compute an itinerary
+        
+        Returns:
+            (positions, review scores, scores) of each day's stops in visiting order
+        """
+        positions, max_review_score = self._candidates(categories, budget_level)
+        
+        # Only places with coordinates can be routed
+        lat = self.spatial_index.latitude
+        lng = self.spatial_index.longitude
+        positions = positions[~(np.isnan(lat[positions]) | np.isnan(lng[positions]))]
+        if len(positions) == 0 or num_days <= 0:
+            return []
+        
+        timer = self.instrumentation.timer
+        with timer('scoring'):
+            scores, review_scores = self.index.score(positions, max_review_score,
+                                                     budget_level, categories)
+        with timer('itinerary'):
+            days = build_itinerary(
+                lat[positions], lng[positions], scores, self.index.category_codes[positions],
+                num_days, places_per_day
+            )
+        return [(positions[stops], review_scores[stops], scores[stops]) for stops in days]
+    
+    def _fame_order(self, category: str = None, source: str = None) -> np.ndarray:
+        """
+        Positions in descending fame order (ties keep dataset order)
+        
+        The unfiltered order is sorted once; each category/source filter
+        is a one-time pass over it, so every ordering is cached and later
+        calls only slice.
+        """
+        key = (category, source)
+        order = self._fame_orders.get(key)
+        if order is not None:
+            return order
+        
+        if self._fame_score is None:
+            # Heavily weights review count by default
+            self._fame_score = np.broadcast_to(
+                self.fame_model.evaluate(self.index.features), len(self.places_df))
+        if key == (None, None):
+            order = np.argsort(-self._fame_score, kind='stable')
+        else:
+            order = self._fame_order()
+            keep = np.ones(len(order), dtype=bool)
+            wanted = {'category': None if category is None else [category],
+                      'source': None if source is None else matching_sources(source)}
+            for col, accepted in wanted.items():
+                if accepted is None:
+                    continue
+                values = self.places_df[col]
+                present = set(accepted) & set(values.dropna().unique())
+                if not present:
+                    # Unknown values are not cached, so bad input cannot grow the cache
+                    return np.empty(0, dtype=np.int64)
+                keep &= np.isin(values.to_numpy(dtype=object)[order], list(present))
+            order = order[keep]
+        self._fame_orders[key] = order
+        return order
+    
+    def _rows(self, positions: np.ndarray, **extra_columns) -> pd.DataFrame:
+        """
+        Rows at the given positions in the original column layout
         
-        return df
+        Label columns are decoded from their bitsets, and the frame is built
+        in one step from per-column takes plus any extra columns.
+        """
+        columns = {}
+        for col in self._columns:
+            if col in self.labels:
+                columns[col] = self.labels[col].decode(positions)
+            else:
+                columns[col] = self.places_df[col].array.take(positions)
+        columns.update(extra_columns)
+        return pd.DataFrame(columns, index=self.places_df.index[positions])
+    
+    def _result_frame(self, positions: np.ndarray, review_scores: np.ndarray,
+                      scores: np.ndarray) -> pd.DataFrame:
+        """Rows at the given positions with their review_score and score columns"""
+        return self._rows(positions, review_score=review_scores, score=scores)
     
     def print_recommendations(self, recommendations: pd.DataFrame):
         """Pretty print recommendations"""
-        print("\n" + "="*60)
-        print("🌟 TOP RECOMMENDATIONS")
-        print("="*60)
-        
-        for idx, (_, place) in enumerate(recommendations.iterrows(), 1):
-            rating_display = f"{place['rating']:.1f}⭐" if pd.notna(place['rating']) else "No rating"
-            price_display = '$' * int(place['price_estimate']) if place['price_estimate'] > 0 else 'Free/Unknown'
-            
-            print(f"\n{idx}. {place['name']}")
-            print(f"   📍 {place['address']}")
-            print(f"   ⭐ {rating_display} ({int(place['review_count']):,} reviews)")
-            print(f"   💰 {price_display}")
-            print(f"   🏷️  {place['category']}")
-            print(f"   🔗 {place.get('google_maps_url', place.get('yelp_url', 'N/A'))}")
-            print(f"   📊 Score: {place['score']:.2f}")
+        print(render_recommendations(recommendations), end='')
     
     def print_itinerary(self, itinerary: dict):
         """Pretty print day-by-day itinerary"""
-        print("\n" + "="*60)
-        print("📅 YOUR PERSONALIZED ITINERARY")
-        print("="*60)
-        
-        for day_name, places in itinerary.items():
-            print(f"\n{'='*60}")
-            print(f"📆 {day_name.upper()}")
-            print(f"{'='*60}")
-            
-            for idx, (_, place) in enumerate(places.iterrows(), 1):
-                rating_display = f"{place['rating']:.1f}⭐" if pd.notna(place['rating']) else "No rating"
-                price_display = '$' * int(place['price_estimate']) if place['price_estimate'] > 0 else 'Free'
-                
-                print(f"\n  {idx}. {place['name']}")
-                print(f"      📍 {place['address'][:50]}...")
-                print(f"      ⭐ {rating_display} | 💰 {price_display} | 🏷️ {place['category']}")
+        print(render_itinerary(itinerary), end='')
     
     def get_statistics(self) -> dict:
-        """Get dataset statistics"""
-        return {
-            'total_places': len(self.places_df),
-            'by_category': self.places_df['category'].value_counts().to_dict(),
-            'by_source': self.places_df['source'].value_counts().to_dict(),
-            'avg_rating': self.places_df['rating'].mean(),
-            'total_reviews': self.places_df['review_count'].sum(),
-            'price_coverage': (self.places_df['price_level'] > 0).sum() / len(self.places_df) * 100
-        }
\ No newline at end of file
+        """Get dataset statistics (computed once per engine)"""
+        if self._statistics is None:
+            self._statistics = place_statistics(self.places_df)
+        statistics = dict(self._statistics)
+        statistics['by_category'] = dict(statistics['by_category'])
+        statistics['by_source'] = dict(statistics['by_source'])
+        return statistics
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Engine Registry
+Lazily loads cities and shares one memory-mapped dataset per city
+"""
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config.config import (
+    ARROW_CACHE_DIR, CITIES, PROCESSED_DATA_DIR, REGISTRY_RELOAD_CHECK_SECONDS
+)
+from src.instrumentation import Instrumentation
+from src.models.scoring import ScoringModel
+from src.recommender.compact import compact_table
+from src.recommender.recommendation_engine import RecommendationEngine
+
+# Keep string columns Arrow-backed so pandas wraps the mapped buffers instead of
+# building one Python object per value
+_STRING_TYPES = {
+    pa.string(): pd.StringDtype('pyarrow'),
+    pa.large_string(): pd.StringDtype('pyarrow'),
+}
+
+
+class EngineRegistry:
+    """
+    One RecommendationEngine per city, created on first use
+
+    The first load of a city converts {city}_places.parquet into an
+    uncompressed Arrow IPC file, already in the compact layout (see
+    compact_table). Every later load, in this process or any other,
+    memory-maps that file: the engine's frame (string, numeric and
+    categorical columns) is read-only views of the mapping, shared through
+    the OS page cache instead of each worker decoding its own copy.
+    Label bitsets, the query indexes and lazily built aggregates are still
+    built in every process that loads the city; SharedEngineRegistry
+    shares those too. When the parquet file changes on disk the city is
+    reloaded on the next get() call.
+    """
+
+    def __init__(self, data_dir: str = PROCESSED_DATA_DIR, arrow_dir: str = ARROW_CACHE_DIR,
+                 check_interval: float = REGISTRY_RELOAD_CHECK_SECONDS,
+                 verbose: bool = False, instrumentation: Instrumentation = None,
+                 scoring_model: ScoringModel = None):
+        """
+        Args:
+            data_dir: Directory holding {city}_places.parquet files
+            arrow_dir: Directory for the memory-mapped Arrow copies
+            check_interval: Seconds between file change checks per city
+                (0 checks on every call, None disables automatic reloads)
+            verbose: Passed to every engine (print progress messages)
+            instrumentation: Shared by every engine for stage timings
+            scoring_model: Recommendation score weights of every engine
+                (default: the engine's built-in model)
+        """
+        self.data_dir = Path(data_dir)
+        self.arrow_dir = Path(arrow_dir)
+        self.check_interval = check_interval
+        self.verbose = verbose
+        self.instrumentation = instrumentation
+        self.scoring_model = scoring_model
+        self._engines = {}      # city -> RecommendationEngine
+        self._versions = {}     # city -> (mtime_ns, size) of the loaded parquet
+        self._last_check = {}   # city -> monotonic time of the last stat()
+        self._lock = threading.Lock()
+
+    def get(self, city_name: str) -> RecommendationEngine:
+        """
+        Get the engine for a city, loading or reloading it if needed
+
+        Args:
+            city_name: Key from config.CITIES
+
+        Returns:
+            RecommendationEngine sharing the city's mapped dataset
+        """
+        if city_name not in CITIES:
+            raise KeyError(f"Unknown city: {city_name}")
+
+        engine = self._engines.get(city_name)
+        if engine is not None and not self._should_check(city_name):
+            return engine
+
+        with self._lock:
+            version = self._parquet_version(city_name)
+            if city_name not in self._engines or self._versions[city_name] != version:
+                places_df = self._load_places(city_name, version)
+                self._engines[city_name] = RecommendationEngine(
+                    city_name, places_df=places_df, verbose=self.verbose,
+                    instrumentation=self.instrumentation, scoring_model=self.scoring_model
+                )
+                self._versions[city_name] = version
+            self._last_check[city_name] = time.monotonic()
+            return self._engines[city_name]
+
+    def reload(self, city_name: str) -> RecommendationEngine:
+        """Force a reload of a city on the next access and return the fresh engine"""
+        with self._lock:
+            self._engines.pop(city_name, None)
+            self._versions.pop(city_name, None)
+        return self.get(city_name)
+
+    def loaded_cities(self) -> list:
+        """Cities currently held by the registry"""
+        return list(self._engines)
+
+    def get_version(self, city_name: str) -> tuple:
+        """(mtime_ns, size) of the parquet file the loaded engine was built from"""
+        return self._versions.get(city_name)
+
+    def _should_check(self, city_name: str) -> bool:
+        """Whether the parquet file is due for a change check"""
+        if self.check_interval is None:
+            return False
+        return time.monotonic() - self._last_check.get(city_name, 0) >= self.check_interval
+
+    def _parquet_path(self, city_name: str) -> Path:
+        return self.data_dir / f"{city_name}_places.parquet"
+
+    def _parquet_version(self, city_name: str) -> tuple:
+        data_file = self._parquet_path(city_name)
+        try:
+            stat = data_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No data found for {city_name}. Run collect_data.py first!"
+            ) from None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_places(self, city_name: str, version: tuple) -> pd.DataFrame:
+        """Memory-map the Arrow copy of a city's parquet, creating it if needed"""
+        arrow_file = self.arrow_dir / f"{city_name}_places-{version[0]}-{version[1]}.compact.arrow"
+        if not arrow_file.exists():
+            self._write_arrow_copy(city_name, arrow_file)
+
+        table = pa.ipc.open_file(pa.memory_map(str(arrow_file), 'r')).read_all()
+        return table.to_pandas(types_mapper=_STRING_TYPES.get, split_blocks=True)
+
+    def _write_arrow_copy(self, city_name: str, arrow_file: Path):
+        """
+        Convert the parquet file into an uncompressed Arrow IPC file
+
+        Written to a temp file and renamed into place, so concurrent workers
+        never map a half-written file. Copies of older versions are removed;
+        processes still mapping them keep their pages until they reload.
+        """
+        self.arrow_dir.mkdir(parents=True, exist_ok=True)
+        table = compact_table(pq.read_table(self._parquet_path(city_name)))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.arrow_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, arrow_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        for old_file in self.arrow_dir.glob(f"{city_name}_places-*.arrow"):
+            if old_file != arrow_file:
+                old_file.unlink(missing_ok=True)
@@ -0,0 +1,313 @@
+"""
+Rendering
+Text, JSON Lines, CSV and HTML output of recommendations and itineraries
+"""
+
+import html
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from config.config import EXPORT_BATCH_ITINERARIES
+
+FORMATS = ('text', 'jsonl', 'csv', 'html')
+SUFFIX_FORMATS = {'.txt': 'text', '.jsonl': 'jsonl', '.csv': 'csv', '.html': 'html', '.htm': 'html'}
+
+RULE = "=" * 60
+URL_COLUMNS = ('google_maps_url', 'yelp_url')   # First one present is shown as the link
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+def _strings(df: pd.DataFrame, col: str, missing: str = '') -> list:
+    """A column as Python strings, missing values (or a missing column) as `missing`"""
+    if col not in df:
+        return [missing] * len(df)
+    values = df[col].to_numpy(dtype=object)
+    return [missing if null else str(value)
+            for value, null in zip(values.tolist(), pd.isna(values).tolist())]
+
+
+def _numbers(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df:
+        return np.full(len(df), np.nan)
+    return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _links(df: pd.DataFrame) -> list:
+    """Google Maps link, else Yelp link, else 'N/A'"""
+    links = np.full(len(df), 'N/A', dtype=object)
+    for col in reversed(URL_COLUMNS):
+        if col in df:
+            urls = np.array(_strings(df, col), dtype=object)
+            present = urls != ''
+            links[present] = urls[present]
+    return links.tolist()
+
+
+def _ratings(df: pd.DataFrame) -> list:
+    return [f"{rating:.1f}⭐" if rating == rating else "No rating" for rating in _numbers(df, 'rating')]
+
+
+def _prices(df: pd.DataFrame, free: str) -> list:
+    prices = np.nan_to_num(_numbers(df, 'price_estimate')).astype(np.int64)
+    return ['$' * price if price > 0 else free for price in prices.tolist()]
+
+
+def recommendations_text(recommendations: pd.DataFrame) -> str:
+    """
+    Recommendations as the numbered terminal listing
+
+    Every field is formatted once per column and the listing is joined
+    into one string, instead of building a Series per row.
+    """
+    reviews = np.nan_to_num(_numbers(recommendations, 'review_count')).astype(np.int64).tolist()
+    places = zip(
+        _strings(recommendations, 'name'), _strings(recommendations, 'address'),
+        _ratings(recommendations), reviews, _prices(recommendations, 'Free/Unknown'),
+        _strings(recommendations, 'category'), _links(recommendations),
+        _numbers(recommendations, 'score').tolist()
+    )
+    parts = [f"\n{RULE}\n🌟 TOP RECOMMENDATIONS\n{RULE}\n"]
+    parts += [
+        f"\n{idx}. {name}\n"
+        f"   📍 {address}\n"
+        f"   ⭐ {rating} ({count:,} reviews)\n"
+        f"   💰 {price}\n"
+        f"   🏷️  {category}\n"
+        f"   🔗 {link}\n"
+        f"   📊 Score: {score:.2f}\n"
+        for idx, (name, address, rating, count, price, category, link, score) in enumerate(places, 1)
+    ]
+    return ''.join(parts)
+
+
+def famous_text(famous: pd.DataFrame) -> str:
+    """Famous places as a numbered terminal listing"""
+    reviews = np.nan_to_num(_numbers(famous, 'review_count')).astype(np.int64).tolist()
+    places = zip(_strings(famous, 'name'), _ratings(famous), reviews, _strings(famous, 'category'))
+    parts = [f"\n{RULE}\n🏆 TOP {len(famous)} MOST FAMOUS PLACES\n{RULE}\n"]
+    parts += [
+        f"\n{idx}. {name}\n"
+        f"   ⭐ {rating} ({count:,} reviews)\n"
+        f"   🏷️ {category}\n"
+        for idx, (name, rating, count, category) in enumerate(places, 1)
+    ]
+    return ''.join(parts)
+
+
+def itinerary_text(itinerary: dict) -> str:
+    """Day-by-day itinerary as the terminal listing"""
+    parts = [f"\n{RULE}\n📅 YOUR PERSONALIZED ITINERARY\n{RULE}\n"]
+    for day_name, places in itinerary.items():
+        parts.append(f"\n{RULE}\n📆 {day_name.upper()}\n{RULE}\n")
+        stops = zip(
+            _strings(places, 'name'), _strings(places, 'address'), _ratings(places),
+            _prices(places, 'Free'), _strings(places, 'category')
+        )
+        parts += [
+            f"\n  {idx}. {name}\n"
+            f"      📍 {address[:50]}...\n"
+            f"      ⭐ {rating} | 💰 {price} | 🏷️ {category}\n"
+            for idx, (name, address, rating, price, category) in enumerate(stops, 1)
+        ]
+    return ''.join(parts)
+
+
+def itinerary_frame(itinerary: dict, name: str = None) -> pd.DataFrame:
+    """
+    An itinerary as one table, stops in visiting order
+
+    Adds day and stop (1-based) columns in front, preceded by an itinerary
+    column when a name is given.
+    """
+    return itineraries_frame([(name, itinerary)], with_names=name is not None)
+
+
+def itineraries_frame(named_itineraries: list, with_names: bool = True) -> pd.DataFrame:
+    """Several (name, itinerary) pairs as one itinerary_frame table"""
+    days, lead = [], {'itinerary': [], 'day': [], 'stop': []}
+    for name, itinerary in named_itineraries:
+        for day, places in enumerate((places for places in itinerary.values() if len(places)), 1):
+            days.append(places)
+            lead['itinerary'].append(np.full(len(places), name, dtype=object))
+            lead['day'].append(np.full(len(places), day))
+            lead['stop'].append(np.arange(1, len(places) + 1))
+    if not days:
+        return pd.DataFrame()
+    if not with_names:
+        del lead['itinerary']
+    # Column by column: one concatenate per column instead of a block-wise frame concat
+    columns = {col: np.concatenate(parts) for col, parts in lead.items()}
+    for col in days[0].columns:
+        columns[col] = np.concatenate([places[col].to_numpy() for places in days])
+    return pd.DataFrame(columns)
+
+
+def _jsonl(df: pd.DataFrame) -> str:
+    if df.empty:
+        return ''
+    text = df.to_json(orient='records', lines=True, force_ascii=False, double_precision=15)
+    return text if text.endswith('\n') else text + '\n'
+
+
+def _csv(df: pd.DataFrame, header: bool = True) -> str:
+    return df.to_csv(index=False, header=header, lineterminator='\n')
+
+
+def _html_rows(df: pd.DataFrame) -> str:
+    cells = [[html.escape(value) for value in _strings(df, col)] for col in df.columns]
+    return ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>\n'
+                   for row in zip(*cells))
+
+
+def _html_head(columns, title: str) -> str:
+    header = ''.join(f'<th>{html.escape(str(col))}</th>' for col in columns)
+    return (f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{html.escape(title)}'
+            f'</title></head>\n<body>\n<table>\n<thead><tr>{header}</tr></thead>\n<tbody>\n')
+
+
+HTML_TAIL = '</tbody>\n</table>\n</body>\n</html>\n'
+
+
+def render_recommendations(recommendations: pd.DataFrame, fmt: str = 'text') -> str:
+    """
+    Recommendations in one of FORMATS
+
+    Args:
+        recommendations: Output of a get_recommendations* call
+        fmt: 'text' (terminal listing), 'jsonl' (one object per place),
+            'csv' or 'html' (a standalone page with one table)
+
+    Returns:
+        The whole document as one string
+    """
+    if fmt == 'text':
+        return recommendations_text(recommendations)
+    if fmt == 'jsonl':
+        return _jsonl(recommendations)
+    if fmt == 'csv':
+        return _csv(recommendations)
+    if fmt == 'html':
+        return (_html_head(recommendations.columns, 'Recommendations')
+                + _html_rows(recommendations) + HTML_TAIL)
+    raise ValueError(f"fmt must be one of {', '.join(FORMATS)}")
+
+
+def render_itinerary(itinerary: dict, fmt: str = 'text') -> str:
+    """Itinerary in one of FORMATS; tables have one row per stop (see itinerary_frame)"""
+    if fmt == 'text':
+        return itinerary_text(itinerary)
+    return render_recommendations(itinerary_frame(itinerary), fmt)
+
+
+def format_of(path) -> str:
+    """Output format implied by a file suffix"""
+    fmt = SUFFIX_FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unknown output suffix for {path} (use {', '.join(SUFFIX_FORMATS)})")
+    return fmt
+
+
+def _open(path):
+    return open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_BYTES)
+
+
+def write_recommendations(recommendations: pd.DataFrame, path, fmt: str = None):
+    """Write recommendations to a file in one write (format from the suffix by default)"""
+    text = render_recommendations(recommendations, fmt or format_of(path))
+    with _open(path) as out:
+        out.write(text)
+
+
+class ItineraryWriter:
+    """
+    Streams many itineraries into one file
+
+    Itineraries are buffered and rendered batch_size at a time, column-wise,
+    each batch appended with a single write, so memory stays bounded however
+    many are exported. CSV and HTML headers are written once, from the first
+    batch's columns. Table formats carry an itinerary column with the name
+    given to write() (default: the itinerary's 1-based number).
+
+        with ItineraryWriter('campaign.jsonl') as writer:
+            for user, itinerary in itineraries:
+                writer.write(itinerary, name=user)
+    """
+
+    def __init__(self, path_or_file, fmt: str = None, batch_size: int = EXPORT_BATCH_ITINERARIES):
+        """
+        Args:
+            path_or_file: Output path, or an open text file (left open)
+            fmt: One of FORMATS (default: from the path suffix, else text)
+            batch_size: Itineraries rendered per write
+        """
+        if isinstance(path_or_file, (str, Path)):
+            self.fmt = fmt or format_of(path_or_file)
+            self._file = None
+        else:
+            self.fmt = fmt or 'text'
+            self._file = path_or_file
+        if self.fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {', '.join(FORMATS)}")
+        self._owned = self._file is None
+        if self._owned:
+            self._file = _open(path_or_file)
+        self.batch_size = batch_size
+        self.columns = None
+        self.itineraries = 0
+        self.rows = 0
+        self._pending = []
+
+    def write(self, itinerary: dict, name: str = None):
+        """Append one itinerary (as returned by create_itinerary)"""
+        self.itineraries += 1
+        self._pending.append((str(self.itineraries) if name is None else name, itinerary))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Render and write the buffered itineraries"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        if self.fmt == 'text':
+            text = ''.join(f"\n🧳 {name}\n" + itinerary_text(itinerary) for name, itinerary in pending)
+            self.rows += sum(len(places) for _, itinerary in pending for places in itinerary.values())
+            self._file.write(text)
+            return
+
+        frame = itineraries_frame(pending)
+        text = ''
+        if self.columns is None and len(frame.columns):
+            self.columns = list(frame.columns)
+            if self.fmt == 'csv':
+                text = _csv(frame.iloc[:0])
+            elif self.fmt == 'html':
+                text = _html_head(self.columns, 'Itineraries')
+        if len(frame):
+            frame = frame.reindex(columns=self.columns)
+            if self.fmt == 'jsonl':
+                text += _jsonl(frame)
+            elif self.fmt == 'csv':
+                text += _csv(frame, header=False)
+            else:
+                text += _html_rows(frame)
+        self.rows += len(frame)
+        self._file.write(text)
+
+    def close(self):
+        self.flush()
+        if self.fmt == 'html':
+            if self.columns is None:
+                self._file.write(_html_head([], 'Itineraries'))
+            self._file.write(HTML_TAIL)
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
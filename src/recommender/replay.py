@@ -0,0 +1,333 @@
+"""
+Query Replay
+Replay logged service queries across worker processes and profile the slowest ones
+"""
+
+import cProfile
+import json
+import multiprocessing
+import os
+import pstats
+import signal
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import numpy as np
+from config.config import REPLAY_PROFILE_TOP, REPLAY_SAMPLE_INTERVAL_MS, REPLAY_SAMPLE_SECONDS
+from src.recommender.service import RecommendationService, ResultCache
+
+PROFILERS = ('cprofile', 'sample')
+
+
+def parse_query(record: dict) -> dict:
+    """
+    One logged request as {'endpoint', 'params', 'method'}
+
+    Accepted shapes:
+        {"path": "/recommendations?city=boston&categories=food&budget=2"}
+        {"endpoint": "itinerary", "params": {"city": "boston", "categories": ["food"], ...}}
+        {"endpoint": "famous", "city": "miami", "top_n": 10}
+    with an optional "method" (default GET). Parameter values may be
+    scalars or lists; they are passed on as parse_qs-style string lists.
+    """
+    method = str(record.get('method', 'GET')).upper()
+    if 'path' in record:
+        url = urlparse(record['path'])
+        return {'endpoint': url.path.strip('/'), 'params': parse_qs(url.query), 'method': method}
+    if 'endpoint' not in record:
+        raise ValueError("a logged query needs a path or an endpoint")
+    raw = record.get('params')
+    if raw is None:
+        raw = {name: value for name, value in record.items() if name not in ('endpoint', 'method')}
+    params = {name: [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+              for name, value in raw.items() if value is not None}
+    return {'endpoint': str(record['endpoint']).strip('/'), 'params': params, 'method': method}
+
+
+def load_queries(path: str) -> list:
+    """Parsed queries of a JSON Lines log, in log order (blank lines skipped)"""
+    queries = []
+    with open(path, encoding='utf-8') as log:
+        for number, line in enumerate(log, 1):
+            if not line.strip():
+                continue
+            try:
+                queries.append(parse_query(json.loads(line)))
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from None
+    return queries
+
+
+def query_path(query: dict) -> str:
+    """A parsed query back as a request path, for reports"""
+    params = urlencode([(name, value) for name, values in query['params'].items() for value in values])
+    return f"/{query['endpoint']}" + (f"?{params}" if params else '')
+
+
+# Service and queries of the worker processes (inherited through fork)
+_service = None
+_queries = None
+
+
+def _replay_shard(task: tuple) -> tuple:
+    """
+    Run the given query indexes in order
+
+    Open loop (interval set): query i is due at start_at + i * interval and
+    its latency counts from then, so time spent waiting behind a slow
+    request is included. Closed loop: queries run back to back and latency
+    is the service time.
+    """
+    indexes, start_at, interval = task
+    count = len(indexes)
+    latency, service_time, status = np.empty(count), np.empty(count), np.empty(count, dtype=np.int64)
+    hit = np.zeros(count, dtype=bool)
+    for j, i in enumerate(indexes):
+        query = _queries[i]
+        due = None
+        if interval:
+            due = start_at + i * interval
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        begin = time.monotonic()
+        status[j], _, hit[j] = _service.handle(query['endpoint'], query['params'], query['method'])
+        end = time.monotonic()
+        service_time[j] = end - begin
+        latency[j] = end - (due if due is not None else begin)
+    return np.asarray(indexes), latency, service_time, status, hit, os.getpid()
+
+
+def replay(service: RecommendationService, queries: list, workers: int = 1, qps: float = None) -> dict:
+    """
+    Replay queries through a service
+
+    Every city in the log is loaded before the workers fork, so they share
+    the engines like serve() workers do; each worker then answers every
+    workers-th query with its own copy of the result cache.
+
+    Args:
+        service: Service to answer the queries
+        queries: Output of load_queries
+        workers: Worker processes (fork is required for more than one)
+        qps: Open-loop arrival rate over all workers (None: closed loop)
+
+    Returns:
+        Dictionary with per-query arrays (latency_s, service_s, status, hit,
+        worker) in log order, plus wall_s, workers and qps
+    """
+    global _service, _queries
+    cities = {query['params']['city'][-1] for query in queries if query['params'].get('city')}
+    for city in sorted(cities):
+        try:
+            service.registry.get(city)
+        except (KeyError, FileNotFoundError):
+            pass   # answered with 404 like the live service would
+    _service, _queries = service, queries
+
+    workers = max(1, min(workers, len(queries)))
+    if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        workers = 1
+    interval = 1.0 / qps if qps else None
+    shards = [list(range(w, len(queries), workers)) for w in range(workers)]
+
+    num = len(queries)
+    results = {'latency_s': np.zeros(num), 'service_s': np.zeros(num),
+               'status': np.zeros(num, dtype=np.int64), 'hit': np.zeros(num, dtype=bool),
+               'worker': np.zeros(num, dtype=np.int64)}
+    if workers == 1:
+        start = time.monotonic()
+        outputs = [_replay_shard((shards[0], start, interval))]
+    else:
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            # Open loop: let every worker start before the first query is due
+            start = time.monotonic() + (0.1 if interval else 0.0)
+            outputs = pool.map(_replay_shard, [(shard, start, interval) for shard in shards], chunksize=1)
+    wall = time.monotonic() - start
+
+    pids = {}
+    for indexes, latency, service_time, status, hit, pid in outputs:
+        results['latency_s'][indexes] = latency
+        results['service_s'][indexes] = service_time
+        results['status'][indexes] = status
+        results['hit'][indexes] = hit
+        results['worker'][indexes] = pids.setdefault(pid, len(pids))
+    results.update(wall_s=wall, workers=workers, qps=qps)
+    return results
+
+
+def _latency_summary(latency_s: np.ndarray, service_s: np.ndarray, status: np.ndarray,
+                     hit: np.ndarray) -> dict:
+    latency_ms = latency_s * 1000
+    cacheable = status == 200
+    return {
+        'count': len(latency_s),
+        'errors': int((status >= 400).sum()),
+        'mean_ms': float(latency_ms.mean()),
+        'p50_ms': float(np.percentile(latency_ms, 50)),
+        'p95_ms': float(np.percentile(latency_ms, 95)),
+        'p99_ms': float(np.percentile(latency_ms, 99)),
+        'max_ms': float(latency_ms.max()),
+        'service_p50_ms': float(np.percentile(service_s * 1000, 50)),
+        'cache_hit_rate': float(hit[cacheable].mean()) if cacheable.any() else 0.0,
+    }
+
+
+def summarize(results: dict, queries: list, slowest: int = REPLAY_PROFILE_TOP) -> dict:
+    """
+    Latency, throughput and cache report of a replay
+
+    Returns:
+        Dictionary with requests, workers, mode, target_qps, wall_s,
+        throughput_qps, overall and per-endpoint latency summaries (count,
+        errors, mean/p50/p95/p99/max ms, service_p50_ms, cache_hit_rate)
+        and the slowest requests (index, endpoint, path, latency_ms)
+    """
+    endpoints = np.array([query['endpoint'] for query in queries], dtype=object)
+    columns = [results[name] for name in ('latency_s', 'service_s', 'status', 'hit')]
+    report = {
+        'requests': len(queries),
+        'workers': results['workers'],
+        'mode': 'open' if results['qps'] else 'closed',
+        'target_qps': results['qps'],
+        'wall_s': results['wall_s'],
+        'throughput_qps': len(queries) / results['wall_s'] if results['wall_s'] > 0 else 0.0,
+        'overall': _latency_summary(*columns) if len(queries) else {},
+        'endpoints': {},
+        'slowest': [],
+    }
+    for endpoint in sorted(set(endpoints)):
+        rows = endpoints == endpoint
+        report['endpoints'][endpoint] = _latency_summary(*(column[rows] for column in columns))
+    for i in np.argsort(-results['latency_s'], kind='stable')[:slowest]:
+        report['slowest'].append({'index': int(i), 'endpoint': queries[i]['endpoint'],
+                                  'path': query_path(queries[i]),
+                                  'latency_ms': float(results['latency_s'][i] * 1000)})
+    return report
+
+
+def _function_name(code_key: tuple) -> str:
+    """'file.py:line(function)' with paths inside the working directory made relative"""
+    filename, line, name = code_key
+    try:
+        filename = os.path.relpath(filename)
+    except ValueError:
+        pass
+    if filename.startswith('..'):
+        filename = Path(filename).name
+    return f"{filename}:{line}({name})"
+
+
+class StackSampler:
+    """
+    Sampling profiler: records the main thread's stack on every SIGPROF
+
+    The interval timer counts process CPU time, so idle waits are not
+    sampled. Unix only; use as a context manager around the code to
+    profile. Stacks stop below the function that entered the context.
+    """
+
+    def __init__(self, interval_ms: float = REPLAY_SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.samples = 0
+        self.inclusive = Counter()   # function -> samples with it anywhere on the stack
+        self.leaf = Counter()        # function -> samples with it on top
+
+    def _sample(self, signum, frame):
+        self.samples += 1
+        seen = set()
+        top = True
+        while frame is not None and frame is not self._root:
+            code = frame.f_code
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            if top:
+                self.leaf[key] += 1
+                top = False
+            if key not in seen:
+                seen.add(key)
+                self.inclusive[key] += 1
+            frame = frame.f_back
+
+    def __enter__(self):
+        self._root = sys._getframe(1)
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous)
+        self._root = None
+        return False
+
+    def top(self, limit: int = 15) -> list:
+        """(function, inclusive share, self share) of the most sampled functions"""
+        total = max(self.samples, 1)
+        return [(_function_name(key), count / total, self.leaf[key] / total)
+                for key, count in self.inclusive.most_common(limit)]
+
+
+def profile_requests(service: RecommendationService, queries: list, indexes: list,
+                     profiler: str = 'cprofile', output_dir: str = None, limit: int = 15) -> list:
+    """
+    Re-run requests under a profiler, bypassing the result cache
+
+    Args:
+        service: Service whose registry and profile store are used
+        queries: Parsed queries
+        indexes: Positions of the queries to profile (e.g. the slowest)
+        profiler: 'cprofile' (one deterministic run; a .prof file per
+            request is written to output_dir for snakeviz/pstats) or
+            'sample' (StackSampler over repeated runs, REPLAY_SAMPLE_SECONDS
+            of CPU per request)
+        output_dir: Where to write cProfile captures (none: not saved)
+        limit: Functions listed per request
+
+    Returns:
+        List of dicts with index, path, profiler, ms per run, and top:
+        [(function, cumulative ms or inclusive share, own ms or self share)]
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"profiler must be one of {', '.join(PROFILERS)}")
+    uncached = RecommendationService(service.registry, ResultCache(max_size=0),
+                                     profiles=service.profiles)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    captures = []
+    for rank, i in enumerate(indexes, 1):
+        query = queries[i]
+        run = lambda: uncached.handle(query['endpoint'], query['params'], query['method'])
+        run()   # warm any lazily built engine state
+        capture = {'index': int(i), 'path': query_path(query), 'profiler': profiler}
+        if profiler == 'cprofile':
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.runcall(run)
+            capture['ms'] = (time.perf_counter() - start) * 1000
+            stats = pstats.Stats(profile)
+            rows = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:limit]
+            capture['top'] = [(_function_name(key), ct * 1000, tt * 1000)
+                              for key, (cc, nc, tt, ct, callers) in rows]
+            if output_dir is not None:
+                path = Path(output_dir) / f"slowest-{rank:02d}-{query['endpoint']}.prof"
+                stats.dump_stats(path)
+                capture['file'] = str(path)
+        else:
+            runs = 0
+            with StackSampler() as sampler:
+                start = time.process_time()
+                wall = time.perf_counter()
+                while time.process_time() - start < REPLAY_SAMPLE_SECONDS:
+                    run()
+                    runs += 1
+                wall = time.perf_counter() - wall
+            capture['ms'] = wall / runs * 1000
+            capture['runs'] = runs
+            capture['samples'] = sampler.samples
+            capture['top'] = sampler.top(limit)
+        captures.append(capture)
+    return captures
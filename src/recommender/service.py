@@ -0,0 +1,456 @@
+"""
+Recommendation Service
+HTTP/JSON endpoints over the engine registry with a per-worker result cache
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+from config.config import (
+    BUDGET_TIERS, CATEGORY_KEYWORDS, CITIES, ITINERARY_PLACES_PER_DAY, RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL_SECONDS, SERVICE_HOST, SERVICE_MAX_DAYS, SERVICE_MAX_PLACES_PER_DAY,
+    SERVICE_MAX_TOP_N, SERVICE_PORT, SERVICE_WORKERS
+)
+from src.recommender.personalization import ProfileStore
+from src.instrumentation import DISABLED, Instrumentation
+from src.recommender.registry import EngineRegistry
+
+logger = logging.getLogger(__name__)
+
+# Integer parameter -> largest accepted value; each value is its own cache
+# entry and days/top_n/places_per_day drive the work done per request
+QUERY_LIMITS = {'days': SERVICE_MAX_DAYS, 'top_n': SERVICE_MAX_TOP_N,
+                'places_per_day': SERVICE_MAX_PLACES_PER_DAY}
+
+
+class QueryError(ValueError):
+    """A request parameter is missing or invalid (answered with 400)"""
+
+
+class NotFound(LookupError):
+    """Unknown endpoint, or a city without data (answered with 404)"""
+
+
+class ResultCache:
+    """
+    LRU cache of encoded responses with a time-to-live
+
+    Keys start with the city name, so every entry of a city can be dropped
+    at once when its dataset reloads.
+    """
+
+    def __init__(self, max_size: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL_SECONDS):
+        """
+        Args:
+            max_size: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (expires at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """Cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, city_name: str):
+        """Drop every entry of a city"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == city_name]:
+                del self._entries[key]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def frame_records(df: pd.DataFrame) -> list:
+    """
+    Rows of a result frame as JSON-ready dicts
+
+    Converted one column at a time (NumPy/Arrow to Python scalars, missing
+    values to None) and zipped into rows, instead of boxing every row
+    through iterrows().
+    """
+    columns = [str(col) for col in df.columns]
+    values = []
+    for col in df.columns:
+        series = df[col]
+        column = series.tolist()
+        missing = series.isna().to_numpy()
+        if missing.any():
+            for i in np.flatnonzero(missing):
+                column[i] = None
+        values.append(column)
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _json_default(value):
+    """NumPy scalars left in statistics dicts"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, default=_json_default).encode()
+
+
+def normalize_query(params: dict, defaults: dict) -> dict:
+    """
+    Validated, canonical values of the query parameters named in defaults
+
+    categories are deduplicated and sorted so equivalent requests share a
+    cache entry; category must be a known category; source and user are
+    taken as is;
+    budget must be a BUDGET_TIERS level; other parameters must be positive
+    integers, at most their QUERY_LIMITS value. Parameters with a None
+    default are required.
+    """
+    query = {}
+    for name, default in defaults.items():
+        raw = params.get(name)
+        if not raw:
+            if default is None:
+                raise QueryError(f"{name} is required")
+            query[name] = default
+        elif name == 'categories':
+            categories = sorted({category.strip() for value in raw for category in value.split(',')
+                                 if category.strip()})
+            unknown = [category for category in categories if category not in CATEGORY_KEYWORDS]
+            if unknown:
+                raise QueryError(f"Unknown categories: {', '.join(unknown)}")
+            if not categories:
+                raise QueryError("categories is required")
+            query[name] = tuple(categories)
+        elif name == 'category':
+            if raw[-1] not in CATEGORY_KEYWORDS:
+                raise QueryError(f"Unknown category: {raw[-1]}")
+            query[name] = raw[-1]
+        elif name in ('source', 'user'):
+            query[name] = raw[-1]
+        else:
+            try:
+                value = int(raw[-1])
+            except ValueError:
+                raise QueryError(f"{name} must be an integer") from None
+            if name == 'budget' and value not in BUDGET_TIERS:
+                raise QueryError(f"budget must be one of {sorted(BUDGET_TIERS)}")
+            if value <= 0:
+                raise QueryError(f"{name} must be positive")
+            if value > QUERY_LIMITS.get(name, value):
+                raise QueryError(f"{name} must be at most {QUERY_LIMITS[name]}")
+            query[name] = value
+    return query
+
+
+class RecommendationService:
+    """
+    Engine endpoints answering with JSON bytes, cached per normalized query
+
+    Endpoints (GET, city as a query parameter):
+        /recommendations  categories, budget, days, top_n, user
+        /famous           top_n, category, source
+        /itinerary        categories, budget, days, places_per_day
+        /statistics
+        /health           loaded cities and result cache stats
+        /profile          user (no city): the user's liked and visited places
+    Profile events (POST, no city):
+        /like, /visit     user, place_id (repeatable)
+
+    Cache keys hold the city, the endpoint and the normalized query. Each
+    lookup first asks the registry for the engine, which reloads the city
+    when its parquet file changed; a new dataset version drops the city's
+    cached results. Recommendations for a user are reranked against their
+    profile and never cached, since every like or visit changes them.
+    """
+
+    # Endpoint -> query parameter defaults (None = required)
+    ENDPOINTS = {
+        'recommendations': {'categories': None, 'budget': None, 'days': 1, 'top_n': 20,
+                            'user': ''},
+        'famous': {'top_n': 5, 'category': '', 'source': ''},
+        'itinerary': {'categories': None, 'budget': None, 'days': 1,
+                      'places_per_day': ITINERARY_PLACES_PER_DAY},
+        'statistics': {},
+    }
+
+    # POST endpoint -> profile list it adds to
+    PROFILE_EVENTS = {'like': 'liked', 'visit': 'visited'}
+
+    def __init__(self, registry: EngineRegistry = None, cache: ResultCache = None,
+                 instrumentation: Instrumentation = None, profiles: ProfileStore = None):
+        """
+        Args:
+            registry: Engines to serve (a quiet default registry if omitted)
+            cache: Result cache (sized from config if omitted)
+            instrumentation: Records a 'request' timer and cache hit/miss counters
+            profiles: User profile store (user parameters and profile
+                endpoints are rejected without one)
+        """
+        self.registry = registry or EngineRegistry()
+        self.cache = cache if cache is not None else ResultCache()
+        self.profiles = profiles
+        self.instrumentation = instrumentation or DISABLED
+        self._versions = {}   # city -> dataset version the cached results belong to
+
+    def handle(self, endpoint: str, params: dict, method: str = 'GET') -> tuple:
+        """
+        Answer one request
+
+        Args:
+            endpoint: Path without the leading slash
+            params: Query parameters as parsed by urllib.parse.parse_qs
+            method: 'GET' or 'POST' (profile events)
+
+        Returns:
+            (HTTP status, JSON body bytes, cache hit); any other error is
+            logged and answered with 500
+        """
+        with self.instrumentation.timer('request'):
+            try:
+                if method == 'POST' or endpoint == 'profile':
+                    return self._handle_profile(endpoint, params, method)
+                return self._handle(endpoint, params)
+            except QueryError as e:
+                return 400, encode({'error': str(e)}), False
+            except NotFound as e:
+                return 404, encode({'error': str(e)}), False
+            except Exception:
+                logger.exception("%s /%s failed", method, endpoint)
+                return 500, encode({'error': "Internal server error"}), False
+
+    def _handle(self, endpoint: str, params: dict) -> tuple:
+        if endpoint == 'health':
+            return 200, encode({'cities': self.registry.loaded_cities(),
+                                'result_cache': self.cache.get_stats(), 'pid': os.getpid()}), False
+        if endpoint not in self.ENDPOINTS:
+            raise NotFound(f"Unknown endpoint: /{endpoint}")
+
+        city = (params.get('city') or [None])[-1]
+        if not city:
+            raise QueryError("city is required")
+        query = normalize_query(params, self.ENDPOINTS[endpoint])
+        if city not in CITIES:
+            raise NotFound(f"Unknown city: {city}")
+
+        try:
+            engine = self.registry.get(city)
+        except FileNotFoundError as e:
+            raise NotFound(str(e)) from None
+        version = self.registry.get_version(city)
+        if self._versions.get(city) != version:
+            self.cache.invalidate(city)
+            self._versions[city] = version
+
+        if query.get('user'):
+            profile = self._profile_store().get_profile(query['user'])
+            return 200, encode(self._run(engine, endpoint, query, profile)), False
+
+        key = (city, endpoint, *query.values())
+        body = self.cache.get(key)
+        hit = body is not None
+        self.instrumentation.increment('result_cache_hits' if hit else 'result_cache_misses')
+        if not hit:
+            body = encode(self._run(engine, endpoint, query))
+            self.cache.set(key, body)
+        return 200, body, hit
+
+    def _handle_profile(self, endpoint: str, params: dict, method: str) -> tuple:
+        if method == 'POST' and endpoint not in self.PROFILE_EVENTS:
+            raise NotFound(f"Unknown endpoint: POST /{endpoint}")
+        if method == 'GET' and endpoint != 'profile':
+            raise NotFound(f"Unknown endpoint: /{endpoint}")
+        profiles = self._profile_store()
+        user = (params.get('user') or [None])[-1]
+        if not user:
+            raise QueryError("user is required")
+        if endpoint == 'profile':
+            return 200, encode(profiles.get_profile(user)), False
+
+        place_ids = [place_id for value in params.get('place_id', [])
+                     for place_id in value.split(',') if place_id]
+        if not place_ids:
+            raise QueryError("place_id is required")
+        added = profiles.record(user, self.PROFILE_EVENTS[endpoint], place_ids)
+        return 200, encode({'user': user, 'added': added}), False
+
+    def _profile_store(self) -> ProfileStore:
+        if self.profiles is None:
+            raise QueryError("user profiles are not enabled on this server")
+        return self.profiles
+
+    def _run(self, engine, endpoint: str, query: dict, profile: dict = None):
+        if endpoint == 'recommendations' and profile is not None:
+            return frame_records(engine.get_personalized_recommendations(
+                profile, list(query['categories']), query['budget'], query['top_n']))
+        if endpoint == 'recommendations':
+            return frame_records(engine.get_recommendations(
+                list(query['categories']), query['budget'], query['days'], query['top_n']))
+        if endpoint == 'famous':
+            return frame_records(engine.get_top_famous_places(
+                query['top_n'], query['category'] or None, query['source'] or None))
+        if endpoint == 'itinerary':
+            itinerary = engine.create_itinerary(list(query['categories']), query['budget'],
+                                                query['days'], query['places_per_day'])
+            return {day: frame_records(stops) for day, stops in itinerary.items()}
+        return engine.get_statistics()
+
+    def make_server(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+        """Threaded HTTP server bound to host:port answering through this service"""
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive between requests of a client
+            # Headers and body go out in separate writes; without TCP_NODELAY
+            # the body waits for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def _respond(self, method: str):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Where the body ends is unknown, so the connection cannot be reused
+                    self.close_connection = True
+                    return self._send(400, encode({'error': "Content-Length must be a "
+                                                            "non-negative integer"}), False)
+                if length:
+                    try:
+                        form = parse_qs(self.rfile.read(length).decode())
+                    except UnicodeDecodeError:
+                        return self._send(400, encode({'error': "The request body must be "
+                                                                "UTF-8 form data"}), False)
+                    # Form-encoded bodies add to the query string parameters
+                    for name, values in form.items():
+                        params.setdefault(name, []).extend(values)
+                self._send(*service.handle(url.path.strip('/'), params, method))
+
+            def _send(self, status: int, body: bytes, hit: bool):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('X-Cache', 'hit' if hit else 'miss')
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = SERVICE_WORKERS,
+          cities: list = None, registry: EngineRegistry = None, cache: ResultCache = None,
+          profiles: ProfileStore = None):
+    """
+    Run the service until interrupted
+
+    Cities are loaded before any worker starts. With workers > 1 the
+    listening socket is opened once and the process forks: every worker
+    accepts on the shared socket and starts with the preloaded engines
+    (shared copy-on-write, with the datasets memory-mapped from the
+    registry's Arrow files). Each worker keeps its own result cache.
+    With a SharedEngineRegistry every worker maps the snapshots a loader
+    process published instead, and also follows new versions without
+    building anything itself.
+
+    Args:
+        host, port: Address to listen on
+        workers: Number of worker processes (fork is required for more than one)
+        cities: Cities to preload (default: none, loaded on first request)
+        registry: Engines to serve (EngineRegistry or SharedEngineRegistry)
+        cache: Result cache each worker starts from (sized from config if omitted)
+        profiles: User profile store shared by the workers (none: no personalization)
+    """
+    service = RecommendationService(registry, cache, profiles=profiles)
+    for city_name in cities or []:
+        engine = service.registry.get(city_name)
+        if profiles is not None:
+            engine.build_place_vectors()   # built once, shared copy-on-write by the workers
+    server = service.make_server(host, port)
+
+    if workers <= 1 or not hasattr(os, 'fork'):
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    # Stop the workers whether the parent is interrupted or terminated
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+    finally:
+        server.server_close()
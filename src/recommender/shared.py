@@ -0,0 +1,347 @@
+"""
+Shared Datasets
+Publishes built engines as memory-mapped snapshots that worker processes attach to without copying
+"""
+
+import json
+import mmap
+import multiprocessing
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+from config.config import (
+    CITIES, PROCESSED_DATA_DIR, REGISTRY_RELOAD_CHECK_SECONDS, SHARED_DATASET_DIR
+)
+from src.instrumentation import Instrumentation
+from src.models.scoring import ScoringModel
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.registry import _STRING_TYPES
+
+SNAPSHOT_MAGIC = b'TRSNAP01'
+_PREAMBLE = struct.Struct('<8sQQ')   # magic, index offset, index length
+ALIGNMENT = 64                       # Buffer offsets, so mapped arrays are SIMD-aligned
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(engine: RecommendationEngine, path: str) -> int:
+    """
+    Write an engine as a snapshot file
+
+    The engine is pickled with protocol 5: every numpy and Arrow buffer
+    (columns, index arrays, fame orders...) is written out-of-band at an
+    aligned offset and only the small object graph goes into the pickle
+    itself. The file is written to a temp file and renamed into place, so
+    readers never see a partial snapshot.
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    path = Path(path)
+    buffers = []
+    payload = pickle.dumps(engine, protocol=5, buffer_callback=buffers.append)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * _align(_PREAMBLE.size))
+            offset = f.tell()
+            f.write(payload)
+            index = {'payload': [offset, len(payload)], 'buffers': []}
+            for buffer in buffers:
+                data = buffer.raw()
+                offset = _align(f.tell())
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(data)
+                index['buffers'].append([offset, data.nbytes])
+
+            encoded = json.dumps(index, separators=(',', ':')).encode()
+            index_offset = f.tell()
+            f.write(encoded)
+            size = f.tell()
+            f.seek(0)
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, index_offset, len(encoded)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return size
+
+
+def read_snapshot(path: str) -> RecommendationEngine:
+    """
+    Attach to a snapshot file
+
+    The file is mapped read-only and every out-of-band buffer is handed to
+    the unpickler as a view of the mapping, so columns and index arrays are
+    backed by the OS page cache (shared by every process mapping the file)
+    and are read-only. Only the small object graph is built per process.
+    The mapping stays open as long as the engine references it, even after
+    the file is replaced or deleted.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    magic, index_offset, index_length = _PREAMBLE.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not an engine snapshot")
+    index = json.loads(bytes(view[index_offset:index_offset + index_length]))
+
+    offset, length = index['payload']
+    return pickle.loads(view[offset:offset + length],
+                        buffers=[view[start:start + size] for start, size in index['buffers']])
+
+
+def _pointer_path(shared_dir: Path, city_name: str) -> Path:
+    return shared_dir / f"{city_name}.current"
+
+
+def read_pointer(shared_dir: str, city_name: str) -> dict:
+    """
+    The published snapshot of a city
+
+    Returns:
+        {'file', 'version', 'bytes', 'published_at'}, or None when the city
+        has not been published
+    """
+    try:
+        return json.loads(_pointer_path(Path(shared_dir), city_name).read_text())
+    except FileNotFoundError:
+        return None
+
+
+class SharedPublisher:
+    """
+    Builds engines once and publishes them for every worker to attach to
+
+    Each city is published as {city}-{mtime_ns}-{size}.engine (named after
+    the parquet version it was built from) plus a {city}.current pointer
+    naming it. A new version is fully written before the pointer is
+    atomically replaced, so a worker always attaches to a complete
+    snapshot; older snapshots are then removed, and workers still mapping
+    them keep their pages until they switch.
+    """
+
+    def __init__(self, data_dir: str = PROCESSED_DATA_DIR, shared_dir: str = SHARED_DATASET_DIR,
+                 scoring_model: ScoringModel = None, place_vectors: bool = True,
+                 verbose: bool = False):
+        """
+        Args:
+            data_dir: Directory holding {city}_places.parquet files
+            shared_dir: Directory for snapshots and pointers (a tmpfs such as
+                /dev/shm keeps them in memory only)
+            scoring_model: Recommendation score weights of every engine
+                (default: the engine's built-in model)
+            place_vectors: Also build the personalization vectors
+            verbose: Print a line per published city
+        """
+        self.data_dir = Path(data_dir)
+        self.shared_dir = Path(shared_dir)
+        self.scoring_model = scoring_model
+        self.place_vectors = place_vectors
+        self.verbose = verbose
+
+    def publish(self, city_name: str, force: bool = False) -> dict:
+        """
+        Build and publish a city unless its current snapshot is up to date
+
+        Args:
+            city_name: Key from config.CITIES
+            force: Publish even if the parquet file did not change
+
+        Returns:
+            The city's pointer, with 'seconds' spent if it was (re)published
+        """
+        if city_name not in CITIES:
+            raise KeyError(f"Unknown city: {city_name}")
+        data_file = self.data_dir / f"{city_name}_places.parquet"
+        try:
+            stat = data_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No data found for {city_name}. Run collect_data.py first!"
+            ) from None
+        version = [stat.st_mtime_ns, stat.st_size]
+        current = read_pointer(self.shared_dir, city_name)
+        if not force and current is not None and current['version'] == version:
+            return current
+
+        start = time.perf_counter()
+        # Arrow-backed strings stay buffers in the snapshot instead of pickled objects
+        places_df = pq.read_table(data_file).to_pandas(types_mapper=_STRING_TYPES.get,
+                                                       split_blocks=True)
+        engine = RecommendationEngine(city_name, places_df=places_df,
+                                      scoring_model=self.scoring_model)
+        engine.warm(place_vectors=self.place_vectors)
+
+        self.shared_dir.mkdir(parents=True, exist_ok=True)
+        snapshot = self.shared_dir / f"{city_name}-{version[0]}-{version[1]}.engine"
+        pointer = {'file': snapshot.name, 'version': version,
+                   'bytes': write_snapshot(engine, snapshot), 'published_at': time.time()}
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.shared_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(pointer, f)
+            os.replace(tmp_path, _pointer_path(self.shared_dir, city_name))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        for old in self.shared_dir.glob(f"{city_name}-*.engine"):
+            if old != snapshot:
+                old.unlink(missing_ok=True)
+
+        pointer['seconds'] = time.perf_counter() - start
+        if self.verbose:
+            print(f"📤 Published {city_name}: {len(engine.places_df):,} places, "
+                  f"{pointer['bytes'] / 1024**2:.1f} MB in {pointer['seconds']:.2f}s")
+        return pointer
+
+    def run(self, city_names: list, interval: float = REGISTRY_RELOAD_CHECK_SECONDS,
+            ready=None, stop: threading.Event = None):
+        """
+        Publish cities, then republish each one whenever its parquet changes
+
+        Args:
+            city_names: Cities to publish and watch
+            interval: Seconds between change checks
+            ready: Event set once every city is published
+            stop: Event ending the loop (default: run until interrupted)
+        """
+        stop = stop or threading.Event()
+        try:
+            while True:
+                for city_name in city_names:
+                    try:
+                        self.publish(city_name)
+                    except (FileNotFoundError, OSError, ValueError) as e:
+                        # Keep serving the last published version
+                        print(f"⚠️  Could not publish {city_name}: {e}")
+                if ready is not None:
+                    ready.set()
+                if stop.wait(interval):
+                    return
+        except KeyboardInterrupt:
+            pass
+
+
+def start_publisher(publisher: SharedPublisher, city_names: list,
+                    interval: float = REGISTRY_RELOAD_CHECK_SECONDS) -> multiprocessing.Process:
+    """
+    Run a publisher in a loader process of its own and wait for its first pass
+
+    The loader is the only process that reads parquet files and builds
+    engines; it is a daemon, so it stops with the process that started it.
+
+    Returns:
+        The running loader process
+    """
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=publisher.run, args=(city_names, interval, ready),
+                                      name='publisher', daemon=True)
+    process.start()
+    while not ready.wait(0.5):
+        if not process.is_alive():
+            raise RuntimeError("The publisher exited before publishing")
+    return process
+
+
+class SharedEngineRegistry:
+    """
+    Engines attached from published snapshots, with the EngineRegistry interface
+
+    Every process attaching to a city maps the same snapshot file, so the
+    dataset, indexes and precomputed aggregates exist once in memory no
+    matter how many workers serve it. The pointer is re-read every
+    check_interval seconds and a new version is attached on the next get()
+    call; requests already running keep the engine they started with.
+    """
+
+    def __init__(self, shared_dir: str = SHARED_DATASET_DIR,
+                 check_interval: float = REGISTRY_RELOAD_CHECK_SECONDS,
+                 instrumentation: Instrumentation = None):
+        """
+        Args:
+            shared_dir: Directory a SharedPublisher writes to
+            check_interval: Seconds between pointer checks per city
+                (0 checks on every call, None disables automatic reloads)
+            instrumentation: Set on every attached engine for stage timings
+        """
+        self.shared_dir = Path(shared_dir)
+        self.check_interval = check_interval
+        self.instrumentation = instrumentation
+        self._engines = {}      # city -> RecommendationEngine
+        self._versions = {}     # city -> (mtime_ns, size) of the published parquet
+        self._last_check = {}   # city -> monotonic time of the last pointer read
+        self._lock = threading.Lock()
+
+    def get(self, city_name: str) -> RecommendationEngine:
+        """
+        Get the engine for a city, attaching to a newer snapshot if one was published
+
+        Args:
+            city_name: Key from config.CITIES
+
+        Returns:
+            RecommendationEngine over the city's mapped snapshot
+        """
+        if city_name not in CITIES:
+            raise KeyError(f"Unknown city: {city_name}")
+
+        engine = self._engines.get(city_name)
+        if engine is not None and not self._should_check(city_name):
+            return engine
+
+        with self._lock:
+            for _ in range(3):
+                pointer = read_pointer(self.shared_dir, city_name)
+                if pointer is None:
+                    raise FileNotFoundError(
+                        f"{city_name} has not been published to {self.shared_dir}. "
+                        f"Run serve.py --shared or publish.py first!"
+                    )
+                version = tuple(pointer['version'])
+                if self._versions.get(city_name) == version:
+                    break
+                try:
+                    engine = read_snapshot(self.shared_dir / pointer['file'])
+                except FileNotFoundError:
+                    continue   # Replaced between reading the pointer and opening it
+                if self.instrumentation is not None:
+                    engine.instrumentation = self.instrumentation
+                self._engines[city_name] = engine
+                self._versions[city_name] = version
+                break
+            if city_name not in self._engines:
+                raise FileNotFoundError(f"Could not attach to {city_name} in {self.shared_dir}")
+            self._last_check[city_name] = time.monotonic()
+            return self._engines[city_name]
+
+    def reload(self, city_name: str) -> RecommendationEngine:
+        """Re-attach a city's current snapshot and return the engine"""
+        with self._lock:
+            self._engines.pop(city_name, None)
+            self._versions.pop(city_name, None)
+        return self.get(city_name)
+
+    def loaded_cities(self) -> list:
+        """Cities currently attached"""
+        return list(self._engines)
+
+    def get_version(self, city_name: str) -> tuple:
+        """(mtime_ns, size) of the parquet file the attached snapshot was built from"""
+        return self._versions.get(city_name)
+
+    def _should_check(self, city_name: str) -> bool:
+        """Whether the pointer is due for a change check"""
+        if self.check_interval is None:
+            return False
+        return time.monotonic() - self._last_check.get(city_name, 0) >= self.check_interval
@@ -0,0 +1,134 @@
+"""
+Spatial Index
+Uniform grid over place coordinates for radius and nearest-neighbour queries
+"""
+
+import numpy as np
+from config.config import SPATIAL_CELL_METERS
+
+EARTH_RADIUS_METERS = 6_371_000
+
+
+def haversine_meters(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in meters"""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Grid index over latitude/longitude
+
+    Coordinates are projected to meters around the dataset's mean latitude
+    and bucketed into square cells. Row positions are stored sorted by cell
+    key (row * num_cols + col), so every grid row of a query box is a single
+    searchsorted range. Exact distances are haversine on the candidates.
+    Rows without coordinates are never returned.
+    """
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray,
+                 cell_meters: float = SPATIAL_CELL_METERS):
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.cell_meters = cell_meters
+
+        valid = ~(np.isnan(self.latitude) | np.isnan(self.longitude))
+        self.positions_with_coords = np.nonzero(valid)[0]
+        self.origin_lat = self.latitude[valid].mean() if valid.any() else 0.0
+        self.origin_lng = self.longitude[valid].mean() if valid.any() else 0.0
+        self._meters_per_deg_lat = np.radians(1) * EARTH_RADIUS_METERS
+        self._meters_per_deg_lng = self._meters_per_deg_lat * np.cos(np.radians(self.origin_lat))
+
+        col, row = self._cell(self.latitude[valid], self.longitude[valid])
+        self.min_col = int(col.min()) if len(col) else 0
+        self.min_row = int(row.min()) if len(row) else 0
+        self.num_cols = int(col.max()) - self.min_col + 1 if len(col) else 1
+        self.num_rows = int(row.max()) - self.min_row + 1 if len(row) else 1
+
+        keys = (row - self.min_row) * self.num_cols + (col - self.min_col)
+        order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[order]
+        self.sorted_positions = self.positions_with_coords[order]
+
+    def _cell(self, lat, lng) -> tuple:
+        """Grid (col, row) of coordinates"""
+        x = (np.asarray(lng) - self.origin_lng) * self._meters_per_deg_lng
+        y = (np.asarray(lat) - self.origin_lat) * self._meters_per_deg_lat
+        return (np.floor(x / self.cell_meters).astype(np.int64),
+                np.floor(y / self.cell_meters).astype(np.int64))
+
+    def within(self, lat: float, lng: float, radius_meters: float) -> tuple:
+        """
+        Places within a radius of a point
+
+        Returns:
+            (row positions, distances in meters), both in position order
+        """
+        # Grid box covering the circle, clipped to the populated area
+        reach = int(np.ceil(radius_meters / self.cell_meters))
+        col, row = self._cell(lat, lng)
+        col_lo = max(int(col) - reach - self.min_col, 0)
+        col_hi = min(int(col) + reach - self.min_col, self.num_cols - 1)
+        rows = np.arange(max(int(row) - reach - self.min_row, 0),
+                         min(int(row) + reach - self.min_row, self.num_rows - 1) + 1)
+        if col_lo > col_hi or len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        lo = np.searchsorted(self.sorted_keys, rows * self.num_cols + col_lo, side='left')
+        hi = np.searchsorted(self.sorted_keys, rows * self.num_cols + col_hi, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        slots = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(total)
+        candidates = np.sort(self.sorted_positions[slots])
+
+        distances = haversine_meters(lat, lng, self.latitude[candidates], self.longitude[candidates])
+        inside = distances <= radius_meters
+        return candidates[inside], distances[inside]
+
+    def nearest(self, lat: float, lng: float, k: int, allowed=None) -> tuple:
+        """
+        The k places closest to a point
+
+        Searches growing radii until k allowed places are inside the current
+        circle, which guarantees nothing outside it is closer, and falls back
+        to a full scan once the circle covers the whole grid.
+
+        Args:
+            lat, lng: Query point
+            k: Number of places
+            allowed: Optional function(positions) -> bool mask of acceptable rows
+
+        Returns:
+            (row positions, distances in meters), closest first
+        """
+        if k <= 0 or len(self.sorted_positions) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Past this radius the whole grid is covered; finish with a full scan
+        max_radius = self.cell_meters * (self.num_cols + self.num_rows + 2) + np.hypot(
+            (lat - self.origin_lat) * self._meters_per_deg_lat,
+            (lng - self.origin_lng) * self._meters_per_deg_lng
+        )
+
+        radius = self.cell_meters
+        while True:
+            if radius < max_radius:
+                positions, distances = self.within(lat, lng, radius)
+            else:
+                positions = self.positions_with_coords
+                distances = haversine_meters(lat, lng, self.latitude[positions],
+                                             self.longitude[positions])
+            if allowed is not None and len(positions):
+                keep = allowed(positions)
+                positions, distances = positions[keep], distances[keep]
+            if len(positions) >= k or radius >= max_radius:
+                break
+            radius *= 2
+
+        order = np.lexsort((positions, distances))[:k]
+        return positions[order], distances[order]
@@ -0,0 +1,22 @@
+"""
+Test Fixtures
+Small seeded synthetic cities, so the tests need no API keys or collected data
+"""
+
+import pytest
+from benchmarks.synthetic import make_places_df
+from src.recommender.recommendation_engine import RecommendationEngine
+
+
+@pytest.fixture(scope='session')
+def places_df():
+    """3,000 places where every fifth row has the same rating and review count (score ties)"""
+    places = make_places_df(3000, 'boston', seed=7)
+    places.loc[::5, ['rating', 'review_count']] = [4.0, 50]
+    return places
+
+
+@pytest.fixture(scope='session')
+def engine(places_df):
+    """Engine over places_df without materialized results (never mutate it in a test)"""
+    return RecommendationEngine('boston', places_df=places_df, materialized_dir=None)
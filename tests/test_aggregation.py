@@ -0,0 +1,121 @@
+"""
+Rating Aggregation Tests
+Source calibration, Bayesian smoothing and the columns the ingest paths write
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.mock_api import MockAPIServer
+from config.config import RATING_PRIOR_REVIEWS
+from src.data.aggregation import (
+    aggregate_ratings, calibrate_ratings, smooth_ratings, source_rating_stats
+)
+from src.recommender.recommendation_engine import RecommendationEngine
+from tests.test_data_collector import make_collector, quietly
+
+
+@pytest.fixture(scope='module')
+def ratings():
+    """Google rates high and tight, Yelp lower and wider, 10% unrated; a tiny third source"""
+    rng = np.random.default_rng(2)
+    google = rng.normal(4.2, 0.2, 600)
+    yelp = rng.normal(3.6, 0.4, 400)
+    values = np.concatenate([google, yelp, [2.0, 4.0, 5.0]])
+    values[rng.random(len(values)) < 0.1] = np.nan
+    sources = np.array(['google'] * 600 + ['yelp'] * 400 + ['tiny'] * 3)
+    return values, sources
+
+
+def test_source_stats_match_pandas(ratings):
+    values, sources = ratings
+    stats = source_rating_stats(values, sources)
+    grouped = pd.Series(values).groupby(sources).agg(['mean', 'std', 'count'])
+    for source, row in grouped.iterrows():
+        assert stats[source] == pytest.approx((row['mean'], row['std'], row['count']))
+    assert stats['*'] == pytest.approx((np.nanmean(values), pd.Series(values).std(),
+                                        (~np.isnan(values)).sum()))
+
+
+def test_calibration_maps_sources_onto_the_pooled_distribution(ratings):
+    values, sources = ratings
+    stats = source_rating_stats(values, sources)
+    calibrated = calibrate_ratings(values, sources, stats)
+
+    np.testing.assert_array_equal(np.isnan(calibrated), np.isnan(values))
+    pooled_mean, pooled_std, _ = stats['*']
+    for source in ('google', 'yelp'):
+        rescaled = pd.Series(calibrated[sources == source])
+        assert rescaled.mean() == pytest.approx(pooled_mean, abs=0.01)
+        assert rescaled.std() == pytest.approx(pooled_std, rel=0.05)
+        # Order within a source is kept (clipping at 5 may only create ties)
+        raw = values[sources == source]
+        order = np.argsort(raw)[:(~np.isnan(raw)).sum()]
+        assert (np.diff(rescaled.to_numpy()[order]) >= 0).all()
+    # Too few rated rows to rescale
+    np.testing.assert_array_equal(calibrated[sources == 'tiny'], [2.0, 4.0, 5.0])
+    assert np.nanmin(calibrated) >= 1.0 and np.nanmax(calibrated) <= 5.0
+
+
+def test_calibration_keeps_sources_without_spread():
+    values = np.full(50, 4.0)
+    sources = np.array(['google'] * 50)
+    np.testing.assert_array_equal(calibrate_ratings(values, sources, min_rated=10), values)
+
+
+def test_smoothing_follows_the_bayesian_average():
+    ratings = np.array([5.0, 5.0, 3.0, np.nan, 4.0, np.nan])
+    reviews = np.array([3, 10_000, 50, 0, 20, 7])
+    categories = np.array(['food', 'food', 'food', 'food', 'nature', 'park'])
+    smoothed = smooth_ratings(ratings, reviews, categories, fallback=3.5)
+
+    food_mean = (5.0 + 5.0 + 3.0) / 3
+    expected = [(3 * 5.0 + RATING_PRIOR_REVIEWS * food_mean) / (3 + RATING_PRIOR_REVIEWS),
+                (10_000 * 5.0 + RATING_PRIOR_REVIEWS * food_mean) / (10_000 + RATING_PRIOR_REVIEWS),
+                (50 * 3.0 + RATING_PRIOR_REVIEWS * food_mean) / (50 + RATING_PRIOR_REVIEWS),
+                food_mean,   # unrated: the category mean
+                4.0,         # the only rating of its category is its mean
+                3.5]         # category without ratings: the fallback
+    np.testing.assert_allclose(smoothed, expected)
+    # Many reviews keep the rating, few pull it to the mean
+    assert smoothed[1] > smoothed[0] > food_mean
+
+
+def test_aggregate_keeps_existing_calibrated_ratings():
+    places = pd.DataFrame({'rating': [4.0, 3.0, np.nan], 'review_count': [100, 10, 0],
+                           'source': ['google', 'yelp', 'google'], 'category': 'food',
+                           'calibrated_rating': [np.nan, 3.7, np.nan]})
+    result = aggregate_ratings(places)
+    assert result is places
+    assert places['calibrated_rating'].tolist()[:2] == [4.0, 3.7]
+    assert np.isnan(places['calibrated_rating'].iloc[2])
+    np.testing.assert_allclose(
+        places['smoothed_rating'],
+        smooth_ratings(places['calibrated_rating'], places['review_count'], places['category']))
+
+
+def test_collect_and_stream_write_the_same_ratings(tmp_path):
+    categories = ['food', 'nature', 'nightlife']
+    with MockAPIServer(latency=0, throttle_every=0, places_per_keyword=400) as server:
+        collector = make_collector(server, tmp_path / 'collect')
+        collected = quietly(collector.collect_city_data, 'boston', categories)
+        streamer = make_collector(server, tmp_path / 'stream')
+        quietly(streamer.stream_city_data, 'boston', categories, dataset_dir=tmp_path / 'dataset')
+        quietly(streamer.build_city_from_dataset, 'boston', tmp_path / 'dataset')
+    built = pd.read_parquet(tmp_path / 'stream' / 'processed' / 'boston_places.parquet')
+
+    assert collected['calibrated_rating'].notna().any()
+    both = collected.merge(built, on=['place_id', 'category'], suffixes=('', '_built'))
+    assert len(both) == len(collected) == len(built)
+    for col in ('calibrated_rating', 'smoothed_rating'):
+        np.testing.assert_allclose(both[col], both[f'{col}_built'], atol=1e-12)
+
+
+def test_engine_scores_the_stored_smoothed_rating(engine, places_df):
+    stored = RecommendationEngine('boston', places_df=aggregate_ratings(places_df.copy()),
+                                  materialized_dir=None)
+    assert stored.index.scoring_model.name == 'smoothed'
+    assert engine.index.scoring_model.name == 'default'
+    # Datasets saved before the columns existed get the same features at load time
+    for feature in ('calibrated_rating', 'smoothed_rating'):
+        np.testing.assert_allclose(stored.index.features[feature], engine.index.features[feature])
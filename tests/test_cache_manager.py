@@ -0,0 +1,69 @@
+"""
+Cache Manager Tests
+Request normalization, expiry and least recently used eviction
+"""
+
+import os
+import time
+
+from src.data.cache_manager import CacheManager
+
+REQUEST = {'lat': 42.3601, 'lng': -71.0589, 'keyword': 'restaurant', 'radius': 5000}
+
+
+def test_equivalent_requests_share_an_entry(tmp_path):
+    cache = CacheManager(tmp_path)
+    cache.set('google', REQUEST, {'places': [1]})
+    same = dict(REQUEST, keyword='  Restaurant ', lat=42.36010000001, radius=5000.0)
+    assert cache.get('google', same) == {'places': [1]}
+    assert cache.get('yelp', REQUEST) is None
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = CacheManager(tmp_path, expiry_days=1)
+    cache.set('google', REQUEST, {'places': [1]})
+    assert cache.is_fresh('google', REQUEST)
+
+    path = cache._path('google', cache.make_key('google', REQUEST))
+    two_days_ago = time.time() - 2 * 86400
+    os.utime(path, (two_days_ago, two_days_ago))
+    assert cache.get('google', REQUEST) is None
+    assert not cache.is_fresh('google', REQUEST)
+    # Still readable for planning, and removed by evict_expired
+    assert cache.peek('google', REQUEST, include_expired=True) == {'places': [1]}
+    assert cache.evict_expired() == 1
+    assert cache.peek('google', REQUEST, include_expired=True) is None
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = CacheManager(tmp_path)
+    requests = [dict(REQUEST, keyword=keyword) for keyword in ('a', 'b', 'c')]
+    paths = []
+    for age, request in zip((30, 20, 10), requests):
+        cache.set('google', request, {'keyword': request['keyword']})
+        path = cache._path('google', cache.make_key('google', request))
+        os.utime(path, (time.time() - age, time.time() - age))
+        paths.append(path)
+
+    cache.get('google', requests[0])   # 'a' becomes the most recently used
+    cache.max_size_bytes = paths[0].stat().st_size + paths[2].stat().st_size
+    assert cache.enforce_size_limit() == 1
+    assert [path.exists() for path in paths] == [True, False, True]
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_size_limit_is_enforced_on_write(tmp_path):
+    cache = CacheManager(tmp_path, max_size_mb=0)
+    cache.set('google', REQUEST, {'places': [1]})
+    assert cache.get_stats()['size_mb'] == 0
+    assert cache.get('google', REQUEST) is None
+
+
+def test_overwriting_an_entry_keeps_the_size_exact(tmp_path):
+    cache = CacheManager(tmp_path)
+    cache.get_stats()   # scan the (empty) directory, so later writes are tracked incrementally
+    for round_number in range(5):
+        cache.set('google', REQUEST, {'places': list(range(round_number * 10))})
+    path = cache._path('google', cache.make_key('google', REQUEST))
+    assert cache._current_size() == path.stat().st_size
@@ -0,0 +1,102 @@
+"""
+Compact Layout Tests
+Label bitsets and compacted frames must hold the same values as the originals
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from benchmarks.synthetic import make_places_df
+from src.recommender.compact import LabelSet, compact_places, compact_table
+
+
+def values(series: pd.Series) -> list:
+    """Python values of a column, any missing value as None"""
+    return [None if pd.isna(value) else value for value in series.astype(object)]
+
+
+def label_sets(strings) -> list:
+    """Label sets of comma-joined strings (None stays None)"""
+    return [None if value is None else set(filter(None, value.split(','))) for value in strings]
+
+
+@pytest.fixture(scope='module')
+def places():
+    return make_places_df(2000, 'boston', seed=11)
+
+
+def test_label_set_decodes_what_it_encoded():
+    strings = pd.Series(['bar,cafe', None, 'cafe', 'museum,bar,park', '', 'cafe', np.nan])
+    labels = LabelSet(strings)
+    assert list(labels.labels) == ['bar', 'cafe', 'museum', 'park']
+    decoded = labels.decode(np.arange(len(strings)))
+    assert list(decoded) == ['bar,cafe', None, 'cafe', 'bar,museum,park', '', 'cafe', None]
+    assert list(labels.decode(np.array([3, 0]))) == ['bar,museum,park', 'bar,cafe']
+
+
+def test_label_set_round_trip_on_places(places):
+    for col in ('types', 'categories'):
+        labels = LabelSet(places[col])
+        decoded = labels.decode(np.arange(len(places)))
+        assert label_sets(decoded) == label_sets(places[col].to_numpy())
+        # More than eight labels, so rows span several bytes
+        assert labels.bits.shape[1] == -(-len(labels.labels) // 8) > 1
+
+
+@pytest.mark.parametrize('match_all', [False, True])
+def test_label_set_mask_matches_a_scan(places, match_all):
+    labels = LabelSet(places['types'])
+    rows = label_sets(places['types'])
+    vocabulary = list(labels.labels)
+    for wanted in ([vocabulary[0]], vocabulary[3:5], [vocabulary[-1], vocabulary[1]],
+                   [vocabulary[2], 'not_a_label'], ['not_a_label']):
+        test = all if match_all else any
+        expected = [row is not None and test(label in row for label in wanted) for row in rows]
+        np.testing.assert_array_equal(labels.mask(wanted, match_all), expected)
+
+
+def test_compact_places_keeps_every_value(places):
+    original = places.copy()
+    compact, labels, columns = compact_places(places)
+    pd.testing.assert_frame_equal(places, original)
+
+    assert columns == list(places.columns)
+    assert set(labels) == {'types', 'categories'} and not set(labels) & set(compact.columns)
+    assert isinstance(compact['category'].dtype, pd.CategoricalDtype)
+    assert compact['review_count'].dtype == np.int32
+    assert compact['price_estimate'].dtype == np.int8
+    assert compact['rating'].dtype == np.float64
+    for col in compact.columns:
+        assert values(compact[col]) == values(places[col]), col
+        if not isinstance(compact[col].array, pd.arrays.ArrowExtensionArray):
+            assert not np.shares_memory(np.asarray(compact[col]), np.asarray(places[col])), col
+
+
+def test_compact_places_leaves_unfit_integers():
+    places = pd.DataFrame({'review_count': [1.0, np.nan], 'price_level': [1, 300]})
+    compact, _, _ = compact_places(places)
+    assert compact['review_count'].dtype == np.float64
+    assert compact['price_level'].dtype == np.int64
+
+
+def test_compact_table_converts_to_the_compact_layout(places):
+    table = compact_table(pa.Table.from_pandas(places, preserve_index=False))
+    assert table.schema.field('category').type == pa.dictionary(pa.int8(), pa.string())
+    assert table.schema.field('price_level').type == pa.int8()
+
+    from_table, _, _ = compact_places(table.to_pandas())
+    from_frame, _, _ = compact_places(places)
+    pd.testing.assert_frame_equal(from_table, from_frame, check_dtype=False)
+    for col in ('category', 'review_count', 'price_estimate', 'rating'):
+        assert from_table[col].dtype == from_frame[col].dtype, col
+
+
+def test_engine_rows_restore_the_original_frame(engine, places_df):
+    rows = engine._rows(np.arange(len(places_df)))
+    assert list(rows.columns) == list(places_df.columns)
+    for col in ('types', 'categories'):
+        assert label_sets(rows[col]) == label_sets(places_df[col])
+    for col in places_df.columns.drop(['types', 'categories']):
+        assert values(rows[col]) == values(places_df[col]), col
+    assert rows.index.equals(places_df.index)
@@ -0,0 +1,94 @@
+"""
+Data Collector Tests
+Collection runs against the mock API server
+"""
+
+import contextlib
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from benchmarks.mock_api import MockAPIServer
+from config.config import CATEGORY_KEYWORDS
+from src.api.google_client import GooglePlacesClient
+from src.api.yelp_client import YelpClient
+from src.data.cache_manager import CacheManager
+from src.data.data_collector import DataCollector
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockAPIServer(latency=0, throttle_every=0, places_per_keyword=400) as server:
+        yield server
+
+
+def make_collector(server: MockAPIServer, workspace, concurrent: bool = False) -> DataCollector:
+    """Collector on the mock API with its own cache and output directories"""
+    cache = CacheManager(workspace / 'cache')
+    google = GooglePlacesClient('mock-key', base_url=server.google_url, retry_backoff=0, cache=cache)
+    yelp = YelpClient('mock-key', base_url=server.yelp_url, retry_backoff=0, cache=cache)
+    return DataCollector(google, yelp, output_dir=workspace / 'processed', concurrent=concurrent,
+                         cache=cache, snapshot_dir=workspace / 'snapshots')
+
+
+def quietly(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_streaming_searches_shared_keywords_once(server, tmp_path, concurrent):
+    # "beach" is a keyword of both leisure and nature
+    categories = ['leisure', 'nature']
+    collector = make_collector(server, tmp_path, concurrent)
+    quietly(collector.stream_city_data, 'boston', categories, dataset_dir=tmp_path / 'dataset')
+
+    keywords = {keyword for category in categories for keyword in CATEGORY_KEYWORDS[category]}
+    stats = collector.get_usage_stats()
+    assert stats['cache_hits'] + stats['cache_misses'] == 2 * len(keywords)
+    assert stats['total_calls'] == 2 * len(keywords)
+
+    rows = pq.read_table(tmp_path / 'dataset' / 'city=boston', partitioning='hive').to_pandas()
+    beach = rows[rows['name'].str.startswith('Beach')]
+    assert set(beach['category'].astype(str)) == set(categories)
+
+
+def test_refresh_after_sweep_keeps_the_swept_places(server, tmp_path):
+    collector = make_collector(server, tmp_path)
+    swept, report = quietly(collector.sweep_city_data, 'boston', ['nature'], tile_radius=3000)
+    # Many more searches than the center-point ones refresh would run
+    assert report['summary']['tiles'] > 2 * len(CATEGORY_KEYWORDS['nature'])
+
+    refreshed = quietly(collector.refresh_city_data, 'boston', ['nature'])
+    assert refreshed['dropped'] == 0 and refreshed['added'] == 0
+    assert refreshed['total_places'] == len(swept)
+    assert refreshed['api_calls'] == 0
+
+    # Collecting from the center again forgets the sweep's searches
+    collected = quietly(collector.collect_city_data, 'boston', ['nature'])
+    refreshed = quietly(collector.refresh_city_data, 'boston', ['nature'])
+    assert refreshed['dropped'] == 0 and refreshed['total_places'] == len(collected)
+
+
+def test_refresh_drops_rows_the_searches_no_longer_return(server, tmp_path):
+    collector = make_collector(server, tmp_path)
+    places = quietly(collector.collect_city_data, 'boston', ['nature', 'food'])
+    closed = places.assign(place_id=places['place_id'] + '-closed').head(5)
+    collector.save_city_data('boston', pd.concat([places, closed], ignore_index=True))
+
+    refreshed = quietly(collector.refresh_city_data, 'boston', ['nature', 'food'])
+    assert refreshed['dropped'] == len(closed) and refreshed['added'] == 0
+    assert refreshed['total_places'] == len(places)
+
+
+def test_refresh_defaults_to_the_collected_categories(server, tmp_path):
+    collector = make_collector(server, tmp_path)
+    places = quietly(collector.collect_city_data, 'boston', ['food'])
+
+    refreshed = quietly(collector.refresh_city_data, 'boston')
+    assert refreshed['api_calls'] == 0
+    assert refreshed['queries_total'] == 2 * len(CATEGORY_KEYWORDS['food'])
+    assert refreshed['added'] == 0 and refreshed['dropped'] == 0
+    saved = pd.read_parquet(tmp_path / 'processed' / 'boston_places.parquet')
+    assert set(saved['category']) == {'food'} and len(saved) == len(places)
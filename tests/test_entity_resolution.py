@@ -0,0 +1,113 @@
+"""
+Entity Resolution Tests
+Google/Yelp matching against an all-pairs scan, and the merged rows
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.bench_entity_resolution import make_duplicated_city
+from config.config import ENTITY_MATCH_RADIUS_METERS, ENTITY_MATCH_THRESHOLD
+from src.data.entity_resolution import (
+    ADDRESS_WEIGHT, NAME_WEIGHT, _project, find_cross_source_matches, merge_cross_source,
+    signature_similarity, trigram_signatures
+)
+
+METERS_PER_DEG_LAT = 111_320
+
+
+def place(source: str, place_id: str, name: str, address: str, north_m: float = 0.0,
+          category: str = 'food', **values) -> dict:
+    row = {'place_id': place_id, 'source': source, 'name': name, 'address': address,
+           'latitude': 42.36 + north_m / METERS_PER_DEG_LAT, 'longitude': -71.06,
+           'category': category, 'rating': 4.0, 'review_count': 100, 'price_level': 2,
+           'price_estimate': 2, 'categories': None, 'phone': None, 'yelp_url': None,
+           'image_url': None}
+    row.update(values)
+    return row
+
+
+def all_pairs_matches(places: pd.DataFrame) -> set:
+    """Every Google x Yelp pair scored without blocking, kept when mutually best"""
+    source = places['source'].to_numpy()
+    google, yelp = np.nonzero(source == 'google')[0], np.nonzero(source == 'yelp')[0]
+    x, y = _project(places['latitude'].to_numpy(dtype=float), places['longitude'].to_numpy(dtype=float))
+    names = trigram_signatures(places['name'])
+    addresses = trigram_signatures(places['address'].astype(str).str.replace(r',.*', '', regex=True))
+    category = places['category'].to_numpy()
+
+    a, b = np.repeat(google, len(yelp)), np.tile(yelp, len(google))
+    score = (NAME_WEIGHT * signature_similarity(names[a], names[b]) +
+             ADDRESS_WEIGHT * signature_similarity(addresses[a], addresses[b]))
+    keep = ((np.hypot(x[a] - x[b], y[a] - y[b]) <= ENTITY_MATCH_RADIUS_METERS)
+            & (category[a] == category[b]) & (score >= ENTITY_MATCH_THRESHOLD))
+    a, b, score = a[keep], b[keep], score[keep]
+
+    best_of_a, best_of_b = {}, {}
+    for i, j, s in zip(a, b, score):
+        if s > best_of_a.get(i, (-1, None))[0]:
+            best_of_a[i] = (s, j)
+        if s > best_of_b.get(j, (-1, None))[0]:
+            best_of_b[j] = (s, i)
+    return {(i, j) for i, (_, j) in best_of_a.items() if best_of_b[j][1] == i}
+
+
+def test_signature_similarity_bounds():
+    signatures = trigram_signatures(pd.Series(['Golden Lotus', 'golden  LOTUS!', 'xyz', None]))
+    similarity = signature_similarity(signatures[[0, 0, 3]], signatures[[1, 2, 3]])
+    assert similarity[0] == 1.0
+    assert similarity[1] == 0.0
+    assert similarity[2] == 0.0
+
+
+def test_matches_need_same_category_nearby_and_similar():
+    places = pd.DataFrame([
+        place('google', 'g1', 'Golden Lotus Bistro', '12 Main St, Boston, MA'),
+        place('yelp', 'y1', 'Golden  Lotus Bistro & Co', '12 Main Street, Boston', north_m=30),
+        place('yelp', 'y2', 'Golden Lotus Bistro', '12 Main St', north_m=500),
+        place('yelp', 'y3', 'Golden Lotus Bistro', '12 Main St', north_m=10, category='nightlife'),
+        place('yelp', 'y4', 'Harbor Oyster House', '90 Pier Rd', north_m=5),
+    ])
+    matches = find_cross_source_matches(places)
+    assert list(zip(matches['google_pos'], matches['yelp_pos'])) == [(0, 1)]
+    assert matches['distance_m'].iloc[0] == pytest.approx(30, abs=1)
+
+
+def test_matches_equal_an_all_pairs_scan():
+    places, planted = make_duplicated_city(2_000, seed=3)
+    matches = find_cross_source_matches(places)
+    found = set(zip(matches['google_pos'], matches['yelp_pos']))
+    assert found == all_pairs_matches(places)
+
+    # Planted copies are found, and only those
+    ids = places['place_id'].to_numpy()
+    correct = sum(ids[j] == 'yelp_' + ids[i] for i, j in found)
+    assert correct == len(found) and correct >= 0.9 * planted
+
+
+def test_merge_fuses_the_two_rows():
+    places = pd.DataFrame([
+        place('google', 'g1', 'Golden Lotus Bistro', '12 Main St', rating=4.0, review_count=300,
+              price_level=0, price_estimate=2),
+        place('yelp', 'y1', 'Golden Lotus Bistro', '12 Main St', north_m=20, rating=5.0,
+              review_count=100, price_level=3, price_estimate=3, phone='555-0100',
+              yelp_url='https://www.yelp.com/biz/y1', categories='Chinese'),
+        place('google', 'g2', 'Harbor Oyster House', '90 Pier Rd', north_m=2_000),
+    ])
+    merged = merge_cross_source(places)
+    assert merged['place_id'].tolist() == ['g1', 'g2']
+    row = merged.iloc[0]
+    assert row['source'] == 'google+yelp' and row['yelp_place_id'] == 'y1'
+    assert row['review_count'] == 400
+    assert row['rating'] == pytest.approx((4.0 * 300 + 5.0 * 100) / 400)
+    # Google has no price, so the Yelp one is used
+    assert row['price_level'] == 3 and row['price_estimate'] == 3
+    assert (row['phone'], row['yelp_url'], row['categories']) == \
+        ('555-0100', 'https://www.yelp.com/biz/y1', 'Chinese')
+    assert merged.iloc[1]['source'] == 'google'
+
+
+def test_merge_without_matches_returns_the_rows():
+    places = pd.DataFrame([place('google', 'g1', 'Golden Lotus', '1 A St'),
+                           place('yelp', 'y1', 'Harbor Oyster House', '2 B St', north_m=5)])
+    assert merge_cross_source(places).equals(places)
@@ -0,0 +1,88 @@
+"""
+Itinerary Tests
+Day clustering, stop ordering and the engine's itineraries
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from src.recommender.itinerary import build_itinerary, kmeans, order_stops, project_meters
+
+CATEGORIES = ['food', 'cultural', 'nightlife']
+
+
+def path_length(points: np.ndarray, path) -> float:
+    return np.hypot(*(points[path[1:]] - points[path[:-1]]).T).sum()
+
+
+def test_order_stops_is_a_short_permutation():
+    rng = np.random.default_rng(1)
+    for n in range(1, 8):
+        points = rng.uniform(0, 1_000, (n, 2))
+        path = order_stops(points)
+        assert sorted(path) == list(range(n))
+        # Within 25% of the best open path found by trying every order
+        best = min(path_length(points, list(order)) for order in itertools.permutations(range(n)))
+        assert path_length(points, path) <= 1.25 * best + 1e-9
+
+
+def test_order_stops_walks_a_line_end_to_end():
+    points = np.column_stack([np.arange(10) * 100.0, np.zeros(10)])
+    shuffled = np.random.default_rng(2).permutation(10)
+    path = shuffled[order_stops(points[shuffled])]
+    assert list(path) in (list(range(10)), list(range(9, -1, -1)))
+
+
+def test_kmeans_separates_distant_groups():
+    rng = np.random.default_rng(3)
+    offsets = np.array([[0, 0], [10_000, 0], [0, 10_000]])
+    points = np.concatenate([offset + rng.normal(0, 200, (50, 2)) for offset in offsets])
+    labels, _ = kmeans(points, 3)
+    groups = labels.reshape(3, 50)
+    assert all(len(set(group)) == 1 for group in groups)
+    assert len(set(groups[:, 0])) == 3
+
+
+def test_build_itinerary_days():
+    rng = np.random.default_rng(4)
+    lat = 42.36 + rng.normal(0, 0.03, 600)
+    lng = -71.06 + rng.normal(0, 0.04, 600)
+    scores = rng.uniform(0, 5, 600)
+    codes = rng.integers(0, 3, 600)
+    days = build_itinerary(lat, lng, scores, codes, num_days=4, places_per_day=5, max_candidates=200)
+
+    assert [len(day) for day in days] == [5] * 4
+    stops = np.concatenate(days)
+    assert len(set(stops)) == len(stops)
+    # Only the best max_candidates are used
+    assert scores[stops].min() >= np.sort(scores)[-200]
+    # Best-scored day first
+    totals = [scores[day].sum() for day in days]
+    assert totals == sorted(totals, reverse=True)
+    # Each day stays in one area: tighter than the same stops dealt out at random
+    points = project_meters(lat, lng)
+
+    def spread(groups):
+        return np.mean([np.linalg.norm(points[g] - points[g].mean(axis=0), axis=1).mean()
+                        for g in groups])
+    assert spread(days) < 0.5 * spread(rng.permutation(stops).reshape(4, 5))
+
+
+def test_build_itinerary_with_few_candidates():
+    lat, lng = np.array([42.36, 42.37, 42.38]), np.array([-71.06, -71.05, -71.04])
+    days = build_itinerary(lat, lng, np.array([3.0, 2.0, 1.0]), np.zeros(3, dtype=int), num_days=5)
+    assert len(days) == 5
+    assert sorted(np.concatenate(days)) == [0, 1, 2]
+    assert build_itinerary(lat, lng, np.ones(3), np.zeros(3, dtype=int), num_days=0) == []
+
+
+@pytest.mark.parametrize('num_days, per_day', [(1, 5), (3, 4), (7, 5)])
+def test_engine_itinerary(engine, num_days, per_day):
+    itinerary = engine.create_itinerary(CATEGORIES, 2, num_days, per_day)
+    assert list(itinerary) == [f"Day {day}" for day in range(1, num_days + 1)]
+    stops = [row for day in itinerary.values() for row in day.itertuples()]
+    assert all(len(day) == per_day for day in itinerary.values())
+    assert len({stop.place_id for stop in stops}) == len(stops)
+    assert {stop.category for stop in stops} <= set(CATEGORIES)
+    assert all(stop.price_estimate <= 2 for stop in stops)
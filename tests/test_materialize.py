@@ -0,0 +1,58 @@
+"""
+Materialization Tests
+Precomputed recommendations and itineraries must equal the live results
+"""
+
+import pandas as pd
+import pytest
+from benchmarks.synthetic import make_places_df
+from src.recommender.materialize import MaterializedLookup, fingerprint, materialize
+from src.recommender.recommendation_engine import RecommendationEngine
+
+QUERIES = [
+    (['food'], 1),
+    (['food', 'cultural'], 2),
+    (['nature', 'nightlife', 'shopping'], 4),
+    (['adventure', 'family', 'leisure', 'physical_activity'], 3),
+]
+
+
+@pytest.fixture(scope='module')
+def engines(tmp_path_factory):
+    """(live engine, engine answering from a saved and reloaded lookup, lookup directory)"""
+    places = make_places_df(500, 'boston', seed=3)
+    places.loc[::4, ['rating', 'review_count']] = [4.5, 120]
+    live = RecommendationEngine('boston', places_df=places, materialized_dir=None)
+    lookup = materialize(live, top_n=10, max_days=2, workers=1)
+    directory = tmp_path_factory.mktemp('materialized')
+    lookup.save(MaterializedLookup.path(directory, 'boston', fingerprint(live)))
+    stored = RecommendationEngine('boston', places_df=places, materialized_dir=str(directory))
+    assert stored.materialized is not None
+    return live, stored, directory
+
+
+@pytest.mark.parametrize('categories, budget_level', QUERIES)
+@pytest.mark.parametrize('top_n', [1, 10, 25])
+def test_recommendations_equal_live(engines, categories, budget_level, top_n):
+    live, stored, _ = engines
+    pd.testing.assert_frame_equal(stored.get_recommendations(categories, budget_level, 1, top_n),
+                                  live.get_recommendations(categories, budget_level, 1, top_n))
+
+
+@pytest.mark.parametrize('categories, budget_level', QUERIES)
+@pytest.mark.parametrize('num_days', [1, 2, 3])
+def test_itineraries_equal_live(engines, categories, budget_level, num_days):
+    live, stored, _ = engines
+    expected = live.create_itinerary(categories, budget_level, num_days)
+    got = stored.create_itinerary(categories, budget_level, num_days)
+    assert list(got) == list(expected)
+    for day in expected:
+        pd.testing.assert_frame_equal(got[day], expected[day])
+
+
+def test_lookup_belongs_to_its_dataset(engines):
+    live, _, directory = engines
+    other = RecommendationEngine('boston', places_df=make_places_df(500, 'boston', seed=4),
+                                 materialized_dir=str(directory))
+    assert fingerprint(other) != fingerprint(live)
+    assert other.materialized is None
@@ -0,0 +1,136 @@
+"""
+Personalization Tests
+Profile storage, place vectors and personalized reranking
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.recommender.compact import compact_places
+from src.recommender.personalization import PlaceVectors, ProfileStore
+from src.recommender.recommendation_engine import RecommendationEngine
+
+CATEGORIES = ['food', 'cultural']
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(tmp_path / 'profiles' / 'profiles.db')
+
+
+@pytest.fixture(scope='module')
+def venue_places(places_df):
+    """Places where every fifth venue is also listed under a second category"""
+    places = places_df.copy()
+    places.loc[1::5, 'place_id'] = places.loc[0::5, 'place_id'].to_numpy()[:len(places.loc[1::5])]
+    return places
+
+
+@pytest.fixture(scope='module')
+def vectors(venue_places):
+    compact, labels, _ = compact_places(venue_places)
+    return PlaceVectors(compact, labels)
+
+
+def test_store_records_profiles(store):
+    assert store.like('ana', ['p1', 'p2']) == 2
+    assert store.like('ana', ['p2', 'p3']) == 1
+    assert store.visit('ana', [4]) == 1
+    assert store.get_profile('ana') == {'liked': ['p1', 'p2', 'p3'], 'visited': ['4']}
+    assert store.get_profile('nobody') == {'liked': [], 'visited': []}
+
+    assert store.remove('ana', 'liked', ['p1', 'p9']) == 1
+    assert store.get_profile('ana')['liked'] == ['p2', 'p3']
+    # Another store on the same file sees the same rows
+    assert ProfileStore(store.path).get_profile('ana')['visited'] == ['4']
+    store.clear('ana')
+    assert store.get_profile('ana') == {'liked': [], 'visited': []}
+    with pytest.raises(ValueError):
+        store.record('ana', 'bookmarked', ['p1'])
+
+
+def test_store_is_shared_by_threads(store):
+    def like(thread):
+        for i in range(20):
+            store.like(f'user{thread % 2}', [f'{thread}-{i}'])
+    threads = [threading.Thread(target=like, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.get_profile('user0')['liked']) == len(store.get_profile('user1')['liked']) == 60
+
+
+def test_vectors_are_unit_rows(vectors):
+    np.testing.assert_allclose(np.linalg.norm(vectors.matrix, axis=1), 1.0, rtol=1e-5)
+    assert set(vectors.blocks) == {'category', 'price', 'types', 'categories', 'location'}
+
+
+def test_similarity_counts_shared_blocks():
+    places = pd.DataFrame({
+        'place_id': ['a', 'b', 'c', 'd'],
+        'category': ['food', 'food', 'nature', 'food'],
+        'price_estimate': [2, 2, 0, 2],
+        'types': ['cafe,bar', 'cafe,bar', 'park', 'museum'],
+        'latitude': [42.36, 42.36, 42.50, 42.50],
+        'longitude': [-71.06, -71.06, -70.90, -70.90],
+    })
+    compact, labels, _ = compact_places(places)
+    vectors = PlaceVectors(compact, labels)
+    similarity = vectors.similarity(np.arange(4), vectors.matrix[0])
+    # b copies a, c shares nothing with it, d only its category and price (2 of 4 blocks)
+    np.testing.assert_allclose(similarity, [1.0, 1.0, 0.0, 0.5], atol=1e-6)
+
+
+def test_rows_of_matches_a_scan(vectors, venue_places):
+    ids = venue_places['place_id'].to_numpy()
+    wanted = [ids[0], ids[7], ids[1234], 'unknown', ids[0] + 'x' * 50]
+    expected = np.nonzero(np.isin(ids, wanted))[0]
+    np.testing.assert_array_equal(vectors.rows_of(wanted), expected)
+    # A venue listed twice gives both rows
+    assert len(vectors.rows_of([ids[0]])) == 2
+    assert len(vectors.rows_of([])) == 0
+
+
+def test_exclude_matches_setdiff(vectors, venue_places):
+    ids = venue_places['place_id'].to_numpy()
+    positions = np.arange(0, len(ids), 3)
+    dropped = [ids[0], ids[3], ids[10], 'unknown']
+    expected = np.setdiff1d(positions, np.nonzero(np.isin(ids, dropped))[0])
+    np.testing.assert_array_equal(vectors.exclude(positions, dropped), expected)
+
+
+def test_profile_vector(vectors, venue_places):
+    assert not vectors.profile_vector({'liked': ['unknown']}).any()
+    liked = venue_places['place_id'].iloc[[10, 20]].tolist()
+    vector = vectors.profile_vector({'liked': liked, 'visited': []})
+    assert np.linalg.norm(vector) == pytest.approx(1, rel=1e-5)
+    expected = vectors.matrix[vectors.rows_of(liked)].sum(axis=0)
+    np.testing.assert_allclose(vector, expected / np.linalg.norm(expected), rtol=1e-5)
+
+
+@pytest.fixture(scope='module')
+def venue_engine(venue_places):
+    return RecommendationEngine('boston', places_df=venue_places, materialized_dir=None)
+
+
+def test_empty_profile_keeps_the_usual_order(venue_engine):
+    personalized = venue_engine.get_personalized_recommendations({}, CATEGORIES, 3, 20)
+    usual = venue_engine.get_recommendations(CATEGORIES, 3, 1, 20)
+    assert list(personalized.index) == list(usual.index)
+    assert (personalized['similarity'] == 0).all()
+
+
+def test_personalized_reranks_toward_likes_and_skips_visits(venue_engine, venue_places):
+    usual = venue_engine.get_recommendations(CATEGORIES, 3, 1, 20)
+    visited = usual['place_id'].iloc[:5].tolist()
+    liked = venue_places[venue_places['category'] == 'cultural']['place_id'].head(10).tolist()
+
+    personalized = venue_engine.get_personalized_recommendations(
+        {'liked': liked, 'visited': visited}, CATEGORIES, 3, 20, weight=2.0)
+    assert not set(personalized['place_id']) & set(visited)
+    shares = [(frame['category'].astype(str) == 'cultural').mean() for frame in (usual, personalized)]
+    assert shares[1] > shares[0]
+    assert len(personalized) == 20 and np.all(np.diff(personalized['score'].to_numpy()) <= 0)
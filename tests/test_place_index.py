@@ -0,0 +1,72 @@
+"""
+Place Index Tests
+Top-N selection against the original pandas nlargest implementation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+QUERIES = [
+    (['food'], 1, 10),
+    (['food', 'cultural'], 2, 20),
+    (['nature', 'nightlife', 'shopping'], 4, 50),
+    (['family'], 3, 500),
+]
+
+
+def nlargest(values, n: int):
+    """
+    DataFrame/Series.nlargest with ties kept in row order
+
+    pandas switches to an unstable sort_values when n covers every row, so
+    that case is sorted stably here; smaller n are nlargest itself.
+    """
+    if n < len(values):
+        return values.nlargest(n, 'score') if isinstance(values, pd.DataFrame) else values.nlargest(n)
+    if isinstance(values, pd.DataFrame):
+        return values.sort_values('score', ascending=False, kind='stable')
+    return values.sort_values(ascending=False, kind='stable')
+
+
+def reference_recommendations(places_df: pd.DataFrame, categories: list, budget_level: int,
+                              top_n: int) -> pd.DataFrame:
+    """The engine's original per-request pandas path"""
+    filtered = places_df[places_df['category'].isin(categories)].copy()
+    filtered = filtered[(filtered['price_estimate'] <= budget_level)
+                        | (filtered['price_estimate'] == 0)].copy()
+    filtered['review_score'] = np.log1p(filtered['review_count'].fillna(0))
+    max_review_score = filtered['review_score'].max()
+    if max_review_score > 0:
+        filtered['review_score'] = filtered['review_score'] / max_review_score
+    filtered['score'] = filtered['rating'].fillna(0) * 0.7 + filtered['review_score'] * 0.3
+    return nlargest(filtered, top_n)
+
+
+def test_top_n_breaks_ties_like_nlargest(engine):
+    rng = np.random.default_rng(0)
+    positions = np.sort(rng.choice(10_000, 2_000, replace=False))
+    scores = rng.integers(0, 20, len(positions)) / 4   # many ties
+    for top_n in (1, 7, 100, 2_000, 5_000):
+        expected = nlargest(pd.Series(scores, index=positions), top_n)
+        got_positions, got_scores = engine.index.top_n(positions, scores, top_n)
+        np.testing.assert_array_equal(got_positions, expected.index.to_numpy())
+        np.testing.assert_array_equal(got_scores, expected.to_numpy())
+
+
+@pytest.mark.parametrize('categories, budget_level, top_n', QUERIES)
+def test_recommendations_match_pandas_reference(engine, places_df, categories, budget_level, top_n):
+    expected = reference_recommendations(places_df, categories, budget_level, top_n)
+    got = engine.get_recommendations(categories, budget_level, 3, top_n)
+    assert got['place_id'].tolist() == expected['place_id'].tolist()
+    np.testing.assert_allclose(got['score'].to_numpy(), expected['score'].to_numpy(), rtol=1e-12)
+
+
+def test_batch_matches_single_queries(engine):
+    batch = engine.get_recommendations_batch(QUERIES)
+    for i, (categories, budget_level, top_n) in enumerate(QUERIES):
+        single = engine.get_recommendations(categories, budget_level, 3, top_n)
+        count = batch['counts'][i]
+        positions = batch['positions'][i, :count]
+        assert count == len(single)
+        assert engine.places_df['place_id'].to_numpy()[positions].tolist() == single['place_id'].tolist()
@@ -0,0 +1,50 @@
+"""
+Collection Planner Tests
+Which searches a plan keeps, calls or skips
+"""
+
+from src.data.planner import allocate, learn_priors
+
+BUDGETS = {'google': 100, 'yelp': 100}
+
+
+def cached_search(keyword: str, categories: list, places: set) -> dict:
+    """A search with expired cached results, as observe() returns it"""
+    return {'city': 'boston', 'provider': 'google', 'keyword': keyword, 'categories': categories,
+            'fresh': False, 'results': len(places), 'places': frozenset(places)}
+
+
+def decide(searches: list) -> dict:
+    decided = allocate(searches, learn_priors(searches), BUDGETS)
+    return {search['keyword']: search for search in decided}
+
+
+def test_search_repeating_its_own_category_is_redundant():
+    decided = decide([cached_search('restaurant', ['food'], {'a', 'b', 'c'}),
+                      cached_search('dining', ['food'], {'a', 'b'})])
+    assert decided['restaurant']['status'] == 'call'
+    assert decided['dining']['status'] == 'redundant'
+
+
+def test_venues_of_another_category_are_still_new():
+    decided = decide([cached_search('museum', ['cultural'], {'a', 'b', 'c'}),
+                      cached_search("children's museum", ['family'], {'a', 'b'})])
+    assert decided['museum']['status'] == 'call'
+    assert decided["children's museum"]['status'] == 'call'
+    assert decided["children's museum"]['expected_new'] == 2
+
+
+def test_shared_keyword_counts_every_category():
+    park = dict(cached_search('park', ['nature'], {'a', 'b'}), fresh=True)
+    decided = decide([park, cached_search('beach', ['leisure', 'nature'], {'a', 'b', 'c'})])
+    # Free park runs first: a and b are new for leisure only, c for both categories
+    assert decided['beach']['expected_new'] == 4
+
+
+def test_unseen_search_estimate_counts_every_category():
+    seen = cached_search('park', ['nature'], {'a', 'b', 'c', 'd'})
+    unseen = dict(cached_search('beach', ['leisure', 'nature'], set()), places=None, results=None)
+    priors = learn_priors([seen, unseen])
+    decided = {search['keyword']: search for search in allocate([seen, unseen], priors, BUDGETS)}
+    assert decided['beach']['estimated']
+    assert decided['beach']['expected_new'] == 2 * priors['google']['yield']
@@ -0,0 +1,130 @@
+"""
+Projected Read Tests
+Filtered, column-projected reads must give the answers of the full dataset
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from src.data.streaming import write_city_parquet
+from src.models.scoring import DEFAULT_MODEL, SMOOTHED_MODEL
+from src.recommender.projection import (
+    DISPLAY_COLUMNS, ENGINE_COLUMNS, filters_are_exact, read_places, row_filters, schema_names
+)
+from src.recommender.recommendation_engine import RecommendationEngine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope='module')
+def data_file(tmp_path_factory, places_df):
+    """places_df saved like save_city_data, a third of it merged google+yelp"""
+    places = places_df.copy()
+    places.loc[::3, 'source'] = 'google+yelp'
+    path = tmp_path_factory.mktemp('projection') / 'boston_places.parquet'
+    write_city_parquet(places, path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def saved(data_file):
+    return pd.read_parquet(data_file)
+
+
+def test_row_filters():
+    assert row_filters() == []
+    assert row_filters(['nature', 'food', 'nature'], 2, 'yelp') == [
+        ('category', 'in', ['food', 'nature']),
+        ('price_estimate', '<=', 2),
+        ('source', 'in', ['yelp', 'google+yelp']),
+    ]
+    assert row_filters(source='google+yelp') == [('source', 'in', ['google+yelp'])]
+
+
+def test_filters_are_exact():
+    names = ['rating', 'review_count', 'category']
+    assert filters_are_exact(DEFAULT_MODEL.features, names)
+    assert filters_are_exact(['price_fit', 'distance'], names)
+    # Needs the venue's rows in other categories
+    assert not filters_are_exact(['rating', 'category_match'], names)
+    # Aggregated over the whole dataset: exact only when stored in the file
+    assert not filters_are_exact(SMOOTHED_MODEL.features, names)
+    assert filters_are_exact(SMOOTHED_MODEL.features, names + ['smoothed_rating'])
+
+
+@pytest.mark.parametrize('categories, budget, source', [
+    (['food'], None, None),
+    (['nature', 'cultural'], 2, None),
+    (None, 1, 'google'),
+    (['nightlife'], 3, 'yelp'),
+    (['food'], None, 'google+yelp'),
+    (['zoo'], None, None),
+])
+def test_read_places_matches_a_pandas_filter(data_file, saved, categories, budget, source):
+    keep = np.ones(len(saved), dtype=bool)
+    if categories:
+        keep &= saved['category'].isin(categories)
+    if budget is not None:
+        keep &= saved['price_estimate'] <= budget
+    if source:
+        keep &= saved['source'].isin([source, 'google+yelp'])
+    expected = saved[keep].reset_index(drop=True)
+
+    read = read_places(data_file, filters=row_filters(categories, budget, source))
+    pd.testing.assert_frame_equal(read, expected)
+
+
+def test_read_places_projects_columns(data_file, saved):
+    read = read_places(data_file, ['rating', 'name', 'not_a_column', 'rating'])
+    assert list(read.columns) == ['rating', 'name']
+    pd.testing.assert_frame_equal(read, saved[['rating', 'name']])
+    assert schema_names(data_file) == list(saved.columns)
+
+
+def test_category_row_groups(data_file, saved):
+    metadata = pq.ParquetFile(data_file).metadata
+    assert metadata.num_row_groups == saved['category'].nunique()
+
+
+@pytest.mark.parametrize('categories, budget', [(['food', 'cultural'], 2), (['nature'], 4)])
+def test_filtered_engine_answers_like_the_full_one(data_file, saved, categories, budget):
+    full = RecommendationEngine('boston', places_df=saved, materialized_dir=None)
+    places = read_places(data_file, ENGINE_COLUMNS + DISPLAY_COLUMNS, row_filters(categories, budget))
+    filtered = RecommendationEngine('boston', places_df=places, materialized_dir=None)
+
+    columns = ['place_id', 'category', 'score']
+    expected = full.get_recommendations(categories, budget, 2, 30)[columns].reset_index(drop=True)
+    got = filtered.get_recommendations(categories, budget, 2, 30)[columns].reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected, check_categorical=False)
+
+    expected = full.create_itinerary(categories, budget, 2)
+    got = filtered.create_itinerary(categories, budget, 2)
+    for day in expected:
+        assert got[day]['place_id'].tolist() == expected[day]['place_id'].tolist()
+
+
+def test_filtered_famous_answers_like_the_full_one(data_file, saved):
+    full = RecommendationEngine('boston', places_df=saved, materialized_dir=None)
+    places = read_places(data_file, ENGINE_COLUMNS + DISPLAY_COLUMNS, row_filters(['food'], source='yelp'))
+    filtered = RecommendationEngine('boston', places_df=places, materialized_dir=None)
+    expected = full.get_top_famous_places(25, 'food', 'yelp')
+    got = filtered.get_top_famous_places(25, 'food', 'yelp')
+    assert got['place_id'].tolist() == expected['place_id'].tolist()
+    np.testing.assert_array_equal(got['fame_score'], expected['fame_score'])
+
+
+def test_cli_recommend(data_file, saved):
+    output = subprocess.run(
+        [sys.executable, 'cli.py', 'recommend', 'boston', 'food', 'cultural', '--budget', '2',
+         '--top-n', '15', '--format', 'jsonl', '--data-dir', str(data_file.parent)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    got = [json.loads(line)['place_id'] for line in output.splitlines()]
+    full = RecommendationEngine('boston', places_df=saved, materialized_dir=None)
+    assert got == full.get_recommendations(['food', 'cultural'], 2, 1, 15)['place_id'].tolist()
@@ -0,0 +1,76 @@
+"""
+Recommendation Engine Tests
+Famous places and statistics of a loaded dataset
+"""
+
+import numpy as np
+import pytest
+from src.recommender.recommendation_engine import RecommendationEngine
+
+
+@pytest.fixture(scope='module')
+def merged_engine(places_df):
+    """Engine where every third row is a venue merged across Google and Yelp"""
+    places = places_df.copy()
+    places.loc[::3, 'source'] = 'google+yelp'
+    return RecommendationEngine('boston', places_df=places, materialized_dir=None)
+
+
+@pytest.mark.parametrize('source, accepted', [
+    ('google', {'google', 'google+yelp'}),
+    ('yelp', {'yelp', 'google+yelp'}),
+    ('google+yelp', {'google+yelp'}),
+])
+def test_famous_source_includes_merged_venues(merged_engine, source, accepted):
+    famous = merged_engine.get_top_famous_places(len(merged_engine.places_df), source=source)
+    sources = merged_engine.places_df['source'].astype(str)
+    assert set(famous['source'].astype(str)) == accepted
+    assert len(famous) == sources.isin(accepted).sum()
+    assert np.all(np.diff(famous['fame_score'].to_numpy()) <= 0)
+
+
+def test_famous_unknown_source_is_empty(merged_engine):
+    assert merged_engine.get_top_famous_places(5, source='tripadvisor').empty
+
+
+def reference_famous(places, top_n: int):
+    """The unmemoized ranking: pandas nlargest over the fame score"""
+    fame = places['rating'].fillna(0) * 0.3 + places['review_count'].fillna(0) / 100 * 0.7
+    return fame.nlargest(top_n)
+
+
+@pytest.mark.parametrize('category', [None, 'food', 'nature'])
+def test_famous_matches_nlargest(engine, places_df, category):
+    places = places_df if category is None else places_df[places_df['category'] == category]
+    expected = reference_famous(places, 40)
+    for top_n in (40, 7):
+        famous = engine.get_top_famous_places(top_n, category=category)
+        assert list(famous.index) == list(expected.index[:top_n])
+        np.testing.assert_allclose(famous['fame_score'], expected.iloc[:top_n])
+
+
+def test_famous_orders_are_computed_once(places_df):
+    engine = RecommendationEngine('boston', places_df=places_df, materialized_dir=None)
+    first = engine._fame_order('food', 'yelp')
+    assert engine._fame_order('food', 'yelp') is first
+    assert set(engine._fame_orders) == {(None, None), ('food', 'yelp')}
+
+    # Unknown filter values are answered but never cached
+    assert engine.get_top_famous_places(5, category='zoo').empty
+    assert ('zoo', None) not in engine._fame_orders
+
+
+def test_statistics_are_cached_copies(places_df):
+    engine = RecommendationEngine('boston', places_df=places_df, materialized_dir=None)
+    statistics = engine.get_statistics()
+    assert statistics['total_places'] == len(places_df)
+    assert statistics['by_category'] == places_df['category'].value_counts().to_dict()
+    assert statistics['by_source'] == places_df['source'].value_counts().to_dict()
+    assert statistics['avg_rating'] == pytest.approx(places_df['rating'].mean())
+    assert statistics['total_reviews'] == places_df['review_count'].sum()
+
+    # Callers mutating their copy do not change the cached statistics
+    statistics['by_category'].clear()
+    statistics['total_places'] = 0
+    assert engine.get_statistics()['by_category'] == places_df['category'].value_counts().to_dict()
+    assert engine.get_statistics()['total_places'] == len(places_df)
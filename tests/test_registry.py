@@ -0,0 +1,46 @@
+"""
+Engine Registry Tests
+Memory-mapped loads must answer like an engine built from the parquet file
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import write_places_parquet
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.registry import EngineRegistry
+
+
+@pytest.fixture(scope='module')
+def engines(tmp_path_factory):
+    """(engine loaded through the registry, engine built from the parquet file)"""
+    workspace = tmp_path_factory.mktemp('registry')
+    data_file = write_places_parquet(2000, workspace, 'boston', seed=5)
+    mapped = EngineRegistry(workspace, workspace / 'arrow').get('boston')
+    direct = RecommendationEngine('boston', places_df=pd.read_parquet(data_file),
+                                  materialized_dir=None)
+    return mapped, direct
+
+
+def test_frame_is_mapped_read_only(engines):
+    mapped, _ = engines
+    for col in mapped.places_df.columns:
+        array = mapped.places_df[col].array
+        if isinstance(array, pd.arrays.ArrowExtensionArray):
+            continue
+        values = array.codes if isinstance(array, pd.Categorical) else np.asarray(array)
+        assert not values.flags.writeable, col
+
+
+def test_mapped_engine_answers_like_direct(engines):
+    mapped, direct = engines
+    for args in [(['food', 'cultural'], 2, 3, 20), (['nature'], 4, 1, 50)]:
+        pd.testing.assert_frame_equal(mapped.get_recommendations(*args),
+                                      direct.get_recommendations(*args), check_categorical=False)
+    expected = direct.create_itinerary(['food', 'nightlife'], 3, 2)
+    for day, stops in mapped.create_itinerary(['food', 'nightlife'], 3, 2).items():
+        pd.testing.assert_frame_equal(stops, expected[day], check_categorical=False)
+    pd.testing.assert_frame_equal(mapped.get_top_famous_places(10, 'food'),
+                                  direct.get_top_famous_places(10, 'food'), check_categorical=False)
+    assert mapped.get_statistics() == direct.get_statistics()
+
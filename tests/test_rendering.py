@@ -0,0 +1,166 @@
+"""
+Rendering Tests
+Every output format must carry the recommendations and itineraries it was given
+"""
+
+import io
+import json
+from html.parser import HTMLParser
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.bench_rendering import iterrows_text
+from src.recommender.rendering import (
+    FORMATS, ItineraryWriter, format_of, itinerary_frame, render_itinerary,
+    render_recommendations, write_recommendations
+)
+
+CATEGORIES = ['food', 'cultural', 'nightlife']
+
+
+class TableParser(HTMLParser):
+    """Header and body cell texts of the tables in a page"""
+
+    def __init__(self):
+        super().__init__()
+        self.header, self.rows, self._cell = [], [], None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.rows.append([])
+        elif tag in ('td', 'th'):
+            self._cell = ''
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell += data
+
+    def handle_endtag(self, tag):
+        if tag == 'th':
+            self.header.append(self._cell)
+        elif tag == 'td':
+            self.rows[-1].append(self._cell)
+        if tag in ('td', 'th'):
+            self._cell = None
+
+
+def parse_html(text: str) -> TableParser:
+    parser = TableParser()
+    parser.feed(text)
+    parser.rows = [row for row in parser.rows if row]
+    return parser
+
+
+@pytest.fixture(scope='module')
+def recommendations(engine):
+    recs = engine.get_recommendations(CATEGORIES, 3, 1, 60)
+    # Awkward values: markup, a missing rating, a free place
+    recs.iloc[0, recs.columns.get_loc('name')] = 'Tom & Jerry\'s <Bar> "Grill"'
+    recs.iloc[1, recs.columns.get_loc('rating')] = np.nan
+    recs.iloc[2, recs.columns.get_loc('price_estimate')] = 0
+    return recs
+
+
+@pytest.fixture(scope='module')
+def itineraries(engine):
+    return [engine.create_itinerary(CATEGORIES, 3, days) for days in (1, 2, 3, 2, 1)]
+
+
+def test_text_matches_the_row_by_row_listing(recommendations):
+    google = recommendations[recommendations['google_maps_url'].notna()]
+    assert render_recommendations(google) == iterrows_text(google)
+
+    text = render_recommendations(recommendations)
+    assert "No rating" in text and "Free/Unknown" in text
+    # Yelp rows link to Yelp
+    for url in recommendations['yelp_url'].dropna():
+        assert f"🔗 {url}\n" in text
+
+
+def test_jsonl_holds_every_row(recommendations):
+    lines = render_recommendations(recommendations, 'jsonl').splitlines()
+    assert len(lines) == len(recommendations)
+    parsed = pd.DataFrame([json.loads(line) for line in lines])
+    assert list(parsed.columns) == list(recommendations.columns)
+    assert parsed['name'].tolist() == recommendations['name'].tolist()
+    np.testing.assert_allclose(parsed['score'], recommendations['score'], rtol=1e-14)
+    assert parsed['rating'].isna().tolist() == recommendations['rating'].isna().tolist()
+
+
+def test_csv_holds_every_row(recommendations):
+    parsed = pd.read_csv(io.StringIO(render_recommendations(recommendations, 'csv')))
+    assert list(parsed.columns) == list(recommendations.columns)
+    assert parsed['name'].tolist() == recommendations['name'].tolist()
+    assert parsed['place_id'].tolist() == recommendations['place_id'].tolist()
+    np.testing.assert_allclose(parsed['score'], recommendations['score'])
+
+
+def test_html_escapes_values(recommendations):
+    text = render_recommendations(recommendations, 'html')
+    assert '<Bar>' not in text and '&lt;Bar&gt;' in text
+    table = parse_html(text)
+    assert table.header == list(recommendations.columns)
+    assert len(table.rows) == len(recommendations)
+    assert table.rows[0][table.header.index('name')] == 'Tom & Jerry\'s <Bar> "Grill"'
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        render_recommendations(pd.DataFrame(), 'xml')
+    with pytest.raises(ValueError):
+        format_of('out.xlsx')
+    assert format_of('OUT.HTM') == 'html'
+
+
+def test_itinerary_tables(itineraries):
+    itinerary = itineraries[2]
+    frame = itinerary_frame(itinerary)
+    stops = sum(len(day) for day in itinerary.values())
+    assert len(frame) == stops and list(frame.columns[:2]) == ['day', 'stop']
+    for day, places in enumerate(itinerary.values(), 1):
+        rows = frame[frame['day'] == day]
+        assert rows['stop'].tolist() == list(range(1, len(places) + 1))
+        assert rows['place_id'].tolist() == places['place_id'].tolist()
+
+    assert len(render_itinerary(itinerary, 'jsonl').splitlines()) == stops
+    text = render_itinerary(itinerary)
+    assert all(f"📆 DAY {day}" in text for day in range(1, 4))
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_streamed_export_equals_one_batch(itineraries, fmt):
+    outputs = []
+    for batch_size in (1, 2, len(itineraries)):
+        out = io.StringIO()
+        with ItineraryWriter(out, fmt, batch_size=batch_size) as writer:
+            for number, itinerary in enumerate(itineraries):
+                writer.write(itinerary, name=f'user{number}')
+        assert not out.closed
+        assert writer.itineraries == len(itineraries)
+        assert writer.rows == sum(len(day) for it in itineraries for day in it.values())
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+    if fmt == 'csv':
+        parsed = pd.read_csv(io.StringIO(outputs[0]))
+        assert parsed['itinerary'].unique().tolist() == [f'user{n}' for n in range(len(itineraries))]
+        assert len(parsed) == writer.rows
+    elif fmt == 'html':
+        assert len(parse_html(outputs[0]).rows) == writer.rows
+
+
+def test_file_outputs(tmp_path, recommendations, itineraries):
+    write_recommendations(recommendations, tmp_path / 'recs.csv')
+    assert len(pd.read_csv(tmp_path / 'recs.csv')) == len(recommendations)
+
+    with ItineraryWriter(tmp_path / 'trips.jsonl') as writer:
+        for itinerary in itineraries:
+            writer.write(itinerary)
+    lines = (tmp_path / 'trips.jsonl').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == writer.rows
+    assert json.loads(lines[-1])['itinerary'] == str(len(itineraries))
+
+    with ItineraryWriter(tmp_path / 'empty.html'):
+        pass
+    assert parse_html((tmp_path / 'empty.html').read_text()).rows == []
@@ -0,0 +1,131 @@
+"""
+Replay Tests
+Query log parsing, replay across workers and the latency report
+"""
+
+import json
+import multiprocessing
+
+import numpy as np
+import pytest
+from benchmarks.synthetic import write_places_parquet
+from src.recommender.registry import EngineRegistry
+from src.recommender.replay import (
+    load_queries, parse_query, profile_requests, query_path, replay, summarize
+)
+from src.recommender.service import RecommendationService
+
+LOG = [
+    {'path': '/recommendations?city=boston&categories=food&categories=nature&budget=2'},
+    {'endpoint': 'itinerary', 'params': {'city': 'boston', 'categories': ['food'], 'budget': 3,
+                                         'days': 2}},
+    {'endpoint': '/famous', 'city': 'boston', 'top_n': 10, 'source': None},
+    {'path': '/recommendations?city=boston&categories=food&categories=nature&budget=2'},
+    {'endpoint': 'statistics', 'city': 'atlantis'},
+    {'path': '/famous?city=boston&top_n=10'},
+    {'endpoint': 'like', 'method': 'post', 'user': 'ana', 'place_id': ['a', 'b']},
+]
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    workspace = tmp_path_factory.mktemp('replay')
+    write_places_parquet(1000, workspace, 'boston', seed=13)
+    return RecommendationService(EngineRegistry(workspace, workspace / 'arrow', verbose=False))
+
+
+def fresh(service) -> RecommendationService:
+    """Service on the same engines with an empty result cache"""
+    return RecommendationService(service.registry)
+
+
+def test_parse_query_shapes():
+    queries = [parse_query(record) for record in LOG]
+    assert queries[0] == {'endpoint': 'recommendations', 'method': 'GET',
+                          'params': {'city': ['boston'], 'categories': ['food', 'nature'],
+                                     'budget': ['2']}}
+    assert queries[1]['params'] == {'city': ['boston'], 'categories': ['food'], 'budget': ['3'],
+                                    'days': ['2']}
+    assert queries[2] == {'endpoint': 'famous', 'method': 'GET',
+                          'params': {'city': ['boston'], 'top_n': ['10']}}
+    assert queries[6] == {'endpoint': 'like', 'method': 'POST',
+                          'params': {'user': ['ana'], 'place_id': ['a', 'b']}}
+    with pytest.raises(ValueError):
+        parse_query({'city': 'boston'})
+
+
+def test_query_path_round_trips():
+    for record in LOG:
+        query = parse_query(record)
+        again = parse_query({'path': query_path(query), 'method': query['method']})
+        assert again == query
+
+
+def test_load_queries(tmp_path):
+    path = tmp_path / 'queries.jsonl'
+    path.write_text('\n'.join(json.dumps(record) for record in LOG[:3]) + '\n\n'
+                    + json.dumps(LOG[3]) + '\n', encoding='utf-8')
+    assert load_queries(path) == [parse_query(record) for record in LOG[:4]]
+
+    path.write_text(json.dumps(LOG[0]) + '\n{"city": "boston"}\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='queries.jsonl:2'):
+        load_queries(path)
+
+
+def test_replay_answers_like_the_service(service):
+    queries = [parse_query(record) for record in LOG[:6]]
+    results = replay(fresh(service), queries)
+    direct = fresh(service)
+    expected = [direct.handle(q['endpoint'], q['params'], q['method'])[0] for q in queries]
+    assert results['status'].tolist() == expected == [200, 200, 200, 200, 404, 200]
+    # Repeats of a query are answered from the result cache
+    assert results['hit'].tolist() == [False, False, False, True, False, True]
+    assert (results['latency_s'] >= results['service_s']).all()
+    assert results['workers'] == 1 and results['qps'] is None
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_replay_across_workers(service):
+    queries = [parse_query(record) for record in LOG[:6]] * 4
+    results = replay(fresh(service), queries, workers=3, qps=500)
+    assert results['workers'] == 3
+    # Query i runs on worker i % 3, each with its own cache
+    assert sorted(set(results['worker'].tolist())) == [0, 1, 2]
+    assert all(len(set(results['worker'][i::3])) == 1 for i in range(3))
+    assert results['status'].tolist() == [200, 200, 200, 200, 404, 200] * 4
+    # A query hits once its worker has answered it before
+    seen, expected = set(), []
+    for i, status in enumerate(results['status']):
+        key = (i % 3, query_path(queries[i]))
+        expected.append(status == 200 and key in seen)
+        seen.add(key)
+    assert results['hit'].tolist() == expected
+
+
+def test_summarize(service):
+    queries = [parse_query(record) for record in LOG[:6]]
+    results = replay(fresh(service), queries)
+    report = summarize(results, queries, slowest=3)
+
+    assert report['requests'] == 6 and report['mode'] == 'closed'
+    assert report['overall']['count'] == 6 and report['overall']['errors'] == 1
+    # Two of the five answered requests came from the cache
+    assert report['overall']['cache_hit_rate'] == pytest.approx(2 / 5)
+    assert {name: entry['count'] for name, entry in report['endpoints'].items()} == \
+        {'recommendations': 2, 'itinerary': 1, 'famous': 2, 'statistics': 1}
+    latencies = [entry['latency_ms'] for entry in report['slowest']]
+    assert len(latencies) == 3 and latencies == sorted(latencies, reverse=True)
+    assert latencies[0] == pytest.approx(results['latency_s'].max() * 1000)
+    slowest = report['slowest'][0]
+    assert slowest['path'] == query_path(queries[slowest['index']])
+    assert report['overall']['max_ms'] == pytest.approx(np.max(results['latency_s']) * 1000)
+
+
+def test_profile_requests_writes_captures(service, tmp_path):
+    queries = [parse_query(record) for record in LOG[:3]]
+    captures = profile_requests(service, queries, [1, 0], output_dir=tmp_path, limit=5)
+    assert [capture['index'] for capture in captures] == [1, 0]
+    assert (tmp_path / 'slowest-01-itinerary.prof').exists()
+    assert all(len(capture['top']) == 5 and capture['ms'] > 0 for capture in captures)
+    with pytest.raises(ValueError):
+        profile_requests(service, queries, [0], profiler='perf')
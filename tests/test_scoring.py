@@ -0,0 +1,118 @@
+"""
+Scoring Model Tests
+Linear scoring over feature columns and the offline weight trainer
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import make_interactions
+from src.models.scoring import FEATURES, ScoringModel, price_fit
+from src.models.trainer import auc, fit_weights, load_interactions, train
+
+RICH_MODEL = ScoringModel({'rating': 0.25, 'log_reviews': 0.15, 'smoothed_rating': 0.2,
+                           'price_fit': 0.2, 'category_match': 0.1, 'reviews': 0.02,
+                           'distance': -0.08}, name='rich')
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_model_weights():
+    model = ScoringModel({'price_fit': 0.5, 'log_reviews': 0.2, 'rating': 0.3, 'distance': 0})
+    # Static terms first, zero weights dropped
+    assert model.features == ['rating', 'price_fit', 'log_reviews']
+    assert model.static_features == ['rating']
+    assert ScoringModel.from_vector(model.vector).weights == model.weights
+    with pytest.raises(ValueError, match='popularity'):
+        ScoringModel({'rating': 1, 'popularity': 1})
+
+
+def test_evaluate_sums_weighted_columns():
+    rng = np.random.default_rng(0)
+    columns = {feature: rng.uniform(0, 5, 100) for feature in FEATURES}
+    expected = sum(weight * columns[feature] for feature, weight in RICH_MODEL.weights.items())
+    np.testing.assert_allclose(RICH_MODEL.evaluate(columns), expected)
+
+    # A precomputed static part gives the same scores
+    static = RICH_MODEL.static_score(columns)
+    np.testing.assert_array_equal(RICH_MODEL.evaluate(columns, static=static),
+                                  RICH_MODEL.evaluate(columns))
+
+    # (queries, places) columns broadcast against flat ones
+    columns['price_fit'] = price_fit(columns['rating'], np.array([[1.0], [4.0]]))
+    batched = RICH_MODEL.evaluate(columns)
+    assert batched.shape == (2, 100)
+    assert ScoringModel({}).evaluate(columns) == 0.0
+
+
+def test_price_fit():
+    prices = np.array([0.0, 1.0, 2.0, 4.0, np.nan])
+    np.testing.assert_allclose(price_fit(prices, 2), [0.5, 0.75, 1.0, 0.5, 0.0])
+
+
+def test_model_save_and_load(tmp_path):
+    RICH_MODEL.save(tmp_path / 'models' / 'rich.json')
+    loaded = ScoringModel.load(tmp_path / 'models' / 'rich.json')
+    assert loaded.name == 'rich' and loaded.weights == RICH_MODEL.weights
+
+
+def test_auc():
+    assert auc(np.array([3.0, 2.0, 1.0]), np.array([1, 0, 0])) == 1.0
+    assert auc(np.array([1.0, 2.0, 3.0]), np.array([1, 0, 0])) == 0.0
+    assert auc(np.array([1.0, 1.0]), np.array([1, 0])) == 0.5
+    assert np.isnan(auc(np.array([1.0, 2.0]), np.array([1, 1])))
+
+
+def test_fit_weights_recovers_a_logistic_model():
+    rng = np.random.default_rng(1)
+    X = rng.normal(0, 1, (20_000, len(FEATURES)))
+    X[:, FEATURES.index('reviews')] = 3.0
+    true = np.array([1.0, -0.5, 0.0, 0.8, 0.0, 1.5, 0.3, -1.0])
+    clicked = (rng.random(len(X)) < 1 / (1 + np.exp(-(X @ true - 0.5)))).astype(float)
+
+    model = fit_weights(X, clicked, l2=1.0)
+    assert model.weights.get('reviews', 0.0) == 0.0
+    assert np.abs(model.vector).sum() == pytest.approx(1.0)
+    assert cosine(model.vector, true) > 0.99
+
+
+def test_train_on_a_click_log(engine):
+    log = make_interactions(engine, 1_000, RICH_MODEL, seed=3)
+    model, report = train(engine, log, baseline=ScoringModel({'rating': 0.7, 'log_reviews': 0.3}))
+    assert report['matched_rows'] == report['rows'] == len(log)
+    assert report['train_rows'] + report['holdout_rows'] == len(log)
+    assert report['trained_auc'] > report['baseline_auc']
+    assert cosine(model.vector, RICH_MODEL.vector) > 0.9
+
+
+def test_train_ignores_unknown_places(engine):
+    log = make_interactions(engine, 100, RICH_MODEL, seed=4)
+    log.loc[::10, 'place_id'] = 'gone'
+    _, report = train(engine, log, holdout=0)
+    assert report['matched_rows'] == len(log) - len(log.loc[::10])
+    with pytest.raises(ValueError):
+        train(engine, log.assign(place_id='gone'))
+
+
+@pytest.mark.parametrize('suffix', ['.jsonl', '.csv', '.parquet'])
+def test_load_interactions(tmp_path, suffix):
+    log = pd.DataFrame({'query_id': [1, 1], 'place_id': ['001', '002'], 'clicked': [1, 0],
+                        'categories': ['food,nature', 'food'], 'budget_level': [2, 2]})
+    path = tmp_path / f'log{suffix}'
+    if suffix == '.jsonl':
+        log.to_json(path, orient='records', lines=True)
+    elif suffix == '.csv':
+        log.to_csv(path, index=False)
+    else:
+        log.to_parquet(path)
+    # Place ids stay strings, leading zeros included
+    assert load_interactions(path)['place_id'].tolist() == ['001', '002']
+
+
+def test_load_interactions_needs_the_log_columns(tmp_path):
+    path = tmp_path / 'log.csv'
+    pd.DataFrame({'query_id': [1], 'place_id': ['a'], 'budget_level': [2]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match='clicked, categories'):
+        load_interactions(path)
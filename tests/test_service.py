@@ -0,0 +1,107 @@
+"""
+Service Tests
+Parameter bounds and error statuses of the HTTP endpoints
+"""
+
+import http.client
+import json
+import logging
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+from benchmarks.synthetic import write_places_parquet
+from config.config import SERVICE_MAX_DAYS, SERVICE_MAX_PLACES_PER_DAY, SERVICE_MAX_TOP_N
+from src.recommender.registry import EngineRegistry
+from src.recommender.service import RecommendationService
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    workspace = tmp_path_factory.mktemp('service')
+    write_places_parquet(1000, workspace, 'boston', seed=11)
+    return RecommendationService(EngineRegistry(workspace, workspace / 'arrow', verbose=False))
+
+
+def request(service, path: str, method: str = 'GET') -> tuple:
+    endpoint, _, query = path.partition('?')
+    status, body, _ = service.handle(endpoint, parse_qs(query), method)
+    return status, json.loads(body)
+
+
+@pytest.mark.parametrize('path', [
+    f"recommendations?city=boston&categories=food&budget=2&days={SERVICE_MAX_DAYS}",
+    f"recommendations?city=boston&categories=food&budget=2&top_n={SERVICE_MAX_TOP_N}",
+    f"famous?city=boston&top_n={SERVICE_MAX_TOP_N}",
+    f"itinerary?city=boston&categories=food&budget=2&days=2&places_per_day={SERVICE_MAX_PLACES_PER_DAY}",
+])
+def test_limits_are_accepted(service, path):
+    assert request(service, path)[0] == 200
+
+
+@pytest.mark.parametrize('path, name', [
+    ("recommendations?city=boston&categories=food&budget=2&days=2000", 'days'),
+    (f"recommendations?city=boston&categories=food&budget=2&top_n={SERVICE_MAX_TOP_N + 1}", 'top_n'),
+    (f"famous?city=boston&top_n={SERVICE_MAX_TOP_N + 1}", 'top_n'),
+    (f"itinerary?city=boston&categories=food&budget=2&days={SERVICE_MAX_DAYS + 1}", 'days'),
+    (f"itinerary?city=boston&categories=food&budget=2&places_per_day={SERVICE_MAX_PLACES_PER_DAY + 1}",
+     'places_per_day'),
+])
+def test_values_over_the_limits_are_rejected(service, path, name):
+    status, body = request(service, path)
+    assert status == 400 and body['error'].startswith(f"{name} must be at most")
+
+
+@pytest.mark.parametrize('path, status', [
+    ("recommendations?city=boston&budget=2", 400),
+    ("recommendations?city=boston&categories=food&budget=7", 400),
+    ("famous?city=boston&top_n=0", 400),
+    ("nowhere?city=boston", 404),
+    ("statistics?city=atlantis", 404),
+    # A configured city without a dataset
+    ("statistics?city=miami", 404),
+])
+def test_error_statuses(service, path, status):
+    assert request(service, path)[0] == status
+
+
+def test_unknown_post_endpoint_is_not_found(service):
+    assert request(service, "nowhere?user=u1&place_id=p1", 'POST')[0] == 404
+
+
+def test_unexpected_errors_are_logged_500s(service, monkeypatch, caplog):
+    def broken(*args, **kwargs):
+        raise KeyError('rating')
+
+    monkeypatch.setattr(service, '_run', broken)
+    with caplog.at_level(logging.ERROR, logger='src.recommender.service'):
+        status, body = request(service, "statistics?city=boston")
+    assert status == 500 and body == {'error': "Internal server error"}
+    assert 'GET /statistics failed' in caplog.text
+
+
+@pytest.fixture
+def server(service):
+    server = service.make_server('127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('headers, body', [
+    ({'Content-Length': 'ten'}, b''),
+    ({'Content-Length': '-1'}, b''),
+    ({'Content-Length': '2'}, b'\xff\xfe'),
+])
+def test_malformed_bodies_are_answered_with_400(server, headers, body):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    connection.putrequest('POST', '/like?user=u1&place_id=p1')
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    assert response.status == 400
+    assert 'error' in json.loads(response.read())
+    connection.close()
@@ -0,0 +1,161 @@
+"""
+Shared Dataset Tests
+Snapshots must answer like the engine they were written from, and workers must follow republished versions
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import make_places_df, write_places_parquet
+from src.recommender.recommendation_engine import RecommendationEngine
+from src.recommender.shared import (
+    SharedEngineRegistry, SharedPublisher, read_pointer, read_snapshot, start_publisher,
+    write_snapshot
+)
+
+PROFILE = {'liked': ['syn7_10', 'syn7_20'], 'visited': ['syn7_30']}
+
+
+def answers(engine: RecommendationEngine) -> dict:
+    """Results of every engine query the service exposes"""
+    return {
+        'recommendations': engine.get_recommendations(['food', 'cultural'], 2, 2, 30),
+        'famous': engine.get_top_famous_places(15, 'food', 'yelp'),
+        'near': engine.get_recommendations_near(42.3554, -71.0605, 3, ['nature'], 3, 20),
+        'personalized': engine.get_personalized_recommendations(PROFILE, ['food'], 3, 20),
+        'itinerary': pd.concat(engine.create_itinerary(['food', 'nightlife'], 3, 3)),
+    }
+
+
+def assert_same_answers(got: RecommendationEngine, expected: RecommendationEngine,
+                        check_dtype: bool = True):
+    """Equal results; check_dtype=False allows Arrow-backed strings for object ones"""
+    for name, frame in answers(expected).items():
+        pd.testing.assert_frame_equal(answers(got)[name], frame, obj=name, check_dtype=check_dtype,
+                                      check_categorical=check_dtype)
+    assert got.get_statistics() == expected.get_statistics()
+
+
+@pytest.fixture(scope='module')
+def warmed(places_df):
+    engine = RecommendationEngine('boston', places_df=places_df, materialized_dir=None)
+    engine.warm(place_vectors=True)
+    return engine
+
+
+def test_snapshot_round_trip(warmed, tmp_path):
+    path = tmp_path / 'boston.engine'
+    size = write_snapshot(warmed, path)
+    assert size == path.stat().st_size
+    assert not list(tmp_path.glob('*.tmp'))
+
+    attached = read_snapshot(path)
+    assert_same_answers(attached, warmed)
+
+
+def test_snapshot_arrays_are_mapped_read_only(warmed, tmp_path):
+    write_snapshot(warmed, tmp_path / 'boston.engine')
+    attached = read_snapshot(tmp_path / 'boston.engine')
+    arrays = [attached.index.features['rating'], attached.place_vectors.matrix,
+              attached._fame_order(), attached._fame_order('food', None)]
+    for col in ('latitude', 'rating', 'review_count'):
+        arrays.append(np.asarray(attached.places_df[col].array))
+    for array in arrays:
+        assert not array.flags.writeable
+    with pytest.raises(ValueError):
+        arrays[0][0] = 1.0
+
+
+def test_snapshot_outlives_its_file(warmed, tmp_path):
+    write_snapshot(warmed, tmp_path / 'boston.engine')
+    attached = read_snapshot(tmp_path / 'boston.engine')
+    os.remove(tmp_path / 'boston.engine')
+    assert_same_answers(attached, warmed)
+
+
+def test_read_snapshot_rejects_other_files(tmp_path):
+    (tmp_path / 'boston.engine').write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        read_snapshot(tmp_path / 'boston.engine')
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    data_dir, shared_dir = tmp_path / 'processed', tmp_path / 'shared'
+    write_places_parquet(2000, data_dir, 'boston', seed=7)
+    return data_dir, shared_dir
+
+
+def republish(data_dir, seed: int):
+    """Replace the city's parquet with another dataset (a new version)"""
+    data_file = data_dir / 'boston_places.parquet'
+    stat = data_file.stat()
+    make_places_df(1500, 'boston', seed).to_parquet(data_file, index=False)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_publisher_swaps_the_pointer(workspace):
+    data_dir, shared_dir = workspace
+    publisher = SharedPublisher(data_dir, shared_dir)
+    first = publisher.publish('boston')
+    assert read_pointer(shared_dir, 'boston') == {k: v for k, v in first.items() if k != 'seconds'}
+    assert (shared_dir / first['file']).stat().st_size == first['bytes']
+
+    # Unchanged parquet: nothing is rebuilt
+    assert 'seconds' not in publisher.publish('boston')
+
+    republish(data_dir, seed=8)
+    second = publisher.publish('boston')
+    assert second['file'] != first['file'] and second['version'] != first['version']
+    assert read_pointer(shared_dir, 'boston')['file'] == second['file']
+    assert {path.name for path in shared_dir.iterdir()} == {'boston.current', second['file']}
+    assert read_pointer(shared_dir, 'miami') is None
+
+
+def test_registry_follows_published_versions(workspace):
+    data_dir, shared_dir = workspace
+    publisher = SharedPublisher(data_dir, shared_dir)
+    registry = SharedEngineRegistry(shared_dir, check_interval=0)
+    with pytest.raises(FileNotFoundError):
+        registry.get('boston')
+    with pytest.raises(KeyError):
+        registry.get('atlantis')
+
+    publisher.publish('boston')
+    old = registry.get('boston')
+    assert registry.get('boston') is old
+    assert registry.loaded_cities() == ['boston']
+    assert registry.get_version('boston') == tuple(read_pointer(shared_dir, 'boston')['version'])
+
+    republish(data_dir, seed=8)
+    publisher.publish('boston')
+    new = registry.get('boston')
+    assert new is not old and len(new.places_df) == 1500
+    assert registry.get_version('boston') == tuple(read_pointer(shared_dir, 'boston')['version'])
+    # Requests holding the old engine keep working after its file is removed
+    assert len(old.get_recommendations(['food'], 2, 1, 10)) == 10
+    assert registry.reload('boston') is not new
+
+    # Without automatic checks the attached version is kept
+    pinned = SharedEngineRegistry(shared_dir, check_interval=None)
+    engine = pinned.get('boston')
+    republish(data_dir, seed=9)
+    publisher.publish('boston')
+    assert pinned.get('boston') is engine
+
+
+def test_publisher_process(workspace):
+    data_dir, shared_dir = workspace
+    process = start_publisher(SharedPublisher(data_dir, shared_dir), ['boston'], interval=0.1)
+    try:
+        pointer = read_pointer(shared_dir, 'boston')
+        engine = SharedEngineRegistry(shared_dir).get('boston')
+        data_file = data_dir / 'boston_places.parquet'
+        direct = RecommendationEngine('boston', places_df=pd.read_parquet(data_file))
+        assert pointer['version'][1] == data_file.stat().st_size
+        assert_same_answers(engine, direct, check_dtype=False)
+    finally:
+        process.terminate()
+        process.join()
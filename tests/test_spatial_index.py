@@ -0,0 +1,86 @@
+"""
+Spatial Index Tests
+Grid radius and nearest queries against a brute-force haversine scan
+"""
+
+import numpy as np
+import pytest
+from src.recommender.spatial_index import SpatialIndex, haversine_meters
+
+# Query points: downtown, the edge of the data and far outside it
+POINTS = [(42.3554, -71.0605), (42.40, -71.00), (42.10, -71.50)]
+
+
+@pytest.fixture(scope='module')
+def coordinates():
+    """5,000 points around Boston, 2% without coordinates"""
+    rng = np.random.default_rng(5)
+    lat = 42.36 + rng.normal(0, 0.03, 5000)
+    lng = -71.06 + rng.normal(0, 0.04, 5000)
+    missing = rng.random(5000) < 0.02
+    lat[missing] = np.nan
+    lng[rng.random(5000) < 0.01] = np.nan
+    return lat, lng
+
+
+@pytest.fixture(scope='module')
+def index(coordinates):
+    return SpatialIndex(*coordinates, cell_meters=400)
+
+
+def scan(coordinates, lat: float, lng: float) -> np.ndarray:
+    """Distance to every row (NaN without coordinates)"""
+    return haversine_meters(lat, lng, *coordinates)
+
+
+@pytest.mark.parametrize('point', POINTS)
+@pytest.mark.parametrize('radius', [0, 150, 1_000, 5_000, 50_000])
+def test_within_matches_scan(index, coordinates, point, radius):
+    distances = scan(coordinates, *point)
+    expected = np.nonzero(distances <= radius)[0]
+    positions, got = index.within(*point, radius)
+    np.testing.assert_array_equal(positions, expected)
+    np.testing.assert_allclose(got, distances[expected])
+
+
+@pytest.mark.parametrize('point', POINTS)
+@pytest.mark.parametrize('k', [1, 10, 250, 10_000])
+def test_nearest_matches_scan(index, coordinates, point, k):
+    distances = scan(coordinates, *point)
+    valid = np.nonzero(~np.isnan(distances))[0]
+    expected = valid[np.lexsort((valid, distances[valid]))][:k]
+    positions, got = index.nearest(*point, k)
+    np.testing.assert_array_equal(positions, expected)
+    np.testing.assert_allclose(got, distances[expected])
+
+
+def test_nearest_with_allowed_rows(index, coordinates):
+    distances = scan(coordinates, *POINTS[0])
+    allowed = np.zeros(len(distances), dtype=bool)
+    allowed[::97] = True
+    candidates = np.nonzero(allowed & ~np.isnan(distances))[0]
+    expected = candidates[np.argsort(distances[candidates], kind='stable')][:20]
+    positions, _ = index.nearest(*POINTS[0], 20, allowed=lambda rows: allowed[rows])
+    np.testing.assert_array_equal(positions, expected)
+
+
+def test_empty_index():
+    index = SpatialIndex(np.array([np.nan]), np.array([np.nan]))
+    assert len(index.within(42.36, -71.06, 1_000)[0]) == 0
+    assert len(index.nearest(42.36, -71.06, 5)[0]) == 0
+
+
+def test_recommendations_near_stay_in_radius_and_filters(engine):
+    lat, lng = POINTS[0]
+    near = engine.get_recommendations_near(lat, lng, 2, ['food', 'cultural'], 2, 50)
+    assert not near.empty and len(near) <= 50
+    assert (near['distance_km'] <= 2).all()
+    assert set(near['category'].astype(str)) <= {'food', 'cultural'}
+    assert (near['price_estimate'] <= 2).all()
+    assert np.all(np.diff(near['score'].to_numpy()) <= 0)
+
+
+def test_nearest_places_are_sorted_by_distance(engine):
+    nearest = engine.get_nearest_places(*POINTS[0], 15, ['nature'])
+    assert len(nearest) == 15 and set(nearest['category'].astype(str)) == {'nature'}
+    assert np.all(np.diff(nearest['distance_km'].to_numpy()) >= 0)
@@ -0,0 +1,44 @@
+"""
+Scoring Model Training Script
+Fit recommendation score weights from a logged click history
+"""
+
+import argparse
+
+from config.config import CITIES, SCORING_MODEL_PATH
+from src.models.scoring import FEATURES
+from src.models.trainer import load_interactions, train
+from src.recommender.recommendation_engine import RecommendationEngine
+
+def main():
+    parser = argparse.ArgumentParser(description="Train scoring weights from an interaction log")
+    parser.add_argument('log', help="Interaction log (.jsonl, .csv or .parquet) with query_id, "
+                                    "place_id, clicked, categories and budget_level columns")
+    parser.add_argument('--city', choices=list(CITIES), default='boston',
+                        help="City the log was recorded in")
+    parser.add_argument('--l2', type=float, default=1.0, help="Ridge penalty on the weights")
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help="Share of queries held out to compare against the current model")
+    parser.add_argument('--output', default=SCORING_MODEL_PATH, help="Where to write the model")
+    args = parser.parse_args()
+
+    engine = RecommendationEngine(args.city)
+    interactions = load_interactions(args.log)
+    print(f"\n🧮 Training on {len(interactions):,} logged interactions")
+    model, report = train(engine, interactions, args.l2, args.holdout)
+
+    print(f"   Matched rows: {report['matched_rows']:,} "
+          f"(train {report['train_rows']:,} | holdout {report['holdout_rows']:,})")
+    print(f"   Click rate: {report['click_rate']:.1%}")
+    if 'trained_auc' in report:
+        print(f"   Holdout AUC: current {report['baseline_auc']:.3f} -> "
+              f"trained {report['trained_auc']:.3f}")
+    for feature, weight in zip(FEATURES, model.vector):
+        print(f"   {feature:16s} {weight:+.4f}")
+
+    model.save(args.output)
+    print(f"\n✅ Saved {model} to {args.output}")
+    print(f"   Serve it with: python serve.py --scoring-model {args.output}")
+
+if __name__ == "__main__":
+    main()